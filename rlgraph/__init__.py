@@ -19,6 +19,7 @@ from __future__ import print_function
 
 from rlgraph.version import __version__
 
+import importlib.util
 import json
 import os
 import logging
@@ -50,8 +51,8 @@ BACKEND = "tf"
 DISTRIBUTED_BACKEND = "distributed_tf"
 
 distributed_compatible_backends = dict(
-    tf=["distributed_tf", "ray", "horovod"],
-    pytorch=["ray", "horovod"]
+    tf=["distributed_tf", "ray", "horovod", "multiprocessing"],
+    pytorch=["ray", "horovod", "multiprocessing"]
 )
 
 
@@ -116,26 +117,24 @@ if DISTRIBUTED_BACKEND not in distributed_compatible_backends[BACKEND]:
                      "are: {}".format(DISTRIBUTED_BACKEND, BACKEND, distributed_compatible_backends[BACKEND]))
 
 
-# Test imports.
+# Test imports. Only check for the availability of the backend packages (w/o importing them) to keep
+# `import rlgraph` fast. The actual import happens in the modules that use the backends.
 if DISTRIBUTED_BACKEND == 'distributed_tf':
     assert BACKEND == "tf"
-    try:
-        import tensorflow
-    except ImportError as e:
+    if importlib.util.find_spec("tensorflow") is None:
         raise ImportError(
             "INIT ERROR: Cannot run distributed_tf without backend (tensorflow)! Please install tensorflow first "
             "via `pip install tensorflow` or `pip install tensorflow-gpu`."
         )
 elif DISTRIBUTED_BACKEND == "horovod":
-    try:
-        import horovod
-    except ImportError as e:
+    if importlib.util.find_spec("horovod") is None:
         raise ValueError("INIT ERROR: Cannot run RLGraph with distributed backend Horovod.")
 elif DISTRIBUTED_BACKEND == "ray":
-    try:
-        import ray
-    except ImportError as e:
+    if importlib.util.find_spec("ray") is None:
         raise ValueError("INIT ERROR: Cannot run RLGraph with distributed backend Ray.")
+elif DISTRIBUTED_BACKEND == "multiprocessing":
+    # Local processes only (python standard library), nothing to check.
+    pass
 else:
     raise ValueError("Distributed backend {} not supported".format(DISTRIBUTED_BACKEND))
 
@@ -18,35 +18,30 @@ from __future__ import division
 from __future__ import print_function
 
 from rlgraph.agents.agent import Agent
-from rlgraph.agents.dqn_agent import DQNAgent
-from rlgraph.agents.dqfd_agent import DQFDAgent
-from rlgraph.agents.apex_agent import ApexAgent
-from rlgraph.agents.impala_agents import IMPALAAgent, SingleIMPALAAgent
-from rlgraph.agents.ppo_agent import PPOAgent
-from rlgraph.agents.actor_critic_agent import ActorCriticAgent
-from rlgraph.agents.random_agent import RandomAgent
-from rlgraph.agents.sac_agent import SACAgent
-
+from rlgraph.utils.lazy_import import get_attribute_modules, lazy_module_attributes
 
+# Agent classes are registered by their python path and only imported on first use (e.g. via `Agent.from_spec` or
+# `from rlgraph.agents import DQNAgent`).
 Agent.__lookup_classes__ = dict(
-    apex=ApexAgent,
-    apexagent=ApexAgent,
-    actorcritic=ActorCriticAgent,
-    dqn=DQNAgent,
-    dqnagent=DQNAgent,
-    dqfd=DQFDAgent,
-    dqfdagent=DQFDAgent,
-    impala=IMPALAAgent,  # TODO: Split non-single agents into Actor and Learner
-    singleimpala=SingleIMPALAAgent,
-    singleimpalaagent=SingleIMPALAAgent,
-    ppo=PPOAgent,
-    ppoagent=PPOAgent,
-    random=RandomAgent,
-    randomagent=RandomAgent,
-    sac=SACAgent,
-    sacagent=SACAgent
+    apex="rlgraph.agents.apex_agent.ApexAgent",
+    apexagent="rlgraph.agents.apex_agent.ApexAgent",
+    actorcritic="rlgraph.agents.actor_critic_agent.ActorCriticAgent",
+    dqn="rlgraph.agents.dqn_agent.DQNAgent",
+    dqnagent="rlgraph.agents.dqn_agent.DQNAgent",
+    dqfd="rlgraph.agents.dqfd_agent.DQFDAgent",
+    dqfdagent="rlgraph.agents.dqfd_agent.DQFDAgent",
+    impala="rlgraph.agents.impala_agents.IMPALAAgent",  # TODO: Split non-single agents into Actor and Learner
+    singleimpala="rlgraph.agents.impala_agents.SingleIMPALAAgent",
+    singleimpalaagent="rlgraph.agents.impala_agents.SingleIMPALAAgent",
+    ppo="rlgraph.agents.ppo_agent.PPOAgent",
+    ppoagent="rlgraph.agents.ppo_agent.PPOAgent",
+    random="rlgraph.agents.random_agent.RandomAgent",
+    randomagent="rlgraph.agents.random_agent.RandomAgent",
+    sac="rlgraph.agents.sac_agent.SACAgent",
+    sacagent="rlgraph.agents.sac_agent.SACAgent"
 )
 
-__all__ = ["Agent"] + \
-          list(set(map(lambda x: x.__name__, Agent.__lookup_classes__.values())))
+_attribute_modules = get_attribute_modules(Agent.__lookup_classes__.values())
+__getattr__, __dir__ = lazy_module_attributes(__name__, _attribute_modules)
 
+__all__ = ["Agent"] + list(_attribute_modules.keys())
@@ -76,17 +76,23 @@ class ActorCriticAgent(Agent):
             sequence_indices=BoolBox(add_batch_rank=True)
         ))
 
-        # The merger to merge inputs into one record Dict going into the memory.
-        self.merger = ContainerMerger("states", "actions", "rewards", "terminals")
-        self.memory = Memory.from_spec(memory_spec)
-        assert isinstance(self.memory, RingBuffer), \
-            "ERROR: Actor-critic memory must be ring-buffer for episode-handling."
-        # The splitter for splitting up the records coming from the memory.
-        self.splitter = ContainerSplitter("states", "actions", "rewards", "terminals")
+        # Acting-only Agents have no memory and no loss function.
+        self.merger = None
+        self.memory = None
+        self.splitter = None
+        self.loss_function = None
+        if self.acting_only is False:
+            # The merger to merge inputs into one record Dict going into the memory.
+            self.merger = ContainerMerger("states", "actions", "rewards", "terminals")
+            self.memory = Memory.from_spec(memory_spec)
+            assert isinstance(self.memory, RingBuffer), \
+                "ERROR: Actor-critic memory must be ring-buffer for episode-handling."
+            # The splitter for splitting up the records coming from the memory.
+            self.splitter = ContainerSplitter("states", "actions", "rewards", "terminals")
+            self.loss_function = ActorCriticLossFunction(weight_entropy=weight_entropy)
 
         self.gae_function = GeneralizedAdvantageEstimation(gae_lambda=gae_lambda, discount=self.discount,
                                                            clip_rewards=clip_rewards)
-        self.loss_function = ActorCriticLossFunction(weight_entropy=weight_entropy)
 
         # Add all our sub-components to the core.
         sub_components = [self.preprocessor, self.merger, self.memory, self.splitter, self.policy,
@@ -96,7 +102,7 @@ class ActorCriticAgent(Agent):
 
         # Define the Agent's (root-Component's) API.
         self.define_graph_api()
-        self.build_options = dict(vf_optimizer=self.value_function_optimizer)
+        self.build_options = dict(vf_optimizer=self.value_function_optimizer) if self.acting_only is False else dict()
 
         if self.auto_build:
             self._build_graph([self.root_component], self.input_spaces, optimizer=self.optimizer,
@@ -130,18 +136,22 @@ class ActorCriticAgent(Agent):
             preprocessed_states = agent.preprocessor.preprocess(states)
             return root.action_from_preprocessed_state(preprocessed_states, deterministic)
 
-        # Insert into memory.
-        @rlgraph_api(component=self.root_component)
-        def insert_records(root, preprocessed_states, actions, rewards, terminals):
-            records = agent.merger.merge(preprocessed_states, actions, rewards, terminals)
-            return agent.memory.insert_records(records)
-
         @rlgraph_api(component=self.root_component)
         def post_process(root, preprocessed_states, rewards, terminals, sequence_indices):
             baseline_values = agent.value_function.value_output(preprocessed_states)
             pg_advantages = agent.gae_function.calc_gae_values(baseline_values, rewards, terminals, sequence_indices)
             return pg_advantages
 
+        # Acting-only: No memory- or update-API-methods.
+        if self.acting_only is True:
+            return
+
+        # Insert into memory.
+        @rlgraph_api(component=self.root_component)
+        def insert_records(root, preprocessed_states, actions, rewards, terminals):
+            records = agent.merger.merge(preprocessed_states, actions, rewards, terminals)
+            return agent.memory.insert_records(records)
+
         # Learn from memory.
         @rlgraph_api(component=self.root_component)
         def update_from_memory(root):
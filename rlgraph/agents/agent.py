@@ -30,7 +30,9 @@ from rlgraph.graphs.graph_executor import GraphExecutor
 from rlgraph.spaces import Space, ContainerSpace
 from rlgraph.utils.decorators import rlgraph_api, graph_fn
 from rlgraph.utils.input_parsing import parse_execution_spec, parse_observe_spec, parse_update_spec
+from rlgraph.utils.rlgraph_errors import RLGraphError
 from rlgraph.utils.specifiable import Specifiable
+from rlgraph.utils.util import force_list
 
 if get_backend() == "tf":
     import tensorflow as tf
@@ -46,7 +48,7 @@ class Agent(Specifiable):
                  policy_spec=None, value_function_spec=None,
                  exploration_spec=None, execution_spec=None, optimizer_spec=None, value_function_optimizer_spec=None,
                  observe_spec=None, update_spec=None,
-                 summary_spec=None, saver_spec=None, auto_build=True, name="agent"):
+                 summary_spec=None, saver_spec=None, auto_build=True, acting_only=False, name="agent"):
         """
         Args:
             state_space (Union[dict,Space]): Spec dict for the state Space or a direct Space object.
@@ -82,11 +84,17 @@ class Agent(Specifiable):
                 graph builder. If false, users must separately call agent.build(). Useful for debugging or analyzing
                 components before building.
 
+            acting_only (bool): If True, only builds the Components and API-methods required for acting
+                (preprocessor, policy, exploration, weight getting/setting and optional worker-side post-processing),
+                but no memories, optimizers or update API-methods. Useful for actor processes in distributed
+                settings, which only ever call `get_action` and `set_weights`.
+
             name (str): Some name for this Agent object.
         """
         super(Agent, self).__init__()
         self.name = name
         self.auto_build = auto_build
+        self.acting_only = acting_only
         self.graph_built = False
         self.logger = logging.getLogger(__name__)
 
@@ -181,14 +189,16 @@ class Agent(Specifiable):
         self.timesteps = 0
 
         # Create the Agent's optimizer based on optimizer_spec and execution strategy.
+        # Acting-only Agents do not need optimizers (and their slot variables).
         self.optimizer = None
         if optimizer_spec is not None:
             # Save spec in case agent needs to create more optimizers e.g. for baseline.
             self.optimizer_spec = optimizer_spec
-            self.optimizer = Optimizer.from_spec(optimizer_spec)
+            if self.acting_only is False:
+                self.optimizer = Optimizer.from_spec(optimizer_spec)
 
         self.value_function_optimizer = None
-        if self.value_function is not None:
+        if self.value_function is not None and self.acting_only is False:
             if value_function_optimizer_spec is None:
                 vf_optimizer_spec = self.optimizer_spec
             else:
@@ -304,6 +314,12 @@ class Agent(Specifiable):
         """
         Builds the internal graph from the RLGraph meta-graph via the graph executor..
         """
+        # Acting-only agents do not define the update API-methods -> Drop their (unused) input-spaces.
+        if self.acting_only is True:
+            input_spaces = {
+                name: space for name, space in input_spaces.items()
+                if any(name in root_component.api_method_inputs for root_component in root_components)
+            }
         return self.graph_executor.build(root_components, input_spaces, **kwargs)
 
     def build(self, build_options=None):
@@ -392,6 +408,11 @@ class Agent(Specifiable):
 
             batched (bool): Whether given data (states, actions, etc..) is already batched or not.
         """
+        if self.acting_only is True:
+            raise RLGraphError(
+                "ERROR: Agent was constructed with `acting_only=True` and has no memory to observe into!"
+            )
+
         # Check for illegal internals.
         if internals is None:
             internals = []
@@ -500,11 +521,50 @@ class Agent(Specifiable):
             batch (Optional[dict]): Optional external data batch to use for update. If None, the
                 agent should be configured to sample internally.
 
+        Keyword Args:
+            num_steps (int): If supported by the Agent: The number of update steps to perform within this call.
+                Losses are then returned stacked along a new 0th axis (one row per step).
+
         Returns:
             Union(list, tuple, float): The loss value calculated in this update.
         """
         raise NotImplementedError
 
+    def _execute_in_order(self, api_method_calls):
+        """
+        Executes API-method calls that must see each other's variable updates (e.g. several update steps with
+        target-net syncs in between) in the given order, using as few executor calls as the backend allows:
+        Define-by-run executors run all calls of one `execute` one after the other, so all calls are executed at
+        once. Static-graph executors run all fetches of one `execute` concurrently, so each call is executed
+        separately.
+
+        Args:
+            api_method_calls (list): The calls. Either API-method names (str) of methods without return values
+                (e.g. syncs) or (API-method name, params, return-op indices)-tuples. If no return-op indices are
+                given, the API-method must return a single value (or a dict).
+
+        Returns:
+            list: One list of return values per tuple-call (str-calls are left out).
+        """
+        num_returns = [len(call[2]) if len(call) > 2 else 1 for call in api_method_calls if isinstance(call, tuple)]
+        if get_backend() == "pytorch":
+            flat_results = self.graph_executor.execute(*api_method_calls)
+            # Executor unwraps single results.
+            if sum(num_returns) == 1:
+                flat_results = [flat_results]
+            results = []
+            for num in num_returns:
+                results.append(list(flat_results[:num]))
+                flat_results = flat_results[num:]
+            return results
+        else:
+            results = []
+            for call in api_method_calls:
+                ret = self.graph_executor.execute(call)
+                if isinstance(call, tuple):
+                    results.append(list(ret) if len(call) > 2 and len(call[2]) > 1 else [ret])
+            return results
+
     def import_observations(self, observations):
         """
         Bulk imports observations, potentially using device pre-fetching. Can be optionally
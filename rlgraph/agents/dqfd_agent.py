@@ -17,14 +17,19 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
+import os
+import time
+
 import numpy as np
+from six.moves import xrange as range_
 
 from rlgraph.agents import Agent
-from rlgraph.components import Memory, PrioritizedReplay, ContainerMerger, ContainerSplitter, DQFDLossFunction
+from rlgraph.components import Memory, ContainerMerger, ContainerSplitter, DQFDLossFunction
+from rlgraph.components.memories.prioritized_replay import PrioritizedReplay
 from rlgraph.spaces import FloatBox, BoolBox
 from rlgraph.utils import RLGraphError
 from rlgraph.utils.decorators import rlgraph_api
-from rlgraph.utils.util import strip_list
+from rlgraph.utils.util import strip_list, force_list
 
 
 class DQFDAgent(Agent):
@@ -58,6 +63,8 @@ class DQFDAgent(Agent):
                 (memory or external) in `self.last_q_table` for debugging purposes.
                 Default: False.
         """
+        if kwargs.get("acting_only", False) is True:
+            raise RLGraphError("ERROR: DQFDAgent does not support `acting_only` builds!")
         # Fix action-adapter before passing it to the super constructor.
         policy_spec = kwargs.pop("policy_spec", dict())
         # Use a DuelingPolicy (instead of a basic Policy) if option is set.
@@ -496,5 +503,79 @@ class DQFDAgent(Agent):
         """
         self.graph_executor.execute(("insert_demos", [preprocessed_states, actions, rewards, next_states, terminals]))
 
+    def import_observations(self, observations, chunk_size=10000):
+        """
+        Bulk imports demonstrations into the demo memory. Demonstrations are streamed in large chunks (one
+        executor call per chunk) and the progress is logged after each chunk.
+
+        Args:
+            observations (Union[dict,str,list]): The demonstrations, all items batched along their 0th axis.
+                Either:
+                - A dict with keys "states" (or "preprocessed_states"), "actions", "rewards", "next_states" and
+                "terminals". Values are (possibly nested, e.g. for container actions) arrays, which may be
+                memory-mapped.
+                - The path of an npz-file with these keys.
+                - The path of a directory holding one npy-file per key (e.g. "states.npy"). These are
+                memory-mapped, so only one chunk at a time is read into memory.
+                - A list of the above (e.g. shards of a large demo set), imported one after the other.
+            chunk_size (int): The number of demo records to insert per executor call. Default: 10000.
+
+        Returns:
+            int: The number of imported demo records.
+        """
+        time_start = time.perf_counter()
+        num_imported = 0
+        for shard in force_list(observations):
+            demos = self._load_demos(shard)
+            num_records = len(demos["terminals"])
+            for start in range_(0, num_records, chunk_size):
+                chunk = {key: self._slice_demos(value, start, start + chunk_size) for key, value in demos.items()}
+                self.observe_demos(
+                    chunk["preprocessed_states"], chunk["actions"], chunk["rewards"], chunk["next_states"],
+                    chunk["terminals"]
+                )
+                num_imported += len(chunk["terminals"])
+                self.logger.info("Imported {} demo records ({:.0f} records/s).".format(
+                    num_imported, num_imported / (time.perf_counter() - time_start)
+                ))
+
+        if num_imported > self.demo_memory.capacity:
+            self.logger.warning(
+                "Imported {} demo records into a demo memory of capacity {}: The oldest records were "
+                "overwritten!".format(num_imported, self.demo_memory.capacity)
+            )
+        return num_imported
+
+    @staticmethod
+    def _load_demos(source):
+        """
+        Returns a dict of (possibly memory-mapped) demo arrays from a dict, npz-file or directory of npy-files.
+        """
+        if isinstance(source, str):
+            if os.path.isdir(source):
+                demos = {
+                    filename[:-len(".npy")]: np.load(os.path.join(source, filename), mmap_mode="r")
+                    for filename in os.listdir(source) if filename.endswith(".npy")
+                }
+            else:
+                with np.load(source) as npz_file:
+                    demos = dict(npz_file)
+        else:
+            demos = dict(source)
+
+        if "preprocessed_states" not in demos and "states" in demos:
+            demos["preprocessed_states"] = demos.pop("states")
+        for key in ["preprocessed_states", "actions", "rewards", "next_states", "terminals"]:
+            if key not in demos:
+                raise RLGraphError("ERROR: Demonstrations must contain key '{}'!".format(key))
+        return demos
+
+    @staticmethod
+    def _slice_demos(value, start, end):
+        if isinstance(value, dict):
+            return {key: DQFDAgent._slice_demos(v, start, end) for key, v in value.items()}
+        # Slicing a memory-mapped array only reads the chunk from disk.
+        return np.asarray(value[start:end])
+
     def __repr__(self):
         return "DQFDAgent(doubleQ={} duelingQ={})".format(self.double_q, self.dueling_q)
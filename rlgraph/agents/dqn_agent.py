@@ -18,10 +18,12 @@ from __future__ import division
 from __future__ import print_function
 
 import numpy as np
+from six.moves import xrange as range_
 
 from rlgraph.agents import Agent
-from rlgraph.components import Memory, PrioritizedReplay, DQNLossFunction, ContainerMerger, ContainerSplitter
-from rlgraph.spaces import FloatBox, BoolBox
+from rlgraph.components import Memory, DQNLossFunction, ContainerMerger, ContainerSplitter, InputPipeline
+from rlgraph.components.memories.prioritized_replay import PrioritizedReplay
+from rlgraph.spaces import FloatBox, BoolBox, Dict
 from rlgraph.utils import RLGraphError
 from rlgraph.utils.decorators import rlgraph_api
 from rlgraph.utils.util import strip_list
@@ -37,7 +39,8 @@ class DQNAgent(Agent):
     [4] https://en.wikipedia.org/wiki/Huber_loss
     """
     def __init__(self, double_q=True, dueling_q=True, huber_loss=False, n_step=1, shared_container_action_target=True,
-                 memory_spec=None, store_last_memory_batch=False, store_last_q_table=False, **kwargs):
+                 memory_spec=None, input_pipeline_spec=None, store_last_memory_batch=False, store_last_q_table=False,
+                 **kwargs):
         """
         Args:
             double_q (bool): Whether to use the double DQN loss function (see [2]).
@@ -45,6 +48,11 @@ class DQNAgent(Agent):
             huber_loss (bool) : Whether to apply a Huber loss. (see [4]).
             n_step (Optional[int]): n-step adjustment to discounting.
             memory_spec (Optional[dict,Memory]): The spec for the Memory to use for the DQN algorithm.
+            input_pipeline_spec (Optional[dict,InputPipeline]): Optional spec for an InputPipeline to feed external
+                batches through (instead of feeding them into the graph on each update call). If given,
+                `update` takes its batches from the pipeline (see `update`), into which other threads may insert
+                batches ahead of time via `self.input_pipeline.insert()`.
+                Default: None.
             store_last_memory_batch (bool): Whether to store the last pulled batch from the memory in
                 `self.last_memory_batch` for debugging purposes.
                 Default: False.
@@ -111,19 +119,38 @@ class DQNAgent(Agent):
         if self.value_function is not None:
             self.input_spaces["value_function_weights"] = "variables:{}".format(self.value_function.scope),
 
-        # The merger to merge inputs into one record Dict going into the memory.
-        self.merger = ContainerMerger("states", "actions", "rewards", "next_states", "terminals")
-        # The replay memory.
-        self.memory = Memory.from_spec(memory_spec)
-        # The splitter for splitting up the records coming from the memory.
-        self.splitter = ContainerSplitter("states", "actions", "rewards", "terminals", "next_states")
-
-        # Make sure the python buffer is not larger than our memory capacity.
-        assert self.observe_spec["buffer_size"] <= self.memory.capacity,\
-            "ERROR: Buffer's size ({}) in `observe_spec` must be smaller or equal to the memory's capacity ({})!".\
-            format(self.observe_spec["buffer_size"], self.memory.capacity)
+        # Acting-only Agents have no memory (and thus no merger/splitter for memory records).
+        self.merger = None
+        self.memory = None
+        self.splitter = None
+        if self.acting_only is False:
+            # The merger to merge inputs into one record Dict going into the memory.
+            self.merger = ContainerMerger("states", "actions", "rewards", "next_states", "terminals")
+            # The replay memory.
+            self.memory = Memory.from_spec(memory_spec)
+            # The splitter for splitting up the records coming from the memory.
+            self.splitter = ContainerSplitter("states", "actions", "rewards", "terminals", "next_states")
+
+            # Make sure the python buffer is not larger than our memory capacity.
+            assert self.observe_spec["buffer_size"] <= self.memory.capacity,\
+                "ERROR: Buffer's size ({}) in `observe_spec` must be smaller or equal to the memory's capacity ({})!".\
+                format(self.observe_spec["buffer_size"], self.memory.capacity)
+
+        # The optional input pipeline for external batches and its splitter.
+        self.input_pipeline = None
+        self.input_pipeline_splitter = None
+        if input_pipeline_spec is not None and self.acting_only is False:
+            self.input_pipeline = InputPipeline.from_spec(input_pipeline_spec, record_space=Dict(
+                states=self.preprocessed_state_space, actions=self.action_space, rewards=float, terminals=bool,
+                next_states=self.preprocessed_state_space, importance_weights=float
+            ))
+            self.input_pipeline_splitter = ContainerSplitter(
+                "states", "actions", "rewards", "terminals", "next_states", "importance_weights",
+                scope="input-pipeline-splitter"
+            )
 
         # Copy our Policy (target-net), make target-net synchronizable.
+        # Note: Also needed when acting only, as workers may compute td-losses via `post_process`.
         self.target_policy = self.policy.copy(scope="target-policy", trainable=False)
         # Number of steps since the last target-net synching from the main policy.
         self.steps_since_target_net_sync = 0
@@ -138,7 +165,8 @@ class DQNAgent(Agent):
         self.root_component.add_components(
             self.preprocessor, self.merger, self.memory, self.splitter, self.policy, self.target_policy,
             self.value_function, self.value_function_optimizer,  # <- should both be None for DQN
-            self.exploration, self.loss_function, self.optimizer, self.vars_merger, self.vars_splitter
+            self.exploration, self.loss_function, self.optimizer, self.vars_merger, self.vars_splitter,
+            self.input_pipeline, self.input_pipeline_splitter
         )
 
         # Define the Agent's (root-Component's) API.
@@ -176,6 +204,31 @@ class DQNAgent(Agent):
             preprocessed_states = agent.preprocessor.preprocess(states)
             return root.action_from_preprocessed_state(preprocessed_states, time_step, use_exploration)
 
+        @rlgraph_api(component=self.root_component)
+        def get_td_loss(root, preprocessed_states, actions, rewards,
+                        terminals, preprocessed_next_states, importance_weights):
+
+            policy = root.get_sub_component_by_name(agent.policy.scope)
+            target_policy = root.get_sub_component_by_name(agent.target_policy.scope)
+            loss_function = root.get_sub_component_by_name(agent.loss_function.scope)
+
+            # Get the different Q-values.
+            q_values_s = policy.get_logits_parameters_log_probs(preprocessed_states)["logits"]
+            qt_values_sp = target_policy.get_logits_parameters_log_probs(preprocessed_next_states)["logits"]
+
+            q_values_sp = None
+            if self.double_q:
+                q_values_sp = policy.get_logits_parameters_log_probs(preprocessed_next_states)["logits"]
+
+            loss, loss_per_item = loss_function.loss(
+                q_values_s, actions, rewards, terminals, qt_values_sp, q_values_sp, importance_weights
+            )
+            return loss, loss_per_item
+
+        # Acting-only: No memory-, sync- or update-API-methods.
+        if self.acting_only is True:
+            return
+
         # Insert into memory.
         @rlgraph_api(component=self.root_component)
         def insert_records(root, preprocessed_states, actions, rewards, next_states, terminals):
@@ -214,6 +267,20 @@ class DQNAgent(Agent):
             else:
                 return step_op, loss, loss_per_item, records, q_values_s
 
+        # Learn from the next batch in the input pipeline.
+        if self.input_pipeline is not None:
+            @rlgraph_api(component=self.root_component)
+            def update_from_input_pipeline(root, apply_postprocessing):
+                records = agent.input_pipeline.get_batch()
+                preprocessed_s, actions, rewards, terminals, preprocessed_s_prime, importance_weights = \
+                    agent.input_pipeline_splitter.split(records)
+
+                step_op, loss, loss_per_item, q_values_s = root.update_from_external_batch(
+                    preprocessed_s, actions, rewards, terminals, preprocessed_s_prime, importance_weights,
+                    apply_postprocessing
+                )
+                return step_op, loss, loss_per_item, q_values_s
+
         # Learn from an external batch.
         @rlgraph_api(component=self.root_component)
         def update_from_external_batch(
@@ -274,27 +341,6 @@ class DQNAgent(Agent):
                 step_op = root._graph_fn_training_step(step_op)
                 return step_op, loss, loss_per_item, q_values_s
 
-        @rlgraph_api(component=self.root_component)
-        def get_td_loss(root, preprocessed_states, actions, rewards,
-                        terminals, preprocessed_next_states, importance_weights):
-
-            policy = root.get_sub_component_by_name(agent.policy.scope)
-            target_policy = root.get_sub_component_by_name(agent.target_policy.scope)
-            loss_function = root.get_sub_component_by_name(agent.loss_function.scope)
-
-            # Get the different Q-values.
-            q_values_s = policy.get_logits_parameters_log_probs(preprocessed_states)["logits"]
-            qt_values_sp = target_policy.get_logits_parameters_log_probs(preprocessed_next_states)["logits"]
-
-            q_values_sp = None
-            if self.double_q:
-                q_values_sp = policy.get_logits_parameters_log_probs(preprocessed_next_states)["logits"]
-
-            loss, loss_per_item = loss_function.loss(
-                q_values_s, actions, rewards, terminals, qt_values_sp, q_values_sp, importance_weights
-            )
-            return loss, loss_per_item
-
     def get_action(self, states, internals=None, use_exploration=True, apply_preprocessing=True, extra_returns=None):
         """
         Args:
@@ -339,33 +385,53 @@ class DQNAgent(Agent):
     def _observe_graph(self, preprocessed_states, actions, internals, rewards, next_states, terminals):
         self.graph_executor.execute(("insert_records", [preprocessed_states, actions, rewards, next_states, terminals]))
 
-    def update(self, batch=None):
-        # Should we sync the target net?
-        self.steps_since_target_net_sync += self.update_spec["update_interval"]
-        if self.steps_since_target_net_sync >= self.update_spec["sync_interval"]:
-            sync_call = "sync_target_qnet"
-            self.steps_since_target_net_sync = 0
-        else:
-            sync_call = None
+    def update(self, batch=None, num_steps=1):
+        """
+        Args:
+            batch (Optional[dict]): Optional external data batch to use for update. If None, samples from the
+                memory or - if this Agent has an input pipeline - takes the next batch(es) previously inserted into
+                the pipeline. If given and this Agent has an input pipeline, `batch` is inserted into the pipeline
+                (once per step) and the steps consume the pipeline's batches in insertion order.
+            num_steps (int): The number of update steps to perform (each on a freshly sampled memory batch or -
+                if `batch` is given - on the same external batch). Target-net syncs that become due are performed
+                right after the respective step. Steps are executed with as few executor calls as the backend
+                allows (see `Agent._execute_in_order`): PyTorch runs all steps in one call. TF still needs one
+                session run per step (and sync), so it saves no calls over calling `update` `num_steps` times.
+                Default: 1.
 
+        Returns:
+            tuple:
+                - The loss.
+                - The loss per item for external (or input pipeline) updates, the memory records for updates from
+                memory.
+                If `num_steps` > 1, losses (and losses per item) are stacked along a new 0th axis (one row per
+                step) and memory records are returned as a list (one item per step).
+        """
         # [0]=no-op step; [1]=the loss; [2]=loss-per-item, [3]=memory-batch (if pulled); [4]=q-values
         return_ops = [0, 1, 2]
-        q_table = None
+        from_memory = batch is None and self.input_pipeline is None
 
-        if batch is None:
+        if from_memory:
             # Add some additional return-ops to pull (left out normally for performance reasons).
             if self.store_last_q_table is True:
                 return_ops += [3, 4]  # 3=batch, 4=q-values
             elif self.store_last_memory_batch is True:
                 return_ops += [3]  # 3=batch
-            ret = self.graph_executor.execute(("update_from_memory", [True], return_ops))
-
-            # Store the last Q-table?
+            update_call = ("update_from_memory", [True], return_ops)
+        elif self.input_pipeline is not None:
             if self.store_last_q_table is True:
-                q_table = dict(
-                    states=ret[3]["states"],
-                    q_values=ret[4]
-                )
+                return_ops += [3]  # 3=q-values
+            if batch is not None:
+                # All copies must fit into the pipeline before the first step consumes one.
+                if num_steps > self.input_pipeline.capacity:
+                    raise RLGraphError(
+                        "ERROR: `num_steps` ({}) must not exceed the input pipeline's capacity ({}) for updates from "
+                        "an external batch!".format(num_steps, self.input_pipeline.capacity)
+                    )
+                for _ in range_(num_steps):
+                    self.input_pipeline.insert(batch)
+            # TODO apply postprocessing always true atm.
+            update_call = ("update_from_input_pipeline", [True], return_ops)
         else:
             # Add some additional return-ops to pull (left out normally for performance reasons).
             if self.store_last_q_table is True:
@@ -374,29 +440,40 @@ class DQNAgent(Agent):
             # TODO apply postprocessing always true atm.
             batch_input = [batch["states"], batch["actions"], batch["rewards"], batch["terminals"],
                            batch["next_states"], batch["importance_weights"], True]
-            ret = self.graph_executor.execute(("update_from_external_batch", batch_input, return_ops))
-
-            # Store the last Q-table?
-            if self.store_last_q_table is True:
-                q_table = dict(
-                    states=batch["states"],
-                    q_values=ret[3]
-                )
-
-        # Do the target net synching after the update (for better clarity: after a sync, we would expect for both
-        # networks to be the exact same).
-        if sync_call:
-            self.graph_executor.execute(sync_call)
+            update_call = ("update_from_external_batch", batch_input, return_ops)
+
+        api_method_calls = []
+        for _ in range_(num_steps):
+            api_method_calls.append(update_call)
+            # Should we sync the target net?
+            # Do the target net synching after the update (for better clarity: after a sync, we would expect for both
+            # networks to be the exact same).
+            self.steps_since_target_net_sync += self.update_spec["update_interval"]
+            if self.steps_since_target_net_sync >= self.update_spec["sync_interval"]:
+                api_method_calls.append("sync_target_qnet")
+                self.steps_since_target_net_sync = 0
+
+        results = self._execute_in_order(api_method_calls)
+        ret = results[-1]
+
+        # Store the last Q-table?
+        if self.store_last_q_table is True:
+            if from_memory:
+                self.last_q_table = dict(states=ret[3]["states"], q_values=ret[4])
+            else:
+                self.last_q_table = dict(states=batch["states"] if batch is not None else None, q_values=ret[3])
 
         # Store the latest pulled memory batch?
-        if self.store_last_memory_batch is True and batch is None:
+        if self.store_last_memory_batch is True and from_memory:
             self.last_memory_batch = ret[2]
-        if self.store_last_q_table is True:
-            self.last_q_table = q_table
 
         # 1=the loss
         # 2=loss per item for external update, records for update from memory
-        return ret[1], ret[2]
+        if num_steps == 1:
+            return ret[1], ret[2]
+        second_returns = [r[2] for r in results]
+        return np.stack([r[1] for r in results]), \
+            np.stack(second_returns) if not from_memory else second_returns
 
     def reset(self):
         """
@@ -79,6 +79,8 @@ class IMPALAAgent(Agent):
         Keyword Args:
             type (str): One of "single", "actor" or "learner". Default: "single".
         """
+        if kwargs.get("acting_only", False) is True:
+            raise RLGraphError("ERROR: IMPALAAgent does not support `acting_only` builds! Use type='actor' instead.")
         type_ = kwargs.pop("type", "single")
         assert type_ in ["single", "actor", "learner"]
         self.type = type_
@@ -96,24 +96,30 @@ class PPOAgent(Agent):
             apply_postprocessing=bool
         ))
 
-        # The merger to merge inputs into one record Dict going into the memory.
-        self.merger = ContainerMerger("states", "actions", "rewards", "terminals")
-        self.memory = Memory.from_spec(memory_spec)
-        assert isinstance(self.memory, RingBuffer), "ERROR: PPO memory must be ring-buffer for episode-handling!"
-
-        # Make sure the python buffer is not larger than our memory capacity.
-        assert self.observe_spec["buffer_size"] <= self.memory.capacity, \
-            "ERROR: Buffer's size ({}) in `observe_spec` must be smaller or equal to the memory's capacity ({})!". \
-                format(self.observe_spec["buffer_size"], self.memory.capacity)
+        # Acting-only Agents have no memory and no loss function.
+        self.merger = None
+        self.memory = None
+        if self.acting_only is False:
+            # The merger to merge inputs into one record Dict going into the memory.
+            self.merger = ContainerMerger("states", "actions", "rewards", "terminals")
+            self.memory = Memory.from_spec(memory_spec)
+            assert isinstance(self.memory, RingBuffer), "ERROR: PPO memory must be ring-buffer for episode-handling!"
+
+            # Make sure the python buffer is not larger than our memory capacity.
+            assert self.observe_spec["buffer_size"] <= self.memory.capacity, \
+                "ERROR: Buffer's size ({}) in `observe_spec` must be smaller or equal to the memory's capacity ({})!". \
+                    format(self.observe_spec["buffer_size"], self.memory.capacity)
 
         # The splitter for splitting up the records coming from the memory.
         self.standardize_advantages = standardize_advantages
         self.gae_function = GeneralizedAdvantageEstimation(
             gae_lambda=gae_lambda, discount=self.discount, clip_rewards=clip_rewards
         )
-        self.loss_function = PPOLossFunction(
-            clip_ratio=clip_ratio, weight_entropy=weight_entropy
-        )
+        self.loss_function = None
+        if self.acting_only is False:
+            self.loss_function = PPOLossFunction(
+                clip_ratio=clip_ratio, weight_entropy=weight_entropy
+            )
 
         self.iterations = self.update_spec["num_iterations"]
         self.sample_size = self.update_spec["sample_size"]
@@ -128,7 +134,7 @@ class PPOAgent(Agent):
         )
         # Define the Agent's (root-Component's) API.
         self.define_graph_api()
-        self.build_options = dict(vf_optimizer=self.value_function_optimizer)
+        self.build_options = dict(vf_optimizer=self.value_function_optimizer) if self.acting_only is False else dict()
 
         if self.auto_build:
             self._build_graph(
@@ -164,18 +170,22 @@ class PPOAgent(Agent):
             preprocessed_states = agent.preprocessor.preprocess(states)
             return root.action_from_preprocessed_state(preprocessed_states, deterministic)
 
-        # Insert into memory.
-        @rlgraph_api(component=self.root_component)
-        def insert_records(root, preprocessed_states, actions, rewards, terminals):
-            records = agent.merger.merge(preprocessed_states, actions, rewards, terminals)
-            return agent.memory.insert_records(records)
-
         @rlgraph_api(component=self.root_component)
         def post_process(root, preprocessed_states, rewards, terminals, sequence_indices):
             baseline_values = agent.value_function.value_output(preprocessed_states)
             pg_advantages = agent.gae_function.calc_gae_values(baseline_values, rewards, terminals, sequence_indices)
             return pg_advantages
 
+        # Acting-only: No memory- or update-API-methods.
+        if self.acting_only is True:
+            return
+
+        # Insert into memory.
+        @rlgraph_api(component=self.root_component)
+        def insert_records(root, preprocessed_states, actions, rewards, terminals):
+            records = agent.merger.merge(preprocessed_states, actions, rewards, terminals)
+            return agent.memory.insert_records(records)
+
         # Learn from memory.
         @rlgraph_api(component=self.root_component)
         def update_from_memory(root, apply_postprocessing):
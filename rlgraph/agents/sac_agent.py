@@ -18,6 +18,7 @@ from __future__ import division
 from __future__ import print_function
 
 import numpy as np
+from six.moves import xrange as range_
 
 from rlgraph import get_backend
 from rlgraph.agents import Agent
@@ -27,7 +28,8 @@ from rlgraph.spaces import FloatBox, BoolBox, IntBox, Dict
 from rlgraph.components import Component, Synchronizable
 from rlgraph.components.loss_functions.sac_loss_function import SACLossFunction
 from rlgraph.utils.decorators import rlgraph_api, graph_fn
-from rlgraph.components import Memory, ContainerMerger, PrioritizedReplay
+from rlgraph.components import Memory, ContainerMerger
+from rlgraph.components.memories.prioritized_replay import PrioritizedReplay
 from rlgraph.utils.util import strip_list
 from rlgraph.utils.ops import flatten_op, DataOpTuple
 
@@ -378,6 +380,8 @@ class SACAgent(Agent):
             memory_spec (Optional[dict,Memory]): The spec for the Memory to use for the DQN algorithm.
             update_spec (dict): Here we can have sync_interval or sync_tau (for the value network update).
         """
+        if kwargs.get("acting_only", False) is True:
+            raise RLGraphError("ERROR: SACAgent does not support `acting_only` builds!")
         value_function_spec = kwargs.pop("value_function_spec")
         value_function_spec = dict(type="sac_value_function", network_spec=value_function_spec)
         super(SACAgent, self).__init__(
@@ -421,6 +425,8 @@ class SACAgent(Agent):
 
         self.iterations = self.update_spec["num_iterations"]
         self.batch_size = self.update_spec["batch_size"]
+        # Whether the memory holds enough records for a batch (memories never shrink, so we only check until True).
+        self.memory_ready = False
         float_action_space = self.action_space.with_batch_rank()
 
         if isinstance(self.action_space, Dict):
@@ -547,19 +553,39 @@ class SACAgent(Agent):
     def _observe_graph(self, preprocessed_states, actions, internals, rewards, next_states, terminals):
         self.graph_executor.execute((self.root_component.insert_records, [preprocessed_states, actions, rewards, next_states, terminals]))
 
-    def update(self, batch=None):
+    def update(self, batch=None, num_steps=1):
+        """
+        Args:
+            batch (Optional[dict]): Optional external data batch to use for update. If None, samples from the
+                memory.
+            num_steps (int): The number of update steps to perform (see `Agent._execute_in_order`). Default: 1.
+
+        Returns:
+            tuple: Actor loss, actor loss per item, critic loss and alpha loss. If `num_steps` > 1, each stacked along
+                a new 0th axis (one row per step).
+        """
         if batch is None:
-            size = self.graph_executor.execute(self.root_component.get_memory_size)
-            # TODO: is this necessary?
-            if size < self.batch_size:
-                return 0.0, 0.0, 0.0
-            ret = self.graph_executor.execute((self.root_component.update_from_memory, [self.batch_size]))
+            if self.memory_ready is False:
+                size = self.graph_executor.execute(self.root_component.get_memory_size)
+                # TODO: is this necessary?
+                if size < self.batch_size:
+                    if num_steps == 1:
+                        return 0.0, 0.0, 0.0
+                    # Same per-step shapes as the stacked losses of actual updates.
+                    return np.zeros(num_steps), np.zeros((num_steps, self.batch_size)), np.zeros(num_steps), \
+                        np.zeros(num_steps)
+                self.memory_ready = True
+            update_call = (self.root_component.update_from_memory, [self.batch_size])
         else:
             # No sequence indices means terminals are used in place.
             batch_input = [batch["states"], batch["actions"], batch["rewards"], batch["terminals"], batch["next_states"]]
-            ret = self.graph_executor.execute((self.root_component.update_from_external_batch, batch_input))
+            update_call = (self.root_component.update_from_external_batch, batch_input)
 
-        return ret["actor_loss"], ret["actor_loss_per_item"], ret["critic_loss"], ret["alpha_loss"]
+        results = [ret[0] for ret in self._execute_in_order([update_call for _ in range_(num_steps)])]
+        keys = ["actor_loss", "actor_loss_per_item", "critic_loss", "alpha_loss"]
+        if num_steps == 1:
+            return tuple(results[0][key] for key in keys)
+        return tuple(np.stack([ret[key] for ret in results]) for key in keys)
 
     def reset(self):
         """
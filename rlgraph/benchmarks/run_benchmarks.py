@@ -0,0 +1,169 @@
+# Copyright 2018/2019 The RLgraph authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+
+import numpy as np
+
+from rlgraph import get_backend, get_distributed_backend, distributed_compatible_backends
+from rlgraph.benchmarks.scenarios import BENCHMARK_SCENARIOS
+from rlgraph.utils.util import print_logging_handler
+from rlgraph.version import __version__
+
+
+def run_benchmarks(scenarios=None, batch_sizes=(1, 32, 256), num_envs=(1, 8, 64), iterations=100,
+                   agent_spec=None):
+    """
+    Runs the given benchmark scenarios with the current backend.
+
+    Args:
+        scenarios (Optional[List[str]]): Keys into `BENCHMARK_SCENARIOS`. Default: All scenarios.
+        batch_sizes (List[int]): The batch sizes to run "act", "update" and "memory" scenarios with.
+        num_envs (List[int]): The numbers of environments to run "env" and "worker" scenarios with.
+        iterations (int): The number of timed iterations per scenario setting.
+        agent_spec (Optional[dict]): The Agent to use for Agent scenarios. Default: A small DQN.
+
+    Returns:
+        dict: JSON-serializable results with keys "meta" (versions, backends, host) and "results" (a list with one
+            entry per scenario setting, holding the scenario name, backend, params and metrics or an error message).
+    """
+    results = []
+    for scenario in (scenarios or sorted(BENCHMARK_SCENARIOS.keys())):
+        try:
+            scenario_results = BENCHMARK_SCENARIOS[scenario](
+                batch_sizes=list(batch_sizes), num_envs=list(num_envs), iterations=iterations, agent_spec=agent_spec
+            )
+        # Record failures (e.g. missing optional dependencies) instead of aborting all other scenarios.
+        except Exception as e:
+            scenario_results = [dict(error="{}: {}".format(type(e).__name__, e))]
+        for result in scenario_results:
+            results.append(dict(scenario=scenario, backend=get_backend(), **result))
+    return dict(meta=_get_meta(), results=results)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m rlgraph.benchmarks",
+        description="Runs standardized RLgraph throughput benchmarks and emits the results as JSON."
+    )
+    parser.add_argument("--scenarios", type=_str_list, default=sorted(BENCHMARK_SCENARIOS.keys()),
+                        help="Comma separated scenarios out of: {}.".format(", ".join(sorted(BENCHMARK_SCENARIOS))))
+    parser.add_argument("--backends", type=_str_list, default=[get_backend()],
+                        help="Comma separated backends (tf, pytorch). Default: The current backend.")
+    parser.add_argument("--batch-sizes", type=_int_list, default=[1, 32, 256])
+    parser.add_argument("--num-envs", type=_int_list, default=[1, 8, 64])
+    parser.add_argument("--iterations", type=int, default=100)
+    parser.add_argument("--agent-config", default=None, help="Optional json file with the Agent spec to use.")
+    parser.add_argument("--output", default=None, help="Optional file to write the JSON to. Default: stdout.")
+    args = parser.parse_args(argv)
+
+    # Keep stdout clean for the JSON output.
+    print_logging_handler.setStream(sys.stderr)
+
+    for scenario in args.scenarios:
+        if scenario not in BENCHMARK_SCENARIOS:
+            parser.error("Unknown scenario '{}'!".format(scenario))
+
+    agent_spec = None
+    if args.agent_config is not None:
+        with open(args.agent_config) as f:
+            agent_spec = json.load(f)
+
+    output = None
+    for backend in args.backends:
+        # The backend is fixed at import time -> Run other backends in a fresh interpreter.
+        if backend == get_backend():
+            backend_output = run_benchmarks(
+                args.scenarios, args.batch_sizes, args.num_envs, args.iterations, agent_spec
+            )
+        else:
+            backend_output = _run_in_subprocess(backend, args.scenarios, argv if argv is not None else sys.argv[1:])
+        if output is None:
+            output = backend_output
+        else:
+            output["results"].extend(backend_output["results"])
+            output["meta"]["backends"].extend(backend_output["meta"]["backends"])
+
+    if args.output is None:
+        print(json.dumps(output, indent=2))
+    else:
+        with open(args.output, "w") as f:
+            json.dump(output, f, indent=2)
+
+
+def _run_in_subprocess(backend, scenarios, argv):
+    env = dict(os.environ, RLGRAPH_BACKEND=backend)
+    if get_distributed_backend() not in distributed_compatible_backends[backend]:
+        env["RLGRAPH_DISTRIBUTED_BACKEND"] = distributed_compatible_backends[backend][0]
+    # Strip our own backends and output args.
+    sub_argv = []
+    skip = False
+    for arg in argv:
+        if skip:
+            skip = False
+        elif arg in ["--backends", "--output"]:
+            skip = True
+        elif not arg.startswith("--backends=") and not arg.startswith("--output="):
+            sub_argv.append(arg)
+
+    fd, path = tempfile.mkstemp(suffix=".json")
+    os.close(fd)
+    try:
+        subprocess.check_call(
+            [sys.executable, "-m", "rlgraph.benchmarks"] + sub_argv + ["--output", path], env=env
+        )
+        with open(path) as f:
+            return json.load(f)
+    # E.g. backend not installed: Record the failure for all scenarios.
+    except subprocess.CalledProcessError as e:
+        return dict(
+            meta=dict(backends=[backend]),
+            results=[dict(scenario=scenario, backend=backend, error=str(e)) for scenario in scenarios]
+        )
+    finally:
+        os.remove(path)
+
+
+def _get_meta():
+    return dict(
+        rlgraph_version=__version__,
+        backends=[get_backend()],
+        distributed_backend=get_distributed_backend(),
+        python_version=platform.python_version(),
+        numpy_version=np.__version__,
+        platform=platform.platform(),
+        processor=platform.processor(),
+        cpu_count=os.cpu_count(),
+        timestamp=datetime.datetime.utcnow().isoformat()
+    )
+
+
+def _str_list(value):
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
+def _int_list(value):
+    return [int(item) for item in _str_list(value)]
@@ -0,0 +1,266 @@
+# Copyright 2018/2019 The RLgraph authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import time
+
+import numpy as np
+from six.moves import xrange as range_
+
+from rlgraph.agents import Agent
+from rlgraph.environments import SequentialVectorEnv
+from rlgraph.environments.grid_world import VectorGridWorld
+from rlgraph.environments.random_env import VectorRandomEnv
+from rlgraph.execution.single_threaded_worker import SingleThreadedWorker
+import rlgraph.spaces as spaces
+
+
+# The local stand-in environment all Agent benchmarks act on.
+BENCHMARK_STATE_SPACE = spaces.FloatBox(shape=(8,))
+BENCHMARK_ACTION_SPACE = spaces.IntBox(4)
+
+# The Agent used if no other spec is given.
+DEFAULT_AGENT_SPEC = dict(
+    type="dqn",
+    network_spec=[
+        dict(type="dense", units=64, activation="relu", scope="hidden-layer-1"),
+        dict(type="dense", units=64, activation="relu", scope="hidden-layer-2")
+    ],
+    memory_spec=dict(type="replay", capacity=10000),
+    update_spec=dict(do_updates=True, update_mode="time_steps", update_interval=4, batch_size=32, sync_interval=64),
+    optimizer_spec=dict(type="adam", learning_rate=0.001)
+)
+
+
+def benchmark_env_steps(num_envs, iterations, **kwargs):
+    """
+    Measures environment steps per second of the natively vectorized GridWorld vs a sequential vector of GridWorlds.
+
+    Args:
+        num_envs (List[int]): The numbers of environments to step at once.
+        iterations (int): The number of (vector) steps to time.
+
+    Returns:
+        List[dict]: One result per environment type and number of environments.
+    """
+    results = []
+    for num_environments in num_envs:
+        for env_type, env in [
+            ("vector-grid-world", VectorGridWorld(num_environments=num_environments, world="8x8")),
+            ("sequential-grid-world", SequentialVectorEnv(
+                num_environments=num_environments, env_spec=dict(type="grid-world", world="8x8")
+            ))
+        ]:
+            actions = np.random.randint(4, size=(iterations, num_environments))
+            env.reset_all()
+            start = time.perf_counter()
+            for i in range_(iterations):
+                _, _, terminals, _ = env.step(actions[i])
+                for index in np.nonzero(terminals)[0]:
+                    env.reset(index)
+            runtime = time.perf_counter() - start
+            results.append(dict(
+                params=dict(env=env_type, num_envs=num_environments, iterations=iterations),
+                metrics=dict(
+                    runtime=runtime,
+                    env_steps_per_second=iterations * num_environments / runtime
+                )
+            ))
+    return results
+
+
+def benchmark_get_action(batch_sizes, iterations, agent_spec=None, **kwargs):
+    """
+    Measures `Agent.get_action` latencies for different state batch sizes.
+
+    Args:
+        batch_sizes (List[int]): The numbers of states to pass into each call.
+        iterations (int): The number of calls to time per batch size.
+        agent_spec (Optional[dict]): The Agent to benchmark. Default: `DEFAULT_AGENT_SPEC`.
+
+    Returns:
+        List[dict]: One result per batch size.
+    """
+    agent = _create_agent(agent_spec)
+    results = []
+    for batch_size in batch_sizes:
+        states = BENCHMARK_STATE_SPACE.sample(size=batch_size)
+        # Warm up (e.g. first-call graph/trace overhead).
+        for _ in range_(min(iterations, 10)):
+            agent.get_action(states)
+        latencies = []
+        for _ in range_(iterations):
+            start = time.perf_counter()
+            agent.get_action(states)
+            latencies.append(time.perf_counter() - start)
+        results.append(dict(
+            params=dict(batch_size=batch_size, iterations=iterations),
+            metrics=dict(
+                _latency_stats(latencies),
+                calls_per_second=iterations / sum(latencies),
+                states_per_second=iterations * batch_size / sum(latencies)
+            )
+        ))
+    return results
+
+
+def benchmark_updates(batch_sizes, iterations, agent_spec=None, **kwargs):
+    """
+    Measures `Agent.update` throughput on external batches of different sizes.
+
+    Args:
+        batch_sizes (List[int]): The batch sizes to update with.
+        iterations (int): The number of updates to time per batch size.
+        agent_spec (Optional[dict]): The Agent to benchmark. Default: `DEFAULT_AGENT_SPEC`.
+
+    Returns:
+        List[dict]: One result per batch size.
+    """
+    agent = _create_agent(agent_spec)
+    results = []
+    for batch_size in batch_sizes:
+        batch = dict(
+            states=BENCHMARK_STATE_SPACE.sample(size=batch_size),
+            actions=BENCHMARK_ACTION_SPACE.sample(size=batch_size),
+            rewards=np.random.uniform(size=batch_size).astype(np.float32),
+            terminals=np.zeros(shape=(batch_size,), dtype=np.bool_),
+            next_states=BENCHMARK_STATE_SPACE.sample(size=batch_size),
+            importance_weights=np.ones(shape=(batch_size,), dtype=np.float32)
+        )
+        agent.update(batch)
+        latencies = []
+        for _ in range_(iterations):
+            start = time.perf_counter()
+            agent.update(batch)
+            latencies.append(time.perf_counter() - start)
+        results.append(dict(
+            params=dict(batch_size=batch_size, iterations=iterations),
+            metrics=dict(
+                _latency_stats(latencies),
+                updates_per_second=iterations / sum(latencies),
+                samples_per_second=iterations * batch_size / sum(latencies)
+            )
+        ))
+    return results
+
+
+def benchmark_worker(num_envs, iterations, agent_spec=None, **kwargs):
+    """
+    Measures end-to-end acting/observing/updating throughput of a SingleThreadedWorker on vectorized
+    random environments.
+
+    Args:
+        num_envs (List[int]): The numbers of environments to step at once.
+        iterations (int): The number of time steps to execute per number of environments.
+        agent_spec (Optional[dict]): The Agent to benchmark. Default: `DEFAULT_AGENT_SPEC`.
+
+    Returns:
+        List[dict]: One result per number of environments.
+    """
+    results = []
+    for num_environments in num_envs:
+        agent = _create_agent(agent_spec)
+        env = VectorRandomEnv(
+            num_environments=num_environments, state_space=BENCHMARK_STATE_SPACE,
+            action_space=BENCHMARK_ACTION_SPACE, reward_space=spaces.FloatBox(-1.0, 1.0), terminal_prob=0.01
+        )
+        worker = SingleThreadedWorker(env_spec=env, agent=agent, worker_executes_preprocessing=False)
+        result = worker.execute_timesteps(num_timesteps=iterations, use_exploration=True)
+        results.append(dict(
+            params=dict(num_envs=num_environments, iterations=iterations),
+            metrics=dict(
+                runtime=result["runtime"],
+                env_steps_per_second=result["env_frames_per_second"],
+                timesteps_per_second=result["ops_per_second"]
+            )
+        ))
+    return results
+
+
+def benchmark_memory(batch_sizes, iterations, **kwargs):
+    """
+    Measures insert, sample and priority-update rates of the python prioritized replay memory.
+
+    Args:
+        batch_sizes (List[int]): The sample batch sizes.
+        iterations (int): The number of sample/update calls to time per batch size. Ten times as many records
+            are inserted.
+
+    Returns:
+        List[dict]: One result per batch size.
+    """
+    # Only importable with the ray distributed backend.
+    from rlgraph.execution.ray.apex.apex_memory import ApexMemory
+
+    results = []
+    for batch_size in batch_sizes:
+        num_records = max(iterations * 10, batch_size)
+        memory = ApexMemory(capacity=num_records, alpha=0.6, beta=0.4)
+        records = [(
+            BENCHMARK_STATE_SPACE.sample(), BENCHMARK_ACTION_SPACE.sample(), float(np.random.uniform()), False,
+            BENCHMARK_STATE_SPACE.sample(), None
+        ) for _ in range_(num_records)]
+
+        start = time.perf_counter()
+        for record in records:
+            memory.insert_records(record)
+        insert_runtime = time.perf_counter() - start
+
+        start = time.perf_counter()
+        samples = [memory.get_records(batch_size) for _ in range_(iterations)]
+        sample_runtime = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for _, indices, _ in samples:
+            memory.update_records(indices, np.random.uniform(size=len(indices)))
+        update_runtime = time.perf_counter() - start
+
+        results.append(dict(
+            params=dict(batch_size=batch_size, iterations=iterations, num_records=num_records),
+            metrics=dict(
+                inserts_per_second=num_records / insert_runtime,
+                samples_per_second=iterations / sample_runtime,
+                sampled_records_per_second=iterations * batch_size / sample_runtime,
+                updates_per_second=iterations / update_runtime
+            )
+        ))
+    return results
+
+
+BENCHMARK_SCENARIOS = dict(
+    env=benchmark_env_steps,
+    act=benchmark_get_action,
+    update=benchmark_updates,
+    worker=benchmark_worker,
+    memory=benchmark_memory
+)
+
+
+def _create_agent(agent_spec=None):
+    return Agent.from_spec(
+        agent_spec or DEFAULT_AGENT_SPEC, state_space=BENCHMARK_STATE_SPACE, action_space=BENCHMARK_ACTION_SPACE
+    )
+
+
+def _latency_stats(latencies):
+    latencies_ms = np.asarray(latencies) * 1000.0
+    return dict(
+        latency_mean_ms=float(np.mean(latencies_ms)),
+        latency_p50_ms=float(np.percentile(latencies_ms, 50)),
+        latency_p99_ms=float(np.percentile(latencies_ms, 99))
+    )
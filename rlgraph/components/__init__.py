@@ -13,42 +13,43 @@
 # limitations under the License.
 # ==============================================================================
 
+
 from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
 # Core.
 from rlgraph.components.component import Component
-# Component child-classes.
-from rlgraph.components.distributions import *
-from rlgraph.components.explorations import Exploration, EpsilonExploration
-from rlgraph.components.layers import *
-from rlgraph.components.loss_functions import *
-from rlgraph.components.memories import *
-from rlgraph.components.neural_networks import *
-from rlgraph.components.optimizers import *
-from rlgraph.components.policies import *
-from rlgraph.components.common import *
+# Component child-classes. The sub-packages only import their base classes and register all other classes
+# lazily (see `rlgraph.utils.lazy_import`).
+from rlgraph.components import distributions, explorations, layers, loss_functions, memories, neural_networks, \
+    optimizers, policies, common
 
+from rlgraph.utils.lazy_import import lazy_module_attributes
 from rlgraph.utils.util import default_dict
 
 # Create the lookup dict for Component.
 Component.__lookup_classes__ = dict(
-    containermerger=ContainerMerger,
-    containersplitter=ContainerSplitter,
+    containermerger="rlgraph.components.common.container_merger.ContainerMerger",
+    containersplitter="rlgraph.components.common.container_splitter.ContainerSplitter",
 )
 
 # Add all specific sub-classes to this one.
-default_dict(Component.__lookup_classes__, Distribution.__lookup_classes__)
-default_dict(Component.__lookup_classes__, Layer.__lookup_classes__)
-default_dict(Component.__lookup_classes__, Stack.__lookup_classes__)
-default_dict(Component.__lookup_classes__, LossFunction.__lookup_classes__)
-default_dict(Component.__lookup_classes__, Memory.__lookup_classes__)
-default_dict(Component.__lookup_classes__, NeuralNetwork.__lookup_classes__)
-default_dict(Component.__lookup_classes__, Optimizer.__lookup_classes__)
-default_dict(Component.__lookup_classes__, Policy.__lookup_classes__)
-
-
-__all__ = ["Component"] + \
-          list(set(map(lambda x: x.__name__, Component.__lookup_classes__.values())))
-
+default_dict(Component.__lookup_classes__, distributions.Distribution.__lookup_classes__)
+default_dict(Component.__lookup_classes__, layers.Layer.__lookup_classes__)
+default_dict(Component.__lookup_classes__, neural_networks.Stack.__lookup_classes__)
+default_dict(Component.__lookup_classes__, loss_functions.LossFunction.__lookup_classes__)
+default_dict(Component.__lookup_classes__, memories.Memory.__lookup_classes__)
+default_dict(Component.__lookup_classes__, neural_networks.NeuralNetwork.__lookup_classes__)
+default_dict(Component.__lookup_classes__, optimizers.Optimizer.__lookup_classes__)
+default_dict(Component.__lookup_classes__, policies.Policy.__lookup_classes__)
+
+# Resolve all public names of the sub-packages through their (lazy) module attributes.
+_attribute_modules = dict()
+for _sub_package in [distributions, explorations, layers, loss_functions, memories, neural_networks, optimizers,
+                     policies, common]:
+    _attribute_modules.update({name: _sub_package.__name__ for name in _sub_package.__all__})
+__getattr__, __dir__ = lazy_module_attributes(__name__, _attribute_modules)
+
+
+__all__ = ["Component"] + list(_attribute_modules.keys())
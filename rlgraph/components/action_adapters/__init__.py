@@ -1,4 +1,4 @@
-# Copyright 2018/2019 The RLgraph authors, All Rights Reserved.
+# Copyright 2018/2019 The RLgraph authors. All Rights Reserved.
 #
 # Licensed under the Apache License, Version 2.0 (the "License");
 # you may not use this file except in compliance with the License.
@@ -13,32 +13,37 @@
 # limitations under the License.
 # ==============================================================================
 
+
 from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
 from rlgraph.components.action_adapters.action_adapter import ActionAdapter
-from rlgraph.components.action_adapters.action_adapter_utils import get_action_adapter_type_from_distribution_type, \
-    get_distribution_spec_from_action_adapter
-from rlgraph.components.action_adapters.bernoulli_distribution_adapter import BernoulliDistributionAdapter
-from rlgraph.components.action_adapters.beta_distribution_adapter import BetaDistributionAdapter
-from rlgraph.components.action_adapters.categorical_distribution_adapter import CategoricalDistributionAdapter
-from rlgraph.components.action_adapters.gumbel_softmax_distribution_adapter import GumbelSoftmaxDistributionAdapter
-from rlgraph.components.action_adapters.normal_distribution_adapter import NormalDistributionAdapter
-from rlgraph.components.action_adapters.squashed_normal_distribution_adapter import SquashedNormalDistributionAdapter
+from rlgraph.utils.lazy_import import get_attribute_modules, lazy_module_attributes
 
 ActionAdapter.__lookup_classes__ = dict(
     actionadapter=ActionAdapter,
-    bernoullidistributionadapter=BernoulliDistributionAdapter,
-    categoricaldistributionadapter=CategoricalDistributionAdapter,
-    betadistributionadapter=BetaDistributionAdapter,
-    gumbelsoftmaxdistributionadapter=GumbelSoftmaxDistributionAdapter,
-    gumbelsoftmaxadapter=GumbelSoftmaxDistributionAdapter,
-    normaldistributionadapter=NormalDistributionAdapter,
-    squashednormaladapter=SquashedNormalDistributionAdapter,
-    squashednormaldistributionadapter=SquashedNormalDistributionAdapter,
+    bernoullidistributionadapter=
+    "rlgraph.components.action_adapters.bernoulli_distribution_adapter.BernoulliDistributionAdapter",
+    categoricaldistributionadapter=
+    "rlgraph.components.action_adapters.categorical_distribution_adapter.CategoricalDistributionAdapter",
+    betadistributionadapter="rlgraph.components.action_adapters.beta_distribution_adapter.BetaDistributionAdapter",
+    gumbelsoftmaxdistributionadapter=
+    "rlgraph.components.action_adapters.gumbel_softmax_distribution_adapter.GumbelSoftmaxDistributionAdapter",
+    gumbelsoftmaxadapter=
+    "rlgraph.components.action_adapters.gumbel_softmax_distribution_adapter.GumbelSoftmaxDistributionAdapter",
+    normaldistributionadapter=
+    "rlgraph.components.action_adapters.normal_distribution_adapter.NormalDistributionAdapter",
+    squashednormaladapter=
+    "rlgraph.components.action_adapters.squashed_normal_distribution_adapter.SquashedNormalDistributionAdapter",
+    squashednormaldistributionadapter=
+    "rlgraph.components.action_adapters.squashed_normal_distribution_adapter.SquashedNormalDistributionAdapter",
 )
 
-__all__ = ["ActionAdapter", "get_action_adapter_type_from_distribution_type",
-           "get_distribution_spec_from_action_adapter"] + \
-          list(set(map(lambda x: x.__name__, ActionAdapter.__lookup_classes__.values())))
+_attribute_modules = get_attribute_modules([
+    "rlgraph.components.action_adapters.action_adapter_utils.get_action_adapter_type_from_distribution_type",
+    "rlgraph.components.action_adapters.action_adapter_utils.get_distribution_spec_from_action_adapter"
+] + [c for c in ActionAdapter.__lookup_classes__.values() if isinstance(c, str)])
+__getattr__, __dir__ = lazy_module_attributes(__name__, _attribute_modules)
+
+__all__ = ["ActionAdapter"] + list(_attribute_modules.keys())
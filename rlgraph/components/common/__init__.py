@@ -13,45 +13,47 @@
 # limitations under the License.
 # ==============================================================================
 
+
 from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
-from rlgraph.components.common.batch_apply import BatchApply
-from rlgraph.components.common.batch_splitter import BatchSplitter
-from rlgraph.components.common.container_merger import ContainerMerger
-from rlgraph.components.common.container_splitter import ContainerSplitter
-from rlgraph.components.common.decay_components import DecayComponent, LinearDecay, PolynomialDecay, ExponentialDecay, \
-    ConstantDecay
-from rlgraph.components.common.multi_gpu_synchronizer import MultiGpuSynchronizer
-from rlgraph.components.common.noise_components import NoiseComponent, ConstantNoise, GaussianNoise, \
-    OrnsteinUhlenbeckNoise
-from rlgraph.components.common.repeater_stack import RepeaterStack
-from rlgraph.components.common.sampler import Sampler
-from rlgraph.components.common.slice import Slice
-from rlgraph.components.common.staging_area import StagingArea
-from rlgraph.components.common.synchronizable import Synchronizable
+from rlgraph.components.common.decay_components import DecayComponent, LinearDecay
+from rlgraph.components.common.noise_components import NoiseComponent, GaussianNoise
+from rlgraph.utils.lazy_import import get_attribute_modules, lazy_module_attributes
 
 DecayComponent.__lookup_classes__ = dict(
     lineardecay=LinearDecay,
-    constantdecay=ConstantDecay,
-    exponentialdecay=ExponentialDecay,
-    polynomialdecay=PolynomialDecay
+    constantdecay="rlgraph.components.common.decay_components.ConstantDecay",
+    exponentialdecay="rlgraph.components.common.decay_components.ExponentialDecay",
+    polynomialdecay="rlgraph.components.common.decay_components.PolynomialDecay"
 )
 DecayComponent.__default_constructor__ = LinearDecay
 
 NoiseComponent.__lookup_classes__ = dict(
-    constantnoise=ConstantNoise,
+    constantnoise="rlgraph.components.common.noise_components.ConstantNoise",
     gaussiannoise=GaussianNoise,
-    ornsteinuhlenbeck=OrnsteinUhlenbeckNoise,
-    ornsteinuhlenbecknoise=OrnsteinUhlenbeckNoise
+    ornsteinuhlenbeck="rlgraph.components.common.noise_components.OrnsteinUhlenbeckNoise",
+    ornsteinuhlenbecknoise="rlgraph.components.common.noise_components.OrnsteinUhlenbeckNoise"
 )
 NoiseComponent.__default_constructor__ = GaussianNoise
 
+# Lazily imported decay/noise components are taken from the lookup tables above.
+_attribute_modules = get_attribute_modules(
+    [c for c in DecayComponent.__lookup_classes__.values() if isinstance(c, str)] +
+    [c for c in NoiseComponent.__lookup_classes__.values() if isinstance(c, str)] + [
+    "rlgraph.components.common.batch_apply.BatchApply",
+    "rlgraph.components.common.batch_splitter.BatchSplitter",
+    "rlgraph.components.common.container_merger.ContainerMerger",
+    "rlgraph.components.common.container_splitter.ContainerSplitter",
+    "rlgraph.components.common.input_pipeline.InputPipeline",
+    "rlgraph.components.common.multi_gpu_synchronizer.MultiGpuSynchronizer",
+    "rlgraph.components.common.repeater_stack.RepeaterStack",
+    "rlgraph.components.common.sampler.Sampler",
+    "rlgraph.components.common.slice.Slice",
+    "rlgraph.components.common.staging_area.StagingArea",
+    "rlgraph.components.common.synchronizable.Synchronizable"
+])
+__getattr__, __dir__ = lazy_module_attributes(__name__, _attribute_modules)
 
-__all__ = ["BatchApply", "ContainerMerger", "ContainerSplitter",
-           "Synchronizable", "RepeaterStack", "Slice",
-           "DecayComponent", "ConstantDecay", "LinearDecay", "PolynomialDecay", "ExponentialDecay",
-           "NoiseComponent", "ConstantNoise", "GaussianNoise", "OrnsteinUhlenbeckNoise",
-           "Sampler", "BatchSplitter", "MultiGpuSynchronizer"]
-
+__all__ = ["DecayComponent", "LinearDecay", "NoiseComponent", "GaussianNoise"] + list(_attribute_modules.keys())
@@ -39,7 +39,7 @@ class EnvironmentStepper(Component):
     n times through the environment, each time picking actions depending on the states that the environment produces.
     """
 
-    def __init__(self, environment_spec, actor_component_spec, num_steps=20,
+    def __init__(self, environment_spec, actor_component_spec, num_steps=20, num_environments=1,
                  state_space=None, action_space=None, reward_space=None,
                  internal_states_space=None,
                  add_action_probs=False, action_probs_space=None,
@@ -54,6 +54,12 @@ class EnvironmentStepper(Component):
             actor_component_spec (Union[ActorComponent,dict]): A specification dict to construct this EnvStepper's
                 ActionComponent (to generate actions) or an already constructed ActionComponent object.
             num_steps (int): The number of steps to perform per `step` call.
+            num_environments (int): The number of Environments (all hosted by the same SpecifiableServer) to step
+                through in parallel using one server round-trip per step. If > 1, the states of all Environments
+                are batched into one input for the ActorComponent and the resulting actions are split back out to
+                the individual Environments.
+                All outputs of `step` then carry a batch rank (of size `num_environments`) right after the
+                time rank (0th rank). Default: 1 (outputs have no batch rank).
             state_space (Optional[Space]): The state Space of the Environment. If None, will construct a dummy
                 environment to get the state Space from there.
             action_space (Optional[Space]): The action Space of the Environment. If None, will construct a dummy
@@ -65,8 +71,8 @@ class EnvironmentStepper(Component):
             add_action_probs (bool): Whether to add all action probabilities for each step to the ActionComponent's
                 outputs at each step. These will be added as additional tensor inside the
                 Default: False.
-            action_probs_space (Optional[Space]): If add_action_probs is True, the Space that the action_probs will have.
-                This is usually just the flattened (one-hot) action space.
+            action_probs_space (Optional[Space]): If add_action_probs is True, the Space that the action_probs will
+                have. This is usually just the flattened (one-hot) action space.
             add_action (bool): Whether to add the action to the output of the `step` API-method.
                 Default: False.
             add_reward (bool): Whether to add the reward to the output of the `step` API-method.
@@ -123,9 +129,10 @@ class EnvironmentStepper(Component):
         self.state_space_env_list = list(self.state_space_env_flattened.values())
 
         # TODO: automate this by lookup from the NN Component
+        self.num_environments = num_environments
         self.internal_states_space = None
         if internal_states_space is not None:
-            self.internal_states_space = internal_states_space.with_batch_rank(add_batch_rank=1)
+            self.internal_states_space = internal_states_space.with_batch_rank(add_batch_rank=self.num_environments)
 
         # Add the action/reward spaces to the state space (must be Dict).
         if self.add_previous_action_to_state is True:
@@ -154,7 +161,8 @@ class EnvironmentStepper(Component):
                 step_flow=self.state_space_env_list + [self.reward_space, bool],
                 reset_flow=self.state_space_env_list
             ),
-            shutdown_method="terminate"
+            shutdown_method="terminate",
+            num_instances=self.num_environments
         )
         # Add the sub-components.
         self.actor_component = ActorComponent.from_spec(actor_component_spec)  # type: ActorComponent
@@ -178,13 +186,13 @@ class EnvironmentStepper(Component):
         )
         self.current_state = self.get_variable(
             name="current-state", from_space=self.state_space_actor, initializer=0, flatten=True, trainable=False,
-            local=True, use_resource=True
+            local=True, use_resource=True, add_batch_rank=self.num_environments if self.num_environments > 1 else False
         )
         if self.has_rnn:
             self.current_internal_states = self.get_variable(
                 name="current-internal-states", from_space=self.internal_states_space,
                 initializer=0.0, flatten=True, trainable=False, local=True, use_resource=True,
-                add_batch_rank=1
+                add_batch_rank=self.num_environments
             )
 
     @rlgraph_api(returns=1)
@@ -202,11 +210,15 @@ class EnvironmentStepper(Component):
 
                 flat_state = OrderedDict()
                 for i, flat_key in enumerate(self.state_space_actor_flattened.keys()):
+                    expanded = state[i]
                     # Add a simple (size 1) batch rank to the state so it'll pass through the NN.
                     # - Also have to add a time-rank for RNN processing.
-                    expanded = state[i]
-                    for _ in range(1 if self.has_rnn is False else 2):
-                        expanded = tf.expand_dims(input=expanded, axis=0)
+                    if self.num_environments == 1:
+                        for _ in range(1 if self.has_rnn is False else 2):
+                            expanded = tf.expand_dims(input=expanded, axis=0)
+                    # States of all envs are already batched: Only add the (size 1) time-rank for RNN processing.
+                    elif self.has_rnn is True:
+                        expanded = tf.expand_dims(input=expanded, axis=1)
                     # Make None so it'll be recognized as batch-rank by the auto-Space detector.
                     flat_state[flat_key] = tf.placeholder_with_default(
                         input=expanded, shape=(None,) + ((None,) if self.has_rnn is True else ()) +
@@ -231,11 +243,16 @@ class EnvironmentStepper(Component):
                 current_internal_states = out.get("last_internal_states")
 
                 # Strip the batch (and maybe time) ranks again from the action in case the Env doesn't like it.
-                a_no_extra_ranks = a[0, 0] if self.has_rnn is True else a[0]
-                # Step through the Env and collect next state (tuple!), reward and terminal as single values
-                # (not batched).
-                out = self.environment_server.step_flow(a_no_extra_ranks)
-                s_, r, t_ = out[:-2], out[-2], out[-1]
+                a_no_extra_ranks = self._strip_extra_ranks(a)
+                # Step through the Env(s) and collect next state (tuple!), reward and terminal.
+                if self.num_environments == 1:
+                    # Single values (not batched).
+                    out = self.environment_server.step_flow(a_no_extra_ranks)
+                    s_, r, t_ = out[:-2], out[-2], out[-1]
+                else:
+                    # Step all envs in one round-trip (batched along the 0th rank).
+                    out = self.environment_server.call_many("step_flow", a_no_extra_ranks)
+                    s_, r, t_ = out[:-2], out[-2], out[-1]
                 r = tf.cast(r, dtype="float32")
 
                 # Add a and/or r to next_state?
@@ -250,27 +267,28 @@ class EnvironmentStepper(Component):
                 ret = [t_, s_] + \
                     ([a_no_extra_ranks] if self.add_action else []) + \
                     ([r] if self.add_reward else []) + \
-                    ([(action_probs[0][0] if self.has_rnn is True else action_probs[0])] if
-                     self.add_action_probs is True else []) + \
+                    ([self._strip_extra_ranks(action_probs)] if self.add_action_probs is True else []) + \
                     ([tuple(current_internal_states)] if self.has_rnn is True else [])
 
                 return tuple(ret)
 
             # Initialize the tf.scan run.
+            # All non-state values have an additional batch rank if we step through more than one env.
+            batch_shape = () if self.num_environments == 1 else (self.num_environments,)
             initializer = [
                 # terminals
-                tf.zeros(shape=(), dtype=tf.bool),
+                tf.zeros(shape=batch_shape, dtype=tf.bool),
                 # current (raw) state (flattened components if ContainerSpace).
                 tuple(map(lambda x: x.read_value(), self.current_state.values()))
             ]
             # Append actions and rewards if needed.
             if self.add_action:
-                initializer.append(tf.zeros(shape=self.action_space.shape, dtype=self.action_space.dtype))
+                initializer.append(tf.zeros(shape=batch_shape + self.action_space.shape, dtype=self.action_space.dtype))
             if self.add_reward:
-                initializer.append(tf.zeros(shape=self.reward_space.shape))
+                initializer.append(tf.zeros(shape=batch_shape + self.reward_space.shape))
             # Append action probs if needed.
             if self.add_action_probs is True:
-                initializer.append(tf.zeros(shape=self.action_probs_space.shape))
+                initializer.append(tf.zeros(shape=batch_shape + self.action_probs_space.shape))
             # Append internal states if needed.
             if self.current_internal_states is not None:
                 initializer.append(tuple(
@@ -302,9 +320,14 @@ class EnvironmentStepper(Component):
                 # Remove batch rank from internal states again.
                 internal_states_wo_batch = list()
                 for i, var_ref in enumerate(self.current_internal_states.values()):  #range(len(step_results[slot])):
-                    # 1=batch axis (which has dim=1); 0=time axis.
-                    internal_states_component = tf.squeeze(step_results[slot][i], axis=1)
-                    assigns.append(self.assign_variable(var_ref, internal_states_component[-1:]))
+                    if self.num_environments == 1:
+                        # 1=batch axis (which has dim=1); 0=time axis.
+                        internal_states_component = tf.squeeze(step_results[slot][i], axis=1)
+                        assigns.append(self.assign_variable(var_ref, internal_states_component[-1:]))
+                    # Keep the batch axis (one row per env).
+                    else:
+                        internal_states_component = step_results[slot][i]
+                        assigns.append(self.assign_variable(var_ref, internal_states_component[-1]))
                     internal_states_wo_batch.append(internal_states_component)
                 step_results[slot] = tuple(internal_states_wo_batch)
 
@@ -315,10 +338,11 @@ class EnvironmentStepper(Component):
                 for slot in range(len(step_results)):
                     first_values, rest_values = initializer[slot], step_results[slot]
                     # Internal states need a slightly different concatenating as the batch rank is missing.
-                    if self.current_internal_states is not None and slot == len(step_results) - 1:
+                    if self.current_internal_states is not None and slot == len(step_results) - 1 and \
+                            self.num_environments == 1:
                         full_results.append(nest.map_structure(self._concat, first_values, rest_values))
-                    # States need concatenating (first state needed).
-                    elif slot == 1:
+                    # States (and batched internal states) need concatenating (first state needed).
+                    elif slot == 1 or self.current_internal_states is not None and slot == len(step_results) - 1:
                         full_results.append(nest.map_structure(
                             lambda first, rest: tf.concat([[first], rest], axis=0), first_values, rest_values)
                         )
@@ -339,9 +363,20 @@ class EnvironmentStepper(Component):
             full_results = DataOpTuple(full_results)
             for o in flatten_op(full_results).values():
                 o._time_rank = 0  # which position in the shape is the time-rank?
+                if self.num_environments > 1:
+                    o._batch_rank = 1
 
             return full_results
 
+    def _strip_extra_ranks(self, op):
+        """
+        Helper method to remove the ranks added for the ActorComponent (batch- and time-rank) from one of its outputs.
+        Keeps the batch rank if we step through more than one env.
+        """
+        if self.num_environments == 1:
+            return op[0, 0] if self.has_rnn is True else op[0]
+        return op[:, 0] if self.has_rnn is True else op
+
     @staticmethod
     def _concat(first, rest):
         """
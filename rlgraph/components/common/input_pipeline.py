@@ -0,0 +1,165 @@
+# Copyright 2018/2019 The RLgraph authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import threading
+
+import numpy as np
+from six.moves import queue
+
+from rlgraph import get_backend
+from rlgraph.components.component import Component
+from rlgraph.spaces import Space
+from rlgraph.utils.decorators import rlgraph_api
+from rlgraph.utils.execution_util import define_by_run_unflatten
+from rlgraph.utils.ops import flatten_op, unflatten_op, DataOpDict, FlattenedDataOp, TraceContext
+from rlgraph.utils.rlgraph_errors import RLGraphError
+from rlgraph.utils.util import convert_dtype as dtype_
+
+if get_backend() == "tf":
+    import tensorflow as tf
+elif get_backend() == "pytorch":
+    import torch
+
+
+class InputPipeline(Component):
+    """
+    Feeds host-side (numpy) batches into the graph without going through placeholders on every update call.
+    Batches are inserted (from any python thread) into a bounded host queue. The graph pulls them from there:
+    - tf: Via a `tf.data` iterator with prefetching, such that the next batches are copied into the graph while
+        the current update is still running.
+    - pytorch: Via a background thread that converts the next batches into torch tensors (the CPU-equivalent of
+        staging them in a StagingArea) while the current update is still running.
+
+    Batches are handed out in the order they were inserted.
+
+    API:
+        get_batch() -> The next batch (a DataOpDict structured like `record_space`).
+    """
+    def __init__(self, record_space, capacity=4, prefetch_size=2, scope="input-pipeline", **kwargs):
+        """
+        Args:
+            record_space (Union[dict,Space]): The Space (usually a Dict) of a single record in the batches. Batches
+                may contain additional keys (e.g. "indices"), which are ignored.
+            capacity (int): The maximum number of batches to hold in the host queue. `insert` blocks when full.
+                Default: 4.
+            prefetch_size (int): The number of batches to prepare ahead of their consumption in the graph.
+                Default: 2.
+        """
+        super(InputPipeline, self).__init__(scope=scope, **kwargs)
+
+        self.record_space = Space.from_spec(record_space).with_batch_rank()
+        self.flat_record_space = self.record_space.flatten()
+        self.capacity = capacity
+        self.prefetch_size = prefetch_size
+
+        # The host queue holding tuples of flat (numpy) batch items.
+        self.queue = queue.Queue(maxsize=self.capacity)
+
+        # tf: The tf.data iterator.
+        self.iterator = None
+        # pytorch: The queue of already converted batches and the thread converting them.
+        self.prefetch_queue = None
+        self.prefetch_thread = None
+        self.prefetch_lock = threading.Lock()
+
+    def create_variables(self, input_spaces, action_space=None):
+        if get_backend() == "tf":
+            dataset = tf.data.Dataset.from_generator(
+                self._generate_batches,
+                output_types=tuple(dtype_(space.dtype) for space in self.flat_record_space.values()),
+                output_shapes=tuple(
+                    tf.TensorShape(space.get_shape(with_batch_rank=True)) for space in self.flat_record_space.values()
+                )
+            )
+            self.iterator = dataset.prefetch(self.prefetch_size).make_one_shot_iterator()
+
+    def insert(self, batch, block=True):
+        """
+        Inserts a host batch into the pipeline (not an API-method; may be called from any python thread).
+
+        Args:
+            batch (dict): The batch to insert. Must contain all keys of `record_space`.
+            block (bool): Whether to block while the pipeline is full. If False and the pipeline is full,
+                raises `queue.Full`.
+        """
+        flat_batch = flatten_op(batch)
+        self.queue.put(tuple(
+            np.asarray(flat_batch[key], dtype=dtype_(space.dtype, to="np"))
+            for key, space in self.flat_record_space.items()
+        ), block=block)
+
+        # pytorch: Convert batches in the background, starting with the first insert.
+        if get_backend() == "pytorch":
+            self._start_prefetching()
+
+    def close(self):
+        """
+        Ends the pipeline: Batches that are already inserted are still handed out, after that, `get_batch` fails
+        (tf: with an OutOfRangeError, pytorch: with an RLGraphError).
+        """
+        self.queue.put(None)
+
+    def _generate_batches(self):
+        while True:
+            flat_batch = self.queue.get()
+            if flat_batch is None:
+                return
+            yield flat_batch
+
+    def _start_prefetching(self):
+        """
+        pytorch: Starts the thread converting inserted batches (once; may be called from any python thread).
+        """
+        with self.prefetch_lock:
+            if self.prefetch_thread is None:
+                self.prefetch_queue = queue.Queue(maxsize=self.prefetch_size)
+                self.prefetch_thread = threading.Thread(target=self._prefetch, name="input-pipeline-prefetch")
+                self.prefetch_thread.daemon = True
+                self.prefetch_thread.start()
+
+    def _prefetch(self):
+        for flat_batch in self._generate_batches():
+            self.prefetch_queue.put(tuple(torch.from_numpy(item) for item in flat_batch))
+        self.prefetch_queue.put(None)
+
+    @rlgraph_api
+    def _graph_fn_get_batch(self):
+        """
+        Returns:
+            DataOpDict: The next batch in the pipeline (blocks until one is available).
+        """
+        if get_backend() == "tf":
+            flat_batch = self.iterator.get_next()
+            for item, space in zip(flat_batch, self.flat_record_space.values()):
+                item.set_shape(space.get_shape(with_batch_rank=True))
+            return unflatten_op(FlattenedDataOp(zip(self.flat_record_space.keys(), flat_batch)))
+        elif get_backend() == "pytorch":
+            # Build: Do not consume inserted batches -> Push a single zero record through the graph.
+            if TraceContext.DEFINE_BY_RUN_CONTEXT == "building":
+                flat_batch = tuple(
+                    torch.from_numpy(np.asarray(space.zeros(size=1))) for space in self.flat_record_space.values()
+                )
+            else:
+                # Block until a batch is inserted (as the tf iterator does).
+                self._start_prefetching()
+                flat_batch = self.prefetch_queue.get()
+                if flat_batch is None:
+                    raise RLGraphError("Input pipeline '{}' has been closed!".format(self.global_scope))
+            return define_by_run_unflatten(DataOpDict(zip(self.flat_record_space.keys(), flat_batch)))
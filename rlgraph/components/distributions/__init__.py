@@ -13,41 +13,37 @@
 # limitations under the License.
 # ==============================================================================
 
+
 from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
-from rlgraph.components.distributions.bernoulli import Bernoulli
-from rlgraph.components.distributions.beta import Beta
-from rlgraph.components.distributions.categorical import Categorical
 from rlgraph.components.distributions.distribution import Distribution
-from rlgraph.components.distributions.gumbel_softmax import GumbelSoftmax
-from rlgraph.components.distributions.mixture_distribution import MixtureDistribution
-from rlgraph.components.distributions.multivariate_normal import MultivariateNormal
-from rlgraph.components.distributions.normal import Normal
-from rlgraph.components.distributions.squashed_normal import SquashedNormal
+from rlgraph.utils.lazy_import import get_attribute_modules, lazy_module_attributes
 
 Distribution.__lookup_classes__ = dict(
-    bernoulli=Bernoulli,
-    bernoullidistribution=Bernoulli,
-    categorical=Categorical,
-    categoricaldistribution=Categorical,
-    gaussian=Normal,
-    gaussiandistribution=Normal,
-    gumbelsoftmax=GumbelSoftmax,
-    gumbelsoftmaxdistribution=GumbelSoftmax,
-    mixture=MixtureDistribution,
-    mixturedistribution=MixtureDistribution,
-    multivariatenormal=MultivariateNormal,
-    multivariategaussian=MultivariateNormal,
-    normal=Normal,
-    normaldistribution=Normal,
-    beta=Beta,
-    betadistribution=Beta,
-    squashed=SquashedNormal,
-    squashednormal=SquashedNormal,
-    squashednormaldistribution=SquashedNormal
+    bernoulli="rlgraph.components.distributions.bernoulli.Bernoulli",
+    bernoullidistribution="rlgraph.components.distributions.bernoulli.Bernoulli",
+    categorical="rlgraph.components.distributions.categorical.Categorical",
+    categoricaldistribution="rlgraph.components.distributions.categorical.Categorical",
+    gaussian="rlgraph.components.distributions.normal.Normal",
+    gaussiandistribution="rlgraph.components.distributions.normal.Normal",
+    gumbelsoftmax="rlgraph.components.distributions.gumbel_softmax.GumbelSoftmax",
+    gumbelsoftmaxdistribution="rlgraph.components.distributions.gumbel_softmax.GumbelSoftmax",
+    mixture="rlgraph.components.distributions.mixture_distribution.MixtureDistribution",
+    mixturedistribution="rlgraph.components.distributions.mixture_distribution.MixtureDistribution",
+    multivariatenormal="rlgraph.components.distributions.multivariate_normal.MultivariateNormal",
+    multivariategaussian="rlgraph.components.distributions.multivariate_normal.MultivariateNormal",
+    normal="rlgraph.components.distributions.normal.Normal",
+    normaldistribution="rlgraph.components.distributions.normal.Normal",
+    beta="rlgraph.components.distributions.beta.Beta",
+    betadistribution="rlgraph.components.distributions.beta.Beta",
+    squashed="rlgraph.components.distributions.squashed_normal.SquashedNormal",
+    squashednormal="rlgraph.components.distributions.squashed_normal.SquashedNormal",
+    squashednormaldistribution="rlgraph.components.distributions.squashed_normal.SquashedNormal"
 )
 
-__all__ = ["Distribution"] + list(set(map(lambda x: x.__name__, Distribution.__lookup_classes__.values())))
+_attribute_modules = get_attribute_modules(Distribution.__lookup_classes__.values())
+__getattr__, __dir__ = lazy_module_attributes(__name__, _attribute_modules)
 
+__all__ = ["Distribution"] + list(_attribute_modules.keys())
@@ -13,12 +13,17 @@
 # limitations under the License.
 # ==============================================================================
 
+
 from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
-from rlgraph.components.explorations.exploration import Exploration
-from rlgraph.components.explorations.epsilon_exploration import EpsilonExploration
+from rlgraph.utils.lazy_import import get_attribute_modules, lazy_module_attributes
 
-__all__ = ["Exploration", "EpsilonExploration"]
+_attribute_modules = get_attribute_modules([
+    "rlgraph.components.explorations.exploration.Exploration",
+    "rlgraph.components.explorations.epsilon_exploration.EpsilonExploration"
+])
+__getattr__, __dir__ = lazy_module_attributes(__name__, _attribute_modules)
 
+__all__ = list(_attribute_modules.keys())
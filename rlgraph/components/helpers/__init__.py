@@ -13,18 +13,24 @@
 # limitations under the License.
 # ==============================================================================
 
+
 from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
-from rlgraph.components.helpers.mem_segment_tree import MemSegmentTree
-from rlgraph.components.helpers.segment_tree import SegmentTree
-from rlgraph.components.helpers.softmax import SoftMax
-from rlgraph.components.helpers.v_trace_function import VTraceFunction
-from rlgraph.components.helpers.sequence_helper import SequenceHelper
-from rlgraph.components.helpers.clipping import Clipping
-from rlgraph.components.helpers.generalized_advantage_estimation import GeneralizedAdvantageEstimation
+from rlgraph.utils.lazy_import import get_attribute_modules, lazy_module_attributes
+
+_attribute_modules = get_attribute_modules([
+    "rlgraph.components.helpers.mem_segment_tree.MemSegmentTree",
+    "rlgraph.components.helpers.memmap_storage.MemmapStorage",
+    "rlgraph.components.helpers.segment_tree.SegmentTree",
+    "rlgraph.components.helpers.softmax.SoftMax",
+    "rlgraph.components.helpers.v_trace_function.VTraceFunction",
+    "rlgraph.components.helpers.sequence_helper.SequenceHelper",
+    "rlgraph.components.helpers.clipping.Clipping",
+    "rlgraph.components.helpers.generalized_advantage_estimation.GeneralizedAdvantageEstimation"
+])
+__getattr__, __dir__ = lazy_module_attributes(__name__, _attribute_modules)
 
 
-__all__ = ["MemSegmentTree", "SegmentTree", "SoftMax", "VTraceFunction", "SequenceHelper",
-           "GeneralizedAdvantageEstimation", "Clipping"]
+__all__ = list(_attribute_modules.keys())
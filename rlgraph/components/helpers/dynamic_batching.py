@@ -12,7 +12,12 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-"""Dynamic batching."""
+"""
+Dynamic batching.
+
+Requires the custom `batcher` TF op (see batcher.cc) to be compiled and loadable. For a backend-agnostic,
+python-side alternative batching `Agent.get_action` calls, see `rlgraph.execution.DynamicBatchingServer`.
+"""
 
 from __future__ import absolute_import
 from __future__ import division
@@ -21,7 +26,9 @@ from __future__ import print_function
 import functools
 
 from rlgraph import get_backend
+from rlgraph.utils.rlgraph_errors import RLGraphError
 
+batcher_ops = None
 if get_backend() == "tf":
     import tensorflow as tf
 
@@ -32,7 +39,7 @@ if get_backend() == "tf":
         try:
             batcher_ops = tf.load_op_library('/root/scalable_agent/batcher.so')
         except:
-            pass
+            batcher_ops = None
 
     nest = tf.contrib.framework.nest
 
@@ -46,6 +53,10 @@ class Batcher(object):
     """
 
     def __init__(self, minimum_batch_size, maximum_batch_size, timeout_ms):
+        if batcher_ops is None:
+            raise RLGraphError(
+                "ERROR: Custom batcher op could not be loaded! Use `rlgraph.execution.DynamicBatchingServer` instead."
+            )
         self.handle = batcher_ops.batcher(
             minimum_batch_size, maximum_batch_size, timeout_ms or -1
         )
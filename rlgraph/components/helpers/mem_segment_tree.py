@@ -19,6 +19,8 @@ from __future__ import print_function
 
 import operator
 
+import numpy as np
+
 from rlgraph.utils.rlgraph_errors import RLGraphError
 
 
@@ -26,9 +28,10 @@ class MemSegmentTree(object):
     """
     In-memory Segment tree for prioritized replay.
 
-    Note: The pure TensorFlow segment tree is much slower because variable updating is expensive,
-    and in scenarios like Ape-X, memory and update are separated processes, so there is little to be gained
-    from inserting into the graph.
+    Note: The pure TensorFlow segment tree batches its updates level by level, but in scenarios like Ape-X,
+    memory and update are separated processes, so there is little to be gained from inserting into the graph.
+    The tree is stored in a numpy array, such that batches of lookups descend the tree level by level for all
+    elements at once.
     """
 
     def __init__(
@@ -41,11 +44,11 @@ class MemSegmentTree(object):
         Helper to represent a segment tree.
 
         Args:
-            values (list): Storage for the segment tree.
-            capacity (int): Capacity of segment tree.
+            values (Union[list,np.ndarray]): Initial storage for the segment tree (2 * `capacity` elements).
+            capacity (int): Capacity of segment tree (a power of 2, such that all leaves have the same depth).
             operator (callable): Reduce operation of the segment tree.
         """
-        self.values = values
+        self.values = np.asarray(values, dtype=np.float64)
         self.capacity = capacity
         self.operator = operator
 
@@ -84,6 +87,48 @@ class MemSegmentTree(object):
         """
         return self.values[self.capacity + index]
 
+    def get_leaves(self, indices):
+        """
+        Reads several items from the segment tree.
+
+        Args:
+            indices (iterable[int]): The indices to read.
+
+        Returns:
+            np.ndarray: The elements.
+        """
+        return self.values[self.capacity + np.asarray(indices, dtype=np.int64)]
+
+    def sample(self, num_records, prob_sum, stratified=False):
+        """
+        Samples indices proportionally to their values (sum-tree only) by looking up prefix sums.
+
+        Args:
+            num_records (int): The number of indices to sample.
+            prob_sum (float): The total mass to sample prefix sums from (e.g. the sum over all stored elements).
+            stratified (bool): If True, splits `prob_sum` into `num_records` segments of equal mass and draws one
+                prefix sum per segment (lower variance than independent draws). Default: False.
+
+        Returns:
+            np.ndarray: The sampled indices.
+        """
+        if stratified is True:
+            samples = (np.arange(num_records) + np.random.random(size=(num_records,))) * (prob_sum / num_records)
+        else:
+            samples = np.random.random(size=(num_records,)) * prob_sum
+
+        # Descend level by level for all samples at once: Go left if the left child's mass exceeds the remaining
+        # prefix sum, otherwise subtract that mass and go right.
+        values = self.values
+        indices = np.ones(shape=(num_records,), dtype=np.int64)
+        for _ in range(self.capacity.bit_length() - 1):
+            left_indices = 2 * indices
+            left_values = values[left_indices]
+            go_right = left_values <= samples
+            samples = samples - left_values * go_right
+            indices = left_indices + go_right
+        return indices - self.capacity
+
     def index_of_prefixsum(self, prefix_sum):
         """
         Identifies the highest index which satisfies the condition that the sum
@@ -198,3 +243,30 @@ class MinSumSegmentTree(object):
             self.min_segment_tree.values[index] = min(self.min_segment_tree.values[update_index],
                                                       self.min_segment_tree.values[update_index + 1])
             index = index >> 1
+
+    def insert_batch(self, indices, elements):
+        """
+        Inserts several elements into both segment trees, recomputing each affected inner node only once
+        (instead of once per element as with repeated `insert` calls).
+
+        Args:
+            indices (iterable[int]): Insertion indices.
+            elements (iterable[any]): Elements to insert (one per index).
+        """
+        nodes = np.asarray(indices, dtype=np.int64) + self.capacity
+        if len(nodes) == 0:
+            return
+        # For duplicate indices, keep the last element (as repeated `insert` calls would).
+        nodes, positions = np.unique(nodes[::-1], return_index=True)
+        elements = np.asarray(elements, dtype=np.float64)[::-1][positions]
+
+        sum_values = self.sum_segment_tree.values
+        min_values = self.min_segment_tree.values
+        sum_values[nodes] = elements
+        min_values[nodes] = elements
+
+        # All leaves have the same depth -> Update level by level towards the root.
+        while nodes[0] > 1:
+            nodes = np.unique(nodes >> 1)
+            sum_values[nodes] = sum_values[2 * nodes] + sum_values[2 * nodes + 1]
+            min_values[nodes] = np.minimum(min_values[2 * nodes], min_values[2 * nodes + 1])
@@ -0,0 +1,142 @@
+# Copyright 2018/2019 The RLgraph authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import os
+import re
+import tempfile
+
+import numpy as np
+
+from rlgraph.utils.util import convert_dtype
+
+
+class MemmapStorage(object):
+    """
+    Disk-backed ring-buffer storage for flat records: Each record column lives in an `np.memmap` file, so the
+    storage's capacity is limited by local disk instead of RAM. The most recently inserted records are held in a
+    small in-RAM write buffer and written to disk in large contiguous blocks once the buffer is full.
+    Reads gather all requested indices of a column in sorted order (one pass over the file per column).
+    """
+    def __init__(self, flat_record_space, capacity, directory=None, write_buffer_size=1000):
+        """
+        Args:
+            flat_record_space (dict): Dict mapping flat record keys to the (batch-rank free) Spaces of the columns.
+            capacity (int): The number of records the storage can hold.
+            directory (Optional[str]): Directory to place the memmap files in. If None, uses a new temporary
+                directory.
+            write_buffer_size (int): The number of records to hold in RAM before writing them to disk.
+        """
+        self.capacity = capacity
+        self.directory = directory or tempfile.mkdtemp(prefix="rlgraph-memmap-storage-")
+        if not os.path.exists(self.directory):
+            os.makedirs(self.directory)
+        self.write_buffer_size = min(write_buffer_size, capacity)
+
+        self.columns = dict()
+        self.write_buffer = dict()
+        for i, (key, space) in enumerate(flat_record_space.items()):
+            dtype = convert_dtype(space.dtype, to="np")
+            shape = tuple(space.shape)
+            filename = "{}{}.dat".format(i, re.sub(r'\W+', "-", key))
+            self.columns[key] = np.memmap(
+                os.path.join(self.directory, filename), dtype=dtype, mode="w+", shape=(capacity,) + shape
+            )
+            self.write_buffer[key] = np.zeros(shape=(self.write_buffer_size,) + shape, dtype=dtype)
+
+        # The storage index of the first buffered record and the number of buffered records.
+        self.buffer_start = 0
+        self.buffer_count = 0
+
+    def insert(self, flat_records, index):
+        """
+        Inserts records at consecutive storage indices (rolling over at `capacity`).
+
+        Args:
+            flat_records (dict): Dict mapping flat record keys to arrays of records (batched along the 0th axis).
+            index (int): The storage index of the first record. Must be the index following the last insert.
+        """
+        num_records = len(next(iter(flat_records.values())))
+        if self.buffer_count == 0:
+            self.buffer_start = index
+        inserted = 0
+        while inserted < num_records:
+            num_items = min(num_records - inserted, self.write_buffer_size - self.buffer_count)
+            for key, values in flat_records.items():
+                self.write_buffer[key][self.buffer_count:self.buffer_count + num_items] = \
+                    values[inserted:inserted + num_items]
+            self.buffer_count += num_items
+            inserted += num_items
+            if self.buffer_count == self.write_buffer_size:
+                self.flush()
+                self.buffer_start = (index + inserted) % self.capacity
+
+    def flush(self):
+        """
+        Writes all buffered records to disk.
+        """
+        if self.buffer_count == 0:
+            return
+        end = self.buffer_start + self.buffer_count
+        for key, column in self.columns.items():
+            # Contiguous block, possibly wrapping around the end of the file.
+            num_before_wrap = min(end, self.capacity) - self.buffer_start
+            column[self.buffer_start:self.buffer_start + num_before_wrap] = self.write_buffer[key][:num_before_wrap]
+            if num_before_wrap < self.buffer_count:
+                column[:self.buffer_count - num_before_wrap] = \
+                    self.write_buffer[key][num_before_wrap:self.buffer_count]
+        self.buffer_count = 0
+
+    def write(self, indices, flat_records):
+        """
+        Writes records directly to disk at arbitrary storage indices (e.g. when restoring a snapshot).
+
+        Args:
+            indices (np.ndarray): The storage indices to write.
+            flat_records (dict): Dict mapping flat record keys to arrays of the records to write.
+        """
+        self.flush()
+        for key, column in self.columns.items():
+            column[indices] = flat_records[key]
+
+    def read(self, indices):
+        """
+        Reads the records at the given storage indices.
+
+        Args:
+            indices (np.ndarray): The storage indices to read (in any order, duplicates allowed).
+
+        Returns:
+            dict: Dict mapping flat record keys to arrays of the read records (in the order of `indices`).
+        """
+        indices = np.asarray(indices, dtype=np.int64)
+        # Read on-disk values in ascending file order, then restore the requested order.
+        sort_order = np.argsort(indices)
+        sorted_indices = indices[sort_order]
+        # Records still in the write buffer overwrite their (stale) on-disk values.
+        buffer_offsets = (indices - self.buffer_start) % self.capacity
+        in_buffer = buffer_offsets < self.buffer_count
+
+        records = dict()
+        for key, column in self.columns.items():
+            values = np.empty(shape=(len(indices),) + column.shape[1:], dtype=column.dtype)
+            values[sort_order] = column[sorted_indices]
+            values[in_buffer] = self.write_buffer[key][buffer_offsets[in_buffer]]
+            records[key] = values
+        return records
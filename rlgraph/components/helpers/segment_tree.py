@@ -41,6 +41,10 @@ class SegmentTree(object):
         """
         self.values = storage_variable
         self.capacity = capacity
+        # Number of levels below the root (capacity must be a power of 2).
+        self.depth = 0
+        while (1 << self.depth) < self.capacity:
+            self.depth += 1
 
     def insert(self, index, element, insert_op=None):
         """
@@ -117,64 +121,80 @@ class SegmentTree(object):
         with tf.control_dependencies(control_inputs=[assignment]):
             return tf.no_op()
 
+    def insert_batch(self, indices, elements, insert_op=None):
+        """
+        Inserts a batch of elements into the segment tree. Instead of walking up the tree once per element,
+        all leaves are written at once and then each level (bottom-up) is recomputed with one gather of the
+        children and one scatter-update of the parents.
+
+        Args:
+            indices (tf.Tensor): Insertion indices (1D int tensor). For duplicate indices, it is undefined which
+                element is written.
+            elements (tf.Tensor): Elements to insert (1D float tensor, one per index).
+            insert_op (Union(tf.add, tf.minimum, tf, maximum)): Insert operation on the tree.
+
+        Returns:
+            tf.Operation: The op performing all updates.
+        """
+        insert_op = insert_op or tf.add
+
+        index = tf.cast(indices, dtype=tf.int32) + self.capacity
+        assignment = tf.scatter_update(ref=self.values, indices=index, updates=elements)
+
+        # Levels are static -> Unroll the bottom-up pass. Each level reads the values written by the level below.
+        for _ in range(self.depth):
+            with tf.control_dependencies(control_inputs=[assignment]):
+                index = tf.floordiv(x=index, y=2)
+                left = tf.gather(params=self.values, indices=2 * index)
+                right = tf.gather(params=self.values, indices=2 * index + 1)
+                # Duplicate parents receive identical values.
+                assignment = tf.scatter_update(ref=self.values, indices=index, updates=insert_op(x=left, y=right))
+
+        with tf.control_dependencies(control_inputs=[assignment]):
+            return tf.no_op()
+
     def get(self, index):
         """
         Reads an item from the segment tree.
 
         Args:
-            index (int):
+            index (Union[int,tf.Tensor]): Index or 1D tensor of indices.
 
-        Returns: The element.
+        Returns: The element(s).
 
         """
-        return self.values[self.capacity + index]
+        return tf.gather(params=self.values, indices=self.capacity + index)
 
     def index_of_prefixsum(self, prefix_sum):
         """
         Identifies the highest index which satisfies the condition that the sum
         over all elements from 0 till the index is <= prefix_sum.
+        All prefix sums descend the tree at once (one gather per level).
 
         Args:
-            prefix_sum .float): Upper bound on prefix we are allowed to select.
+            prefix_sum (tf.Tensor): Upper bound(s) on prefix we are allowed to select (scalar or 1D float tensor).
 
         Returns:
-            int: Index/indices satisfying prefix sum condition.
+            tf.Tensor: Index/indices satisfying prefix sum condition.
         """
         assert_ops = list()
         # 0 <= prefix_sum <= sum(priorities)
         priority_sum = tf.reduce_sum(input_tensor=self.values, axis=0)
-        # priority_sum_tensor = tf.fill(dims=tf.shape(prefix_sum), value=priority_sum)
         assert_ops.append(tf.Assert(
-            condition=tf.less_equal(x=prefix_sum, y=priority_sum),
+            condition=tf.reduce_all(input_tensor=tf.less_equal(x=prefix_sum, y=priority_sum)),
             data=[prefix_sum]
         ))
 
-        # Vectorized loop -> initialize all indices matching elements in prefix-sum,
-        index = 1
+        with tf.control_dependencies(control_inputs=assert_ops):
+            index = tf.ones_like(tensor=prefix_sum, dtype=tf.int32)
 
-        def search_body(index, prefix_sum):
+        for _ in range(self.depth):
             # Is the value at position 2 * index > prefix sum?
-            compare_value = self.values[2 * index]
-
-            def update_prefix_sum_fn(index, prefix_sum):
-                # 'Use up' values in this segment, then jump to next.
-                prefix_sum -= self.values[2 * index]
-                return 2 * index + 1, prefix_sum
-
-            index, prefix_sum = tf.cond(
-                pred=compare_value > prefix_sum,
-                # If over prefix sum, jump index.
-                true_fn=lambda: (2 * index, prefix_sum),
-                # Else adjust prefix sum until done.
-                false_fn=lambda: update_prefix_sum_fn(index, prefix_sum)
-            )
-            return index, prefix_sum
-
-        def cond(index, prefix_sum):
-            return index < self.capacity
-
-        with tf.control_dependencies(control_inputs=assert_ops):
-            index, _ = tf.while_loop(cond=cond, body=search_body, loop_vars=[index, prefix_sum])
+            compare_value = tf.gather(params=self.values, indices=2 * index)
+            go_left = tf.greater(x=compare_value, y=prefix_sum)
+            # If over prefix sum, jump to the left child. Else 'use up' values in this segment and jump right.
+            prefix_sum = tf.where(condition=go_left, x=prefix_sum, y=prefix_sum - compare_value)
+            index = tf.where(condition=go_left, x=2 * index, y=2 * index + 1)
 
         return index - self.capacity
 
@@ -30,6 +30,9 @@ elif get_backend() == "pytorch":
 class SequenceHelper(Component):
     """
     A helper Component that helps manipulate sequences with various utilities, e.g. for discounting.
+
+    All utilities process the sub-sequences of a batch at once (no element-wise loops): Sub-sequence boundaries are
+    turned into masks and segment ids, and discounted sums are computed by a segmented scan.
     """
 
     def __init__(self, scope="sequence-helper", **kwargs):
@@ -46,60 +49,13 @@ class SequenceHelper(Component):
             Sequence lengths.
         """
         if get_backend() == "tf":
-            # TensorArray:
-            elems = tf.shape(input=sequence_indices)[0]
-            sequence_lengths = tf.TensorArray(
-                dtype=tf.int32,
-                infer_shape=False,
-                size=1,
-                dynamic_size=True,
-                clear_after_read=False
-            )
-
-            def update(write_index, sequence_array, length):
-                # Write to index, increase
-                sequence_array = sequence_array.write(write_index, length)
-                return sequence_array, write_index + 1, 0
-
-            def insert_body(index, length, sequence_lengths, write_index):
-                length += 1
-
-                # Update tensor array, reset length to 0.
-                sequence_lengths, write_index, length = tf.cond(
-                    pred=tf.equal(sequence_indices[index], tf.ones_like(sequence_indices[index])),
-                    true_fn=lambda: update(write_index, sequence_lengths, length),
-                    false_fn=lambda: (sequence_lengths, write_index, length)
-                )
-                return index + 1, length, sequence_lengths, write_index
-
-            def cond(index, length, sequence_lengths, write_index):
-                return index < elems
-
-            _, final_length, sequence_lengths, write_index = tf.while_loop(
-                cond=cond,
-                body=insert_body,
-                loop_vars=[0, 0, sequence_lengths, 0],
-                back_prop=False
-            )
-            # If the final element was terminal -> already included.
-            sequence_lengths, _, _ = tf.cond(
-                pred=tf.greater(final_length, 0),
-                true_fn=lambda: update(write_index, sequence_lengths, final_length),
-                false_fn=lambda: (sequence_lengths, write_index, final_length)
-            )
-            return sequence_lengths.stack()
+            sequence_ends = self._get_sequence_ends(sequence_indices)
+            end_positions = tf.cast(tf.where(condition=sequence_ends)[:, 0], dtype=tf.int32)
+            return end_positions - tf.concat([[-1], end_positions[:-1]], axis=0)
         elif get_backend() == "pytorch":
-            sequence_lengths = []
-            length = 0
-            for index in sequence_indices:
-                length += 1
-                if index == 1:
-                    sequence_lengths.append(length)
-                    length = 0
-            # Append final sequence.
-            if length > 0:
-                sequence_lengths.append(length)
-            return torch.tensor(sequence_lengths, dtype=torch.int32)
+            sequence_ends = self._get_sequence_ends(sequence_indices)
+            end_positions = torch.nonzero(sequence_ends)[:, 0].int()
+            return end_positions - torch.cat([torch.tensor([-1], dtype=torch.int32), end_positions[:-1]], 0)
 
     @rlgraph_api(returns=2, must_be_complete=False)
     def _graph_fn_calc_sequence_decays(self, sequence_indices, decay=0.9):
@@ -123,87 +79,38 @@ class SequenceHelper(Component):
                 - Decays.
         """
         if get_backend() == "tf":
-            elems = tf.shape(input=sequence_indices)[0]
-            sequence_indices = tf.cast(sequence_indices, dtype=tf.int32)
-
-            # TensorArray:
-            sequence_lengths = tf.TensorArray(
-                dtype=tf.int32,
-                infer_shape=False,
-                size=1,
-                dynamic_size=True,
-                clear_after_read=False
-            )
-            decays = tf.TensorArray(
-                dtype=tf.float32,
-                infer_shape=False,
-                size=1,
-                dynamic_size=True,
-                clear_after_read=False
-            )
-
-            def update(write_index, sequence_array, length):
-                # Write to index, increase
-                sequence_array = sequence_array.write(write_index, length)
-                return sequence_array, write_index + 1, 0
-
-            def insert_body(index, length, sequence_lengths, write_index, decays):
-                # Decay is based on length, so val = decay^length
-                decay_val = tf.pow(x=decay, y=tf.cast(length, dtype=tf.float32))
-
-                # Write decay val into array.
-                decays = decays.write(index, decay_val)
-                length += 1
-
-                # Update tensor array, reset length to 0.
-                sequence_lengths, write_index, length = tf.cond(
-                    pred=tf.equal(sequence_indices[index], 1),
-                    true_fn=lambda: update(write_index, sequence_lengths, length),
-                    false_fn=lambda: (sequence_lengths, write_index, length)
-                )
-                return index + 1, length, sequence_lengths, write_index, decays
-
-            def cond(index, length, sequence_lengths, write_index, decays):
-                return index < elems
-
-            index, final_length, sequence_lengths, write_index, decays = tf.while_loop(
-                cond=cond,
-                body=insert_body,
-                loop_vars=[0, 0, sequence_lengths, 0, decays],
-                back_prop=False
-            )
-
-            # If the final element was terminal -> already included.
-            # Decays need no updating because we just wrote them always.
-            sequence_lengths, _, _ = tf.cond(
-                pred=tf.greater(final_length, 0),
-                true_fn=lambda: update(write_index, sequence_lengths, final_length),
-                false_fn=lambda: (sequence_lengths, write_index, final_length)
-            )
-            return tf.stop_gradient(sequence_lengths.stack()), tf.stop_gradient(decays.stack())
+            sequence_ends = self._get_sequence_ends(sequence_indices)
+            positions = tf.range(tf.shape(input=sequence_ends)[0])
+            # A sub-sequence starts at 0 and after each sequence end.
+            sequence_starts = tf.concat([[True], sequence_ends[:-1]], axis=0)[:tf.shape(input=sequence_ends)[0]]
+            start_positions = tf.boolean_mask(tensor=positions, mask=sequence_starts)
+            segment_ids = tf.cumsum(tf.cast(sequence_starts, dtype=tf.int32)) - 1
+
+            offsets = positions - tf.gather(params=start_positions, indices=segment_ids)
+            decays = tf.pow(x=tf.cast(decay, dtype=tf.float32), y=tf.cast(offsets, dtype=tf.float32))
+            end_positions = tf.boolean_mask(tensor=positions, mask=sequence_ends)
+            sequence_lengths = end_positions - tf.concat([[-1], end_positions[:-1]], axis=0)
+            return tf.stop_gradient(sequence_lengths), tf.stop_gradient(decays)
         elif get_backend() == "pytorch":
-            sequence_lengths = []
-            decays = []
-
-            length = 0
-            for index in sequence_indices:
-                # Compute decay based on sequence length.
-                decays.append(pow(decay, length))
-                length += 1
-                if index == 1:
-                    sequence_lengths.append(length)
-                    length = 0
-
-            # Append final sequence.
-            if length > 0:
-                sequence_lengths.append(length)
-            return torch.tensor(sequence_lengths, dtype=torch.int32), torch.tensor(decays, dtype=torch.int32)
+            sequence_ends = self._get_sequence_ends(sequence_indices)
+            positions = torch.arange(len(sequence_ends))
+            sequence_starts = torch.cat([torch.ones(1, dtype=torch.bool), sequence_ends[:-1]], 0)[:len(positions)]
+            start_positions = positions[sequence_starts]
+            segment_ids = torch.cumsum(sequence_starts.long(), 0) - 1
+
+            offsets = positions - start_positions[segment_ids]
+            decays = torch.pow(torch.as_tensor(decay, dtype=torch.float32), offsets.float())
+            end_positions = positions[sequence_ends]
+            sequence_lengths = end_positions - torch.cat([torch.tensor([-1]), end_positions[:-1]], 0)
+            return sequence_lengths.int(), decays
 
     @rlgraph_api
     def _graph_fn_reverse_apply_decays_to_sequence(self, values, sequence_indices, decay=0.9):
         """
         Computes decays for sequence indices and applies them (in reverse manner to a sequence of values).
         Useful to compute discounted reward estimates across a sequence of estimates.
+        That is, for each sub-sequence: out[t] = values[t] + decay * out[t + 1] (out[t] = values[t] at the end of
+        each sub-sequence).
 
         Args:
             values (DataOp): Values to apply decays to.
@@ -214,75 +121,13 @@ class SequenceHelper(Component):
             Decayed sequence values.
         """
         if get_backend() == "tf":
-            elems = tf.shape(input=sequence_indices)[0]
-            decayed_values = tf.TensorArray(
-                dtype=tf.float32,
-                infer_shape=False,
-                size=1,
-                dynamic_size=True,
-                clear_after_read=False
-            )
-            sequence_indices = tf.cast(sequence_indices, dtype=tf.int32)
-
-            def insert_body(index, forward_index, write_index, length, prev_v, decayed_values):
-                # Decay is based on length, so val = decay^length
-                decay_val = tf.pow(x=decay, y=tf.cast(length, dtype=tf.float32))
-                accum_v = prev_v + values[index] * decay_val
-
-                # Write decayed val into array.
-                decayed_values = decayed_values.write(write_index, accum_v)
-                prev_v = accum_v
-
-                # Reset length to 0 if terminal encountered.
-                # NOTE: We cannot prev_v to 0.0 because values[index] might have a more complex shape,
-                # so this violates shape checks.
-                length, prev_v = tf.cond(
-                    pred=tf.equal(sequence_indices[forward_index], tf.ones_like(sequence_indices[forward_index])),
-                    true_fn=lambda: (0, tf.zeros_like(prev_v)),
-                    false_fn=lambda: (length, prev_v)
-                )
-                # index = tf.Print(index, [index, prev_v], summarize=100, message="index, prev = ")
-
-                # Increase write-index and length of sub-sequence, decrease loop index in reverse iteration.
-                return index - 1, forward_index + 1, write_index + 1, length + 1, prev_v, decayed_values
-
-            def cond(index, forward_index, write_index, length, prev_v, decayed_values):
-                # Scan in reverse.
-                return index >= 0
-
-            _, _, _, _, _, decayed_values = tf.while_loop(
-                cond=cond,
-                body=insert_body,
-                # loop index, index writing to tensor array, current length of sub-sequence, previous val (float)
-                loop_vars=[elems - 1, 0, 0, 0, tf.zeros_like(values[-1]), decayed_values],
-                back_prop=False
-            )
-
-            decayed_values = decayed_values.stack()
-            return tf.stop_gradient(tf.reverse(tensor=decayed_values, axis=[0]))
+            sequence_ends = tf.cast(sequence_indices, dtype=tf.bool)
+            decayed_values = self._segmented_reverse_discounted_cumsum(values, sequence_ends, decay)
+            return tf.stop_gradient(decayed_values)
         elif get_backend() == "pytorch":
-            # Scan all sequences in reverse:
-            discounted = []
-            i = 0
-            length = 0
-            prev_v = 0
-            for v in reversed(values.data):
-                # Accumulate prior value.
-                accum_v = prev_v + v * pow(decay, length)
-                discounted.append(accum_v)
-                prev_v = accum_v
-
-                # Arrived at new sequence, start over.
-                if sequence_indices[i] == 1:
-                    length = 0
-                    prev_v = 0
-
-                # Increase length of current sub-sequence.
-                length += 1
-                i += 1
-
-            # Reverse, convert, and return final.
-            return torch.tensor(list(reversed(discounted)), dtype=torch.float32)
+            sequence_ends = torch.as_tensor(sequence_indices).bool()
+            values = torch.as_tensor(values, dtype=torch.float32)
+            return self._segmented_reverse_discounted_cumsum(values, sequence_ends, decay).detach()
 
     @rlgraph_api
     def _graph_fn_bootstrap_values(self, rewards, values, terminals, sequence_indices, discount=0.99):
@@ -306,98 +151,89 @@ class SequenceHelper(Component):
             Sequence of deltas.
         """
         if get_backend() == "tf":
-            values = tf.squeeze(input=values)
-            num_values = tf.shape(input=values)[0]
-
+            values = tf.reshape(tensor=values, shape=[-1])
+            rewards = tf.cast(rewards, dtype=tf.float32)
             # Again ensure last index is 1 for any sub-sample arriving here.
-            last_sequence = tf.expand_dims(sequence_indices[-1], -1)
-            sequence_indices = tf.concat([sequence_indices[:-1], tf.ones_like(last_sequence, dtype=tf.bool)], axis=0)
+            sequence_ends = self._get_sequence_ends(sequence_indices)
 
-            # Cannot use 0.0 because unknown shape.
-            deltas = tf.TensorArray(dtype=tf.float32, infer_shape=False, size=num_values,
-                                    dynamic_size=False, clear_after_read=False, name="bootstrap-deltas")
-
-            # Boot-strap with 0 only if terminals[i] and sequence_indices[i] are both true.
-            boot_strap_zeros = tf.where(
-                condition=tf.logical_and(sequence_indices, terminals),
-                x=tf.ones_like(sequence_indices),
-                y=tf.zeros_like(sequence_indices),
+            # Boot-strap with 0 if terminals[i] and sequence_indices[i] are both true, with the last value of
+            # the sub-sequence if only sequence_indices[i] is true, else with the next value.
+            bootstrap_values = tf.where(
+                condition=tf.cast(terminals, dtype=tf.bool), x=tf.zeros_like(values), y=values
             )
+            next_values = tf.concat([values[1:], values[-1:]], axis=0)
+            next_values = tf.where(condition=sequence_ends, x=bootstrap_values, y=next_values)
+            return rewards + discount * next_values - values
+        elif get_backend() == "pytorch":
+            values = torch.as_tensor(values, dtype=torch.float32).reshape(-1)
+            rewards = torch.as_tensor(rewards, dtype=torch.float32)
+            sequence_ends = self._get_sequence_ends(sequence_indices)
 
-            def write(index, deltas, start_index):
-                # First: Concat the slice of values representing the current sequence with bootstrap value.
-                baseline_slice = values[start_index:index + 1]
-                # Expand so value has a batch dim when we concat.
-
-                # If true terminal, append 0. Otherwise, append boot-strap val -> last observed val.
-                bootstrap_value = tf.cond(
-                    pred=tf.equal(boot_strap_zeros[index], tf.ones_like(sequence_indices[index])),
-                    true_fn=lambda: tf.zeros_like(tensor=values[index], dtype=tf.float32),
-                    false_fn=lambda: values[index],
-                )
+            bootstrap_values = torch.where(torch.as_tensor(terminals).bool(), torch.zeros_like(values), values)
+            next_values = torch.cat([values[1:], values[-1:]], 0)
+            next_values = torch.where(sequence_ends, bootstrap_values, next_values)
+            return rewards + torch.as_tensor(discount, dtype=torch.float32) * next_values - values
 
-                value = tf.expand_dims(bootstrap_value, 0)
-                adjusted_v = tf.concat([baseline_slice, value], axis=0)
+    @staticmethod
+    def _get_sequence_ends(sequence_indices):
+        """
+        Returns:
+            DataOp: Bool mask of sub-sequence ends (the given sequence indices with the last element always set).
+        """
+        if get_backend() == "tf":
+            sequence_ends = tf.cast(sequence_indices, dtype=tf.bool)
+            return tf.concat([sequence_ends[:-1], tf.ones_like(sequence_ends[-1:])], axis=0)
+        elif get_backend() == "pytorch":
+            sequence_ends = torch.as_tensor(sequence_indices).bool()
+            return torch.cat([sequence_ends[:-1], torch.ones_like(sequence_ends[-1:])], 0)
 
-                # Compute deltas for this sequence.
-                sequence_deltas = rewards[start_index:index + 1] + discount * adjusted_v[1:] - adjusted_v[:-1]
+    @staticmethod
+    def _segmented_reverse_discounted_cumsum(values, sequence_ends, decay):
+        """
+        Computes out[t] = values[t] + decay * out[t + 1] within each sub-sequence (resetting after each sequence end)
+        for all sub-sequences at once.
 
-                # Write delta to tensor-array.
-                write_indices = tf.range(start=start_index, limit=index + 1)
-                deltas = deltas.scatter(write_indices, sequence_deltas)
+        The recurrence is an affine map per element (factor: decay, or 0 at a sequence end), so it can be solved
+        with a log-depth scan: In step k, each element absorbs the partial sum of the element 2^k positions ahead and
+        the product of their factors. This takes log2(n) fully vectorized steps (instead of n sequential ones) and
+        stays numerically stable as all factors are <= 1.
 
-                start_index = index + 1
-                # Set start-index for the next sub-sequence to index + 1
-                return deltas, start_index
+        Args:
+            values (DataOp): The values of shape [n] + any.
+            sequence_ends (DataOp): Bool mask of shape [n]; True where a sub-sequence ends.
+            decay (float): The discount factor.
 
-            def body(index, start_index, deltas):
-                # Whenever we encounter a sequence end, we compute deltas for that sequence.
-                deltas, start_index = tf.cond(
-                    pred=tf.equal(sequence_indices[index], tf.ones_like(sequence_indices[index])),
-                    true_fn=lambda: write(index, deltas, start_index),
-                    false_fn=lambda: (deltas, start_index)
-                )
-                return index + 1, start_index, deltas
+        Returns:
+            DataOp: The discounted sums (same shape as `values`).
+        """
+        if get_backend() == "tf":
+            values = tf.cast(values, dtype=tf.float32)
+            factors = tf.cast(decay, dtype=tf.float32) * (1.0 - tf.cast(sequence_ends, dtype=tf.float32))
+            # Broadcast factors over possible value dims.
+            factors = tf.reshape(
+                tensor=factors, shape=tf.concat([tf.shape(input=factors), tf.ones_like(tf.shape(input=values)[1:])], 0)
+            )
+            num_values = tf.shape(input=values)[0]
 
-            def cond(index, start_index, deltas):
-                return index < num_values
+            def body(shift, factors, sums):
+                sums = sums + factors * tf.concat([sums[shift:], tf.zeros_like(sums[:shift])], axis=0)
+                factors = factors * tf.concat([factors[shift:], tf.zeros_like(factors[:shift])], axis=0)
+                return shift * 2, factors, sums
 
-            index, start_index, deltas = tf.while_loop(
-                cond=cond,
+            _, _, sums = tf.while_loop(
+                cond=lambda shift, factors, sums: shift < num_values,
                 body=body,
-                loop_vars=[0, 0, deltas],
-                parallel_iterations=1,
+                loop_vars=[1, factors, values],
                 back_prop=False
             )
-
-            deltas = deltas.stack()
-            # Squeeze because we inserted
-            return tf.squeeze(deltas)
+            return sums
         elif get_backend() == "pytorch":
-            deltas = []
-            discount_tensor = torch.tensor(discount)
-            start_index = 0
-            i = 0
-            if len(values) > 1:
-                last_sequence = torch.unsqueeze(sequence_indices[-1], -1)
-                sequence_indices = torch.cat((sequence_indices[:-1], torch.ones_like(last_sequence)), 0)
-
-            for _ in range(len(values)):
-                if sequence_indices[i]:
-                    # Compute deltas for this sub-sequence.
-                    # Cannot do this all at once because we would need the correct offsets for each sub-sequence.
-                    baseline_slice = list(values[start_index:i + 1])
-                    if terminals[i]:
-                        baseline_slice.append(0)
-                    else:
-                        baseline_slice.append(values[-1])
-                    adjusted_v = torch.tensor(baseline_slice)
-
-                    # +1 because we want to include i-th value.
-                    delta = rewards[start_index:i + 1] + discount_tensor * adjusted_v[1:] - adjusted_v[:-1]
-                    deltas.extend(delta)
-                    start_index = i + 1
-                i += 1
-
-            return torch.tensor(deltas)
-
+            factors = torch.as_tensor(decay, dtype=torch.float32) * (1.0 - sequence_ends.float())
+            factors = factors.reshape(factors.shape + (1,) * (values.dim() - 1))
+            sums = values
+            shift = 1
+            while shift < len(values):
+                sums = sums + factors * torch.cat([sums[shift:], torch.zeros_like(sums[:shift])], 0)
+                factors = factors * torch.cat([factors[shift:], torch.zeros_like(factors[:shift])], 0)
+                shift *= 2
+            return sums
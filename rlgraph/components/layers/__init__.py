@@ -13,6 +13,7 @@
 # limitations under the License.
 # ==============================================================================
 
+
 from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
@@ -20,23 +21,28 @@ from __future__ import print_function
 # Basics.
 from rlgraph.components.layers.layer import Layer
 # NN-Layers.
-from rlgraph.components.layers.nn import *
+from rlgraph.components.layers import nn
 # Preprocessing Layers.
-from rlgraph.components.layers.preprocessing import *
+from rlgraph.components.layers import preprocessing
 # String Layers.
-from rlgraph.components.layers.strings import *
+from rlgraph.components.layers import strings
+from rlgraph.utils.lazy_import import lazy_module_attributes
 from rlgraph.utils.util import default_dict
 
 # The Layers.
 Layer.__lookup_classes__ = dict(
-    nnlayer=NNLayer,
-    preprocesslayer=PreprocessLayer
+    nnlayer=nn.NNLayer,
+    preprocesslayer=preprocessing.PreprocessLayer
 )
 # Add all specific Layer sub-classes to this one.
-default_dict(Layer.__lookup_classes__, NNLayer.__lookup_classes__)
-default_dict(Layer.__lookup_classes__, PreprocessLayer.__lookup_classes__)
-default_dict(Layer.__lookup_classes__, StringLayer.__lookup_classes__)
+default_dict(Layer.__lookup_classes__, nn.NNLayer.__lookup_classes__)
+default_dict(Layer.__lookup_classes__, preprocessing.PreprocessLayer.__lookup_classes__)
+default_dict(Layer.__lookup_classes__, strings.StringLayer.__lookup_classes__)
+
+_attribute_modules = dict()
+for _sub_package in [nn, preprocessing, strings]:
+    _attribute_modules.update({name: _sub_package.__name__ for name in _sub_package.__all__})
+__getattr__, __dir__ = lazy_module_attributes(__name__, _attribute_modules)
 
 
-__all__ = ["Layer"] + \
-          list(set(map(lambda x: x.__name__, Layer.__lookup_classes__.values())))
+__all__ = ["Layer"] + list(_attribute_modules.keys())
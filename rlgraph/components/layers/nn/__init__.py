@@ -13,37 +13,36 @@
 # limitations under the License.
 # ==============================================================================
 
+
 from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
 from rlgraph.components.layers.nn.nn_layer import NNLayer
-from rlgraph.components.layers.nn.concat_layer import ConcatLayer
-from rlgraph.components.layers.nn.conv2d_layer import Conv2DLayer
-from rlgraph.components.layers.nn.dense_layer import DenseLayer
-#from rlgraph.components.layers.nn.dueling_layer import DuelingLayer
-from rlgraph.components.layers.nn.lstm_layer import LSTMLayer
-from rlgraph.components.layers.nn.maxpool2d_layer import MaxPool2DLayer
-from rlgraph.components.layers.nn.residual_layer import ResidualLayer
-from rlgraph.components.layers.nn.local_response_normalization_layer import LocalResponseNormalizationLayer
+from rlgraph.utils.lazy_import import get_attribute_modules, lazy_module_attributes
 
 NNLayer.__lookup_classes__ = dict(
-    concat=ConcatLayer,
-    concatlayer=ConcatLayer,
-    conv2d=Conv2DLayer,
-    conv2dlayer=Conv2DLayer,
-    dense=DenseLayer,
-    denselayer=DenseLayer,
-    fc=DenseLayer,
-    fclayer=DenseLayer,
-    lstm=LSTMLayer,
-    lstmlayer=LSTMLayer,
-    maxpool2d=MaxPool2DLayer,
-    maxpool2dlayer=MaxPool2DLayer,
-    residual=ResidualLayer,
-    residuallayer=ResidualLayer,
-    localresponsenormalization=LocalResponseNormalizationLayer,
-    localresponsenormalizationlayer=LocalResponseNormalizationLayer
+    concat="rlgraph.components.layers.nn.concat_layer.ConcatLayer",
+    concatlayer="rlgraph.components.layers.nn.concat_layer.ConcatLayer",
+    conv2d="rlgraph.components.layers.nn.conv2d_layer.Conv2DLayer",
+    conv2dlayer="rlgraph.components.layers.nn.conv2d_layer.Conv2DLayer",
+    dense="rlgraph.components.layers.nn.dense_layer.DenseLayer",
+    denselayer="rlgraph.components.layers.nn.dense_layer.DenseLayer",
+    fc="rlgraph.components.layers.nn.dense_layer.DenseLayer",
+    fclayer="rlgraph.components.layers.nn.dense_layer.DenseLayer",
+    lstm="rlgraph.components.layers.nn.lstm_layer.LSTMLayer",
+    lstmlayer="rlgraph.components.layers.nn.lstm_layer.LSTMLayer",
+    maxpool2d="rlgraph.components.layers.nn.maxpool2d_layer.MaxPool2DLayer",
+    maxpool2dlayer="rlgraph.components.layers.nn.maxpool2d_layer.MaxPool2DLayer",
+    residual="rlgraph.components.layers.nn.residual_layer.ResidualLayer",
+    residuallayer="rlgraph.components.layers.nn.residual_layer.ResidualLayer",
+    localresponsenormalization=
+    "rlgraph.components.layers.nn.local_response_normalization_layer.LocalResponseNormalizationLayer",
+    localresponsenormalizationlayer=
+    "rlgraph.components.layers.nn.local_response_normalization_layer.LocalResponseNormalizationLayer"
 )
 
-__all__ = ["NNLayer"] + list(set(map(lambda x: x.__name__, NNLayer.__lookup_classes__.values())))
+_attribute_modules = get_attribute_modules(NNLayer.__lookup_classes__.values())
+__getattr__, __dir__ = lazy_module_attributes(__name__, _attribute_modules)
+
+__all__ = ["NNLayer"] + list(_attribute_modules.keys())
@@ -13,45 +13,35 @@
 # limitations under the License.
 # ==============================================================================
 
+
 from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
 from rlgraph.components.layers.preprocessing.preprocess_layer import PreprocessLayer
+from rlgraph.utils.lazy_import import get_attribute_modules, lazy_module_attributes
 
-from rlgraph.components.layers.preprocessing.clip import Clip
-from rlgraph.components.layers.preprocessing.concat import Concat
-from rlgraph.components.layers.preprocessing.grayscale import GrayScale
-from rlgraph.components.layers.preprocessing.image_binary import ImageBinary
-from rlgraph.components.layers.preprocessing.convert_type import ConvertType
-from rlgraph.components.layers.preprocessing.image_crop import ImageCrop
-from rlgraph.components.layers.preprocessing.image_resize import ImageResize
-from rlgraph.components.layers.preprocessing.moving_standardize import MovingStandardize
-from rlgraph.components.layers.preprocessing.normalize import Normalize
-from rlgraph.components.layers.preprocessing.multiply_divide import Multiply, Divide
-from rlgraph.components.layers.preprocessing.rank_reinterpreter import RankReinterpreter
-from rlgraph.components.layers.preprocessing.reshape import ReShape
-from rlgraph.components.layers.preprocessing.sequence import Sequence
-from rlgraph.components.layers.preprocessing.transpose import Transpose
-
+# Registered by python path, so that e.g. opencv is only imported if an image preprocessor is actually used.
 PreprocessLayer.__lookup_classes__ = dict(
-    clip=Clip,
-    concat=Concat,
-    divide=Divide,
-    grayscale=GrayScale,
-    imagebinary=ImageBinary,
-    converttype=ConvertType,
-    imagecrop=ImageCrop,
-    imageresize=ImageResize,
-    multiply=Multiply,
-    normalize=Normalize,
-    rankreinterpreter=RankReinterpreter,
-    movingstandardize=MovingStandardize,
-    reshape=ReShape,
-    sequence=Sequence,
-    transpose=Transpose,
+    clip="rlgraph.components.layers.preprocessing.clip.Clip",
+    concat="rlgraph.components.layers.preprocessing.concat.Concat",
+    divide="rlgraph.components.layers.preprocessing.multiply_divide.Divide",
+    grayscale="rlgraph.components.layers.preprocessing.grayscale.GrayScale",
+    imagebinary="rlgraph.components.layers.preprocessing.image_binary.ImageBinary",
+    converttype="rlgraph.components.layers.preprocessing.convert_type.ConvertType",
+    imagecrop="rlgraph.components.layers.preprocessing.image_crop.ImageCrop",
+    imageresize="rlgraph.components.layers.preprocessing.image_resize.ImageResize",
+    multiply="rlgraph.components.layers.preprocessing.multiply_divide.Multiply",
+    normalize="rlgraph.components.layers.preprocessing.normalize.Normalize",
+    rankreinterpreter="rlgraph.components.layers.preprocessing.rank_reinterpreter.RankReinterpreter",
+    movingstandardize="rlgraph.components.layers.preprocessing.moving_standardize.MovingStandardize",
+    reshape="rlgraph.components.layers.preprocessing.reshape.ReShape",
+    sequence="rlgraph.components.layers.preprocessing.sequence.Sequence",
+    transpose="rlgraph.components.layers.preprocessing.transpose.Transpose",
 )
 
+_attribute_modules = get_attribute_modules(PreprocessLayer.__lookup_classes__.values())
+__getattr__, __dir__ = lazy_module_attributes(__name__, _attribute_modules)
+
 
-__all__ = ["PreprocessLayer"] + \
-          list(set(map(lambda x: x.__name__, PreprocessLayer.__lookup_classes__.values())))
+__all__ = ["PreprocessLayer"] + list(_attribute_modules.keys())
@@ -13,18 +13,21 @@
 # limitations under the License.
 # ==============================================================================
 
+
 from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
 from rlgraph.components.layers.strings.string_layer import StringLayer
-from rlgraph.components.layers.strings.embedding_lookup import EmbeddingLookup
-from rlgraph.components.layers.strings.string_to_hash_bucket import StringToHashBucket
+from rlgraph.utils.lazy_import import get_attribute_modules, lazy_module_attributes
 
 StringLayer.__lookup_classes__ = dict(
-    embedding=EmbeddingLookup,
-    embeddinglookup=EmbeddingLookup,
-    stringtohashbucket=StringToHashBucket
+    embedding="rlgraph.components.layers.strings.embedding_lookup.EmbeddingLookup",
+    embeddinglookup="rlgraph.components.layers.strings.embedding_lookup.EmbeddingLookup",
+    stringtohashbucket="rlgraph.components.layers.strings.string_to_hash_bucket.StringToHashBucket"
 )
 
-__all__ = ["StringLayer", "EmbeddingLookup", "StringToHashBucket"]
+_attribute_modules = get_attribute_modules(StringLayer.__lookup_classes__.values())
+__getattr__, __dir__ = lazy_module_attributes(__name__, _attribute_modules)
+
+__all__ = ["StringLayer"] + list(_attribute_modules.keys())
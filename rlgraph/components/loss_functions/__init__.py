@@ -13,27 +13,24 @@
 # limitations under the License.
 # ==============================================================================
 
+
 from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
 from rlgraph.components.loss_functions.loss_function import LossFunction
-from rlgraph.components.loss_functions.actor_critic_loss_function import ActorCriticLossFunction
-from rlgraph.components.loss_functions.dqn_loss_function import DQNLossFunction
-from rlgraph.components.loss_functions.dqfd_loss_function import DQFDLossFunction
-from rlgraph.components.loss_functions.impala_loss_function import IMPALALossFunction
-from rlgraph.components.loss_functions.ppo_loss_function import PPOLossFunction
-from rlgraph.components.loss_functions.sac_loss_function import SACLossFunction
+from rlgraph.utils.lazy_import import get_attribute_modules, lazy_module_attributes
 
 LossFunction.__lookup_classes__ = dict(
-    actorcriticlossfunction=ActorCriticLossFunction,
-    dqnlossfunction=DQNLossFunction,
-    dqfdlossfunction=DQFDLossFunction,
-    impalalossfunction=IMPALALossFunction,
-    ppolossfunction=PPOLossFunction,
-    saclossfunction=SACLossFunction,
+    actorcriticlossfunction="rlgraph.components.loss_functions.actor_critic_loss_function.ActorCriticLossFunction",
+    dqnlossfunction="rlgraph.components.loss_functions.dqn_loss_function.DQNLossFunction",
+    dqfdlossfunction="rlgraph.components.loss_functions.dqfd_loss_function.DQFDLossFunction",
+    impalalossfunction="rlgraph.components.loss_functions.impala_loss_function.IMPALALossFunction",
+    ppolossfunction="rlgraph.components.loss_functions.ppo_loss_function.PPOLossFunction",
+    saclossfunction="rlgraph.components.loss_functions.sac_loss_function.SACLossFunction",
 )
 
-__all__ = ["LossFunction"] + \
-          list(set(map(lambda x: x.__name__, LossFunction.__lookup_classes__.values())))
+_attribute_modules = get_attribute_modules(LossFunction.__lookup_classes__.values())
+__getattr__, __dir__ = lazy_module_attributes(__name__, _attribute_modules)
 
+__all__ = ["LossFunction"] + list(_attribute_modules.keys())
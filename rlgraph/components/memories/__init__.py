@@ -13,45 +13,50 @@
 # limitations under the License.
 # ==============================================================================
 
+
 from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
 from rlgraph import get_backend
 from rlgraph.components.memories.memory import Memory
-from rlgraph.components.memories.fifo_queue import FIFOQueue
-from rlgraph.components.memories.prioritized_replay import PrioritizedReplay
 from rlgraph.components.memories.replay_memory import ReplayMemory
-from rlgraph.components.memories.ring_buffer import RingBuffer
-from rlgraph.components.memories.mem_prioritized_replay import MemPrioritizedReplay
+from rlgraph.utils.lazy_import import get_attribute_modules, lazy_module_attributes
 
+# All memories are registered under both backends (backend-restricted ones raise an RLGraphError when being built).
+Memory.__lookup_classes__ = dict(
+    fifo="rlgraph.components.memories.fifo_queue.FIFOQueue",
+    fifoqueue="rlgraph.components.memories.fifo_queue.FIFOQueue",
+    prioritized="rlgraph.components.memories.prioritized_replay.PrioritizedReplay",
+    prioritizedreplay="rlgraph.components.memories.prioritized_replay.PrioritizedReplay",
+    prioritizedreplaybuffer="rlgraph.components.memories.prioritized_replay.PrioritizedReplay",
+    mem_prioritized_replay="rlgraph.components.memories.mem_prioritized_replay.MemPrioritizedReplay",
+    concurrentprioritized="rlgraph.components.memories.concurrent_mem_prioritized_replay."
+                          "ConcurrentMemPrioritizedReplay",
+    concurrentmemprioritizedreplay="rlgraph.components.memories.concurrent_mem_prioritized_replay."
+                                   "ConcurrentMemPrioritizedReplay",
+    memmap="rlgraph.components.memories.memmap_replay_memory.MemmapReplayMemory",
+    memmapreplay="rlgraph.components.memories.memmap_replay_memory.MemmapReplayMemory",
+    memmapreplaymemory="rlgraph.components.memories.memmap_replay_memory.MemmapReplayMemory",
+    replay=ReplayMemory,
+    replaybuffer=ReplayMemory,
+    replaymemory=ReplayMemory,
+    ringbuffer="rlgraph.components.memories.ring_buffer.RingBuffer"
+)
 # TODO backend reorg.
-if get_backend() == "tf":
-    Memory.__lookup_classes__ = dict(
-        fifo=FIFOQueue,
-        fifoqueue=FIFOQueue,
-        prioritized=PrioritizedReplay,
-        prioritizedreplay=PrioritizedReplay,
-        prioritizedreplaybuffer=PrioritizedReplay,
-        mem_prioritized_replay=MemPrioritizedReplay,
-        replay=ReplayMemory,
-        replaybuffer=ReplayMemory,
-        replaymemory=ReplayMemory,
-        ringbuffer=RingBuffer
-    )
-elif get_backend() == "pytorch":
-    Memory.__lookup_classes__ = dict(
-        prioritized=MemPrioritizedReplay,
-        prioritizedreplay=MemPrioritizedReplay,
-        prioritizedreplaybuffer=MemPrioritizedReplay,
-        mem_prioritized_replay=MemPrioritizedReplay,
-        replay=ReplayMemory,
-        replaybuffer=ReplayMemory,
-        replaymemory=ReplayMemory,
-        ringbuffer=RingBuffer
-    )
+if get_backend() == "pytorch":
+    Memory.__lookup_classes__.update(dict(
+        prioritized="rlgraph.components.memories.mem_prioritized_replay.MemPrioritizedReplay",
+        prioritizedreplay="rlgraph.components.memories.mem_prioritized_replay.MemPrioritizedReplay",
+        prioritizedreplaybuffer="rlgraph.components.memories.mem_prioritized_replay.MemPrioritizedReplay"
+    ))
 Memory.__default_constructor__ = ReplayMemory
 
-__all__ = ["Memory", "PrioritizedReplay"] + \
-          list(set(map(lambda x: x.__name__, Memory.__lookup_classes__.values())))
+# All memories are public (w/o importing them here), incl. `PrioritizedReplay` (not registered under pytorch).
+_attribute_modules = get_attribute_modules(
+    [c for c in Memory.__lookup_classes__.values() if isinstance(c, str)] +
+    ["rlgraph.components.memories.prioritized_replay.PrioritizedReplay"]
+)
+__getattr__, __dir__ = lazy_module_attributes(__name__, _attribute_modules)
 
+__all__ = ["Memory", "ReplayMemory"] + list(_attribute_modules.keys())
@@ -0,0 +1,176 @@
+# Copyright 2018/2019 The RLgraph authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+from collections import deque
+import threading
+
+import numpy as np
+
+from rlgraph import get_backend
+from rlgraph.components.memories.mem_prioritized_replay import MemPrioritizedReplay
+from rlgraph.utils import DataOpDict
+from rlgraph.utils.decorators import rlgraph_api
+from rlgraph.utils.execution_util import define_by_run_unflatten
+from rlgraph.utils.ops import TraceContext
+from rlgraph.utils.rlgraph_errors import RLGraphError
+from rlgraph.utils.util import SMALL_NUMBER, convert_dtype, get_rank
+
+if get_backend() == "pytorch":
+    import torch
+
+
+class ConcurrentMemPrioritizedReplay(MemPrioritizedReplay):
+    """
+    An in-memory prioritized replay that can be shared between any number of inserting threads (e.g. actors) and
+    one sampling/updating thread (e.g. the learner).
+
+    Inserting threads reserve a contiguous range of slots (the only synchronized step is a counter increment),
+    write their records into the reserved slots and then publish the slots through a queue. Only the
+    sampling/updating thread touches the segment trees: Before each sample or priority update, it commits all
+    published slots with a single batched tree update. Records therefore become visible to sampling once their
+    priorities are committed. A slot that is being overwritten while it is sampled may be read with its previous
+    priority (just like a priority update for an overwritten slot applies to the new record).
+    Only available for define-by-run backends, as records are handled as numpy arrays outside of any graph.
+    """
+    def __init__(self, capacity=1000, next_states=True, alpha=1.0, beta=0.0, stratified_sampling=False,
+                 unique_indices=False):
+        super(ConcurrentMemPrioritizedReplay, self).__init__(
+            capacity=capacity, next_states=next_states, alpha=alpha, beta=beta,
+            stratified_sampling=stratified_sampling, unique_indices=unique_indices
+        )
+        # Guards the reservation counter only (records are written outside of any lock).
+        self.reservation_lock = threading.Lock()
+        self.num_reserved = 0
+        # Reserved and fully written slots, waiting to be committed to the segment trees.
+        self.pending_commits = deque()
+
+    def create_variables(self, input_spaces, action_space=None):
+        if get_backend() == "tf":
+            raise RLGraphError("ERROR: ConcurrentMemPrioritizedReplay is not supported by the tf backend!")
+        super(ConcurrentMemPrioritizedReplay, self).create_variables(input_spaces, action_space)
+        # Preallocate all columns (inserting threads must not race to create them).
+        self.columns = {
+            key: np.zeros(shape=(self.capacity,) + space.shape, dtype=convert_dtype(space.dtype, to="np"))
+            for key, space in self.flat_record_space.items()
+        }
+
+    @rlgraph_api(flatten_ops=True)
+    def _graph_fn_insert_records(self, records):
+        if records is None or get_rank(records[self.terminal_key]) == 0:
+            return
+        num_records = len(records[self.terminal_key])
+
+        # Reserve slots.
+        with self.reservation_lock:
+            start = self.num_reserved
+            self.num_reserved += num_records
+        insert_indices = np.arange(start=start, stop=start + num_records) % self.capacity
+
+        for key, values in records.items():
+            if get_backend() == "pytorch" and isinstance(values, torch.Tensor):
+                values = values.detach().cpu().numpy()
+            self.columns[key][insert_indices] = values
+
+        # Publish the written slots (deque appends are atomic).
+        self.pending_commits.append(insert_indices)
+
+    def commit_pending_records(self):
+        """
+        Inserts the default priorities of all published records into the segment trees using one batched update.
+        Must only be called by the sampling/updating thread.
+
+        Returns:
+            int: The number of committed records.
+        """
+        indices = []
+        while len(self.pending_commits) > 0:
+            indices.extend(self.pending_commits.popleft())
+        if len(indices) == 0:
+            return 0
+
+        self.merged_segment_tree.insert_batch(indices, [self.default_new_weight] * len(indices))
+        self.num_inserted += len(indices)
+        self.index = self.num_inserted % self.capacity
+        self.size = min(self.num_inserted, self.capacity)
+        return len(indices)
+
+    @rlgraph_api
+    def _graph_fn_get_records(self, num_records=1):
+        self.commit_pending_records()
+
+        # Nothing to sample from (e.g. during the build): Return a single zero record.
+        if self.size == 0 or TraceContext.DEFINE_BY_RUN_CONTEXT == "building":
+            indices = np.zeros(shape=(1,), dtype=np.int64)
+            weights = np.ones(shape=(1,), dtype=np.float32)
+            flat_records = {key: space.zeros(size=1) for key, space in self.flat_record_space.items()}
+        else:
+            sum_tree = self.merged_segment_tree.sum_segment_tree
+            # Committed slots need not be contiguous -> Sample over the whole tree.
+            prob_sum = sum_tree.get_sum()
+            indices = sum_tree.sample(int(num_records), prob_sum, stratified=self.stratified_sampling)
+            if self.unique_indices is True:
+                indices = np.unique(indices)
+
+            min_prob = self.merged_segment_tree.min_segment_tree.get_min_value() / (prob_sum + SMALL_NUMBER)
+            max_weight = (min_prob * self.size) ** (-self.beta)
+            sample_probs = sum_tree.get_leaves(indices) / (prob_sum + SMALL_NUMBER)
+            weights = ((sample_probs * self.size) ** (-self.beta) / max_weight).astype(np.float32)
+            flat_records = {key: column[indices] for key, column in self.columns.items()}
+
+        records = DataOpDict()
+        for key, value in flat_records.items():
+            records[key] = torch.from_numpy(np.asarray(value))
+        records = define_by_run_unflatten(records)
+        return records, torch.from_numpy(indices), torch.from_numpy(weights)
+
+    @rlgraph_api(must_be_complete=False)
+    def _graph_fn_update_records(self, indices, update):
+        if get_backend() == "pytorch":
+            if isinstance(indices, torch.Tensor):
+                indices = indices.detach().cpu().numpy()
+            if isinstance(update, torch.Tensor):
+                update = update.detach().cpu().numpy()
+        self.commit_pending_records()
+
+        priorities = np.power(np.asarray(update, dtype=np.float64), self.alpha)
+        self.merged_segment_tree.insert_batch(indices, priorities.tolist())
+        if len(priorities) > 0:
+            self.max_priority = max(self.max_priority, float(np.max(priorities)))
+
+    def post_define_by_run_build(self):
+        # Discard the records and priorities written by the build.
+        super(ConcurrentMemPrioritizedReplay, self).post_define_by_run_build()
+        for column in self.columns.values():
+            column.fill(0)
+        self.merged_segment_tree.sum_segment_tree.values.fill(0.0)
+        self.merged_segment_tree.min_segment_tree.values.fill(float("inf"))
+        self.num_reserved = 0
+        self.num_inserted = 0
+        self.pending_commits.clear()
+        self.max_priority = 1.0
+
+    def get_snapshot_state(self):
+        # Snapshots should be taken while no inserts are in flight.
+        self.commit_pending_records()
+        return super(ConcurrentMemPrioritizedReplay, self).get_snapshot_state()
+
+    def set_snapshot_state(self, state):
+        super(ConcurrentMemPrioritizedReplay, self).set_snapshot_state(state)
+        self.num_reserved = self.num_inserted
@@ -23,6 +23,7 @@ from rlgraph.spaces.space_utils import sanity_check_space
 from rlgraph.utils.ops import FlattenedDataOp, flatten_op
 from rlgraph.utils.util import convert_dtype as dtype_
 from rlgraph.utils.decorators import rlgraph_api
+from rlgraph.utils.rlgraph_errors import RLGraphError
 
 if get_backend() == "tf":
     import tensorflow as tf
@@ -64,6 +65,8 @@ class FIFOQueue(Memory):
                     return self.queue.enqueue_many(flattened_stopped_records)
 
     def create_variables(self, input_spaces, action_space=None):
+        if get_backend() != "tf":
+            raise RLGraphError("ERROR: FIFOQueue is only supported by the tf backend!")
         # Overwrite parent's method as we don't need a custom registry.
         if self.record_space is None:
             self.record_space = input_spaces["records"]
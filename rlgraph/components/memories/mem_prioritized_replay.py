@@ -19,14 +19,15 @@ from __future__ import print_function
 
 import numpy as np
 import operator
-from six.moves import xrange as range_
 
 from rlgraph import get_backend
 from rlgraph.utils import util, DataOpDict
 from rlgraph.utils.execution_util import define_by_run_unflatten
+from rlgraph.utils.ops import TraceContext
 from rlgraph.utils.util import SMALL_NUMBER, get_rank
 from rlgraph.components.memories.memory import Memory
 from rlgraph.components.helpers.mem_segment_tree import MemSegmentTree, MinSumSegmentTree
+from rlgraph.components.helpers.memmap_storage import MemmapStorage
 from rlgraph.utils.decorators import rlgraph_api
 
 if get_backend() == "pytorch":
@@ -40,10 +41,22 @@ class MemPrioritizedReplay(Memory):
     API:
         update_records(indices, update) -> Updates the given indices with the given priority scores.
     """
-    def __init__(self, capacity=1000, next_states=True, alpha=1.0, beta=0.0):
+    def __init__(self, capacity=1000, next_states=True, alpha=1.0, beta=0.0, memmap_spec=None,
+                 stratified_sampling=False, unique_indices=False):
+        """
+        Args:
+            memmap_spec (Optional[dict]): If given, records are stored on disk in a MemmapStorage (instead of in
+                RAM), created with this dict as kwargs (e.g. `directory`, `write_buffer_size`).
+            stratified_sampling (bool): Whether to draw one sample per segment of equal priority mass (instead of
+                independent samples), which reduces the variance of sampled batches.
+            unique_indices (bool): Whether to remove duplicate indices from sampled batches (which may then hold
+                fewer than the requested number of records).
+        """
         super(MemPrioritizedReplay, self).__init__()
 
-        self.memory_values = []
+        # One preallocated numpy array per flat record key (unless stored in a MemmapStorage). Created with the
+        # first written records (see `write_columns`).
+        self.columns = None
         self.index = 0
         self.capacity = capacity
 
@@ -55,16 +68,27 @@ class MemPrioritizedReplay(Memory):
 
         self.default_new_weight = np.power(self.max_priority, self.alpha)
 
+        self.memmap_spec = memmap_spec
+        self.storage = None
+
+        self.stratified_sampling = stratified_sampling
+        self.unique_indices = unique_indices
+
     def create_variables(self, input_spaces, action_space=None):
-        super(MemPrioritizedReplay, self).create_variables(input_spaces, action_space)
+        if self.memmap_spec is not None:
+            self.record_space = input_spaces["records"]
+            self.flat_record_space = self.record_space.flatten()
+            self.storage = MemmapStorage(self.flat_record_space, self.capacity, **self.memmap_spec)
+        else:
+            super(MemPrioritizedReplay, self).create_variables(input_spaces, action_space)
         self.priority_capacity = 1
         while self.priority_capacity < self.capacity:
             self.priority_capacity *= 2
 
         # Create segment trees, initialize with neutral elements.
-        sum_values = [0.0 for _ in range_(2 * self.priority_capacity)]
+        sum_values = np.zeros(shape=(2 * self.priority_capacity,))
         sum_segment_tree = MemSegmentTree(sum_values, self.priority_capacity, operator.add)
-        min_values = [float('inf') for _ in range_(2 * self.priority_capacity)]
+        min_values = np.full(shape=(2 * self.priority_capacity,), fill_value=float("inf"))
         min_segment_tree = MemSegmentTree(min_values, self.priority_capacity, min)
 
         self.merged_segment_tree = MinSumSegmentTree(
@@ -79,72 +103,134 @@ class MemPrioritizedReplay(Memory):
             return
         num_records = len(records[self.terminal_key])
 
+        flat_records = dict()
+        for name, record_values in records.items():
+            if get_backend() == "pytorch" and isinstance(record_values, torch.Tensor):
+                record_values = record_values.detach().cpu().numpy()
+            flat_records[name] = np.asarray(record_values)
+
+        insert_indices = np.arange(start=self.index, stop=self.index + num_records) % self.capacity
+        if self.storage is not None:
+            self.storage.insert(flat_records, self.index)
+        else:
+            self.write_columns(insert_indices, flat_records)
+
         if num_records == 1:
-            if self.index >= self.size:
-                self.memory_values.append(records)
-            else:
-                self.memory_values[self.index] = records
             self.merged_segment_tree.insert(self.index, self.default_new_weight)
         else:
-            insert_indices = np.arange(start=self.index, stop=self.index + num_records) % self.capacity
-            i = 0
-            for insert_index in insert_indices:
-                self.merged_segment_tree.insert(insert_index, self.default_new_weight)
-                record = {}
-                for name, record_values in records.items():
-                    record[name] = record_values[i]
-                if insert_index >= self.size:
-                    self.memory_values.append(record)
-                else:
-                    self.memory_values[insert_index] = record
-                i += 1
+            self.merged_segment_tree.insert_batch(
+                insert_indices, np.full(shape=(num_records,), fill_value=self.default_new_weight)
+            )
 
         # Update indices
         self.index = (self.index + num_records) % self.capacity
         self.size = min(self.size + num_records, self.capacity)
+        self.num_inserted += num_records
 
     @rlgraph_api
     def _graph_fn_get_records(self, num_records=1):
         available_records = min(num_records, self.size)
-        indices = []
-        prob_sum = self.merged_segment_tree.sum_segment_tree.get_sum(0, self.size - 1)
-        samples = np.random.random(size=(available_records,)) * prob_sum
-        for sample in samples:
-            indices.append(self.merged_segment_tree.sum_segment_tree.index_of_prefixsum(prefix_sum=sample))
+        sum_segment_tree = self.merged_segment_tree.sum_segment_tree
+        prob_sum = sum_segment_tree.get_sum(0, self.size - 1)
+        indices = sum_segment_tree.sample(available_records, prob_sum, stratified=self.stratified_sampling)
+        if self.unique_indices is True:
+            indices = np.unique(indices)
 
-        sum_prob = self.merged_segment_tree.sum_segment_tree.get_sum() + SMALL_NUMBER
+        sum_prob = sum_segment_tree.get_sum() + SMALL_NUMBER
         min_prob = self.merged_segment_tree.min_segment_tree.get_min_value() / sum_prob
         max_weight = (min_prob * self.size) ** (-self.beta)
-        weights = []
-        for index in indices:
-            sample_prob = self.merged_segment_tree.sum_segment_tree.get(index) / sum_prob
-            weight = (sample_prob * self.size) ** (-self.beta)
-            weights.append(weight / max_weight)
+        weights = (sum_segment_tree.get_leaves(indices) / sum_prob * self.size) ** (-self.beta) / max_weight
+
+        if self.storage is not None:
+            flat_records = self.storage.read(indices)
+        elif len(indices) == 0 and TraceContext.DEFINE_BY_RUN_CONTEXT == "building":
+            # Nothing inserted during the build: Return zeros of the record spaces' shapes (like `read_variable`).
+            flat_records = {name: np.zeros(shape=space.shape, dtype=util.convert_dtype(space.dtype, to="np"))
+                            for name, space in self.flat_record_space.items()}
+        else:
+            flat_records = self.read_columns(indices)
 
         if get_backend() == "pytorch":
             indices = torch.tensor(indices)
-            weights = torch.tensor(weights)
-        else:
-            indices = np.asarray(indices)
-            weights = np.asarray(weights)
+            weights = torch.tensor(weights, dtype=torch.float32)
 
         records = DataOpDict()
-        for name, variable in self.memory.items():
-            records[name] = self.read_variable(variable, indices, dtype=
-            util.convert_dtype(self.flat_record_space[name].dtype, to="pytorch"))
+        for name, values in flat_records.items():
+            records[name] = torch.from_numpy(values) if get_backend() == "pytorch" else values
         records = define_by_run_unflatten(records)
         return records, indices, weights
 
     @rlgraph_api(must_be_complete=False)
     def _graph_fn_update_records(self, indices, update):
-        for index, loss in zip(indices, update):
-            priority = np.power(loss, self.alpha)
-            self.merged_segment_tree.insert(index, priority)
-            self.max_priority = max(self.max_priority, priority)
+        priorities = np.power(np.asarray(update, dtype=np.float64), self.alpha)
+        self.merged_segment_tree.insert_batch(indices, priorities)
+        if len(priorities) > 0:
+            self.max_priority = max(self.max_priority, float(np.max(priorities)))
 
     def get_state(self):
         return {
             "size": self.size,
             "index": self.index,
             "max_priority": self.max_priority
-        }
\ No newline at end of file
+        }
+
+    def get_snapshot_state(self):
+        return dict(
+            index=self.index, size=self.size, max_priority=self.max_priority, num_inserted=self.num_inserted,
+            sum_tree=self.merged_segment_tree.sum_segment_tree.values.copy(),
+            min_tree=self.merged_segment_tree.min_segment_tree.values.copy()
+        )
+
+    def set_snapshot_state(self, state):
+        self.index = int(state["index"])
+        self.size = int(state["size"])
+        self.max_priority = float(state["max_priority"])
+        self.num_inserted = int(state["num_inserted"])
+        self.merged_segment_tree.sum_segment_tree.values = np.array(state["sum_tree"], dtype=np.float64)
+        self.merged_segment_tree.min_segment_tree.values = np.array(state["min_tree"], dtype=np.float64)
+
+    def read_snapshot_records(self, indices):
+        if self.storage is not None:
+            return self.storage.read(indices)
+        return self.read_columns(indices)
+
+    def write_snapshot_records(self, indices, records):
+        if self.storage is not None:
+            self.storage.write(indices, records)
+        else:
+            self.write_columns(indices, records)
+
+    def read_columns(self, indices):
+        """
+        Reads the in-RAM records at the given indices.
+
+        Args:
+            indices (np.ndarray): The indices to read.
+
+        Returns:
+            dict: Dict mapping flat record keys to arrays of the read records (empty if nothing was written yet).
+        """
+        if self.columns is None:
+            return {name: np.zeros(shape=(0,), dtype=util.convert_dtype(space.dtype, to="np"))
+                    for name, space in self.flat_record_space.items()}
+        return {name: column[indices] for name, column in self.columns.items()}
+
+    def write_columns(self, indices, flat_records):
+        """
+        Writes records into the in-RAM columns, creating the columns with the first records. Columns are shaped
+        like the records (w/o their batch rank), as define-by-run record spaces may carry a batch rank in their shape.
+
+        Args:
+            indices (np.ndarray): The indices to write.
+            flat_records (dict): Dict mapping flat record keys to arrays of records (batched along the 0th axis).
+        """
+        if len(indices) == 0:
+            return
+        if self.columns is None:
+            self.columns = {
+                name: np.zeros(shape=(self.capacity,) + np.shape(flat_records[name])[1:],
+                               dtype=util.convert_dtype(space.dtype, to="np"))
+                for name, space in self.flat_record_space.items()
+            }
+        for name, values in flat_records.items():
+            self.columns[name][indices] = values
@@ -0,0 +1,121 @@
+# Copyright 2018/2019 The RLgraph authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import numpy as np
+
+from rlgraph import get_backend
+from rlgraph.components.helpers.memmap_storage import MemmapStorage
+from rlgraph.components.memories.memory import Memory
+from rlgraph.utils import DataOpDict
+from rlgraph.utils.decorators import rlgraph_api
+from rlgraph.utils.execution_util import define_by_run_unflatten
+from rlgraph.utils.ops import TraceContext
+from rlgraph.utils.rlgraph_errors import RLGraphError
+from rlgraph.utils.util import get_rank
+
+if get_backend() == "pytorch":
+    import torch
+
+
+class MemmapReplayMemory(Memory):
+    """
+    A replay memory (uniform sampling like ReplayMemory) whose records live in memory-mapped files on local disk
+    (see MemmapStorage), allowing for capacities beyond the available RAM.
+    Only available for define-by-run backends, as records are handled as numpy arrays outside of any graph.
+    """
+    def __init__(self, capacity=1000, directory=None, write_buffer_size=1000, scope="memmap-replay-memory",
+                 **kwargs):
+        """
+        Args:
+            directory (Optional[str]): Directory to place the memmap files in. If None, uses a new temporary
+                directory.
+            write_buffer_size (int): The number of most recent records to hold in RAM before writing them to disk.
+        """
+        super(MemmapReplayMemory, self).__init__(capacity, scope=scope, **kwargs)
+
+        self.directory = directory
+        self.write_buffer_size = write_buffer_size
+        self.storage = None
+        self.index = 0
+        self.size = 0
+
+    def create_variables(self, input_spaces, action_space=None):
+        if get_backend() == "tf":
+            raise RLGraphError("ERROR: MemmapReplayMemory is not supported by the tf backend!")
+        # No in-memory variables: All records go into the storage.
+        self.record_space = input_spaces["records"]
+        self.flat_record_space = self.record_space.flatten()
+        self.storage = MemmapStorage(
+            self.flat_record_space, self.capacity, directory=self.directory,
+            write_buffer_size=self.write_buffer_size
+        )
+
+    @rlgraph_api(flatten_ops=True)
+    def _graph_fn_insert_records(self, records):
+        if records is None or get_rank(records[self.terminal_key]) == 0:
+            return
+        flat_records = dict()
+        for key, value in records.items():
+            if get_backend() == "pytorch" and isinstance(value, torch.Tensor):
+                value = value.detach().cpu().numpy()
+            flat_records[key] = np.asarray(value)
+        num_records = len(flat_records[self.terminal_key])
+
+        self.storage.insert(flat_records, self.index)
+        self.index = (self.index + num_records) % self.capacity
+        self.size = min(self.size + num_records, self.capacity)
+        self.num_inserted += num_records
+
+    @rlgraph_api
+    def _graph_fn_get_records(self, num_records=1):
+        # Nothing to sample from (e.g. during the build): Return a single zero record.
+        if self.size == 0 or TraceContext.DEFINE_BY_RUN_CONTEXT == "building":
+            indices = np.zeros(shape=(1,), dtype=np.int64)
+            flat_records = {key: space.zeros(size=1) for key, space in self.flat_record_space.items()}
+        else:
+            indices = np.random.choice(self.size, size=int(num_records))
+            indices = (self.index - 1 - indices) % self.capacity
+            flat_records = self.storage.read(indices)
+
+        records = DataOpDict()
+        for key, value in flat_records.items():
+            records[key] = torch.from_numpy(np.asarray(value))
+        records = define_by_run_unflatten(records)
+        return records, torch.from_numpy(indices), torch.ones(len(indices), dtype=torch.float32)
+
+    def get_state(self):
+        return {
+            "index": self.index,
+            "size": self.size
+        }
+
+    def get_snapshot_state(self):
+        return dict(index=self.index, size=self.size, num_inserted=self.num_inserted)
+
+    def set_snapshot_state(self, state):
+        self.index = int(state["index"])
+        self.size = int(state["size"])
+        self.num_inserted = int(state["num_inserted"])
+
+    def read_snapshot_records(self, indices):
+        return self.storage.read(indices)
+
+    def write_snapshot_records(self, indices, records):
+        self.storage.write(indices, records)
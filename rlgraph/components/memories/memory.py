@@ -17,9 +17,12 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
+from rlgraph import get_backend
 from rlgraph.utils.ops import FLATTEN_SCOPE_PREFIX
 
 from rlgraph.components.component import Component, rlgraph_api
+from rlgraph.utils.rlgraph_errors import RLGraphError
+from rlgraph.utils.snapshot_util import store_memory_snapshot, load_memory_snapshot
 from rlgraph.utils import FlattenedDataOp
 
 
@@ -49,6 +52,10 @@ class Memory(Component):
         # Use this to get batch size.
         self.terminal_key = FLATTEN_SCOPE_PREFIX + "terminals"
 
+        # Total number of inserted records and its value at the last snapshot (define-by-run memories only).
+        self.num_inserted = 0
+        self.num_inserted_at_snapshot = 0
+
     def create_variables(self, input_spaces, action_space=None):
         # Store our record-space for convenience.
         self.record_space = input_spaces["records"]
@@ -134,3 +141,65 @@ class Memory(Component):
             SingleDataOp: The size (int) of the memory.
         """
         return self.read_variable(self.size)
+
+    def store_snapshot(self, directory):
+        """
+        Stores an (incremental) snapshot of the memory's records and state in `directory` (see
+        `rlgraph.utils.snapshot_util.store_memory_snapshot`). Only for define-by-run memories: tf memories are
+        variables and thus stored with the model's checkpoints.
+
+        Args:
+            directory (str): The snapshot directory.
+
+        Returns:
+            int: The number of records written.
+        """
+        if get_backend() == "tf":
+            raise RLGraphError("ERROR: tf memories are stored with the model's checkpoints (see Agent.store_model)!")
+        return store_memory_snapshot(self, directory)
+
+    def load_snapshot(self, directory):
+        """
+        Restores the memory's records and state from a snapshot in `directory`.
+
+        Args:
+            directory (str): The snapshot directory.
+
+        Returns:
+            int: The number of records read.
+        """
+        if get_backend() == "tf":
+            raise RLGraphError("ERROR: tf memories are restored with the model's checkpoints (see Agent.load_model)!")
+        return load_memory_snapshot(self, directory)
+
+    def get_snapshot_state(self):
+        """
+        Returns:
+            dict: The memory's state (besides its records) as numpy-compatible values.
+        """
+        raise NotImplementedError
+
+    def set_snapshot_state(self, state):
+        """
+        Args:
+            state (dict): A state as returned by `get_snapshot_state`.
+        """
+        raise NotImplementedError
+
+    def read_snapshot_records(self, indices):
+        """
+        Args:
+            indices (np.ndarray): The storage indices to read.
+
+        Returns:
+            dict: Flat record keys mapped to numpy arrays of the records at `indices`.
+        """
+        raise NotImplementedError
+
+    def write_snapshot_records(self, indices, records):
+        """
+        Args:
+            indices (np.ndarray): The storage indices to write.
+            records (dict): Flat record keys mapped to numpy arrays of the records to write.
+        """
+        raise NotImplementedError
@@ -23,6 +23,7 @@ from rlgraph import get_backend
 from rlgraph.components.memories.memory import Memory
 from rlgraph.components.helpers.segment_tree import SegmentTree
 from rlgraph.utils.decorators import rlgraph_api
+from rlgraph.utils.rlgraph_errors import RLGraphError
 from rlgraph.utils.util import get_batch_size
 
 if get_backend() == "tf":
@@ -67,6 +68,9 @@ class PrioritizedReplay(Memory):
         self.beta = beta
 
     def create_variables(self, input_spaces, action_space=None):
+        if get_backend() != "tf":
+            raise RLGraphError("ERROR: PrioritizedReplay is only supported by the tf backend (use "
+                               "MemPrioritizedReplay instead)!")
         super(PrioritizedReplay, self).create_variables(input_spaces, action_space)
 
         # Record space must contain 'terminals' for a replay memory.
@@ -127,31 +131,14 @@ class PrioritizedReplay(Memory):
 
         weight = tf.pow(x=self.max_priority, y=self.alpha)
 
-        # Insert new priorities into segment tree.
-        def insert_body(i):
-            sum_insert = self.sum_segment_tree.insert(update_indices[i], weight, tf.add)
-            with tf.control_dependencies(control_inputs=[sum_insert]):
-                return i + 1
-
-        def cond(i):
-            return i < num_records
-
+        # Insert new priorities into segment trees (batched, level by level).
         with tf.control_dependencies(control_inputs=index_updates):
-            sum_insert = tf.while_loop(cond=cond, body=insert_body, loop_vars=[0])
-
-        def insert_body(i):
-            min_insert = self.min_segment_tree.insert(update_indices[i], weight, tf.minimum)
-            with tf.control_dependencies(control_inputs=[min_insert]):
-                return i + 1
-
-        def cond(i):
-            return i < num_records
-
-        with tf.control_dependencies(control_inputs=[sum_insert]):
-            min_insert = tf.while_loop(cond=cond, body=insert_body, loop_vars=[0])
+            weights = tf.fill(dims=tf.shape(update_indices), value=weight)
+            sum_insert = self.sum_segment_tree.insert_batch(update_indices, weights, tf.add)
+            min_insert = self.min_segment_tree.insert_batch(update_indices, weights, tf.minimum)
 
         # Nothing to return.
-        with tf.control_dependencies(control_inputs=[min_insert]):
+        with tf.control_dependencies(control_inputs=[sum_insert, min_insert]):
             return tf.no_op()
 
     @rlgraph_api
@@ -163,65 +150,31 @@ class PrioritizedReplay(Memory):
         # Sample the entire batch.
         sample = stored_elements_prob_sum * tf.random_uniform(shape=(num_records, ))
 
-        # Sample by looking up prefix sum.
-        sample_indices = tf.map_fn(fn=self.sum_segment_tree.index_of_prefixsum, elems=sample, dtype=tf.int32)
-        # sample_indices = self.sum_segment_tree.index_of_prefixsum(sample)
+        # Sample by looking up prefix sums (all samples at once).
+        sample_indices = self.sum_segment_tree.index_of_prefixsum(sample)
 
         # Importance correction.
         total_prob = self.sum_segment_tree.reduce(start=0, limit=self.priority_capacity - 1)
         min_prob = self.min_segment_tree.get_min_value() / total_prob
         max_weight = tf.pow(x=min_prob * tf.cast(current_size, tf.float32), y=-self.beta)
 
-        def importance_sampling_fn(sample_index):
-            sample_prob = self.sum_segment_tree.get(sample_index) / stored_elements_prob_sum
-            weight = tf.pow(x=sample_prob * tf.cast(current_size, tf.float32), y=-self.beta)
-
-            return weight / max_weight
-
-        corrected_weights = tf.map_fn(
-            fn=importance_sampling_fn,
-            elems=sample_indices,
-            dtype=tf.float32
-        )
+        sample_probs = self.sum_segment_tree.get(sample_indices) / stored_elements_prob_sum
+        corrected_weights = tf.pow(x=sample_probs * tf.cast(current_size, tf.float32), y=-self.beta) / max_weight
         # sample_indices = tf.Print(sample_indices, [sample_indices, self.sum_segment_tree.values], summarize=1000,
         #                           message='sample indices, segment tree values = ')
         return self._read_records(indices=sample_indices), sample_indices, corrected_weights
 
     @rlgraph_api(must_be_complete=False)
     def _graph_fn_update_records(self, indices, update):
-        num_records = get_batch_size(indices)
-        max_priority = 0.0
-
-        # Update has to be sequential.
-        def insert_body(i, max_priority_):
-            priority = tf.pow(x=update[i], y=self.alpha)
-
-            sum_insert = self.sum_segment_tree.insert(
-                index=indices[i],
-                element=priority,
-                insert_op=tf.add
-            )
-            min_insert = self.min_segment_tree.insert(
-                index=indices[i],
-                element=priority,
-                insert_op=tf.minimum
-            )
-            # Keep track of current max priority element.
-            max_priority_ = tf.maximum(x=max_priority_, y=priority)
-
-            with tf.control_dependencies(control_inputs=[tf.group(sum_insert, min_insert)]):
-                # TODO: This confuses the auto-return value detector.
-                return i + 1, max_priority_
-
-        def cond(i, max_priority_):
-            return i < num_records - 1
-
-        _, max_priority = tf.while_loop(
-            cond=cond,
-            body=insert_body,
-            loop_vars=(0, max_priority)
-        )
+        priorities = tf.pow(x=update, y=self.alpha)
+
+        sum_insert = self.sum_segment_tree.insert_batch(indices, priorities, tf.add)
+        min_insert = self.min_segment_tree.insert_batch(indices, priorities, tf.minimum)
+
+        # Keep track of the max priority of this update.
+        max_priority = tf.maximum(x=tf.reduce_max(input_tensor=priorities), y=0.0)
 
-        assignment = self.assign_variable(ref=self.max_priority, value=max_priority)
+        with tf.control_dependencies(control_inputs=[sum_insert, min_insert]):
+            assignment = self.assign_variable(ref=self.max_priority, value=max_priority)
         with tf.control_dependencies(control_inputs=[assignment]):
             return tf.no_op()
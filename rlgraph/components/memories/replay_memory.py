@@ -86,12 +86,15 @@ class ReplayMemory(Memory):
             with tf.control_dependencies(control_inputs=index_updates):
                 return tf.no_op()
         elif get_backend() == "pytorch":
-            update_indices = torch.arange(self.index, self.index + num_records) % self.capacity
+            update_indices = np.arange(self.index, self.index + num_records) % self.capacity
+            flat_records = dict()
             for key in self.memory:
-                for i, val in zip(update_indices, records[key]):
-                    self.memory[key][i] = val
+                values = records[key]
+                flat_records[key] = values.detach().cpu().numpy() if isinstance(values, torch.Tensor) else values
+            self.write_columns(update_indices, flat_records)
             self.index = (self.index + num_records) % self.capacity
             self.size = min(self.size + num_records, self.capacity)
+            self.num_inserted += num_records
             return None
 
     @rlgraph_api
@@ -113,9 +116,12 @@ class ReplayMemory(Memory):
                 indices = (self.index - 1 - indices) % self.capacity
             records = DataOpDict()
             for name, variable in self.memory.items():
-                records[name] = self.read_variable(variable, indices, dtype=
-                                                   util.convert_dtype(self.flat_record_space[name].dtype, to="pytorch"),
-                                                   shape=self.flat_record_space[name].shape)
+                dtype = util.convert_dtype(self.flat_record_space[name].dtype, to="pytorch")
+                if len(indices) > 0:
+                    records[name] = torch.from_numpy(variable[indices]).to(dtype)
+                else:
+                    records[name] = self.read_variable(variable, indices, dtype=dtype,
+                                                       shape=self.flat_record_space[name].shape)
             records = define_by_run_unflatten(records)
             weights = torch.ones(indices.shape, dtype=torch.float32) if len(indices) > 0 \
                 else torch.ones(1, dtype=torch.float32)
@@ -127,3 +133,40 @@ class ReplayMemory(Memory):
             "size": self.size,
             "memory": self.memory
         }
+
+    def get_snapshot_state(self):
+        return dict(index=self.index, size=self.size, num_inserted=self.num_inserted)
+
+    def set_snapshot_state(self, state):
+        self.index = int(state["index"])
+        self.size = int(state["size"])
+        self.num_inserted = int(state["num_inserted"])
+
+    def read_snapshot_records(self, indices):
+        if len(indices) == 0:
+            return {name: np.zeros(shape=(0,), dtype=util.convert_dtype(space.dtype, to="np"))
+                    for name, space in self.flat_record_space.items()}
+        return {name: variable[indices] for name, variable in self.memory.items()}
+
+    def write_snapshot_records(self, indices, records):
+        self.write_columns(indices, records)
+
+    def write_columns(self, indices, flat_records):
+        """
+        Writes records into the (define-by-run) memory, which stores each flat record key in a preallocated numpy
+        array. The arrays are created with the first records and shaped like them (w/o their batch rank), as
+        define-by-run record spaces may carry a batch rank in their shape.
+
+        Args:
+            indices (np.ndarray): The indices to write.
+            flat_records (dict): Dict mapping flat record keys to arrays of records (batched along the 0th axis).
+        """
+        if len(indices) == 0:
+            return
+        for name, values in flat_records.items():
+            if not isinstance(self.memory[name], np.ndarray):
+                self.memory[name] = self.get_variable(name="memory" + name, trainable=False, initializer=np.zeros(
+                    shape=(self.capacity,) + np.shape(values)[1:],
+                    dtype=util.convert_dtype(self.flat_record_space[name].dtype, to="np")
+                ))
+            self.memory[name][indices] = values
@@ -13,35 +13,34 @@
 # limitations under the License.
 # ==============================================================================
 
+
 from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
 from rlgraph.components.neural_networks.stack import Stack
-from rlgraph.components.neural_networks.dict_preprocessor_stack import DictPreprocessorStack
-from rlgraph.components.neural_networks.preprocessor_stack import PreprocessorStack
-
 from rlgraph.components.neural_networks.neural_network import NeuralNetwork
 from rlgraph.components.neural_networks.value_function import ValueFunction
-from rlgraph.components.neural_networks.sac.sac_networks import SACValueNetwork
+from rlgraph.utils.lazy_import import get_attribute_modules, lazy_module_attributes
 
 
 # The Stacks.
 Stack.__lookup_classes__ = dict(
-    dictpreprocessorstack=DictPreprocessorStack,
-    preprocessorstack=PreprocessorStack
+    dictpreprocessorstack="rlgraph.components.neural_networks.dict_preprocessor_stack.DictPreprocessorStack",
+    preprocessorstack="rlgraph.components.neural_networks.preprocessor_stack.PreprocessorStack"
 )
 
 ValueFunction.__lookup_classes__ = dict(
-    sacvaluefunction=SACValueNetwork,
+    sacvaluefunction="rlgraph.components.neural_networks.sac.sac_networks.SACValueNetwork",
     valuefunction=ValueFunction,
 )
 ValueFunction.__default_constructor__ = ValueFunction
 
-
-__all__ = ["NeuralNetwork", "ValueFunction"] + \
-          ["Stack"] + \
-          list(set(map(lambda x: x.__name__, Stack.__lookup_classes__.values()))) + \
-          list(set(map(lambda x: x.__name__, ValueFunction.__lookup_classes__.values())))
+_attribute_modules = get_attribute_modules(
+    list(Stack.__lookup_classes__.values()) +
+    ["rlgraph.components.neural_networks.sac.sac_networks.SACValueNetwork"]
+)
+__getattr__, __dir__ = lazy_module_attributes(__name__, _attribute_modules)
 
 
+__all__ = ["Stack", "NeuralNetwork", "ValueFunction"] + list(_attribute_modules.keys())
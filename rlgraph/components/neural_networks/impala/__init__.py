@@ -1,4 +1,4 @@
-# Copyright 2018/2019 The RLgraph authors, All Rights Reserved.
+# Copyright 2018/2019 The RLgraph authors. All Rights Reserved.
 #
 # Licensed under the Apache License, Version 2.0 (the "License");
 # you may not use this file except in compliance with the License.
@@ -13,12 +13,18 @@
 # limitations under the License.
 # ==============================================================================
 
+
 from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
-from rlgraph.components.neural_networks.impala.impala_networks import LargeIMPALANetwork
-from rlgraph.components.neural_networks.impala.impala_networks import SmallIMPALANetwork
+from rlgraph.utils.lazy_import import get_attribute_modules, lazy_module_attributes
+
+_attribute_modules = get_attribute_modules([
+    "rlgraph.components.neural_networks.impala.impala_networks.LargeIMPALANetwork",
+    "rlgraph.components.neural_networks.impala.impala_networks.SmallIMPALANetwork"
+])
+__getattr__, __dir__ = lazy_module_attributes(__name__, _attribute_modules)
 
 
-__all__ = ["LargeIMPALANetwork", "SmallIMPALANetwork"]
+__all__ = list(_attribute_modules.keys())
@@ -13,20 +13,21 @@
 # limitations under the License.
 # ==============================================================================
 
+
 from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
 from functools import partial
 
-from rlgraph.components.optimizers.horovod_optimizer import HorovodOptimizer
 from rlgraph.components.optimizers.local_optimizers import *
-from rlgraph.components.common.multi_gpu_synchronizer import MultiGpuSynchronizer
 from rlgraph.components.optimizers.optimizer import Optimizer
+from rlgraph.utils.lazy_import import get_attribute_modules, lazy_module_attributes
 
 
 Optimizer.__lookup_classes__ = dict(
-    horovod=HorovodOptimizer,
+    # Only imported if used (imports horovod).
+    horovod="rlgraph.components.optimizers.horovod_optimizer.HorovodOptimizer",
     #multigpu=MultiGpuSynchronizer,
     #multigpusync=MultiGpuSynchronizer,
     # LocalOptimizers.
@@ -42,5 +43,12 @@ Optimizer.__lookup_classes__ = dict(
 # The default Optimizer to use if a spec is None and no args/kwars are given.
 Optimizer.__default_constructor__ = partial(GradientDescentOptimizer, learning_rate=0.0001)
 
-__all__ = ["Optimizer", "LocalOptimizer", "MultiGpuSynchronizer"] + \
-          list(set(map(lambda x: x.__name__, Optimizer.__lookup_classes__.values())))
+_attribute_modules = get_attribute_modules([
+    "rlgraph.components.optimizers.horovod_optimizer.HorovodOptimizer",
+    "rlgraph.components.common.multi_gpu_synchronizer.MultiGpuSynchronizer"
+])
+__getattr__, __dir__ = lazy_module_attributes(__name__, _attribute_modules)
+
+__all__ = ["Optimizer", "LocalOptimizer"] + \
+          sorted(set(c.__name__ for c in Optimizer.__lookup_classes__.values() if not isinstance(c, str))) + \
+          list(_attribute_modules.keys())
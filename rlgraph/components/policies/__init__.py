@@ -13,20 +13,24 @@
 # limitations under the License.
 # ==============================================================================
 
+
 from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
 from rlgraph.components.policies.policy import Policy
-from rlgraph.components.policies.shared_value_function_policy import SharedValueFunctionPolicy
-from rlgraph.components.policies.dueling_policy import DuelingPolicy
+from rlgraph.utils.lazy_import import get_attribute_modules, lazy_module_attributes
 
 # The Stacks.
 Policy.__lookup_classes__ = dict(
     policy=Policy,
-    sharedvaluefunctionpolicy=SharedValueFunctionPolicy,
-    duelingpolicy=DuelingPolicy
+    sharedvaluefunctionpolicy="rlgraph.components.policies.shared_value_function_policy.SharedValueFunctionPolicy",
+    duelingpolicy="rlgraph.components.policies.dueling_policy.DuelingPolicy"
+)
+
+_attribute_modules = get_attribute_modules(
+    [c for c in Policy.__lookup_classes__.values() if isinstance(c, str)]
 )
+__getattr__, __dir__ = lazy_module_attributes(__name__, _attribute_modules)
 
-__all__ = ["Policy"] + \
-          list(set(map(lambda x: x.__name__, Policy.__lookup_classes__.values())))
+__all__ = ["Policy"] + list(_attribute_modules.keys())
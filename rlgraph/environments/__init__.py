@@ -17,61 +17,50 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
+import importlib.util
+
 from rlgraph.environments.environment import Environment
-from rlgraph.environments.deterministic_env import DeterministicEnv
-from rlgraph.environments.gaussian_density_as_reward_env import GaussianDensityAsRewardEnv
-from rlgraph.environments.grid_world import GridWorld
-from rlgraph.environments.openai_gym import OpenAIGymEnv
-from rlgraph.environments.random_env import RandomEnv
 from rlgraph.environments.vector_env import VectorEnv
-from rlgraph.environments.sequential_vector_env import SequentialVectorEnv
+from rlgraph.utils.lazy_import import get_attribute_modules, lazy_module_attributes
 
+# Environment classes are registered by their python path and only imported on first use, so that e.g. gym or
+# opencv are only imported by processes that actually create such an Environment.
 Environment.__lookup_classes__ = dict(
-    deterministic=DeterministicEnv,
-    deterministicenv=DeterministicEnv,
-    gaussiandensity=GaussianDensityAsRewardEnv,
-    gaussiandensityasreward=GaussianDensityAsRewardEnv,
-    gaussiandensityasrewardenv=GaussianDensityAsRewardEnv,
-    gridworld=GridWorld,
-    gridworldenv=GridWorld,
-    openai=OpenAIGymEnv,
-    openaigym=OpenAIGymEnv,
-    openaigymenv=OpenAIGymEnv,
-    random=RandomEnv,
-    randomenv=RandomEnv,
-    sequentialvector=SequentialVectorEnv,
-    sequentialvectorenv=SequentialVectorEnv
+    deterministic="rlgraph.environments.deterministic_env.DeterministicEnv",
+    deterministicenv="rlgraph.environments.deterministic_env.DeterministicEnv",
+    gaussiandensity="rlgraph.environments.gaussian_density_as_reward_env.GaussianDensityAsRewardEnv",
+    gaussiandensityasreward="rlgraph.environments.gaussian_density_as_reward_env.GaussianDensityAsRewardEnv",
+    gaussiandensityasrewardenv="rlgraph.environments.gaussian_density_as_reward_env.GaussianDensityAsRewardEnv",
+    gridworld="rlgraph.environments.grid_world.GridWorld",
+    gridworldenv="rlgraph.environments.grid_world.GridWorld",
+    openai="rlgraph.environments.openai_gym.OpenAIGymEnv",
+    openaigym="rlgraph.environments.openai_gym.OpenAIGymEnv",
+    openaigymenv="rlgraph.environments.openai_gym.OpenAIGymEnv",
+    random="rlgraph.environments.random_env.RandomEnv",
+    randomenv="rlgraph.environments.random_env.RandomEnv",
+    sequentialvector="rlgraph.environments.sequential_vector_env.SequentialVectorEnv",
+    sequentialvectorenv="rlgraph.environments.sequential_vector_env.SequentialVectorEnv",
+    vectordeterministic="rlgraph.environments.deterministic_env.VectorDeterministicEnv",
+    vectordeterministicenv="rlgraph.environments.deterministic_env.VectorDeterministicEnv",
+    vectorgridworld="rlgraph.environments.grid_world.VectorGridWorld",
+    vectorrandom="rlgraph.environments.random_env.VectorRandomEnv",
+    vectorrandomenv="rlgraph.environments.random_env.VectorRandomEnv"
 )
 
-try:
-    import deepmind_lab
-
-    # If import works: Can import our Adapter.
-    from rlgraph.environments.deepmind_lab import DeepmindLabEnv
-
+# Only register our adapters if the respective library is installed (w/o importing it here).
+if importlib.util.find_spec("deepmind_lab") is not None:
     Environment.__lookup_classes__.update(dict(
-        deepmindlab=DeepmindLabEnv,
-        deepmindlabenv=DeepmindLabEnv,
+        deepmindlab="rlgraph.environments.deepmind_lab.DeepmindLabEnv",
+        deepmindlabenv="rlgraph.environments.deepmind_lab.DeepmindLabEnv",
     ))
-    # TODO travis error on this, investigate.
-except Exception:
-    pass
-
-
-try:
-    import mlagents
-
-    # If import works: Can import our Adapter.
-    from rlgraph.environments.mlagents_env import MLAgentsEnv
 
+if importlib.util.find_spec("mlagents") is not None:
     Environment.__lookup_classes__.update(dict(
-        mlagents=MLAgentsEnv,
-        mlagentsenv=MLAgentsEnv,
+        mlagents="rlgraph.environments.mlagents_env.MLAgentsEnv",
+        mlagentsenv="rlgraph.environments.mlagents_env.MLAgentsEnv",
     ))
-    # TODO travis error on this, investigate.
-except Exception:
-    pass
 
+_attribute_modules = get_attribute_modules(Environment.__lookup_classes__.values())
+__getattr__, __dir__ = lazy_module_attributes(__name__, _attribute_modules)
 
-__all__ = ["Environment"] + \
-          list(set(map(lambda x: x.__name__, Environment.__lookup_classes__.values())))
+__all__ = ["Environment", "VectorEnv"] + list(_attribute_modules.keys())
@@ -19,7 +19,7 @@ from __future__ import print_function
 
 import numpy as np
 
-from rlgraph.environments import Environment
+from rlgraph.environments import Environment, VectorEnv
 import rlgraph.spaces as spaces
 
 
@@ -81,3 +81,62 @@ class DeterministicEnv(Environment):
 
     def __str__(self):
         return "DeterministicEnv()"
+
+
+class VectorDeterministicEnv(VectorEnv):
+    """
+    A natively vectorized DeterministicEnv, holding the states, rewards and episode step counters of
+    `num_environments` environments in numpy arrays and stepping all of them in one vectorized call.
+    """
+    def __init__(self, num_environments, state_start=0.0, reward_start=-100.0, steps_to_terminal=10):
+        """
+        Args:
+            num_environments (int): The number of environments to step at once.
+
+        For all other args, see DeterministicEnv.
+        """
+        super(VectorDeterministicEnv, self).__init__(
+            num_environments=num_environments, state_space=spaces.FloatBox(), action_space=spaces.IntBox(2)
+        )
+        self.state_start = state_start
+        self.reward_start = reward_start
+        self.steps_to_terminal = steps_to_terminal
+        self.env = None
+
+        self.state = np.full(shape=(num_environments,), fill_value=state_start, dtype=np.float32)
+        self.reward = np.full(shape=(num_environments,), fill_value=reward_start, dtype=np.float32)
+        self.steps_into_episode = np.zeros(shape=(num_environments,), dtype=np.int32)
+
+    def seed(self, seed=None):
+        return seed
+
+    def get_env(self):
+        if self.env is None:
+            self.env = DeterministicEnv(self.state_start, self.reward_start, self.steps_to_terminal)
+        return self.env
+
+    def reset(self, index=0):
+        self.steps_into_episode[index] = 0
+        self.state[index] = self.state_start
+        self.reward[index] = self.reward_start
+        return self.state[index:index + 1].copy()
+
+    def reset_all(self):
+        self.steps_into_episode[:] = 0
+        self.state[:] = self.state_start
+        self.reward[:] = self.reward_start
+        return self.state[:, None].copy()
+
+    def step(self, actions=None, **kwargs):
+        self.state += 1.0
+        rewards = self.reward.copy()
+        self.reward += 1.0
+        self.steps_into_episode += 1
+        terminals = self.steps_into_episode >= self.steps_to_terminal
+        return self.state[:, None].copy(), rewards, terminals, [None] * self.num_environments
+
+    def terminate_all(self):
+        pass
+
+    def __str__(self):
+        return "VectorDeterministicEnv({})".format(self.num_environments)
@@ -23,7 +23,7 @@ import random
 from six.moves import xrange as range_
 import time
 
-from rlgraph.environments import Environment
+from rlgraph.environments import Environment, VectorEnv
 import rlgraph.spaces as spaces
 
 
@@ -513,3 +513,153 @@ class GridWorld(Environment):
             else:
                 converted_actions["jump"] = 1
             return converted_actions
+
+
+class VectorGridWorld(VectorEnv):
+    """
+    A natively vectorized GridWorld, holding `num_environments` grid worlds (all with the same map and settings) as
+    numpy arrays and stepping all of them in one vectorized call. Behaves like a SequentialVectorEnv of GridWorlds,
+    but without the per-environment python overhead.
+    """
+    # Moves (0=up, 1=right, 2=down, 3=left) by orientation index (orientation / 90) and "forward" action.
+    # -1: No move (forward=1).
+    FTJ_MOVES = np.array([[2, -1, 0], [3, -1, 1], [0, -1, 2], [1, -1, 3]])
+
+    def __init__(self, num_environments, world="4x4", save_mode=False, action_type="udlr",
+                 reward_function="sparse", state_representation="discrete"):
+        """
+        Args:
+            num_environments (int): The number of grid worlds to step at once.
+
+        For all other args, see GridWorld.
+        """
+        # A single GridWorld used for translating the map into vectorized lookup tables.
+        self.env = GridWorld(world=world, save_mode=save_mode, action_type=action_type,
+                             reward_function=reward_function, state_representation=state_representation)
+        super(VectorGridWorld, self).__init__(
+            num_environments=num_environments, state_space=self.env.state_space, action_space=self.env.action_space
+        )
+        self.action_type = action_type
+        self.state_representation = state_representation
+        self.n_row, self.n_col = self.env.n_row, self.env.n_col
+        num_positions = self.n_row * self.n_col
+
+        # Next positions for each position, move (0-3) and in-air flag.
+        self.transitions = np.zeros(shape=(num_positions, 4, 2), dtype=np.int32)
+        for pos in range_(num_positions):
+            for move in range_(4):
+                for in_air in range_(2):
+                    try:
+                        self.transitions[pos, move, in_air] = \
+                            self.env.get_possible_next_positions(pos, move, in_air=bool(in_air))[0][0]
+                    # Moves off the map in non-square worlds (GridWorld itself fails here): Stay where we are.
+                    except IndexError:
+                        self.transitions[pos, move, in_air] = pos
+        # Reward and terminal flag for arriving at each position.
+        field_types = np.array([
+            self.env.world[pos % self.n_col, pos // self.n_col] if pos % self.n_col < self.n_row and
+            pos // self.n_col < self.n_col else "W" for pos in range_(num_positions)
+        ])
+        self.position_rewards = np.full(shape=(num_positions,), fill_value=-1.0, dtype=np.float32)
+        self.position_rewards[field_types == "H"] = -5.0 if reward_function == "sparse" else -10.0
+        self.position_rewards[field_types == "F"] = -3.0 if reward_function == "sparse" else -10.0
+        self.position_rewards[field_types == "G"] = 1.0 if reward_function == "sparse" else 50.0
+        self.position_terminals = (field_types == "H") | (field_types == "G")
+        # Possible start positions for randomized resets.
+        self.random_start_positions = np.nonzero(np.isin(field_types, [" ", "S", "F"]))[0]
+        # The static part of the camera image.
+        if self.state_representation == "camera":
+            self.env.update_cam_pixels()
+            self.camera_background = np.copy(self.env.camera_pixels)
+            self.camera_background[:, :, 2] = 0
+
+        # Flattened "ftj" int actions: Columns are turn, forward, jump.
+        self.ftj_actions = np.array([[a // 6, (a % 6) // 2, a % 2] for a in range_(18)], dtype=np.int32)
+
+        self.discrete_pos = np.full(shape=(num_environments,), fill_value=self.env.default_start_pos, dtype=np.int32)
+        self.orientation = np.zeros(shape=(num_environments,), dtype=np.int32)
+
+    def seed(self, seed=None):
+        return self.env.seed(seed)
+
+    def get_env(self):
+        return self.env
+
+    def reset(self, index=0, randomize=False):
+        """
+        Args:
+            index (int): The index of the grid world to reset.
+            randomize (bool): Whether to start the new episode in a random position (instead of "S").
+        """
+        self._reset(index, randomize)
+        return self._get_states()[index]
+
+    def reset_all(self, randomize=False):
+        self._reset(slice(None), randomize)
+        return self._get_states()
+
+    def step(self, actions, **kwargs):
+        """
+        Args:
+            actions (Union[np.ndarray,Dict[str,np.ndarray]]): One action per grid world (see `GridWorld.step`).
+
+        Returns:
+            tuple: Batched states, rewards and terminal flags and a list of infos (None).
+        """
+        if self.action_type == "udlr":
+            self.discrete_pos = self.transitions[self.discrete_pos, np.asarray(actions), 0]
+        else:
+            if isinstance(actions, dict):
+                turn, forward, jump = (np.asarray(actions[key]) for key in ["turn", "forward", "jump"])
+            else:
+                turn, forward, jump = self.ftj_actions[np.asarray(actions).reshape((self.num_environments,))].T
+            self.orientation = (self.orientation + (turn - 1) * 90) % 360
+            direction = self.orientation // 90
+            moves = self.FTJ_MOVES[direction, forward]
+            self.discrete_pos = np.where(
+                moves >= 0, self.transitions[self.discrete_pos, np.maximum(moves, 0), 0], self.discrete_pos
+            )
+            # Jump: Move two fields forward (over walls/fires/holes w/o any damage).
+            for in_air in range_(2):
+                self.discrete_pos = np.where(
+                    jump == 1, self.transitions[self.discrete_pos, direction, in_air], self.discrete_pos
+                )
+
+        rewards = self.position_rewards[self.discrete_pos]
+        terminals = self.position_terminals[self.discrete_pos]
+        return self._get_states(), rewards, terminals, [None] * self.num_environments
+
+    def render(self, index=0):
+        self.env.discrete_pos = int(self.discrete_pos[index])
+        self.env.orientation = int(self.orientation[index])
+        self.env.render()
+
+    def terminate_all(self):
+        pass
+
+    def __str__(self):
+        return "VectorGridWorld({}x{})".format(self.env.description, self.num_environments)
+
+    def _reset(self, indices, randomize):
+        if randomize is False:
+            self.discrete_pos[indices] = self.env.default_start_pos
+        else:
+            self.discrete_pos[indices] = np.random.choice(
+                self.random_start_positions, size=np.shape(self.discrete_pos[indices])
+            )
+        self.orientation[indices] = 0
+
+    def _get_states(self):
+        x = self.discrete_pos // self.n_col
+        y = self.discrete_pos % self.n_col
+        if self.state_representation == "discrete":
+            return np.copy(self.discrete_pos)
+        elif self.state_representation == "xy":
+            return np.stack([x, y], axis=-1).astype(np.int32)
+        elif self.state_representation == "xy+orientation":
+            orientations = np.array([[0, 1], [1, 0], [0, -1], [-1, 0]], dtype=np.int32)
+            return np.concatenate([np.stack([x, y], axis=-1), orientations[self.orientation // 90]], axis=-1)
+        else:
+            states = np.tile(self.camera_background, (self.num_environments, 1, 1, 1))
+            states[np.arange(self.num_environments), y, x, 2] = 255
+            return states
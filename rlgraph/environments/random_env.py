@@ -20,7 +20,7 @@ from __future__ import print_function
 import numpy as np
 import time
 
-from rlgraph.environments import Environment
+from rlgraph.environments import Environment, VectorEnv
 import rlgraph.spaces as spaces
 
 
@@ -78,3 +78,83 @@ class RandomEnv(Environment):
 
     def __str__(self):
         return "RandomEnv()"
+
+
+class VectorRandomEnv(VectorEnv):
+    """
+    A natively vectorized RandomEnv, producing random states, rewards and terminals for `num_environments`
+    environments in one vectorized call (no matter what actions come in).
+    """
+    def __init__(self, num_environments, state_space, action_space, reward_space=None, terminal_prob=0.1,
+                 deterministic=False):
+        """
+        Args:
+            num_environments (int): The number of environments to step at once.
+
+        For all other args, see RandomEnv.
+        """
+        super(VectorRandomEnv, self).__init__(
+            num_environments=num_environments, state_space=state_space, action_space=action_space
+        )
+        self.reward_space = spaces.Space.from_spec(reward_space)
+        self.terminal_prob = terminal_prob
+        self.env_spec = dict(state_space=state_space, action_space=action_space, reward_space=reward_space,
+                             terminal_prob=terminal_prob, deterministic=deterministic)
+        self.env = None
+
+        if deterministic is True:
+            np.random.seed(10)
+        self.last_state = np.random.get_state()
+
+    def seed(self, seed=None):
+        if seed is None:
+            seed = time.time()
+        np.random.seed(seed)
+        self.last_state = np.random.get_state()
+        return seed
+
+    def get_env(self):
+        if self.env is None:
+            self.env = RandomEnv(**self.env_spec)
+        return self.env
+
+    def reset(self, index=0):
+        np.random.set_state(self.last_state)
+        state = self.state_space.sample()
+        self.last_state = np.random.get_state()
+        return state
+
+    def reset_all(self):
+        np.random.set_state(self.last_state)
+        states = self._sample(self.state_space)
+        self.last_state = np.random.get_state()
+        return states
+
+    def step(self, actions=None, **kwargs):
+        # Set the seed to the last observed state for this instance.
+        np.random.set_state(self.last_state)
+        states = self._sample(self.state_space)
+        rewards = self._sample(self.reward_space)
+        terminals = np.random.random_sample(size=self.num_environments) < self.terminal_prob
+        self.last_state = np.random.get_state()
+        return states, rewards, terminals, [None] * self.num_environments
+
+    def terminate_all(self):
+        pass
+
+    def __str__(self):
+        return "VectorRandomEnv({})".format(self.num_environments)
+
+    def _sample(self, space):
+        samples = space.sample(size=self.num_environments)
+        # Spaces drop the batch dimension for a single sample.
+        if self.num_environments == 1:
+            samples = self._add_batch_dim(samples)
+        return samples
+
+    def _add_batch_dim(self, samples):
+        if isinstance(samples, dict):
+            return {key: self._add_batch_dim(value) for key, value in samples.items()}
+        elif isinstance(samples, tuple):
+            return tuple(self._add_batch_dim(value) for value in samples)
+        return np.expand_dims(samples, axis=0)
@@ -17,14 +17,46 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
+import re
+
+from rlgraph import get_distributed_backend
+from rlgraph.execution.dynamic_batching_server import DynamicBatchingServer
 from rlgraph.execution.environment_sample import EnvironmentSample
 from rlgraph.execution.worker import Worker
 from rlgraph.execution.single_threaded_worker import SingleThreadedWorker
+from rlgraph.utils.rlgraph_errors import RLGraphError
 
-__all__ = ["Worker", "SingleThreadedWorker", "EnvironmentSample"]
+__all__ = ["Worker", "SingleThreadedWorker", "EnvironmentSample", "DynamicBatchingServer",
+           "get_distributed_executor_class"]
 
 Worker.__lookup_classes__ = dict(
    single=SingleThreadedWorker,
    singlethreadedworker=SingleThreadedWorker,
    singlethreaded=SingleThreadedWorker
-)
\ No newline at end of file
+)
+
+
+def get_distributed_executor_class(executor_type):
+    """
+    Looks up a distributed executor class for the configured distributed backend: Ray executors for "ray",
+    executors running workers and memories in local processes for "multiprocessing". Both take the same configs.
+
+    Args:
+        executor_type (str): The executor type, e.g. "apex" or "sync-batch".
+
+    Returns:
+        type: The executor class.
+    """
+    if get_distributed_backend() == "ray":
+        from rlgraph.execution.ray import RayExecutor as executor_base
+    elif get_distributed_backend() == "multiprocessing":
+        from rlgraph.execution.multiprocess import MultiprocessExecutor as executor_base
+    else:
+        raise RLGraphError("No executors for distributed backend '{}'.".format(get_distributed_backend()))
+
+    key = re.sub(r'[\W_]', '', executor_type.lower())
+    if key not in executor_base.__lookup_classes__:
+        raise RLGraphError("Unknown executor type '{}'. Available types: {}.".format(
+            executor_type, sorted(executor_base.__lookup_classes__)
+        ))
+    return executor_base.__lookup_classes__[key]
@@ -0,0 +1,331 @@
+# Copyright 2018/2019 The RLgraph authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+from functools import partial
+import logging
+import multiprocessing
+import threading
+import time
+
+import numpy as np
+from six.moves import queue
+
+from rlgraph.utils.rlgraph_errors import RLGraphError
+from rlgraph.utils.specifiable import Specifiable
+
+
+class DynamicBatchingServer(Specifiable):
+    """
+    An in-process, backend-agnostic dynamic batching service for inference.
+
+    Many callers (python threads or worker processes) send single states or small batches of states to the server,
+    which aggregates them into one batch, runs a single forward pass (e.g. `Agent.get_action`) on that batch and
+    hands every caller back its slice of the result. Batching follows the same rules as the (TF custom op based)
+    `dynamic_batching` helper: A batch is computed as soon as it holds at least `minimum_batch_size` states or
+    `timeout_ms` milliseconds have passed since its first request arrived. It never exceeds `maximum_batch_size`
+    states (single requests larger than that are computed on their own).
+
+    Since the server only deals with numpy data on the python side, it works the same for TF and PyTorch Agents.
+
+    Example usage:
+        server = DynamicBatchingServer(agent=agent, minimum_batch_size=8, timeout_ms=5)
+        server.start()
+        # From many threads:
+        actions = server.get_action(states)
+        # Or from worker processes (create the clients before starting the processes):
+        client = server.get_client()
+        actions = client.get_action(states)
+        server.stop()
+    """
+    # Marker put into the request queue to shut down the serving thread.
+    STOP = "__stop__"
+
+    def __init__(self, agent=None, batch_fn=None, minimum_batch_size=1, maximum_batch_size=64, timeout_ms=10,
+                 use_processes=False, get_action_kwargs=None):
+        """
+        Args:
+            agent (Optional[Agent]): The Agent whose `get_action` method to batch calls to.
+            batch_fn (Optional[callable]): Alternatively to `agent`: An arbitrary callable taking batched (numpy)
+                inputs and returning batched outputs (with the same batch size in the first dimension).
+            minimum_batch_size (int): The minimum number of states to collect before computing a batch.
+            maximum_batch_size (int): The maximum number of states to compute in one batch.
+            timeout_ms (Optional[int]): Milliseconds after the first request of a batch arrived, after which the
+                batch is computed even if it holds fewer than `minimum_batch_size` states. None for no timeout.
+            use_processes (bool): Whether requests will come from other processes (via clients created with
+                `get_client`) instead of threads of this process.
+            get_action_kwargs (Optional[dict]): Keyword args to pass into each (batched) `agent.get_action` call,
+                e.g. `use_exploration` or `extra_returns`. Only used if `agent` is given.
+        """
+        super(DynamicBatchingServer, self).__init__()
+
+        if (agent is None) == (batch_fn is None):
+            raise RLGraphError("ERROR: DynamicBatchingServer needs exactly one of `agent` and `batch_fn`!")
+        if minimum_batch_size < 1 or maximum_batch_size < minimum_batch_size:
+            raise RLGraphError(
+                "ERROR: Batch sizes must satisfy 1 <= minimum_batch_size ({}) <= maximum_batch_size ({})!".format(
+                    minimum_batch_size, maximum_batch_size
+                )
+            )
+        if agent is not None:
+            batch_fn = partial(agent.get_action, **(get_action_kwargs or {}))
+        self.batch_fn = batch_fn
+        self.minimum_batch_size = minimum_batch_size
+        self.maximum_batch_size = maximum_batch_size
+        self.timeout = timeout_ms / 1000.0 if timeout_ms is not None else None
+        self.use_processes = use_processes
+
+        if self.use_processes:
+            self.request_queue = multiprocessing.Queue()
+            # One response queue per client (index = client id).
+            self.response_queues = []
+        else:
+            self.request_queue = queue.Queue()
+        # A request that did not fit into the previous batch anymore.
+        self.pending_request = None
+        self.serving_thread = None
+
+        # Statistics.
+        self.num_requests = 0
+        self.num_batches = 0
+        self.num_states = 0
+
+        self.logger = logging.getLogger(__name__)
+
+    def start(self):
+        """
+        Starts the serving thread.
+        """
+        if self.serving_thread is not None:
+            raise RLGraphError("ERROR: DynamicBatchingServer has already been started!")
+        self.serving_thread = threading.Thread(target=self._serve, name="dynamic-batching-server")
+        self.serving_thread.daemon = True
+        self.serving_thread.start()
+
+    def stop(self):
+        """
+        Stops the serving thread after all requests sent so far have been computed.
+        """
+        if self.serving_thread is None:
+            return
+        self.request_queue.put(self.STOP)
+        self.serving_thread.join()
+        self.serving_thread = None
+
+    def get_action(self, states):
+        """
+        Sends `states` to the server and blocks until the respective actions have been computed.
+        Thread-safe. For calls from other processes, use a client (see `get_client`).
+
+        Args:
+            states (Union[np.ndarray,dict,tuple]): The (already batched) states. The first dimension of all
+                arrays is the batch dimension.
+
+        Returns:
+            any: The outputs of the batch function for `states` (e.g. the actions).
+        """
+        if self.use_processes:
+            raise RLGraphError("ERROR: Use `get_client()` to send requests to a process-based server!")
+        request = _Request()
+        self.request_queue.put((request, states))
+        return request.wait()
+
+    def get_client(self):
+        """
+        Creates a client that other processes can use to send requests to this server. Clients must be created
+        before the processes using them are started (and passed into these processes).
+
+        Returns:
+            DynamicBatchingClient: The new client.
+        """
+        if not self.use_processes:
+            raise RLGraphError("ERROR: Clients are only needed for `use_processes=True`. Call `get_action` directly!")
+        response_queue = multiprocessing.Queue()
+        self.response_queues.append(response_queue)
+        return DynamicBatchingClient(len(self.response_queues) - 1, self.request_queue, response_queue)
+
+    def get_stats(self):
+        """
+        Returns:
+            dict: Number of requests, batches and states served and the resulting mean batch size.
+        """
+        return dict(
+            num_requests=self.num_requests,
+            num_batches=self.num_batches,
+            num_states=self.num_states,
+            mean_batch_size=self.num_states / max(self.num_batches, 1)
+        )
+
+    def _serve(self):
+        while True:
+            requests, stop = self._collect_batch()
+            if len(requests) > 0:
+                self._compute_batch(requests)
+            if stop:
+                return
+
+    def _collect_batch(self):
+        """
+        Blocks until a batch is ready to be computed.
+
+        Returns:
+            tuple:
+                - list: The requests as (sender, states, batch-size) tuples.
+                - bool: Whether the server should stop after computing the batch.
+        """
+        requests = []
+        num_states = 0
+        deadline = None
+        while True:
+            if self.pending_request is not None:
+                request, self.pending_request = self.pending_request, None
+            else:
+                try:
+                    # Batch is large enough: Only add what's already there.
+                    if num_states >= self.minimum_batch_size:
+                        request = self.request_queue.get_nowait()
+                    # Wait for the first request forever, then until the timeout is reached.
+                    elif deadline is None:
+                        request = self.request_queue.get()
+                    else:
+                        remaining = deadline - time.time()
+                        if remaining <= 0.0:
+                            break
+                        request = self.request_queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+
+            if isinstance(request, str) and request == self.STOP:
+                return requests, True
+
+            sender, states = request
+            batch_size = _get_batch_size(states)
+            # Does not fit anymore: Compute it with the next batch.
+            if len(requests) > 0 and num_states + batch_size > self.maximum_batch_size:
+                self.pending_request = request
+                break
+            requests.append((sender, states, batch_size))
+            num_states += batch_size
+            if deadline is None:
+                deadline = time.time() + self.timeout if self.timeout is not None else float("inf")
+            if num_states >= self.maximum_batch_size:
+                break
+
+        return requests, False
+
+    def _compute_batch(self, requests):
+        batch_sizes = [batch_size for _, _, batch_size in requests]
+        try:
+            outputs = self.batch_fn(_concat([states for _, states, _ in requests]))
+            results = _split(outputs, batch_sizes)
+        except Exception as e:
+            self.logger.error("Computing batch of {} states failed: {}".format(sum(batch_sizes), e))
+            results = [e] * len(requests)
+            is_error = True
+        else:
+            is_error = False
+
+        self.num_requests += len(requests)
+        self.num_batches += 1
+        self.num_states += sum(batch_sizes)
+
+        for (sender, _, _), result in zip(requests, results):
+            if self.use_processes:
+                self.response_queues[sender].put((is_error, result if not is_error else str(result)))
+            else:
+                sender.set(result, is_error)
+
+
+class DynamicBatchingClient(object):
+    """
+    The process-side handle of a `DynamicBatchingServer` with `use_processes=True`.
+    """
+    def __init__(self, client_id, request_queue, response_queue):
+        self.client_id = client_id
+        self.request_queue = request_queue
+        self.response_queue = response_queue
+
+    def get_action(self, states):
+        """
+        Sends `states` to the server and blocks until the respective actions have been computed.
+
+        Args:
+            states (Union[np.ndarray,dict,tuple]): The (already batched) states.
+
+        Returns:
+            any: The outputs of the server's batch function for `states`.
+        """
+        self.request_queue.put((self.client_id, states))
+        is_error, result = self.response_queue.get()
+        if is_error:
+            raise RLGraphError("ERROR: Dynamic batching server failed to compute batch: {}".format(result))
+        return result
+
+
+class _Request(object):
+    """
+    A pending (thread-local) request waiting for its result.
+    """
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.is_error = False
+
+    def set(self, result, is_error=False):
+        self.result = result
+        self.is_error = is_error
+        self.event.set()
+
+    def wait(self):
+        self.event.wait()
+        if self.is_error:
+            raise self.result
+        return self.result
+
+
+def _get_batch_size(inputs):
+    if isinstance(inputs, dict):
+        return _get_batch_size(next(iter(inputs.values())))
+    elif isinstance(inputs, (tuple, list)):
+        return _get_batch_size(inputs[0])
+    return len(inputs)
+
+
+def _concat(inputs):
+    """
+    Concatenates a list of (possibly nested) batched inputs along their batch dimensions.
+    """
+    first = inputs[0]
+    if isinstance(first, dict):
+        return {key: _concat([input_[key] for input_ in inputs]) for key in first}
+    elif isinstance(first, (tuple, list)):
+        return type(first)(_concat([input_[i] for input_ in inputs]) for i in range(len(first)))
+    return np.concatenate([np.asarray(input_) for input_ in inputs], axis=0)
+
+
+def _split(outputs, batch_sizes):
+    """
+    Splits (possibly nested) batched outputs back into one output per request.
+    """
+    if isinstance(outputs, dict):
+        split_values = {key: _split(value, batch_sizes) for key, value in outputs.items()}
+        return [{key: split_values[key][i] for key in outputs} for i in range(len(batch_sizes))]
+    elif isinstance(outputs, (tuple, list)):
+        split_values = [_split(value, batch_sizes) for value in outputs]
+        return [type(outputs)(values[i] for values in split_values) for i in range(len(batch_sizes))]
+    return np.split(np.asarray(outputs), np.cumsum(batch_sizes)[:-1], axis=0)
@@ -13,41 +13,208 @@
 # limitations under the License.
 # ==============================================================================
 
-from __future__ import absolute_import
-from __future__ import division
-from __future__ import print_function
+import struct
+import zlib
 
+import numpy as np
+
+try:
+    import lz4.frame
+except ImportError:
+    lz4 = None
 
 
 class EnvironmentSample(object):
     """
     Represents a sampled trajectory from an environment.
+
+    Samples are stored column-wise: Each key of the sample batch is held as one contiguous numpy array or (e.g. for
+    states) as one CompressedColumn. Pickling a sample (e.g. into Ray's object store) thus serializes a handful of
+    buffers instead of one python object per record, and samples are merged by concatenating their columns.
     """
     def __init__(
         self,
         sample_batch,
         batch_size=None,
         metrics=None,
+        compressed_keys=None,
         **kwargs
     ):
         """
         Args:
-            sample_batch (dict): Dict containing sample trajectories.
+            sample_batch (dict): Dict containing sample trajectories. Values may be lists, arrays or CompressedColumns.
+            compressed_keys (Optional[Iterable[str]]): Keys of `sample_batch` to store compressed (one compressed
+                record per item), e.g. ["states"].
             **kwargs (dict): Any additional information relevant for processing the sample.
         """
-        self.sample_batch = sample_batch
+        compressed_keys = compressed_keys or ()
+        self.columns = {}
+        for key, value in sample_batch.items():
+            if isinstance(value, CompressedColumn):
+                self.columns[key] = value
+            elif key in compressed_keys:
+                self.columns[key] = CompressedColumn.from_array(value)
+            elif isinstance(value, (list, tuple, np.ndarray)):
+                self.columns[key] = np.asarray(value)
+            else:
+                self.columns[key] = value
         self.batch_size = batch_size
         self.metrics = metrics
         self.kwargs = kwargs
 
-    def get_batch(self):
+    @property
+    def sample_batch(self):
+        return self.get_batch()
+
+    def get_batch(self, decompress=True):
         """
         Get experience sample in insert format.
 
+        Args:
+            decompress (bool): If False, return the compressed records (a list of bytes) for compressed columns
+                instead of decompressing them (e.g. to store them compressed in a replay memory).
+
         Returns:
             dict: Sample batch.
         """
-        return self.sample_batch
+        return {
+            key: (column.to_array() if decompress else column.get_records())
+            if isinstance(column, CompressedColumn) else column for key, column in self.columns.items()
+        }
 
     def get_metrics(self):
         return self.metrics
+
+    @staticmethod
+    def merge(samples):
+        """
+        Merges samples into a single sample by concatenating their columns (compressed columns are not
+        decompressed).
+
+        Args:
+            samples (list): List of EnvironmentSamples with identical keys.
+
+        Returns:
+            EnvironmentSample: The merged sample.
+        """
+        columns = {}
+        for key, column in samples[0].columns.items():
+            if isinstance(column, CompressedColumn):
+                columns[key] = CompressedColumn.concat([sample.columns[key] for sample in samples])
+            else:
+                columns[key] = np.concatenate([sample.columns[key] for sample in samples])
+        batch_sizes = [sample.batch_size for sample in samples]
+        return EnvironmentSample(
+            sample_batch=columns,
+            batch_size=None if None in batch_sizes else sum(batch_sizes),
+            metrics=[sample.metrics for sample in samples]
+        )
+
+
+class CompressedColumn(object):
+    """
+    A column of individually compressed records (see `compress_array`), packed into one contiguous bytes buffer
+    plus an array of record end offsets. Records can be extracted without decompression (e.g. to be stored
+    compressed in a replay memory), and columns are merged by concatenating buffers.
+    """
+    def __init__(self, data, offsets):
+        """
+        Args:
+            data (bytes): The concatenated compressed records.
+            offsets (np.ndarray): The end offset of each record in `data`.
+        """
+        self.data = data
+        self.offsets = offsets
+
+    @staticmethod
+    def from_array(records):
+        """
+        Args:
+            records (Union[list,np.ndarray]): The records to compress (one per item along the first axis).
+
+        Returns:
+            CompressedColumn: The compressed column.
+        """
+        blobs = [compress_array(np.asarray(record)) for record in records]
+        return CompressedColumn(b"".join(blobs), np.cumsum([len(blob) for blob in blobs], dtype=np.int64))
+
+    @staticmethod
+    def concat(columns):
+        offsets = []
+        shift = 0
+        for column in columns:
+            offsets.append(column.offsets + shift)
+            shift += len(column.data)
+        return CompressedColumn(b"".join(column.data for column in columns), np.concatenate(offsets))
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def __getitem__(self, index):
+        """
+        Args:
+            index (Union[int,slice]): A record index or a slice of records (with step 1).
+
+        Returns:
+            Union[bytes,CompressedColumn]: A single compressed record or a column of the sliced records.
+        """
+        if isinstance(index, slice):
+            start, stop, _ = index.indices(len(self))
+            if start >= stop:
+                return CompressedColumn(b"", np.zeros(shape=(0,), dtype=np.int64))
+            begin = self.offsets[start - 1] if start > 0 else 0
+            return CompressedColumn(self.data[begin:self.offsets[stop - 1]], self.offsets[start:stop] - begin)
+        begin = self.offsets[index - 1] if index > 0 else 0
+        return self.data[begin:self.offsets[index]]
+
+    def get_records(self):
+        """
+        Returns:
+            list: The compressed records (bytes).
+        """
+        begins = [0] + self.offsets[:-1].tolist()
+        return [self.data[begin:end] for begin, end in zip(begins, self.offsets.tolist())]
+
+    def to_array(self):
+        """
+        Returns:
+            np.ndarray: All decompressed records, stacked along a new first axis.
+        """
+        return np.asarray([decompress_array(record) for record in self.get_records()])
+
+
+def compress_array(array):
+    """
+    Compresses a numpy array (including dtype and shape) into bytes, using lz4 if available, otherwise zlib.
+
+    Args:
+        array (np.ndarray): The array to compress.
+
+    Returns:
+        bytes: A one-byte codec marker, followed by the compressed dtype/shape header and array data.
+    """
+    array = np.ascontiguousarray(array)
+    dtype = array.dtype.str.encode("ascii")
+    header = struct.pack("<B{}sB{}i".format(len(dtype), array.ndim), len(dtype), dtype, array.ndim, *array.shape)
+    if lz4 is not None:
+        return b"L" + lz4.frame.compress(header + array.tobytes())
+    return b"Z" + zlib.compress(header + array.tobytes(), 1)
+
+
+def decompress_array(data):
+    """
+    Inverse of `compress_array`.
+
+    Args:
+        data (bytes): The compressed array.
+
+    Returns:
+        np.ndarray: The decompressed array.
+    """
+    payload = lz4.frame.decompress(data[1:]) if data[:1] == b"L" else zlib.decompress(data[1:])
+    dtype_length = payload[0]
+    dtype = np.dtype(payload[1:1 + dtype_length].decode("ascii"))
+    ndim = payload[1 + dtype_length]
+    offset = 2 + dtype_length
+    shape = struct.unpack_from("<{}i".format(ndim), payload, offset)
+    return np.frombuffer(payload, dtype=dtype, offset=offset + 4 * ndim).reshape(shape)
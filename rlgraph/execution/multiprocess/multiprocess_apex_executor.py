@@ -0,0 +1,38 @@
+# Copyright 2018/2019 The RLgraph authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+from six.moves import xrange as range_
+
+from rlgraph.execution.multiprocess.multiprocess_executor import MultiprocessExecutor
+from rlgraph.execution.ray.apex.apex_executor import ApexExecutor
+from rlgraph.execution.ray.apex.ray_memory_actor import RayMemoryActor
+
+
+class MultiprocessApexExecutor(MultiprocessExecutor, ApexExecutor):
+    """
+    Ape-X execution (see `ApexExecutor`) with sample workers and replay memory shards in local processes. The
+    learner runs in a thread of the executor's process, exactly as for Ray.
+    """
+    def create_replay_memories(self):
+        return [self.task_manager.create_actor(RayMemoryActor, self.apex_replay_spec)
+                for _ in range_(self.num_replay_workers)]
+
+    def get_sample_task_results(self, sample_tasks):
+        # Each task returns its (env sample, metrics) tuple.
+        return self.get_remote(sample_tasks)
@@ -0,0 +1,100 @@
+# Copyright 2018/2019 The RLgraph authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+from copy import deepcopy
+from six.moves import xrange as range_
+
+from rlgraph.execution.multiprocess.process_actor import ProcessTaskManager, ProcessTaskPool, SerializedObject
+from rlgraph.execution.ray.ray_executor import RayExecutor
+from rlgraph.execution.ray.ray_util import worker_exploration
+
+
+class MultiprocessExecutor(RayExecutor):
+    """
+    Abstract executor running the workflow of a Ray executor in local processes instead of on a Ray cluster.
+
+    Workers and memories are created as process actors (see `ProcessTaskManager`) from the same classes and
+    configs the Ray executors use. This avoids Ray's startup and object store overhead for single-node runs.
+    Sub-classes combine this class with a Ray executor, whose remote calls go through the overridden backend hooks
+    (`call_remote`, `send_remote`, `get_remote`, `put_remote`, ...).
+    """
+    # Created by `ray_init`.
+    task_manager = None
+
+    def ray_init(self):
+        """
+        Starts the local process task manager (in place of connecting to a Ray cluster). The executor spec's
+        "start_method" selects the multiprocessing start method (default: the platform's default).
+        """
+        self.logger.info("Initializing local process execution with executor spec:")
+        for spec_key, value in self.executor_spec.items():
+            self.logger.info("{}: {}".format(spec_key, value))
+        self.task_manager = ProcessTaskManager(start_method=self.executor_spec.get("start_method", None))
+
+    def create_remote_workers(self, cls, num_actors, agent_config, worker_spec, *args):
+        """
+        Creates process actors for sampling.
+
+        Args:
+            cls (Union[RayValueWorker, RayPolicyWorker]): Worker class.
+            num_actors (int): Num workers to create.
+            agent_config (dict): Agent config.
+            worker_spec (dict): Worker spec.
+            *args (any): Arguments for worker class.
+
+        Returns:
+            list: The ProcessActors.
+        """
+        workers = []
+        ray_constant_exploration = worker_spec.get("ray_constant_exploration", False)
+        for i in range_(num_actors):
+            if ray_constant_exploration is True:
+                worker_spec["ray_exploration"] = worker_exploration(i, num_actors)
+            worker = self.task_manager.create_actor(cls, deepcopy(agent_config), deepcopy(worker_spec), *args)
+            self.worker_ids[worker] = "worker_{}".format(i)
+            workers.append(worker)
+            self.logger.info("Successfully started worker process num {}.".format(i))
+
+        return workers
+
+    def call_remote(self, actor, method_name, *args):
+        return self.task_manager.submit(actor, method_name, *args)
+
+    def send_remote(self, actor, method_name, *args):
+        self.task_manager.send(actor, method_name, *args)
+
+    def get_remote(self, tasks):
+        return self.task_manager.get(tasks)
+
+    def put_remote(self, obj):
+        return SerializedObject(obj)
+
+    def create_task_pool(self):
+        return ProcessTaskPool(self.task_manager)
+
+    def wait_for_tasks(self, task_pools, timeout=None):
+        self.task_manager.wait([task_id for task_pool in task_pools for task_id in task_pool.get_pending()],
+                               timeout=timeout)
+
+    def shutdown(self):
+        """
+        Stops all worker and memory processes.
+        """
+        if self.task_manager is not None:
+            self.task_manager.shutdown()
@@ -0,0 +1,332 @@
+# Copyright 2018/2019 The RLgraph authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import itertools
+import multiprocessing
+import pickle
+import signal
+import time
+import traceback
+
+from six.moves import queue
+
+from rlgraph.utils.rlgraph_errors import RLGraphError
+
+
+class SerializedObject(object):
+    """
+    An object that is serialized only once, e.g. weights broadcast to many actors (analogous to `ray.put`).
+    Passing it as an argument to actor calls only copies the serialized bytes, the receiving actor method gets the
+    deserialized object.
+    """
+    def __init__(self, obj):
+        self.data = pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def get(self):
+        return pickle.loads(self.data)
+
+
+def run_actor(cls, args, request_queue, result_queue):
+    """
+    Main loop of an actor process: Constructs the actor object and executes the method calls arriving on the
+    request queue until a None request (shutdown) arrives.
+
+    Args:
+        cls (type): The class of the actor object (e.g. RayValueWorker).
+        args (tuple): Constructor args.
+        request_queue (multiprocessing.Queue): Queue of (task id, method name, serialized args) tuples.
+        result_queue (multiprocessing.Queue): Queue for (task id, serialized result, error) tuples. The task id is
+            None for failed calls of which no result was requested.
+    """
+    # Interrupts are handled by the executor's process, which shuts the actors down.
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+    error = None
+    try:
+        actor = cls(*args)
+    except Exception:
+        actor = None
+        error = "Constructor of {} failed:\n{}".format(cls.__name__, traceback.format_exc())
+
+    while True:
+        request = request_queue.get()
+        if request is None:
+            break
+        task_id, method_name, serialized_args = request
+        # Every call fails if the constructor did.
+        if error is not None:
+            result_queue.put((task_id, None, error))
+            continue
+        try:
+            method_args = [arg.get() if isinstance(arg, SerializedObject) else arg
+                           for arg in pickle.loads(serialized_args)]
+            result = getattr(actor, method_name)(*method_args)
+            if task_id is not None:
+                # Serialize here to surface serialization errors (the queue's feeder thread only prints them).
+                result_queue.put((task_id, pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL), None))
+        except Exception:
+            result_queue.put((task_id, None, "{}.{} failed:\n{}".format(
+                cls.__name__, method_name, traceback.format_exc()
+            )))
+
+
+class ProcessActor(object):
+    """
+    Runs an actor object (e.g. a RayValueWorker or RayMemoryActor) in a separate local process. Calls to the actor
+    are scheduled via the ProcessTaskManager that created it.
+    """
+    def __init__(self, cls, args, result_queue, context, name=None):
+        """
+        Args:
+            cls (type): The class of the actor object.
+            args (tuple): Constructor args.
+            result_queue (multiprocessing.Queue): The result queue shared by all actors of the task manager.
+            context (multiprocessing.context.BaseContext): The multiprocessing context to create the process with.
+            name (Optional[str]): Name of the process.
+        """
+        self.name = name or cls.__name__
+        self.request_queue = context.Queue()
+        self.process = context.Process(
+            target=run_actor, args=(cls, args, self.request_queue, result_queue), name=self.name
+        )
+        # Terminate when host process terminates.
+        self.process.daemon = True
+        self.process.start()
+
+    def is_alive(self):
+        return self.process.is_alive()
+
+    def stop(self, timeout=5.0):
+        """
+        Shuts the actor process down after its pending calls (terminating it if that takes longer than `timeout`).
+        """
+        if self.process.is_alive():
+            self.request_queue.put(None)
+            self.process.join(timeout)
+            if self.process.is_alive():
+                self.process.terminate()
+                self.process.join()
+
+
+class ProcessTaskManager(object):
+    """
+    Creates process actors, schedules method calls (tasks) on them and collects the results, which all actors
+    send to one shared result queue. This provides the subset of Ray's task semantics (remote calls, `get`, `wait`,
+    `put`) the executors need, on a single node and without any cluster startup or object store.
+    """
+    def __init__(self, start_method=None, liveness_check_interval=1.0):
+        """
+        Args:
+            start_method (Optional[str]): The multiprocessing start method ("fork", "spawn" or "forkserver").
+                Default: The platform's default.
+            liveness_check_interval (float): While blocking on results, how often (in seconds) to check whether
+                the actors executing the awaited tasks are still alive.
+        """
+        self.context = multiprocessing.get_context(start_method)
+        self.liveness_check_interval = liveness_check_interval
+        self.result_queue = self.context.Queue()
+        self.actors = []
+
+        self.task_ids = itertools.count()
+        # Maps pending task ids to their actors.
+        self.task_actors = {}
+        # Received (serialized result, error) tuples by task id.
+        self.results = {}
+
+    def create_actor(self, cls, *args):
+        """
+        Creates an actor object in a new process.
+
+        Args:
+            cls (type): The class of the actor object.
+            *args (any): Constructor args.
+
+        Returns:
+            ProcessActor: The actor.
+        """
+        actor = ProcessActor(
+            cls, args, self.result_queue, self.context, name="{}-{}".format(cls.__name__, len(self.actors))
+        )
+        self.actors.append(actor)
+        return actor
+
+    def submit(self, actor, method_name, *args):
+        """
+        Schedules a method call on an actor.
+
+        Args:
+            actor (ProcessActor): The actor to call.
+            method_name (str): Name of the method to call.
+            *args (any): Method args. Arguments are serialized right away, so they may be modified afterwards.
+
+        Returns:
+            int: The task id to fetch the result with (see `get` and `wait`).
+        """
+        task_id = next(self.task_ids)
+        self.task_actors[task_id] = actor
+        actor.request_queue.put((task_id, method_name, pickle.dumps(args, protocol=pickle.HIGHEST_PROTOCOL)))
+        return task_id
+
+    def send(self, actor, method_name, *args):
+        """
+        Schedules a method call on an actor without fetching its result (e.g. to insert samples or set weights).
+        Failures are raised by subsequent `wait` or `get` calls.
+
+        Args:
+            actor (ProcessActor): The actor to call.
+            method_name (str): Name of the method to call.
+            *args (any): Method args.
+        """
+        actor.request_queue.put((None, method_name, pickle.dumps(args, protocol=pickle.HIGHEST_PROTOCOL)))
+
+    def wait(self, task_ids, timeout=None):
+        """
+        Blocks until at least one of the given tasks has completed.
+
+        Args:
+            task_ids (list): Ids of pending tasks.
+            timeout (Optional[float]): The maximum time (in seconds) to wait. 0 does not wait at all, None blocks
+                until a task has completed.
+
+        Returns:
+            list: The ids of all given tasks that have completed (empty if the timeout passed).
+        """
+        task_ids = list(task_ids)
+        if len(task_ids) == 0:
+            return []
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        self._receive_results(block=False)
+        while not any(task_id in self.results for task_id in task_ids):
+            wait_time = self.liveness_check_interval
+            if deadline is not None:
+                wait_time = min(deadline - time.monotonic(), wait_time)
+                if wait_time <= 0:
+                    break
+            if not self._receive_results(block=True, timeout=wait_time):
+                self._check_actors_alive(task_ids)
+        return [task_id for task_id in task_ids if task_id in self.results]
+
+    def get(self, task_ids):
+        """
+        Blocks until the given task(s) have completed and returns their results.
+
+        Args:
+            task_ids (Union[int, list]): A task id or a list of task ids.
+
+        Returns:
+            any: The result or a list of results.
+
+        Raises:
+            RLGraphError: If a task failed.
+        """
+        if isinstance(task_ids, list):
+            return [self.get(task_id) for task_id in task_ids]
+
+        while task_ids not in self.results:
+            self.wait([task_ids])
+        result, error = self.results.pop(task_ids)
+        del self.task_actors[task_ids]
+        if error is not None:
+            raise RLGraphError("Process actor task failed: {}".format(error))
+        return pickle.loads(result)
+
+    def shutdown(self):
+        """
+        Stops all actor processes.
+        """
+        for actor in self.actors:
+            actor.stop()
+        self.actors = []
+
+    def _receive_results(self, block, timeout=None):
+        """
+        Moves all results available on the result queue into `self.results`.
+
+        Args:
+            block (bool): Whether to block (up to `timeout` seconds) until the first result arrives.
+            timeout (Optional[float]): Maximum time (in seconds) to block.
+
+        Returns:
+            bool: True if any result was received.
+        """
+        received = False
+        try:
+            while True:
+                task_id, result, error = self.result_queue.get(block=block and not received, timeout=timeout)
+                received = True
+                if task_id is None:
+                    raise RLGraphError("Process actor call failed: {}".format(error))
+                self.results[task_id] = (result, error)
+        except queue.Empty:
+            pass
+        return received
+
+    def _check_actors_alive(self, task_ids):
+        for task_id in task_ids:
+            actor = self.task_actors.get(task_id)
+            if actor is not None and not actor.is_alive():
+                raise RLGraphError("Process actor {} (pid {}) died with exit code {} while executing a task.".format(
+                    actor.name, actor.process.pid, actor.process.exitcode
+                ))
+
+
+class ProcessTaskPool(object):
+    """
+    Manages a set of tasks currently being executed by process actors (analogous to RayTaskPool).
+    """
+    def __init__(self, task_manager):
+        """
+        Args:
+            task_manager (ProcessTaskManager): The task manager the tasks were submitted to.
+        """
+        self.task_manager = task_manager
+        self.tasks = {}
+
+    def add_task(self, worker, task_id):
+        """
+        Adds a task to the task pool.
+
+        Args:
+            worker (ProcessActor): Worker completing the task.
+            task_id (int): The task id returned by `ProcessTaskManager.submit`.
+        """
+        self.tasks[task_id] = worker
+
+    def get_completed(self, timeout=0.01):
+        """
+        Waits on pending tasks and yields them upon completion.
+
+        Args:
+            timeout (Optional[float]): The maximum time (in seconds) to wait for the first task to complete. All
+                other tasks that are done by then are returned as well. 0 does not wait at all, None blocks until a
+                task has completed. Default: 0.01.
+
+        Returns:
+            generator: Yields (worker, task id) tuples of completed tasks.
+        """
+        for task_id in self.task_manager.wait(list(self.tasks), timeout=timeout):
+            yield self.tasks.pop(task_id), task_id
+
+    def get_pending(self):
+        """
+        Returns:
+            list: The ids of all pending tasks.
+        """
+        return list(self.tasks)
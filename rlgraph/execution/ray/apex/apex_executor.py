@@ -17,21 +17,22 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
+from collections import deque
+import itertools
+import os
 import random
+import time
 
 from rlgraph.environments import Environment
 from six.moves import queue
 from threading import Thread
 
-from rlgraph import get_distributed_backend
 from rlgraph.agents import Agent
 from rlgraph.execution.ray import RayValueWorker
 from rlgraph.execution.ray.apex.ray_memory_actor import RayMemoryActor
+from rlgraph.execution.ray.apex.sharded_prioritized_replay import ShardedPrioritizedReplay
 from rlgraph.execution.ray.ray_executor import RayExecutor
-from rlgraph.execution.ray.ray_util import create_colocated_ray_actors, RayTaskPool, RayWeight
-
-if get_distributed_backend() == "ray":
-    import ray
+from rlgraph.execution.ray.ray_util import create_colocated_ray_actors, RayWeight
 
 
 class ApexExecutor(RayExecutor):
@@ -65,11 +66,21 @@ class ApexExecutor(RayExecutor):
 
         # These are the Ray remote tasks which sample batches from the replay memory
         # and pass them to the learner.
-        self.prioritized_replay_tasks = RayTaskPool()
+        # Created with the first tasks (see `init_tasks`).
+        self.prioritized_replay_tasks = None
         self.replay_sampling_task_depth = self.executor_spec["replay_sampling_task_depth"]
         self.replay_batch_size = self.agent_config["update_spec"]["batch_size"]
         self.num_cpus_per_replay_actor = self.executor_spec.get("num_cpus_per_replay_actor",
                                                                 self.replay_sampling_task_depth)
+        # Whether to sample the replay shards proportionally to their priority mass (with globally normalized
+        # importance weights) instead of uniformly.
+        self.global_prioritization = self.executor_spec.get("global_prioritization", True)
+        # Insert tasks returning the shard statistics after inserting (only with global prioritization), so shards
+        # which are rarely sampled (or were empty when last sampled) do not keep stale statistics.
+        self.observe_tasks = None
+        # Pending tasks returning shard statistics -> their version (order of submission).
+        self.shard_stats_versions = {}
+        self.shard_stats_version_counter = itertools.count()
 
         # How often weights are synced to remote workers.
         self.weight_sync_steps = self.executor_spec["weight_sync_steps"]
@@ -79,9 +90,25 @@ class ApexExecutor(RayExecutor):
         self.steps_since_weights_synced = {}
 
         # These are the tasks actually interacting with the environment.
-        self.env_sample_tasks = RayTaskPool()
+        self.env_sample_tasks = None
         self.env_interaction_task_depth = self.executor_spec["env_interaction_task_depth"]
         self.worker_sample_size = self.executor_spec["num_worker_samples"] + self.worker_spec["n_step_adjustment"] - 1
+        self.sample_sizer = self.create_sample_sizer(self.worker_sample_size)
+        if self.sample_sizer is not None:
+            # Each task must at least cover the n-step horizon.
+            self.sample_sizer.min_sample_size = max(self.sample_sizer.min_sample_size,
+                                                    self.worker_spec["n_step_adjustment"])
+        # With adaptive sample sizes: The total number of sample tasks to keep in flight, split across workers by
+        # throughput (default: `env_interaction_task_depth` per worker).
+        self.target_in_flight_tasks = self.executor_spec.get("target_in_flight_tasks")
+        # With adaptive sample sizes: The number of replayed samples the learner should consume per env sample. If
+        # given, the learner's consumption (in env samples) scales the sample sizes (see `AdaptiveSampleSizer`).
+        self.target_replay_ratio = self.executor_spec.get("target_replay_ratio")
+        # Pending sample tasks per worker.
+        self.sample_tasks_in_flight = {}
+        # Replayed samples consumed by the learner since `consumption_start` (measured over at least one second).
+        self.consumed_samples = 0
+        self.consumption_start = None
 
         assert not ray_spec, "ERROR: ray_spec still contains items: {}".format(ray_spec)
         self.logger.info("Setting up execution for Apex executor.")
@@ -125,11 +152,10 @@ class ApexExecutor(RayExecutor):
         self.apex_replay_spec["sample_batch_size"] = self.agent_config["update_spec"]["batch_size"]
         self.logger.info("Sampling batch size {}".format(self.apex_replay_spec["sample_batch_size"]))
 
-        self.ray_local_replay_memories = create_colocated_ray_actors(
-            cls=RayMemoryActor.as_remote(num_cpus=self.num_cpus_per_replay_actor),
-            config=self.apex_replay_spec,
-            num_agents=self.num_replay_workers
-        )
+        self.ray_local_replay_memories = self.create_replay_memories()
+        # Tracks the priority statistics of the memory shards to choose which one to sample from.
+        self.sharded_replay = ShardedPrioritizedReplay(num_shards=self.num_replay_workers)
+        self.replay_shard_indices = {memory: i for i, memory in enumerate(self.ray_local_replay_memories)}
 
         # Create remote workers for data collection.
         self.worker_spec["worker_sample_size"] = self.worker_sample_size
@@ -142,7 +168,51 @@ class ApexExecutor(RayExecutor):
         )
         self.init_tasks()
 
+    def create_replay_memories(self):
+        """
+        Creates the replay memory shards (co-located with the executor if possible).
+
+        Returns:
+            list: The remote memory actors.
+        """
+        return create_colocated_ray_actors(
+            cls=RayMemoryActor.as_remote(num_cpus=self.num_cpus_per_replay_actor),
+            config=self.apex_replay_spec,
+            num_agents=self.num_replay_workers
+        )
+
+    def store_memory_snapshots(self, directory):
+        """
+        Stores (incremental) snapshots of all replay memory shards, one sub-directory per shard.
+
+        Args:
+            directory (str): The snapshot directory (on the replay actors' hosts).
+        """
+        num_records = self.get_remote([
+            self.call_remote(memory, "store_snapshot", os.path.join(directory, "memory-{}".format(i)))
+            for i, memory in enumerate(self.ray_local_replay_memories)
+        ])
+        self.logger.info("Stored {} replay records to {}.".format(sum(num_records), directory))
+
+    def load_memory_snapshots(self, directory):
+        """
+        Restores all replay memory shards from snapshots written by `store_memory_snapshots` (with the same
+        number of replay workers).
+
+        Args:
+            directory (str): The snapshot directory (on the replay actors' hosts).
+        """
+        num_records = self.get_remote([
+            self.call_remote(memory, "load_snapshot", os.path.join(directory, "memory-{}".format(i)))
+            for i, memory in enumerate(self.ray_local_replay_memories)
+        ])
+        self.logger.info("Loaded {} replay records from {}.".format(sum(num_records), directory))
+
     def init_tasks(self):
+        self.env_sample_tasks = self.create_task_pool()
+        self.prioritized_replay_tasks = self.create_task_pool()
+        self.observe_tasks = self.create_task_pool()
+
         # Start learner thread.
         self.update_worker.start()
 
@@ -150,19 +220,117 @@ class ApexExecutor(RayExecutor):
         for ray_memory in self.ray_local_replay_memories:
             for _ in range(self.replay_sampling_task_depth):
                 # This initializes remote tasks to sample from the prioritized replay memories of each worker.
-                self.prioritized_replay_tasks.add_task(ray_memory, ray_memory.get_batch.remote())
+                self.schedule_replay_sampling_task(ray_memory)
 
         # Env interaction tasks via RayWorkers which each
         # have a local agent.
-        weights = RayWeight(self.local_agent.get_weights())
+        weights = self.put_remote(RayWeight(self.local_agent.get_weights()))
         for ray_worker in self.ray_env_sample_workers:
-            ray_worker.set_weights.remote(weights)
+            self.send_remote(ray_worker, "set_weights", weights)
             self.steps_since_weights_synced[ray_worker] = 0
 
             self.logger.info("Synced worker {} weights, initializing sample tasks.".format(
                 self.worker_ids[ray_worker]))
-            for _ in range(self.env_interaction_task_depth):
-                self.env_sample_tasks.add_task(ray_worker, ray_worker.execute_and_get_with_count.remote())
+            self.sample_tasks_in_flight[ray_worker] = 0
+            self.schedule_sample_tasks(ray_worker)
+        if self.target_in_flight_tasks is None:
+            self.target_in_flight_tasks = self.env_interaction_task_depth * len(self.ray_env_sample_workers)
+        self.consumption_start = time.perf_counter()
+
+    def get_sample_task_depth(self, ray_worker):
+        """
+        Args:
+            ray_worker (RayValueWorker): The worker to get the number of in-flight sample tasks for.
+
+        Returns:
+            int: The number of sample tasks to keep in flight on the worker. Fixed to `env_interaction_task_depth`,
+                unless adaptive sample sizes are enabled (then the worker's share of `target_in_flight_tasks`).
+        """
+        if self.sample_sizer is None or self.target_in_flight_tasks is None:
+            return self.env_interaction_task_depth
+        return self.sample_sizer.get_task_depth(
+            ray_worker, self.target_in_flight_tasks, len(self.ray_env_sample_workers)
+        )
+
+    def schedule_sample_tasks(self, ray_worker):
+        """
+        Schedules environment sampling tasks on a worker until its task depth (see `get_sample_task_depth`) is
+        reached. Tasks are sized by the worker's throughput if adaptive sample sizes are enabled.
+
+        Args:
+            ray_worker (RayValueWorker): The worker to sample on.
+        """
+        for _ in range(self.get_sample_task_depth(ray_worker) - self.sample_tasks_in_flight[ray_worker]):
+            sample_size = self.sample_sizer.get_sample_size(ray_worker) if self.sample_sizer is not None else None
+            self.env_sample_tasks.add_task(
+                ray_worker, self.call_remote(ray_worker, "execute_and_get_with_count", sample_size)
+            )
+            self.sample_tasks_in_flight[ray_worker] += 1
+
+    def update_consumption(self, num_samples):
+        """
+        Measures the learner's consumption of env samples (replayed samples divided by `target_replay_ratio`) for
+        the adaptive sample sizes.
+
+        Args:
+            num_samples (int): The number of replayed samples the learner consumed since the last call.
+        """
+        if self.sample_sizer is None or self.target_replay_ratio is None:
+            return
+        self.consumed_samples += num_samples
+        runtime = time.perf_counter() - self.consumption_start
+        if runtime >= 1.0:
+            self.sample_sizer.update_consumption(self.consumed_samples / self.target_replay_ratio, runtime)
+            self.consumed_samples = 0
+            self.consumption_start = time.perf_counter()
+
+    def schedule_replay_sampling_task(self, ray_memory=None):
+        """
+        Schedules a batch sampling task on a replay memory shard.
+
+        Args:
+            ray_memory (Optional[RayMemoryActor]): The shard to sample from. If None, the shard is chosen
+                proportionally to its priority mass if `global_prioritization` is True (else it is the one whose task
+                just completed and must be given).
+        """
+        if self.global_prioritization is False:
+            self.prioritized_replay_tasks.add_task(ray_memory, self.call_remote(ray_memory, "get_batch"))
+        else:
+            if ray_memory is None:
+                ray_memory = self.ray_local_replay_memories[self.sharded_replay.choose_shard()]
+            global_stats = self.sharded_replay.get_global_stats()
+            task = self.call_remote(
+                ray_memory, "get_batch_and_stats", global_stats if global_stats[0] > 0.0 else None
+            )
+            self.shard_stats_versions[task] = next(self.shard_stats_version_counter)
+            self.prioritized_replay_tasks.add_task(ray_memory, task)
+
+    def set_shard_stats(self, ray_memory, task, shard_stats):
+        """
+        Sets the shard statistics returned by a completed task, unless newer statistics of the shard are known.
+
+        Args:
+            ray_memory (RayMemoryActor): The memory shard which executed the task.
+            task (any): The completed task.
+            shard_stats (tuple): The (priority sum, min priority, size) of the shard returned by the task.
+        """
+        self.sharded_replay.set_shard_stats(
+            self.replay_shard_indices[ray_memory], shard_stats, version=self.shard_stats_versions.pop(task)
+        )
+
+    def get_sample_task_results(self, sample_tasks):
+        """
+        Fetches the results of completed `execute_and_get_with_count` tasks.
+
+        Args:
+            sample_tasks (list): The completed tasks.
+
+        Returns:
+            list: One (env sample, metrics) tuple per task. With Ray, the env sample is an object id, so it can
+                be passed on to a memory actor without fetching it.
+        """
+        metrics = self.get_remote([sample_task[1] for sample_task in sample_tasks])
+        return [(sample_task[0], sample_metrics) for sample_task, sample_metrics in zip(sample_tasks, metrics)]
 
     def _execute_step(self):
         """
@@ -182,59 +350,76 @@ class ApexExecutor(RayExecutor):
         rewards = []
         weights = None
 
+        # Block until any sample or replay task is done (or the timeout passes to process finished updates).
+        self.wait_for_tasks([self.env_sample_tasks, self.prioritized_replay_tasks], timeout=self.task_wait_timeout)
+
         # 1. Fetch results from RayWorkers.
-        completed_sample_tasks = list(self.env_sample_tasks.get_completed())
-        sample_batch_metrics = ray.get([task[1][1] for task in completed_sample_tasks])
-        for i, (ray_worker, (env_sample_obj_id, sample_size)) in enumerate(completed_sample_tasks):
+        completed_sample_tasks = list(self.env_sample_tasks.get_completed(timeout=0))
+        sample_results = self.get_sample_task_results([task for _, task in completed_sample_tasks])
+        for (ray_worker, _), (env_sample, sample_metrics) in zip(completed_sample_tasks, sample_results):
+            self.sample_tasks_in_flight[ray_worker] -= 1
             # Randomly add env sample to a local replay actor.
-            random.choice(self.ray_local_replay_memories).observe.remote(env_sample_obj_id)
-            sample_steps = sample_batch_metrics[i]["batch_size"]
-            if len(sample_batch_metrics[i]["last_rewards"]) > 0:
-                rewards.extend(sample_batch_metrics[i]["last_rewards"])
+            ray_memory = random.choice(self.ray_local_replay_memories)
+            if self.global_prioritization is True:
+                observe_task = self.call_remote(ray_memory, "observe", env_sample)
+                self.shard_stats_versions[observe_task] = next(self.shard_stats_version_counter)
+                self.observe_tasks.add_task(ray_memory, observe_task)
+            else:
+                self.send_remote(ray_memory, "observe", env_sample)
+            sample_steps = sample_metrics["batch_size"]
+            if len(sample_metrics["last_rewards"]) > 0:
+                rewards.extend(sample_metrics["last_rewards"])
             env_steps += sample_steps
+            if self.sample_sizer is not None:
+                self.sample_sizer.update(ray_worker, sample_metrics["timesteps_executed"], sample_metrics["runtime"])
 
             self.steps_since_weights_synced[ray_worker] += sample_steps
             if self.steps_since_weights_synced[ray_worker] >= self.weight_sync_steps:
                 if weights is None or self.update_worker.update_done:
                     self.update_worker.update_done = False
-                    weights = ray.put(RayWeight(self.local_agent.get_weights()))
-                # self.logger.debug("Syncing weights for worker {}".format(self.worker_ids[ray_worker]))
-                # self.logger.debug("Weights type: {}, weights = {}".format(type(weights), weights))
-                ray_worker.set_weights.remote(weights)
+                    weights = self.put_remote(RayWeight(self.local_agent.get_weights()))
+                self.send_remote(ray_worker, "set_weights", weights)
                 self.weight_syncs_executed += 1
                 self.steps_since_weights_synced[ray_worker] = 0
 
             # Reschedule environment samples.
-            self.env_sample_tasks.add_task(ray_worker, ray_worker.execute_and_get_with_count.remote())
+            self.schedule_sample_tasks(ray_worker)
+
+        # Update shard statistics after inserts.
+        for ray_memory, observe_task in self.observe_tasks.get_completed(timeout=0):
+            self.set_shard_stats(ray_memory, observe_task, self.get_remote(observe_task))
 
         # 2. Fetch completed replay priority sampling task, move to worker, reschedule.
-        for ray_memory, replay_remote_task in self.prioritized_replay_tasks.get_completed():
-            # Immediately schedule new batch sampling tasks on these workers.
-            self.prioritized_replay_tasks.add_task(ray_memory, ray_memory.get_batch.remote())
+        for ray_memory, replay_remote_task in self.prioritized_replay_tasks.get_completed(timeout=0):
+            # Retrieve results via id (also if discarded: the shard statistics are kept up to date and process
+            # actor results must be collected).
+            sampled_batch = self.get_remote(replay_remote_task)
+            if self.global_prioritization is True:
+                sampled_batch, shard_stats = sampled_batch
+                self.set_shard_stats(ray_memory, replay_remote_task, shard_stats)
+                # Immediately schedule a new batch sampling task on a shard chosen by priority mass.
+                self.schedule_replay_sampling_task()
+            else:
+                # Immediately schedule new batch sampling tasks on these workers.
+                self.schedule_replay_sampling_task(ray_memory)
 
-            # Retrieve results via id.
-            # self.logger.info("replay task obj id {}".format(replay_remote_task))
             if self.discard_queued_samples and self.update_worker.input_queue.full():
                 discarded += 1
             else:
-                sampled_batch = ray.get(object_ids=replay_remote_task)
                 # Pass to the agent doing the actual updates.
                 # The ray worker is passed along because we need to update its priorities later in the subsequent
                 # task (see loop below).
                 # Copy due to memory leaks in Ray, see https://github.com/ray-project/ray/pull/3484/
-
                 self.update_worker.input_queue.put((ray_memory, sampled_batch and sampled_batch.copy()))
                 queue_inserts += 1
 
         # 3. Update priorities on priority sampling workers using loss values produced by update worker.
         while not self.update_worker.output_queue.empty():
             ray_memory, indices, loss_per_item = self.update_worker.output_queue.get()
-            # self.logger.info('indices = {}'.format(batch["indices"]))
-            # self.logger.info('loss = {}'.format(loss_per_item))
-
-            ray_memory.update_priorities.remote(indices, loss_per_item)
+            self.send_remote(ray_memory, "update_priorities", indices, loss_per_item)
             # len of loss per item is update count.
             update_steps += len(indices)
+        self.update_consumption(update_steps)
 
         return env_steps, update_steps, {
             "discarded": discarded,
@@ -272,6 +457,10 @@ class UpdateWorker(Thread):
         # Flag for main thread.
         self.update_done = False
 
+        # If the agent feeds external batches through an input pipeline: Memory actors and indices of the batches
+        # inserted into the pipeline, but not yet used for an update (in insertion order).
+        self.pending_batches = deque()
+
     def run(self):
         while True:
             self.step()
@@ -281,8 +470,30 @@ class UpdateWorker(Thread):
         # Replay memory used.
         memory_actor, sample_batch = self.input_queue.get()
 
-        if sample_batch is not None:
+        if sample_batch is not None and getattr(self.agent, "input_pipeline", None) is not None:
+            self.pipelined_step(memory_actor, sample_batch)
+        elif sample_batch is not None:
             losses = self.agent.update(batch=sample_batch)
             # Just pass back indices for updating.
             self.output_queue.put((memory_actor, sample_batch["indices"], losses[1]))
             self.update_done = True
+
+    def pipelined_step(self, memory_actor, sample_batch):
+        """
+        Inserts the given and all further already arrived samples into the agent's input pipeline (up to its
+        capacity), so the pipeline can prepare them while the update on the oldest of them runs.
+        """
+        input_pipeline = self.agent.input_pipeline
+        input_pipeline.insert(sample_batch)
+        self.pending_batches.append((memory_actor, sample_batch["indices"]))
+        while len(self.pending_batches) < input_pipeline.capacity and not self.input_queue.empty():
+            memory_actor, sample_batch = self.input_queue.get_nowait()
+            if sample_batch is None:
+                break
+            input_pipeline.insert(sample_batch)
+            self.pending_batches.append((memory_actor, sample_batch["indices"]))
+
+        losses = self.agent.update()
+        memory_actor, indices = self.pending_batches.popleft()
+        self.output_queue.put((memory_actor, indices, losses[1]))
+        self.update_done = True
@@ -19,9 +19,9 @@ from __future__ import print_function
 
 import numpy as np
 import operator
-from six.moves import xrange as range_
 
 from rlgraph.utils import SMALL_NUMBER
+from rlgraph.utils.snapshot_util import store_memory_snapshot, load_memory_snapshot
 from rlgraph.utils.specifiable import Specifiable
 from rlgraph.components.helpers.mem_segment_tree import MemSegmentTree, MinSumSegmentTree
 from rlgraph.execution.ray.ray_util import ray_decompress
@@ -31,12 +31,15 @@ class ApexMemory(Specifiable):
     """
     Apex prioritized replay implementing compression.
     """
-    def __init__(self, capacity=1000, alpha=1.0, beta=1.0):
+    def __init__(self, capacity=1000, alpha=1.0, beta=1.0, stratified_sampling=False, unique_indices=False):
         """
         Args:
             capacity (int): Max capacity.
             alpha (float): Initial weight.
             beta (float): Prioritisation factor.
+            stratified_sampling (bool): Whether to draw one sample per segment of equal priority mass (instead of
+                independent samples).
+            unique_indices (bool): Whether to remove duplicate indices from sampled batches.
         """
         super(ApexMemory, self).__init__()
 
@@ -47,16 +50,22 @@ class ApexMemory(Specifiable):
         self.max_priority = 1.0
         self.alpha = alpha
         self.beta = beta
+        self.stratified_sampling = stratified_sampling
+        self.unique_indices = unique_indices
 
         self.default_new_weight = np.power(self.max_priority, self.alpha)
+        # Total number of inserted records and its value at the last snapshot.
+        self.num_inserted = 0
+        self.num_inserted_at_snapshot = 0
+
         self.priority_capacity = 1
         while self.priority_capacity < self.capacity:
             self.priority_capacity *= 2
 
         # Create segment trees, initialize with neutral elements.
-        sum_values = [0.0 for _ in range_(2 * self.priority_capacity)]
+        sum_values = np.zeros(shape=(2 * self.priority_capacity,))
         sum_segment_tree = MemSegmentTree(sum_values, self.priority_capacity, operator.add)
-        min_values = [float('inf') for _ in range_(2 * self.priority_capacity)]
+        min_values = np.full(shape=(2 * self.priority_capacity,), fill_value=float("inf"))
         min_segment_tree = MemSegmentTree(min_values, self.priority_capacity, min)
         self.merged_segment_tree = MinSumSegmentTree(
             sum_tree=sum_segment_tree,
@@ -81,6 +90,33 @@ class ApexMemory(Specifiable):
         # Update indices.
         self.index = (self.index + 1) % self.capacity
         self.size = min(self.size + 1, self.capacity)
+        self.num_inserted += 1
+
+    def insert_batch(self, records):
+        """
+        Inserts several records with a single (batched) priority update.
+
+        Args:
+            records (list): The records, each as expected by `insert_records`.
+
+        Returns:
+            tuple: The (priority sum, min priority, size) after the insert (see `get_priority_stats`).
+        """
+        indices = np.empty(shape=(len(records),), dtype=np.int64)
+        priorities = np.empty(shape=(len(records),))
+        for i, record in enumerate(records):
+            if self.index >= self.size:
+                self.memory_values.append(record)
+            else:
+                self.memory_values[self.index] = record
+            indices[i] = self.index
+            priorities[i] = record[5] if record[5] is not None else self.max_priority
+
+            self.index = (self.index + 1) % self.capacity
+            self.size = min(self.size + 1, self.capacity)
+        self.num_inserted += len(records)
+        self.merged_segment_tree.insert_batch(indices, priorities ** self.alpha)
+        return self.get_priority_stats()
 
     def read_records(self, indices):
         """
@@ -113,26 +149,107 @@ class ApexMemory(Specifiable):
             next_states=np.asarray(next_states)
         )
 
-    def get_records(self, num_records):
-        indices = []
-        prob_sum = self.merged_segment_tree.sum_segment_tree.get_sum(0, self.size)
-        samples = np.random.random(size=(num_records,)) * prob_sum
-        for sample in samples:
-            indices.append(self.merged_segment_tree.sum_segment_tree.index_of_prefixsum(prefix_sum=sample))
-
-        sum_prob = self.merged_segment_tree.sum_segment_tree.get_sum()
-        min_prob = self.merged_segment_tree.min_segment_tree.get_min_value() / sum_prob + SMALL_NUMBER
-        max_weight = (min_prob * self.size) ** (-self.beta)
-        weights = []
-        for index in indices:
-            sample_prob = self.merged_segment_tree.sum_segment_tree.get(index) / sum_prob
-            weight = (sample_prob * self.size) ** (-self.beta)
-            weights.append(weight / max_weight)
+    def get_records(self, num_records, global_stats=None):
+        """
+        Samples records proportionally to their priorities.
 
-        return self.read_records(indices=indices), np.asarray(indices), np.asarray(weights)
+        Args:
+            num_records (int): The number of records to sample.
+            global_stats (Optional[tuple]): If this memory is one shard of a sharded replay (see
+                `ShardedPrioritizedReplay`): The (priority sum, min priority, size) over all shards. Importance
+                weights are then normalized w.r.t. the global sampling distribution (given that this shard was chosen
+                proportionally to its priority mass).
+
+        Returns:
+            tuple: The record dict, the sampled indices and their importance weights.
+        """
+        sum_segment_tree = self.merged_segment_tree.sum_segment_tree
+        prob_sum = sum_segment_tree.get_sum(0, self.size)
+        indices = sum_segment_tree.sample(num_records, prob_sum, stratified=self.stratified_sampling)
+        if self.unique_indices is True:
+            indices = np.unique(indices)
+
+        if global_stats is None:
+            sum_prob, min_priority, size = self.get_priority_stats()
+        else:
+            sum_prob, min_priority, size = global_stats
+        min_prob = min_priority / sum_prob + SMALL_NUMBER
+        max_weight = (min_prob * size) ** (-self.beta)
+        weights = (sum_segment_tree.get_leaves(indices) / sum_prob * size) ** (-self.beta) / max_weight
+
+        return self.read_records(indices=indices), indices, weights
+
+    def get_priority_stats(self):
+        """
+        Returns:
+            tuple: The sum of all priorities, the min priority and the number of stored records.
+        """
+        return (
+            self.merged_segment_tree.sum_segment_tree.get_sum(),
+            self.merged_segment_tree.min_segment_tree.get_min_value(),
+            self.size
+        )
 
     def update_records(self, indices, update):
-        for index, loss in zip(indices, update):
-            self.merged_segment_tree.insert(index, loss ** self.alpha)
-            self.max_priority = max(self.max_priority, loss)
+        """
+        Updates the priorities of the given records.
+
+        Args:
+            indices (ndarray): The indices of the records to update.
+            update (ndarray): The new priorities.
+
+        Returns:
+            tuple: The (priority sum, min priority, size) after the update (see `get_priority_stats`).
+        """
+        update = np.asarray(update, dtype=np.float64)
+        self.merged_segment_tree.insert_batch(indices, update ** self.alpha)
+        if len(update) > 0:
+            self.max_priority = max(self.max_priority, float(np.max(update)))
+        return self.get_priority_stats()
+
+    def store_snapshot(self, directory):
+        """
+        Stores an (incremental) snapshot of the records and priorities in `directory` (see
+        `rlgraph.utils.snapshot_util.store_memory_snapshot`).
+
+        Returns:
+            int: The number of records written.
+        """
+        return store_memory_snapshot(self, directory)
+
+    def load_snapshot(self, directory):
+        """
+        Restores records and priorities from a snapshot in `directory`.
+
+        Returns:
+            int: The number of records read.
+        """
+        return load_memory_snapshot(self, directory)
+
+    def get_snapshot_state(self):
+        return dict(
+            index=self.index, size=self.size, max_priority=self.max_priority, num_inserted=self.num_inserted,
+            sum_tree=self.merged_segment_tree.sum_segment_tree.values.copy(),
+            min_tree=self.merged_segment_tree.min_segment_tree.values.copy()
+        )
 
+    def set_snapshot_state(self, state):
+        self.index = int(state["index"])
+        self.size = int(state["size"])
+        self.max_priority = float(state["max_priority"])
+        self.num_inserted = int(state["num_inserted"])
+        self.merged_segment_tree.sum_segment_tree.values = np.array(state["sum_tree"], dtype=np.float64)
+        self.merged_segment_tree.min_segment_tree.values = np.array(state["min_tree"], dtype=np.float64)
+
+    def read_snapshot_records(self, indices):
+        # Records are tuples of (compressed) python objects -> Store as a (pickled) object array.
+        records = np.empty(shape=(len(indices),), dtype=object)
+        for i, index in enumerate(indices):
+            records[i] = self.memory_values[index]
+        return dict(records=records)
+
+    def write_snapshot_records(self, indices, records):
+        for index, record in zip(indices, records["records"]):
+            while len(self.memory_values) <= index:
+                self.memory_values.append(None)
+            self.memory_values[index] = record
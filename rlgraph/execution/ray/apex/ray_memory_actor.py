@@ -49,10 +49,14 @@ class RayMemoryActor(RayActor):
     def as_remote(cls, num_cpus=None, num_gpus=None):
         return ray.remote(num_cpus=num_cpus, num_gpus=num_gpus)(cls)
 
-    def get_batch(self):
+    def get_batch(self, global_stats=None):
         """
         Samples a batch from the replay memory.
 
+        Args:
+            global_stats (Optional[tuple]): The (priority sum, min priority, size) over all replay shards to
+                normalize the importance weights globally (see `ShardedPrioritizedReplay`).
+
         Returns:
             dict: Sample batch
 
@@ -60,19 +64,33 @@ class RayMemoryActor(RayActor):
         if self.memory.size < self.min_sample_memory_size:
             return None
         else:
-            batch, indices, weights = self.memory.get_records(self.sample_batch_size)
+            batch, indices, weights = self.memory.get_records(self.sample_batch_size, global_stats)
             # Merge into one dict to only return one future in ray.
             batch["indices"] = indices
             batch["importance_weights"] = weights
             return batch
 
+    def get_batch_and_stats(self, global_stats=None):
+        """
+        Samples a batch (see `get_batch`) and returns it together with this shard's current priority statistics,
+        so both arrive in one future.
+
+        Returns:
+            tuple: The sample batch (or None) and the (priority sum, min priority, size) of this shard.
+        """
+        return self.get_batch(global_stats), self.memory.get_priority_stats()
+
     def observe(self, env_sample):
         """
         Observes experience(s).
 
         N.b. For performance reason, data layout is slightly different for apex.
+
+        Returns:
+            tuple: The (priority sum, min priority, size) of this shard after the insert.
         """
-        records = env_sample.get_batch()
+        # Keep states compressed (per record) in memory.
+        records = env_sample.get_batch(decompress=False)
         num_records = len(records['states'])
 
         # TODO port to tf PR behaviour.
@@ -80,15 +98,14 @@ class RayMemoryActor(RayActor):
             rewards = np.sign(records["rewards"])
         else:
             rewards = records["rewards"]
-        for i in range_(num_records):
-            self.memory.insert_records((
-                records["states"][i],
-                records["actions"][i],
-                rewards[i],
-                records["terminals"][i],
-                records["next_states"][i],
-                records["importance_weights"][i]
-            ))
+        return self.memory.insert_batch([(
+            records["states"][i],
+            records["actions"][i],
+            rewards[i],
+            records["terminals"][i],
+            records["next_states"][i],
+            records["importance_weights"][i]
+        ) for i in range_(num_records)])
 
     def update_priorities(self, indices, loss):
         """
@@ -101,3 +118,27 @@ class RayMemoryActor(RayActor):
         """
         loss = np.abs(loss) + SMALL_NUMBER
         self.memory.update_records(indices, loss)
+
+    def store_snapshot(self, directory):
+        """
+        Stores an (incremental) snapshot of the replay memory in `directory`.
+
+        Args:
+            directory (str): The snapshot directory (on the actor's host).
+
+        Returns:
+            int: The number of records written.
+        """
+        return self.memory.store_snapshot(directory)
+
+    def load_snapshot(self, directory):
+        """
+        Restores the replay memory from a snapshot in `directory`.
+
+        Args:
+            directory (str): The snapshot directory (on the actor's host).
+
+        Returns:
+            int: The number of records read.
+        """
+        return self.memory.load_snapshot(directory)
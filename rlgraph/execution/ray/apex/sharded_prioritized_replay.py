@@ -0,0 +1,258 @@
+# Copyright 2018/2019 The RLgraph authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+from collections import deque
+
+import numpy as np
+from six.moves import xrange as range_
+
+from rlgraph.execution.ray.apex.apex_memory import ApexMemory
+from rlgraph.utils.rlgraph_errors import RLGraphError
+from rlgraph.utils.specifiable import Specifiable
+from rlgraph.utils.specifiable_server import SpecifiableServer
+
+
+class ShardedPrioritizedReplay(Specifiable):
+    """
+    A prioritized replay spread over several ApexMemory shards, exposing a single logical sampling API.
+
+    The priority mass (sum), min priority and size of each shard are tracked centrally. Samples are assigned to
+    shards proportionally to their mass and drawn proportionally to priority within each shard, such that every
+    record is sampled with its global probability p_i / sum_k(mass_k). Importance weights are normalized w.r.t. this
+    global distribution. Sampled indices are global (they encode the owning shard), so priority updates are routed
+    back to the shard holding the record.
+
+    Shards can either live in this process or each in a separate process (via SpecifiableServer) to scale insert
+    and sampling throughput on one node. Executors with remote shards (e.g. Ape-X's Ray memory actors) can use only
+    the shard statistics part (`set_shard_stats`, `choose_shard`, `get_global_stats`).
+    """
+    # Shard methods replying with the shard's statistics.
+    STATS_REPLY_METHODS = ("insert_batch", "update_records")
+    # Max. number of calls per shard sent without receiving their replies.
+    MAX_PENDING_CALLS = 16
+
+    def __init__(self, num_shards=2, memory_spec=None, use_processes=False, insert_batch_size=32):
+        """
+        Args:
+            num_shards (int): The number of shards.
+            memory_spec (Optional[dict]): The ApexMemory spec for each shard (with the per-shard capacity). If None,
+                no shards are created and only the shard statistics API can be used.
+            use_processes (bool): Whether to host each shard in its own process. Default: False.
+            insert_batch_size (int): The number of inserted records to buffer before sending them to the shards
+                (one batched insert per shard). Buffered records are flushed before any sampling or statistics
+                read. Default: 32.
+        """
+        super(ShardedPrioritizedReplay, self).__init__()
+
+        self.num_shards = num_shards
+        self.use_processes = use_processes
+        self.insert_batch_size = insert_batch_size
+
+        # Per shard: Priority sum, min priority and size.
+        self.priority_sums = np.zeros(shape=(num_shards,))
+        self.min_priorities = np.full(shape=(num_shards,), fill_value=float("inf"))
+        self.sizes = np.zeros(shape=(num_shards,), dtype=np.int64)
+        # Version of the last statistics set per shard (see `set_shard_stats`).
+        self.stats_versions = np.full(shape=(num_shards,), fill_value=-1, dtype=np.int64)
+
+        self.shards = []
+        if memory_spec is not None:
+            for _ in range_(num_shards):
+                if use_processes is True:
+                    shard = SpecifiableServer(ApexMemory, memory_spec, output_spaces=None, use_shared_memory=False)
+                    shard.start_server()
+                else:
+                    shard = ApexMemory.from_spec(memory_spec)
+                self.shards.append(shard)
+        # The next shard to insert into.
+        self.insert_shard = 0
+        # Per shard: Records buffered for the next batched insert.
+        self.insert_buffers = [[] for _ in range_(num_shards)]
+        self.num_buffered = 0
+        # Per shard: Calls sent but whose replies have not been received yet (method name and - for in-process
+        # shards - the result).
+        self.pending_calls = [deque() for _ in range_(num_shards)]
+
+    def set_shard_stats(self, shard_index, stats, version=None):
+        """
+        Sets the tracked statistics of a shard.
+
+        Args:
+            shard_index (int): The shard's index.
+            stats (tuple): The (priority sum, min priority, size) of the shard (see
+                `ApexMemory.get_priority_stats`).
+            version (Optional[int]): Increasing number of the request that reported the stats (e.g. in order of
+                submission to a remote shard). Stats older than the last ones set are ignored, such that a late
+                report (e.g. of a then empty shard) cannot overwrite newer stats. Default: None (always set).
+        """
+        if version is not None:
+            if version < self.stats_versions[shard_index]:
+                return
+            self.stats_versions[shard_index] = version
+        self.priority_sums[shard_index], self.min_priorities[shard_index], self.sizes[shard_index] = stats
+
+    def get_global_stats(self):
+        """
+        Returns:
+            tuple: The (priority sum, min priority, size) over all shards.
+        """
+        self.sync()
+        return float(np.sum(self.priority_sums)), float(np.min(self.min_priorities)), int(np.sum(self.sizes))
+
+    def get_shard_probabilities(self):
+        """
+        Returns:
+            np.ndarray: The probability of each shard to be sampled from (proportional to its priority mass).
+                Uniform as long as no statistics are known.
+        """
+        self.sync()
+        total = np.sum(self.priority_sums)
+        if total <= 0.0:
+            return np.full(shape=(self.num_shards,), fill_value=1.0 / self.num_shards)
+        return self.priority_sums / total
+
+    def choose_shard(self):
+        """
+        Returns:
+            int: The index of a shard chosen proportionally to its priority mass. Sampling a whole batch from this
+                shard yields the global sampling probabilities per record.
+        """
+        return int(np.random.choice(self.num_shards, p=self.get_shard_probabilities()))
+
+    def insert_records(self, record):
+        """
+        Inserts a record (round-robin over the shards). Records are buffered and sent to the shards in batches of
+        `insert_batch_size`.
+
+        Args:
+            record (tuple): The record as expected by `ApexMemory.insert_records`.
+        """
+        self.insert_buffers[self.insert_shard].append(record)
+        self.num_buffered += 1
+        self.insert_shard = (self.insert_shard + 1) % self.num_shards
+        if self.num_buffered >= self.insert_batch_size:
+            self.flush()
+
+    def flush(self):
+        """
+        Sends all buffered records to their shards (one batched insert per shard) without waiting for the shards.
+        The shards' statistics are received with the next sampling or statistics read.
+        """
+        for shard_index, records in enumerate(self.insert_buffers):
+            if len(records) > 0:
+                self._send(shard_index, "insert_batch", records)
+                self.insert_buffers[shard_index] = []
+        self.num_buffered = 0
+
+    def sync(self):
+        """
+        Flushes buffered records and receives all outstanding shard replies, updating the shard statistics.
+        """
+        if len(self.shards) == 0:
+            return
+        self.flush()
+        for shard_index in range_(self.num_shards):
+            self._receive_all(shard_index)
+
+    def get_records(self, num_records):
+        """
+        Samples records from all shards with their global priority-proportional probabilities.
+
+        Args:
+            num_records (int): The number of records to sample.
+
+        Returns:
+            tuple: The record dict, the global indices and the (globally normalized) importance weights.
+        """
+        global_stats = self.get_global_stats()
+        if global_stats[2] == 0:
+            raise RLGraphError("ERROR: Cannot sample from an empty ShardedPrioritizedReplay!")
+        counts = np.random.multinomial(num_records, self.get_shard_probabilities())
+
+        # Sample from all shards concurrently.
+        sampled_shards = np.nonzero(counts)[0]
+        for shard_index in sampled_shards:
+            self._send(shard_index, "get_records", int(counts[shard_index]), global_stats)
+        records, indices, weights = [], [], []
+        for shard_index in sampled_shards:
+            shard_records, shard_indices, shard_weights = self._receive_all(shard_index)
+            records.append(shard_records)
+            indices.append(np.asarray(shard_indices) * self.num_shards + shard_index)
+            weights.append(shard_weights)
+
+        return {key: np.concatenate([r[key] for r in records]) for key in records[0]}, \
+            np.concatenate(indices), np.concatenate(weights)
+
+    def update_records(self, indices, update):
+        """
+        Updates the priorities of the records with the given global indices on their owning shards without waiting
+        for the shards. The shards' new statistics are received with the next sampling or statistics read.
+
+        Args:
+            indices (np.ndarray): Global indices as returned by `get_records`.
+            update (np.ndarray): The new priorities (e.g. losses) per index.
+        """
+        indices = np.asarray(indices)
+        update = np.asarray(update)
+        shard_indices = indices % self.num_shards
+        for shard_index in np.unique(shard_indices):
+            mask = shard_indices == shard_index
+            self._send(shard_index, "update_records", indices[mask] // self.num_shards, update[mask])
+
+    def terminate(self):
+        """
+        Stops the shard processes (if any).
+        """
+        if self.use_processes is True:
+            for shard in self.shards:
+                shard.stop_server()
+
+    def _send(self, shard_index, method_name, *args):
+        """
+        Sends a call to a shard without waiting for its reply (in-process shards execute it right away).
+        """
+        pending_calls = self.pending_calls[shard_index]
+        # Bound the number of unreceived replies (which could otherwise fill up the process pipes).
+        if len(pending_calls) >= self.MAX_PENDING_CALLS:
+            self._receive_all(shard_index)
+        shard = self.shards[shard_index]
+        if self.use_processes is True:
+            shard.remote_send(method_name, *args)
+            pending_calls.append((method_name, None))
+        else:
+            pending_calls.append((method_name, getattr(shard, method_name)(*args)))
+
+    def _receive_all(self, shard_index):
+        """
+        Receives all outstanding replies of a shard, applying the shard statistics piggy-backed on insert and update
+        replies.
+
+        Returns:
+            any: The result of the last call sent to the shard.
+        """
+        result = None
+        pending_calls = self.pending_calls[shard_index]
+        while len(pending_calls) > 0:
+            method_name, result = pending_calls.popleft()
+            if self.use_processes is True:
+                result = self.shards[shard_index].remote_receive(method_name)
+            if method_name in self.STATS_REPLY_METHODS:
+                self.set_shard_stats(shard_index, result)
+        return result
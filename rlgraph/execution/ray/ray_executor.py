@@ -26,7 +26,8 @@ import time
 from rlgraph import get_distributed_backend
 from rlgraph.agents import Agent
 from rlgraph.environments import Environment
-from rlgraph.execution.ray.ray_util import worker_exploration
+from rlgraph.execution.ray.ray_util import AdaptiveSampleSizer, RayTaskPool, wait_for_tasks, worker_exploration
+from rlgraph.utils.streaming_statistics import StreamingStatistics
 
 if get_distributed_backend() == "ray":
     import ray
@@ -67,6 +68,12 @@ class RayExecutor(object):
         # Map worker objects to host ids.
         self.worker_ids = {}
 
+        # Maximum time (in seconds) to block while waiting for any remote task to complete (instead of polling).
+        self.task_wait_timeout = executor_spec.get("task_wait_timeout", 0.1)
+        # Whether to size each worker's sampling tasks by its measured throughput (see `AdaptiveSampleSizer`).
+        self.adaptive_sample_size = executor_spec.get("adaptive_sample_size", False)
+        self.sample_sizer = None
+
     def ray_init(self):
         """
         Connects to a Ray cluster or starts one if none exists.
@@ -114,14 +121,97 @@ class RayExecutor(object):
 
         return workers
 
+    def create_sample_sizer(self, base_sample_size):
+        """
+        Creates the AdaptiveSampleSizer for the remote workers if `adaptive_sample_size` is enabled.
+
+        Args:
+            base_sample_size (int): The sample size of a worker with average throughput.
+
+        Returns:
+            Optional[AdaptiveSampleSizer]: The sample sizer or None if sample sizes are fixed.
+        """
+        if self.adaptive_sample_size is False:
+            return None
+        return AdaptiveSampleSizer(
+            base_sample_size=base_sample_size,
+            min_sample_size=self.executor_spec.get("min_worker_sample_size"),
+            max_sample_size=self.executor_spec.get("max_worker_sample_size")
+        )
+
+    def call_remote(self, actor, method_name, *args):
+        """
+        Schedules a method call on a remote actor.
+
+        Args:
+            actor (any): The remote actor.
+            method_name (str): Name of the method to call.
+            *args (any): Method args.
+
+        Returns:
+            any: The task to fetch the result with (see `get_remote`). For Ray, the object id(s) of the result(s).
+        """
+        return getattr(actor, method_name).remote(*args)
+
+    def send_remote(self, actor, method_name, *args):
+        """
+        Schedules a method call on a remote actor without fetching its result (e.g. to set weights).
+
+        Args:
+            actor (any): The remote actor.
+            method_name (str): Name of the method to call.
+            *args (any): Method args.
+        """
+        self.call_remote(actor, method_name, *args)
+
+    def get_remote(self, tasks):
+        """
+        Blocks until the given task(s) have completed and returns their results.
+
+        Args:
+            tasks (Union[any, list]): A task or a list of tasks as returned by `call_remote`.
+
+        Returns:
+            any: The result or a list of results.
+        """
+        return ray.get(tasks)
+
+    def put_remote(self, obj):
+        """
+        Stores an object to be passed to many remote calls (e.g. weights), so it is only serialized once.
+
+        Args:
+            obj (any): The object.
+
+        Returns:
+            any: The reference to pass to `call_remote` or `send_remote` in place of the object.
+        """
+        return ray.put(obj)
+
+    def create_task_pool(self):
+        """
+        Returns:
+            RayTaskPool: An empty task pool to track pending tasks with.
+        """
+        return RayTaskPool()
+
+    def wait_for_tasks(self, task_pools, timeout=None):
+        """
+        Blocks until at least one task of any of the given task pools has completed.
+
+        Args:
+            task_pools (list): The task pools (see `create_task_pool`).
+            timeout (Optional[float]): The maximum time (in seconds) to wait. None for no limit.
+        """
+        wait_for_tasks(task_pools, timeout=timeout)
+
     def test_worker_init(self):
         """
         Tests every worker for successful constructor call (which may otherwise fail silently.
         """
         for ray_worker in self.ray_env_sample_workers:
             self.logger.info("Testing worker for successful init: {}".format(self.worker_ids[ray_worker]))
-            task = ray_worker.get_constructor_success.remote()
-            result = ray.get(task)
+            result = self.get_remote(self.call_remote(ray_worker, "get_constructor_success"))
             assert result is True, "ERROR: constructor failed, attribute returned: {}" \
                                    "instead of True".format(result)
 
@@ -149,9 +239,10 @@ class RayExecutor(object):
             workload (dict): Workload parameters, primarily 'num_timesteps' and 'report_interval'
                 to indicate how many steps to execute and how often to report results.
         """
-        self.sample_iteration_throughputs = []
-        self.update_iteration_throughputs = []
-        self.iteration_times = []
+        # Fixed-memory statistics over all report intervals (keeping the most recent ones).
+        self.sample_iteration_throughputs = StreamingStatistics(window_size=1000)
+        self.update_iteration_throughputs = StreamingStatistics(window_size=1000)
+        self.iteration_times = StreamingStatistics(window_size=1000)
 
         # Assume time step based initially.
         num_timesteps = workload["num_timesteps"]
@@ -160,8 +251,7 @@ class RayExecutor(object):
         report_interval = workload["report_interval"]
         report_interval_min_seconds = workload["report_interval_min_seconds"]
         timesteps_executed = 0
-        iteration_time_steps = []
-        iteration_update_steps = []
+        all_updates = 0
 
         start = time.monotonic()
         # Call _execute_step as many times as required.
@@ -173,7 +263,7 @@ class RayExecutor(object):
             iteration_start = time.monotonic()
 
             # Last episode rewards seen during iteration.
-            iteration_rewards = []
+            iteration_rewards = StreamingStatistics(window_size=1)
 
             # Record sampling and learning throughput every interval.
             while (iteration_step < report_interval) or\
@@ -187,33 +277,28 @@ class RayExecutor(object):
 
             iteration_end = time.monotonic() - iteration_start
             timesteps_executed += iteration_step
+            all_updates += iteration_updates
 
-            # Append raw values, compute stats after experiment is done.
-            self.iteration_times.append(iteration_end)
-            iteration_update_steps.append(iteration_updates)
-            iteration_time_steps.append(iteration_step)
+            self.iteration_times.add(iteration_end)
+            # Note: these are samples, not internal environment frames.
+            self.sample_iteration_throughputs.add(iteration_step / iteration_end)
+            self.update_iteration_throughputs.add(iteration_updates / iteration_end)
 
             self.logger.info("Executed {} Ray worker steps, {} update steps, ({} of {} ({} %), discarded = {},"
                              " inserts = {})".format(iteration_step, iteration_updates, timesteps_executed,
                              num_timesteps, (100 * timesteps_executed / num_timesteps), iteration_discarded,
                              iteration_queue_inserted))
-            if len(iteration_rewards) > 0:
+            if iteration_rewards.count > 0:
                 self.logger.info("Min iteration reward: {}, mean iteration reward: {}, max iteration reward: {}."
-                                 "Stats from {} episodes.".format(np.min(iteration_rewards), np.mean(iteration_rewards),
-                                                                  np.max(iteration_rewards), len(iteration_rewards)))
+                                 "Stats from {} episodes.".format(iteration_rewards.min, iteration_rewards.mean,
+                                                                  iteration_rewards.max, iteration_rewards.count))
 
         total_time = (time.monotonic() - start) or 1e-10
         self.logger.info("Time steps executed: {} ({} ops/s)".
                          format(timesteps_executed, timesteps_executed / total_time))
-        all_updates = np.sum(iteration_update_steps)
         self.logger.info("Updates executed: {}, ({} updates/s)".format(
             all_updates, all_updates / total_time
         ))
-        for i in range_(len(self.iteration_times)):
-            it_time = self.iteration_times[i]
-            # Note: these are samples, not internal environment frames.
-            self.sample_iteration_throughputs.append(iteration_time_steps[i] / it_time)
-            self.update_iteration_throughputs.append(iteration_update_steps[i] / it_time)
 
         worker_stats = self.get_aggregate_worker_results()
         self.logger.info("Retrieved worker stats for {} workers:".format(len(self.ray_env_sample_workers)))
@@ -226,12 +311,12 @@ class RayExecutor(object):
             # Multiply sample throughput by these env_frames = samples * env_internal * worker_frame_skip:
             env_internal_frame_skip=self.env_internal_frame_skip,
             worker_frame_skip=self.worker_frame_skip,
-            min_iteration_sample_throughput=np.min(self.sample_iteration_throughputs),
-            max_iteration_sample_throughput=np.max(self.sample_iteration_throughputs),
-            mean_iteration_sample_throughput=np.mean(self.sample_iteration_throughputs),
-            min_iteration_update_throughput=np.min(self.update_iteration_throughputs),
-            max_iteration_update_throughput=np.max(self.update_iteration_throughputs),
-            mean_iteration_update_throughput=np.mean(self.update_iteration_throughputs),
+            min_iteration_sample_throughput=self.sample_iteration_throughputs.min,
+            max_iteration_sample_throughput=self.sample_iteration_throughputs.max,
+            mean_iteration_sample_throughput=self.sample_iteration_throughputs.mean,
+            min_iteration_update_throughput=self.update_iteration_throughputs.min,
+            max_iteration_update_throughput=self.update_iteration_throughputs.max,
+            mean_iteration_update_throughput=self.update_iteration_throughputs.mean,
             # Worker stats.
             mean_worker_op_throughput=worker_stats["mean_worker_op_throughput"],
             # N.b. these are already corrected.
@@ -246,13 +331,13 @@ class RayExecutor(object):
         )
 
     def sample_metrics(self):
-        return self.sample_iteration_throughputs
+        return list(self.sample_iteration_throughputs.window)
 
     def update_metrics(self):
-        return self.update_iteration_throughputs
+        return list(self.update_iteration_throughputs.window)
 
     def get_iteration_times(self):
-        return self.iteration_times
+        return list(self.iteration_times.window)
 
     def _execute_step(self):
         """
@@ -274,7 +359,7 @@ class RayExecutor(object):
         """
         config = deepcopy(agent_config)
         # Pop type on a copy because this may be called by multiple classes/worker types.
-        agent_cls = Agent.__lookup_classes__.get(config.pop('type'))
+        agent_cls = Agent.lookup_class(config.pop("type"))
         return agent_cls(**config)
 
     def result_by_worker(self, worker_index=None):
@@ -293,8 +378,7 @@ class RayExecutor(object):
             # Otherwise just pick  first.
             ray_worker = self.ray_env_sample_workers[0]
 
-        task = ray_worker.get_workload_statistics.remote()
-        metrics = ray.get(task)
+        metrics = self.get_worker_statistics([ray_worker])[0]
 
         # Return full reward series.
         return dict(
@@ -310,9 +394,7 @@ class RayExecutor(object):
             list: List dicts with worker results (timesteps and rewards)
         """
         results = list()
-        for ray_worker in self.ray_env_sample_workers:
-            task = ray_worker.get_workload_statistics.remote()
-            metrics = ray.get(task)
+        for metrics in self.get_worker_statistics(self.ray_env_sample_workers):
             results.append(dict(
                 episode_rewards=metrics["episode_rewards"],
                 episode_timesteps=metrics["episode_timesteps"],
@@ -321,6 +403,18 @@ class RayExecutor(object):
             ))
         return results
 
+    def get_worker_statistics(self, workers):
+        """
+        Fetches the workload statistics of the given remote workers.
+
+        Args:
+            workers (list): The remote workers.
+
+        Returns:
+            list: One dict of performance metrics per worker (see the workers' `get_workload_statistics`).
+        """
+        return self.get_remote([self.call_remote(ray_worker, "get_workload_statistics") for ray_worker in workers])
+
     def get_sample_worker_ids(self):
         """
         Returns identifiers of all sample workers.
@@ -347,12 +441,11 @@ class RayExecutor(object):
         episodes_executed = []
         steps_executed = 0
 
-        for ray_worker in self.ray_env_sample_workers:
-            self.logger.info("Retrieving workload statistics for worker: {}".format(
-                self.worker_ids[ray_worker])
-            )
-            task = ray_worker.get_workload_statistics.remote()
-            metrics = ray.get(task)
+        self.logger.info("Retrieving workload statistics for workers: {}".format(
+            [self.worker_ids[ray_worker] for ray_worker in self.ray_env_sample_workers])
+        )
+        all_metrics = self.get_worker_statistics(self.ray_env_sample_workers)
+        for ray_worker, metrics in zip(self.ray_env_sample_workers, all_metrics):
             if metrics["mean_episode_reward"] is not None:
                 min_rewards.append(metrics["min_episode_reward"])
                 max_rewards.append(metrics["max_episode_reward"])
@@ -26,10 +26,12 @@ import time
 from rlgraph import get_distributed_backend
 from rlgraph.components.neural_networks.preprocessor_stack import PreprocessorStack
 from rlgraph.environments.sequential_vector_env import SequentialVectorEnv
-from rlgraph.execution.environment_sample import EnvironmentSample
+from rlgraph.execution.environment_sample import CompressedColumn, EnvironmentSample
 from rlgraph.execution.ray import RayExecutor
 from rlgraph.execution.ray.ray_actor import RayActor
-from rlgraph.execution.ray.ray_util import ray_compress
+from rlgraph.execution.ray.ray_util import ray_method
+from rlgraph.utils.phase_timer import PhaseTimer
+from rlgraph.utils.streaming_statistics import StreamingStatistics
 
 if get_distributed_backend() == "ray":
     import ray
@@ -52,7 +54,8 @@ class RayPolicyWorker(RayActor):
             env_spec (dict): Environment config for environment to run.
             frameskip (int): How often actions are repeated after retrieving them from the agent.
         """
-        assert get_distributed_backend() == "ray"
+        # Also runs as a local process actor (see `rlgraph.execution.multiprocess`).
+        assert get_distributed_backend() in ["ray", "multiprocessing"]
         # Internal frameskip of env.
         self.env_frame_skip = worker_spec.get("env_internal_frame_skip", 1)
         # Worker computes weights for prioritized sampling.
@@ -60,6 +63,12 @@ class RayPolicyWorker(RayActor):
         self.num_environments = worker_spec.pop("num_worker_environments", 1)
         self.worker_sample_size = worker_spec.pop("worker_sample_size") * self.num_environments
         self.worker_executes_postprocessing = worker_spec.pop("worker_executes_postprocessing", True)
+        # Optionally record time spent per phase (preprocessing, acting, env stepping, post-processing, etc.).
+        self.phase_timer = PhaseTimer(enabled=worker_spec.pop("record_phase_times", False))
+        # Kwargs for the fixed-memory statistics of finished episodes (e.g. `window_size`, `num_quantile_samples`).
+        episode_statistics_spec = util.default_dict(
+            worker_spec.pop("episode_statistics_spec", None), dict(window_size=1000)
+        )
 
         self.compress = worker_spec.pop("compress_states", False)
         self.env_ids = ["env_{}".format(i) for i in range_(self.num_environments)]
@@ -84,20 +93,24 @@ class RayPolicyWorker(RayActor):
         self.worker_frameskip = frameskip
 
         # Save these so they can be fetched after training if desired.
-        self.finished_episode_rewards = [[] for _ in range_(self.num_environments)]
-        self.finished_episode_timesteps = [[] for _ in range_(self.num_environments)]
+        self.episode_reward_stats = [StreamingStatistics(**episode_statistics_spec)
+                                     for _ in range_(self.num_environments)]
+        self.episode_timestep_stats = [StreamingStatistics(**episode_statistics_spec)
+                                       for _ in range_(self.num_environments)]
         # Total times sample the "real" wallclock time from start to end for each episode.
-        self.finished_episode_total_times = [[] for _ in range_(self.num_environments)]
+        self.episode_total_time_stats = [StreamingStatistics(**episode_statistics_spec)
+                                         for _ in range_(self.num_environments)]
         # Sample times stop the wallclock time counter between runs, so only the sampling time is accounted for.
-        self.finished_episode_sample_times = [[] for _ in range_(self.num_environments)]
+        self.episode_sample_time_stats = [StreamingStatistics(**episode_statistics_spec)
+                                          for _ in range_(self.num_environments)]
 
         self.total_worker_steps = 0
         self.episodes_executed = 0
 
-        # Step time and steps done per call to execute_and_get to measure throughput of this worker.
-        self.sample_times = []
-        self.sample_steps = []
-        self.sample_env_frames = []
+        # Step time and steps done over all calls to execute_and_get to measure throughput of this worker.
+        self.total_sample_time = 0.0
+        self.total_sample_steps = 0
+        self.total_sample_env_frames = 0
 
         # To continue running through multiple exec calls.
         self.last_states = self.vector_env.reset_all()
@@ -158,6 +171,10 @@ class RayPolicyWorker(RayActor):
         if worker_exec_spec is not None:
             agent_config.update(execution_spec=worker_exec_spec)
 
+        # Workers only act and post-process -> Optionally skip building memories, optimizers and update APIs.
+        if worker_spec.get("acting_only", False) is True:
+            agent_config.update(acting_only=True)
+
         # Build lazily per default.
         return RayExecutor.build_agent_from_config(agent_config)
 
@@ -213,19 +230,22 @@ class RayPolicyWorker(RayActor):
 
         while timesteps_executed < num_timesteps:
             current_iteration_start_timestamp = time.perf_counter()
-            for i, env_id in enumerate(self.env_ids):
-                state = self.agent.state_space.force_batch(env_states[i])
-                if self.preprocessors[env_id] is not None:
-                    if self.is_preprocessed[env_id] is False:
-                        self.preprocessed_states_buffer[i] = self.preprocessors[env_id].preprocess(state)
-                        self.is_preprocessed[env_id] = True
-                else:
-                    self.preprocessed_states_buffer[i] = env_states[i]
-
-            actions = self.get_action(states=self.preprocessed_states_buffer,
-                                      use_exploration=use_exploration, apply_preprocessing=False)
-
-            next_states, step_rewards, terminals, infos = self.vector_env.step(actions=actions)
+            with self.phase_timer.phase("preprocessing"):
+                for i, env_id in enumerate(self.env_ids):
+                    state = self.agent.state_space.force_batch(env_states[i])
+                    if self.preprocessors[env_id] is not None:
+                        if self.is_preprocessed[env_id] is False:
+                            self.preprocessed_states_buffer[i] = self.preprocessors[env_id].preprocess(state)
+                            self.is_preprocessed[env_id] = True
+                    else:
+                        self.preprocessed_states_buffer[i] = env_states[i]
+
+            with self.phase_timer.phase("action_computation"):
+                actions = self.get_action(states=self.preprocessed_states_buffer,
+                                          use_exploration=use_exploration, apply_preprocessing=False)
+
+            with self.phase_timer.phase("env_step"):
+                next_states, step_rewards, terminals, infos = self.vector_env.step(actions=actions)
             # Worker frameskip not needed as done in env.
             # for _ in range_(self.worker_frameskip):
             #     next_states, step_rewards, terminals, infos = self.vector_env.step(actions=actions)
@@ -257,11 +277,11 @@ class RayPolicyWorker(RayActor):
 
                 # Terminate and reset episode for that environment.
                 if terminals[i] or (0 < max_timesteps_per_episode <= current_episode_timesteps[i]):
-                    self.finished_episode_rewards[i].append(current_episode_rewards[i])
+                    self.episode_reward_stats[i].add(current_episode_rewards[i])
 
-                    self.finished_episode_timesteps[i].append(current_episode_timesteps[i])
-                    self.finished_episode_total_times[i].append(time.perf_counter() - current_episode_start_timestamps[i])
-                    self.finished_episode_sample_times[i].append(current_episode_sample_times[i])
+                    self.episode_timestep_stats[i].add(current_episode_timesteps[i])
+                    self.episode_total_time_stats[i].add(time.perf_counter() - current_episode_start_timestamps[i])
+                    self.episode_sample_time_stats[i].add(current_episode_sample_times[i])
                     episodes_executed[i] += 1
                     self.episodes_executed += 1
                     last_episode_rewards.append(current_episode_rewards[i])
@@ -279,14 +299,17 @@ class RayPolicyWorker(RayActor):
                     sample_terminals[env_id] = []
 
                     # Reset this environment and its pre-processor stack.
-                    env_states[i] = self.vector_env.reset(i)
+                    with self.phase_timer.phase("env_reset"):
+                        env_states[i] = self.vector_env.reset(i)
                     if self.preprocessors[env_id] is not None:
-                        self.preprocessors[env_id].reset()
-                        # This re-fills the sequence with the reset state.
-                        state = self.agent.state_space.force_batch(env_states[i])
-                        # Pre - process, add to buffer
-                        self.preprocessed_states_buffer[i] = np.array(self.preprocessors[env_id].preprocess(state))
-                        self.is_preprocessed[env_id] = True
+                        with self.phase_timer.phase("preprocessing"):
+                            self.preprocessors[env_id].reset()
+                            # This re-fills the sequence with the reset state.
+                            state = self.agent.state_space.force_batch(env_states[i])
+                            # Pre - process, add to buffer
+                            self.preprocessed_states_buffer[i] = \
+                                np.array(self.preprocessors[env_id].preprocess(state))
+                            self.is_preprocessed[env_id] = True
                     current_episode_rewards[i] = 0
                     current_episode_timesteps[i] = 0
                     current_episode_start_timestamps[i] = time.perf_counter()
@@ -327,9 +350,9 @@ class RayPolicyWorker(RayActor):
                                                                      batch_sequence_indices)
 
         total_time = (time.perf_counter() - start) or 1e-10
-        self.sample_steps.append(timesteps_executed)
-        self.sample_times.append(total_time)
-        self.sample_env_frames.append(env_frames)
+        self.total_sample_steps += timesteps_executed
+        self.total_sample_time += total_time
+        self.total_sample_env_frames += env_frames
 
         # Note that the controller already evaluates throughput so there is no need
         # for each worker to calculate expensive statistics now.
@@ -345,9 +368,9 @@ class RayPolicyWorker(RayActor):
             )
         )
 
-    @ray.method(num_return_vals=2)
-    def execute_and_get_with_count(self):
-        sample = self.execute_and_get_timesteps(num_timesteps=self.worker_sample_size)
+    @ray_method(num_return_vals=2)
+    def execute_and_get_with_count(self, num_timesteps=None):
+        sample = self.execute_and_get_timesteps(num_timesteps=num_timesteps or self.worker_sample_size)
         return sample, sample.batch_size
 
     def set_weights(self, weights):
@@ -365,16 +388,14 @@ class RayPolicyWorker(RayActor):
             dict: Performance metrics.
         """
         # Adjust env frames for internal env frameskip:
-        adjusted_frames = [env_frames * self.env_frame_skip for env_frames in self.sample_env_frames]
-        if len(self.finished_episode_rewards) > 0:
-            all_finished_rewards = []
-            for env_reward_list in self.finished_episode_rewards:
-                all_finished_rewards.extend(env_reward_list)
-            min_episode_reward = np.min(all_finished_rewards)
-            max_episode_reward = np.max(all_finished_rewards)
-            mean_episode_reward = np.mean(all_finished_rewards)
+        adjusted_frames = self.total_sample_env_frames * self.env_frame_skip
+        reward_stats = StreamingStatistics.merged(self.episode_reward_stats)
+        if reward_stats.count > 0:
+            min_episode_reward = reward_stats.min
+            max_episode_reward = reward_stats.max
+            mean_episode_reward = reward_stats.mean
             # Mean of final episode rewards over all envs
-            final_episode_reward = np.mean([env_rewards[-1] for env_rewards in self.finished_episode_rewards])
+            final_episode_reward = np.mean([stats.last for stats in self.episode_reward_stats if stats.count > 0])
         else:
             # Will be aggregated in executor.
             min_episode_reward = None
@@ -383,18 +404,23 @@ class RayPolicyWorker(RayActor):
             final_episode_reward = None
 
         return dict(
-            episode_timesteps=self.finished_episode_timesteps,
-            episode_rewards=self.finished_episode_rewards,
-            episode_total_times=self.finished_episode_total_times,
-            episode_sample_times=self.finished_episode_sample_times,
+            # Per env: The most recent episodes.
+            episode_timesteps=[list(stats.window) for stats in self.episode_timestep_stats],
+            episode_rewards=[list(stats.window) for stats in self.episode_reward_stats],
+            episode_total_times=[list(stats.window) for stats in self.episode_total_time_stats],
+            episode_sample_times=[list(stats.window) for stats in self.episode_sample_time_stats],
+            # Lifetime and windowed aggregates (and quantile estimates) over all envs.
+            episode_reward_statistics=reward_stats.get_statistics(),
             min_episode_reward=min_episode_reward,
             max_episode_reward=max_episode_reward,
             mean_episode_reward=mean_episode_reward,
             final_episode_reward=final_episode_reward,
             episodes_executed=self.episodes_executed,
             worker_steps=self.total_worker_steps,
-            mean_worker_ops_per_second=sum(self.sample_steps) / sum(self.sample_times),
-            mean_worker_env_frames_per_second=sum(adjusted_frames) / sum(self.sample_times)
+            mean_worker_ops_per_second=self.total_sample_steps / self.total_sample_time,
+            mean_worker_env_frames_per_second=adjusted_frames / self.total_sample_time,
+            # Empty if phase times are not recorded.
+            phase_times=self.phase_timer.get_statistics()
         )
 
     def _process_policy_trajectories(self, states, actions, rewards, terminals, sequence_indices):
@@ -402,19 +428,20 @@ class RayPolicyWorker(RayActor):
         Post-processes policy trajectories.
         """
         if self.worker_executes_postprocessing:
-            rewards = self.agent.post_process(
-                dict(
-                    states=states,
-                    rewards=rewards,
-                    terminals=terminals,
-                    sequence_indices=sequence_indices
+            with self.phase_timer.phase("post_processing"):
+                rewards = self.agent.post_process(
+                    dict(
+                        states=states,
+                        rewards=rewards,
+                        terminals=terminals,
+                        sequence_indices=sequence_indices
+                    )
                 )
-            )
 
         if self.compress:
-            env_dtype = self.vector_env.state_space.dtype
-            states = [ray_compress(np.asarray(state, dtype=util.convert_dtype(dtype=env_dtype, to='np')))
-                      for state in states]
+            with self.phase_timer.phase("compression"):
+                env_dtype = util.convert_dtype(dtype=self.vector_env.state_space.dtype, to='np')
+                states = CompressedColumn.from_array(np.asarray(states, dtype=env_dtype))
         return dict(
             states=states,
             actions=actions,
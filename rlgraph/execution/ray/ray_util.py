@@ -19,9 +19,11 @@ from __future__ import print_function
 
 import os
 import base64
+import math
 import numpy as np
 from six import string_types
 from rlgraph import get_distributed_backend
+from rlgraph.execution.environment_sample import EnvironmentSample, decompress_array
 from rlgraph.utils.rlgraph_errors import RLGraphError
 
 if get_distributed_backend() == "ray":
@@ -80,10 +82,15 @@ class RayTaskPool(object):
         self.ray_tasks[ray_object_id] = worker
         self.ray_objects[ray_object_id] = ray_object_ids
 
-    def get_completed(self):
+    def get_completed(self, timeout=0.01):
         """
         Waits on pending tasks and yields them upon completion.
 
+        Args:
+            timeout (Optional[float]): The maximum time (in seconds) to wait for the first task to complete. All
+                other tasks that are done by then are returned as well. 0 does not wait at all, None blocks until a
+                task has completed. Default: 0.01.
+
         Returns:
             generator: Yields completed tasks.
         """
@@ -91,10 +98,179 @@ class RayTaskPool(object):
         pending_tasks = list(self.ray_tasks)
         if pending_tasks:
             # This ray function checks tasks and splits into ready and non-ready tasks.
-            ready, not_ready = ray.wait(pending_tasks, num_returns=len(pending_tasks), timeout=0.01)
+            ready, not_ready = ray.wait(pending_tasks, num_returns=1, timeout=timeout)
+            if len(ready) > 0 and len(not_ready) > 0:
+                more_ready, _ = ray.wait(not_ready, num_returns=len(not_ready), timeout=0)
+                ready.extend(more_ready)
             for obj_id in ready:
                 yield (self.ray_tasks.pop(obj_id), self.ray_objects.pop(obj_id))
 
+    def get_pending(self):
+        """
+        Returns:
+            list: The object ids of all pending tasks.
+        """
+        return list(self.ray_tasks)
+
+
+def wait_for_tasks(task_pools, timeout=None):
+    """
+    Blocks until at least one task of any of the given task pools has completed (instead of polling each pool).
+
+    Args:
+        task_pools (list): List of RayTaskPools.
+        timeout (Optional[float]): The maximum time (in seconds) to wait. None for no limit.
+    """
+    pending_tasks = [obj_id for task_pool in task_pools for obj_id in task_pool.get_pending()]
+    if pending_tasks:
+        ray.wait(pending_tasks, num_returns=1, timeout=timeout)
+
+
+def ray_method(**kwargs):
+    """
+    Returns Ray's `ray.method` decorator for actor methods if Ray is the distributed backend. Otherwise (e.g. if
+    the actor runs as a local process), methods are left as they are.
+
+    Args:
+        kwargs (any): Options for `ray.method` (e.g. `num_return_vals`).
+
+    Returns:
+        callable: The method decorator.
+    """
+    if get_distributed_backend() == "ray":
+        return ray.method(**kwargs)
+    return lambda method: method
+
+
+class AdaptiveSampleSizer(object):
+    """
+    Sizes the sampling tasks of remote workers proportionally to their measured throughput, such that tasks take
+    about equally long on every worker (instead of slow workers becoming stragglers while fast workers idle).
+
+    If the learner's consumption rate is known (see `update_consumption`), all task sizes are additionally scaled by
+    the ratio of consumption to the workers' total throughput. The number of tasks kept in flight per worker can be
+    derived from a total target (see `get_task_depth`).
+    """
+    def __init__(self, base_sample_size, min_sample_size=None, max_sample_size=None, smoothing=0.7,
+                 min_scale=0.25, max_scale=4.0):
+        """
+        Args:
+            base_sample_size (int): The sample size of a worker with average throughput (and of all workers until
+                their throughput has been measured).
+            min_sample_size (Optional[int]): The minimum sample size per task. Default: `base_sample_size` // 4.
+            max_sample_size (Optional[int]): The maximum sample size per task (only for `get_sample_size`).
+                Default: 4 * `base_sample_size`.
+            smoothing (float): Weight of the previous estimate in the exponential moving average of throughputs.
+            min_scale (float): The minimum consumption-driven scale factor for sample sizes.
+            max_scale (float): The maximum consumption-driven scale factor for sample sizes.
+        """
+        self.base_sample_size = base_sample_size
+        self.min_sample_size = min_sample_size or max(base_sample_size // 4, 1)
+        self.max_sample_size = max_sample_size or 4 * base_sample_size
+        self.smoothing = smoothing
+        self.min_scale = min_scale
+        self.max_scale = max_scale
+        # Smoothed throughput (time steps per second) per worker.
+        self.throughputs = {}
+        # Smoothed rate (time steps per second) at which the learner consumes samples. None until measured.
+        self.consumption_rate = None
+
+    def update(self, worker, num_timesteps, runtime):
+        """
+        Records the throughput of a completed sampling task.
+
+        Args:
+            worker (any): The worker (handle) which executed the task.
+            num_timesteps (int): The number of time steps sampled.
+            runtime (float): The time (in seconds) the worker spent sampling.
+        """
+        throughput = num_timesteps / max(runtime, 1e-10)
+        previous = self.throughputs.get(worker)
+        if previous is not None:
+            throughput = self.smoothing * previous + (1.0 - self.smoothing) * throughput
+        self.throughputs[worker] = throughput
+
+    def update_consumption(self, num_timesteps, runtime):
+        """
+        Records the learner's consumption of samples.
+
+        Args:
+            num_timesteps (float): The number of time steps consumed by the learner.
+            runtime (float): The time (in seconds) over which they were consumed.
+        """
+        consumption_rate = num_timesteps / max(runtime, 1e-10)
+        if self.consumption_rate is not None:
+            consumption_rate = self.smoothing * self.consumption_rate + (1.0 - self.smoothing) * consumption_rate
+        self.consumption_rate = consumption_rate
+
+    def get_scale(self):
+        """
+        Returns:
+            float: The learner's consumption rate relative to the total throughput of all workers (clipped to
+                [`min_scale`, `max_scale`]), or 1.0 as long as either is unknown. Tasks grow while the learner
+                consumes faster than the workers produce (amortizing per-task overheads such as scheduling and
+                weight syncs) and shrink while the workers outpace the learner (keeping samples fresh).
+        """
+        total_throughput = sum(self.throughputs.values())
+        if self.consumption_rate is None or total_throughput <= 0.0:
+            return 1.0
+        return min(max(self.consumption_rate / total_throughput, self.min_scale), self.max_scale)
+
+    def get_sample_size(self, worker):
+        """
+        Args:
+            worker (any): The worker (handle) to size the next task for.
+
+        Returns:
+            int: The base sample size scaled by the worker's throughput relative to the mean throughput of all
+                workers and by the consumption scale (see `get_scale`).
+        """
+        throughput = self.throughputs.get(worker)
+        if throughput is None:
+            sample_size = int(round(self.base_sample_size * self.get_scale()))
+        else:
+            mean_throughput = sum(self.throughputs.values()) / len(self.throughputs)
+            sample_size = int(round(self.base_sample_size * throughput / mean_throughput * self.get_scale()))
+        return min(max(sample_size, self.min_sample_size), self.max_sample_size)
+
+    def get_task_depth(self, worker, target_in_flight_tasks, num_workers):
+        """
+        Splits a total number of in-flight tasks across workers proportionally to their throughput.
+
+        Args:
+            worker (any): The worker (handle) to get the number of in-flight tasks for.
+            target_in_flight_tasks (int): The total number of tasks to keep in flight over all workers.
+            num_workers (int): The number of workers.
+
+        Returns:
+            int: The number of tasks to keep in flight on the worker (at least 1).
+        """
+        throughput = self.throughputs.get(worker)
+        if throughput is None or len(self.throughputs) < num_workers:
+            share = 1.0 / num_workers
+        else:
+            share = throughput / sum(self.throughputs.values())
+        return max(int(round(target_in_flight_tasks * share)), 1)
+
+    def distribute(self, num_samples, workers):
+        """
+        Splits a number of samples (e.g. the learner's next update batch) across workers proportionally to their
+        throughput, such that all workers should finish at the same time.
+
+        Args:
+            num_samples (int): The total number of samples required.
+            workers (list): The workers (handles) to distribute the samples across.
+
+        Returns:
+            List[int]: The sample size for each worker (summing up to at least `num_samples`).
+        """
+        known = [self.throughputs[worker] for worker in workers if worker in self.throughputs]
+        default_throughput = sum(known) / len(known) if len(known) > 0 else 1.0
+        throughputs = [self.throughputs.get(worker, default_throughput) for worker in workers]
+        total_throughput = sum(throughputs)
+        return [max(int(math.ceil(num_samples * throughput / total_throughput)), self.min_sample_size)
+                for throughput in throughputs]
+
 
 def create_colocated_ray_actors(cls, config, num_agents, max_attempts=10):
     """
@@ -164,7 +340,10 @@ def ray_compress(data):
 
 
 def ray_decompress(data):
-    if isinstance(data, bytes) or isinstance(data, string_types):
+    # Single record of a CompressedColumn.
+    if isinstance(data, bytes):
+        return decompress_array(data)
+    elif isinstance(data, string_types):
         data = base64.b64decode(data)
         data = lz4.frame.decompress(data)
         data = pyarrow.deserialize(data)
@@ -190,17 +369,16 @@ def merge_samples(samples, decompress=False):
     Merges list of samples into a final batch.
     Args:
         samples (list): List of EnvironmentSamples
-        decompress (bool): If true, assume states are compressed and decompress them.
+        decompress (bool): If true, assume states were compressed individually via `ray_compress` and decompress
+            them. States stored in a CompressedColumn are always decompressed.
 
     Returns:
         dict: Sample batch of numpy arrays.
     """
-    batch = {}
-    sample_layout = samples[0].sample_batch
-    for key in sample_layout.keys():
-        batch[key] = np.concatenate([sample.sample_batch[key] for sample in samples])
+    # Concatenates columns (compressed states are only decompressed once, for the merged batch).
+    batch = EnvironmentSample.merge(samples).get_batch()
 
-    if decompress:
-        assert "states" in batch
+    # States compressed individually via `ray_compress`.
+    if decompress and batch["states"].dtype == object:
         batch["states"] = np.asarray([ray_decompress(state) for state in batch["states"]])
     return batch
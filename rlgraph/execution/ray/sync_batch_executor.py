@@ -20,13 +20,9 @@ from __future__ import print_function
 from rlgraph.environments import Environment
 from rlgraph.execution.ray.ray_policy_worker import RayPolicyWorker
 
-from rlgraph import get_distributed_backend
 from rlgraph.execution.ray.ray_executor import RayExecutor
 from rlgraph.execution.ray.ray_util import merge_samples, RayWeight
 
-if get_distributed_backend() == "ray":
-    import ray
-
 
 class SyncBatchExecutor(RayExecutor):
     """
@@ -65,6 +61,7 @@ class SyncBatchExecutor(RayExecutor):
 
         # These are the tasks actually interacting with the environment.
         self.worker_sample_size = self.executor_spec["num_worker_samples"]
+        self.sample_sizer = self.create_sample_sizer(self.worker_sample_size)
 
         assert not ray_spec, "ERROR: ray_spec still contains items: {}".format(ray_spec)
         self.logger.info("Setting up execution for Apex executor.")
@@ -99,18 +96,25 @@ class SyncBatchExecutor(RayExecutor):
         env_steps = 0
 
         # 1. Sync local learners weights to remote workers.
-        weights = ray.put(RayWeight(self.local_agent.get_weights()))
-        for ray_worker in self.ray_env_sample_workers:
-            ray_worker.set_weights.remote(weights)
+        self.sync_worker_weights()
 
         # 2. Schedule samples and fetch results from RayWorkers.
         sample_batches = []
         num_samples = 0
         while num_samples < self.update_batch_size:
-            batches = ray.get([worker.execute_and_get_timesteps.remote(self.worker_sample_size)
-                              for worker in self.ray_env_sample_workers])
-            # Each batch has exactly worker_sample_size length.
-            num_samples += len(batches) * self.worker_sample_size
+            if self.sample_sizer is not None:
+                # Split the remaining update batch across workers by throughput, so no worker straggles.
+                sample_sizes = self.sample_sizer.distribute(
+                    self.update_batch_size - num_samples, self.ray_env_sample_workers
+                )
+            else:
+                sample_sizes = [self.worker_sample_size] * len(self.ray_env_sample_workers)
+            batches = self.sample_workers(sample_sizes)
+            if self.sample_sizer is not None:
+                for worker, batch in zip(self.ray_env_sample_workers, batches):
+                    self.sample_sizer.update(worker, batch.metrics["timesteps_executed"], batch.metrics["runtime"])
+            # Each batch has exactly its sample size length.
+            num_samples += sum(sample_sizes)
             sample_batches.extend(batches)
 
         env_steps += num_samples
@@ -129,4 +133,23 @@ class SyncBatchExecutor(RayExecutor):
             "rewards": rewards
         }
 
+    def sync_worker_weights(self):
+        """
+        Broadcasts the local agent's weights to all remote workers.
+        """
+        weights = self.put_remote(RayWeight(self.local_agent.get_weights()))
+        for ray_worker in self.ray_env_sample_workers:
+            self.send_remote(ray_worker, "set_weights", weights)
+
+    def sample_workers(self, sample_sizes):
+        """
+        Executes a sampling task on each remote worker and waits for all of them.
 
+        Args:
+            sample_sizes (list): The number of time steps to sample per worker.
+
+        Returns:
+            list: The EnvironmentSamples of all workers.
+        """
+        return self.get_remote([self.call_remote(worker, "execute_and_get_timesteps", sample_size)
+                                for worker, sample_size in zip(self.ray_env_sample_workers, sample_sizes)])
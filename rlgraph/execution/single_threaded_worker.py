@@ -17,21 +17,48 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
+import threading
 import time
+from collections import deque
 from copy import deepcopy
 
 import numpy as np
 from six.moves import xrange as range_
 
+from rlgraph import get_backend
 from rlgraph.components import PreprocessorStack
 from rlgraph.execution.worker import Worker
 from rlgraph.utils.rlgraph_errors import RLGraphError
+from rlgraph.utils.streaming_statistics import StreamingStatistics
 from rlgraph.utils.util import default_dict
 
 
 class SingleThreadedWorker(Worker):
 
-    def __init__(self, preprocessing_spec=None, worker_executes_preprocessing=True, **kwargs):
+    def __init__(self, preprocessing_spec=None, worker_executes_preprocessing=True, update_in_background=False,
+                 max_update_ratio=None, max_weight_staleness=None, episode_statistics_spec=None, **kwargs):
+        """
+        Args:
+            preprocessing_spec (Optional[list]): Spec for the worker-side preprocessor stack.
+            worker_executes_preprocessing (bool): Whether the worker (instead of the agent's graph) preprocesses
+                states.
+            update_in_background (bool): Whether agent updates should run on a separate learner thread (sampling
+                from the agent's memory) while this worker keeps stepping through the environments. Observed
+                samples are then buffered and inserted into the memory by the learner thread. Otherwise, updates are
+                performed inline between environment steps. With PyTorch (which updates parameters in place),
+                action computation waits for a running update to finish. Default: False.
+            max_update_ratio (Optional[float]): Only for `update_in_background`: The maximum number of update steps
+                per collected environment time step. The learner thread waits for new data whenever it is ahead
+                (unless the acting loop is waiting for fresher weights, see `max_weight_staleness`).
+                Default: None (use the ratio of the update schedule: `update_steps` / `update_interval`).
+            max_weight_staleness (Optional[int]): Only for `update_in_background`: The maximum number of time steps
+                to collect with the same weights (i.e. since the last finished update), once updating has started.
+                The acting loop waits for the learner thread whenever this is exceeded, and the learner thread then
+                updates even if this exceeds `max_update_ratio`. Default: None (no limit).
+            episode_statistics_spec (Optional[dict]): Kwargs for the per-environment StreamingStatistics of finished
+                episodes' rewards, durations and timesteps, e.g. `window_size` (the number of most recent episodes
+                to keep per environment) or `num_quantile_samples`. Default: None (window_size=1000).
+        """
         super(SingleThreadedWorker, self).__init__(**kwargs)
 
         self.logger.info("Initialized single-threaded executor with {} environments '{}' and Agent '{}'".format(
@@ -58,11 +85,13 @@ class SingleThreadedWorker(Worker):
             dtype=self.agent.preprocessed_state_space.dtype
         )
 
-        # Global statistics.
+        # Global statistics (fixed memory: lifetime aggregates plus a window of the most recent episodes per env).
         self.env_frames = 0
-        self.finished_episode_rewards = [[] for _ in range_(self.num_environments)]
-        self.finished_episode_durations = [[] for _ in range_(self.num_environments)]
-        self.finished_episode_timesteps = [[] for _ in range_(self.num_environments)]
+        self.episode_statistics_spec = default_dict(episode_statistics_spec, dict(window_size=1000))
+        self.episode_reward_stats = None
+        self.episode_duration_stats = None
+        self.episode_timestep_stats = None
+        self.reset_episode_statistics()
 
         # Accumulated return over the running episode.
         self.episode_returns = [0 for _ in range_(self.num_environments)]
@@ -76,6 +105,23 @@ class SingleThreadedWorker(Worker):
         # The current state of the running episode.
         self.env_states = [None for _ in range_(self.num_environments)]
 
+        # Background learner thread.
+        self.update_in_background = update_in_background
+        self.max_update_ratio = max_update_ratio
+        self.max_weight_staleness = max_weight_staleness
+        self.learner_thread = None
+        # Observed samples, inserted into the agent's memory by the learner thread.
+        self.observe_buffer = deque()
+        # Serializes updates (learner thread) and action computation (acting loop) if parameters are updated in place.
+        self.agent_lock = threading.Lock()
+        self.lock_actions = get_backend() == "pytorch"
+        # Signals new data (to the learner) and finished updates (to the acting loop).
+        self.learner_condition = threading.Condition()
+        self.learner_stop_event = threading.Event()
+        self.learner_error = None
+        self.background_update_steps = 0
+        self.timesteps_at_last_update = 0
+
     @staticmethod
     def setup_preprocessor(preprocessing_spec, in_space):
         if preprocessing_spec is not None:
@@ -103,6 +149,30 @@ class SingleThreadedWorker(Worker):
         else:
             return None
 
+    def reset_episode_statistics(self):
+        """
+        Clears the statistics of all finished episodes.
+        """
+        self.episode_reward_stats = [StreamingStatistics(**self.episode_statistics_spec)
+                                     for _ in range_(self.num_environments)]
+        self.episode_duration_stats = [StreamingStatistics(**self.episode_statistics_spec)
+                                       for _ in range_(self.num_environments)]
+        self.episode_timestep_stats = [StreamingStatistics(**self.episode_statistics_spec)
+                                       for _ in range_(self.num_environments)]
+
+    @property
+    def finished_episode_rewards(self):
+        # Per environment: The rewards of the most recent finished episodes.
+        return [list(stats.window) for stats in self.episode_reward_stats]
+
+    @property
+    def finished_episode_durations(self):
+        return [list(stats.window) for stats in self.episode_duration_stats]
+
+    @property
+    def finished_episode_timesteps(self):
+        return [list(stats.window) for stats in self.episode_timestep_stats]
+
     def execute_timesteps(self, num_timesteps, max_timesteps_per_episode=0, update_spec=None, use_exploration=True,
                           frameskip=None, reset=True):
         return self._execute(
@@ -174,13 +244,12 @@ class SingleThreadedWorker(Worker):
         episodes_executed = 0
 
         start = time.perf_counter()
+        self.phase_timer.reset()
         episode_terminals = self.episode_terminals
         if reset is True:
             self.env_frames = 0
             self.episodes_since_update = 0
-            self.finished_episode_rewards = [[] for _ in range_(self.num_environments)]
-            self.finished_episode_durations = [[] for _ in range_(self.num_environments)]
-            self.finished_episode_timesteps = [[] for _ in range_(self.num_environments)]
+            self.reset_episode_statistics()
 
             for i, env_id in enumerate(self.env_ids):
                 self.episode_returns[i] = 0
@@ -195,125 +264,149 @@ class SingleThreadedWorker(Worker):
         elif self.env_states[0] is None:
             raise RLGraphError("Runner must be reset at the very beginning. Environment is in invalid state.")
 
-        # Only run everything for at most num_timesteps (if defined).
-        env_states = self.env_states
-        while not (0 < num_timesteps <= timesteps_executed):
-            if self.render:
-                self.vector_env.render()
+        if self.update_in_background is True and self.updating is True:
+            self.start_learner_thread()
 
-            if self.worker_executes_preprocessing:
-                for i, env_id in enumerate(self.env_ids):
-                    state = self.agent.state_space.force_batch(env_states[i])
-                    if self.preprocessors[env_id] is not None:
-                        if self.state_is_preprocessed[env_id] is False:
-                            self.preprocessed_states_buffer[i] = self.preprocessors[env_id].preprocess(state)
-                            self.state_is_preprocessed[env_id] = True
+        # Always stop the learner thread, also if acting fails (e.g. environment errors or interrupts).
+        try:
+            # Only run everything for at most num_timesteps (if defined).
+            env_states = self.env_states
+            while not (0 < num_timesteps <= timesteps_executed):
+                if self.render:
+                    self.vector_env.render()
+
+                if self.worker_executes_preprocessing:
+                    with self.phase_timer.phase("preprocessing"):
+                        for i, env_id in enumerate(self.env_ids):
+                            state = self.agent.state_space.force_batch(env_states[i])
+                            if self.preprocessors[env_id] is not None:
+                                if self.state_is_preprocessed[env_id] is False:
+                                    self.preprocessed_states_buffer[i] = self.preprocessors[env_id].preprocess(state)
+                                    self.state_is_preprocessed[env_id] = True
+                            else:
+                                self.preprocessed_states_buffer[i] = env_states[i]
+                    # TODO extra returns when worker is not applying preprocessing.
+                    with self.phase_timer.phase("action_computation"):
+                        actions = self._get_action(
+                            states=self.preprocessed_states_buffer, use_exploration=use_exploration,
+                            apply_preprocessing=self.apply_preprocessing
+                        )
+                    preprocessed_states = np.array(self.preprocessed_states_buffer)
+                else:
+                    with self.phase_timer.phase("action_computation"):
+                        actions, preprocessed_states = self._get_action(
+                            states=np.array(env_states), use_exploration=use_exploration,
+                            apply_preprocessing=True, extra_returns="preprocessed_states"
+                        )
+
+                # Accumulate the reward over n env-steps (equals one action pick). n=self.frameskip.
+                env_rewards = [0 for _ in range_(self.num_environments)]
+                next_states = None
+                # For container action spaces, we have to treat each key as an array with batch-rank at index 0.
+                # The action-dict is then translated into a list of dicts where each dict contains the original data
+                # but without the batch-rank.
+                # E.g. {'A': array([0, 1]), 'B': array([2, 3])} -> [{'A': 0, 'B': 2}, {'A': 1, 'B': 3}]
+                if self.agent.flat_action_space is not None:
+                    some_key = next(iter(actions))
+                    assert isinstance(actions, dict) and isinstance(actions[some_key], np.ndarray),\
+                        "ERROR: Cannot flip container-action batch with dict keys if returned value is not a dict OR " \
+                        "values of returned value are not np.ndarrays!"
+                    # TODO: What if actions come as nested dicts (more than one level deep)?
+                    if hasattr(actions[some_key], "len"):
+                        env_actions = [{key: value[i] for key, value in actions.items()}
+                                       for i in range(len(actions[some_key]))]
                     else:
-                        self.preprocessed_states_buffer[i] = env_states[i]
-                # TODO extra returns when worker is not applying preprocessing.
-                actions = self.agent.get_action(
-                    states=self.preprocessed_states_buffer, use_exploration=use_exploration,
-                    apply_preprocessing=self.apply_preprocessing
-                )
-                preprocessed_states = np.array(self.preprocessed_states_buffer)
-            else:
-                actions, preprocessed_states = self.agent.get_action(
-                    states=np.array(env_states), use_exploration=use_exploration,
-                    apply_preprocessing=True, extra_returns="preprocessed_states"
-                )
+                        # Action was not array type.
+                        env_actions = [{key: value for key, value in actions.items()}]
 
-            # Accumulate the reward over n env-steps (equals one action pick). n=self.frameskip.
-            env_rewards = [0 for _ in range_(self.num_environments)]
-            next_states = None
-            # For container action spaces, we have to treat each key as an array with batch-rank at index 0.
-            # The action-dict is then translated into a list of dicts where each dict contains the original data
-            # but without the batch-rank.
-            # E.g. {'A': array([0, 1]), 'B': array([2, 3])} -> [{'A': 0, 'B': 2}, {'A': 1, 'B': 3}]
-            if self.agent.flat_action_space is not None:
-                some_key = next(iter(actions))
-                assert isinstance(actions, dict) and isinstance(actions[some_key], np.ndarray),\
-                    "ERROR: Cannot flip container-action batch with dict keys if returned value is not a dict OR " \
-                    "values of returned value are not np.ndarrays!"
-                # TODO: What if actions come as nested dicts (more than one level deep)?
-                if hasattr(actions[some_key], "len"):
-                    env_actions = [{key: value[i] for key, value in actions.items()} for i in range(len(actions[some_key]))]
+                # No flipping necessary.
                 else:
-                    # Action was not array type.
-                    env_actions = [{key: value for key, value in actions.items()}]
-
-            # No flipping necessary.
-            else:
-                env_actions = actions
-                if self.num_environments == 1 and env_actions.shape == ():
-                    env_actions = [env_actions]
-
-            for _ in range_(frameskip):
-                next_states, step_rewards, episode_terminals, _ = self.vector_env.step(actions=env_actions)
-
-                self.env_frames += self.num_environments
-                for i, step_reward in enumerate(step_rewards):
-                    env_rewards[i] += step_reward
-                if np.any(episode_terminals):
-                    break
+                    env_actions = actions
+                    if self.num_environments == 1 and env_actions.shape == ():
+                        env_actions = [env_actions]
 
-            # Only render once per action.
-            #if self.render:
-            #    self.vector_env.environments[0].render()
+                with self.phase_timer.phase("env_step"):
+                    for _ in range_(frameskip):
+                        next_states, step_rewards, episode_terminals, _ = self.vector_env.step(actions=env_actions)
 
-            for i, env_id in enumerate(self.env_ids):
-                self.episode_returns[i] += env_rewards[i]
-                self.episode_timesteps[i] += 1
+                        self.env_frames += self.num_environments
+                        for i, step_reward in enumerate(step_rewards):
+                            env_rewards[i] += step_reward
+                        if np.any(episode_terminals):
+                            break
+
+                # Only render once per action.
+                #if self.render:
+                #    self.vector_env.environments[0].render()
+
+                for i, env_id in enumerate(self.env_ids):
+                    self.episode_returns[i] += env_rewards[i]
+                    self.episode_timesteps[i] += 1
+
+                    if 0 < max_timesteps_per_episode[i] <= self.episode_timesteps[i]:
+                        episode_terminals[i] = True
+                    if self.worker_executes_preprocessing:
+                        self.state_is_preprocessed[env_id] = False
+                    # Do accounting for finished episodes.
+                    if episode_terminals[i]:
+                        episodes_executed += 1
+                        self.episodes_since_update += 1
+                        episode_duration = time.perf_counter() - self.episode_starts[i]
+                        self.episode_reward_stats[i].add(self.episode_returns[i])
+                        self.episode_duration_stats[i].add(episode_duration)
+                        self.episode_timestep_stats[i].add(self.episode_timesteps[i])
+
+                        self.log_finished_episode(
+                            reward=self.episode_returns[i],
+                            duration=episode_duration,
+                            timesteps=self.episode_timesteps[i],
+                            env_num=i
+                        )
+
+                        # Reset this environment and its preprocecssor stack.
+                        with self.phase_timer.phase("env_reset"):
+                            env_states[i] = self.vector_env.reset(i)
+                        if self.worker_executes_preprocessing and self.preprocessors[env_id] is not None:
+                            with self.phase_timer.phase("preprocessing"):
+                                self.preprocessors[env_id].reset()
+                                # This re-fills the sequence with the reset state.
+                                state = self.agent.state_space.force_batch(env_states[i])
+                                # Pre - process, add to buffer
+                                self.preprocessed_states_buffer[i] = \
+                                    np.array(self.preprocessors[env_id].preprocess(state))
+                                self.state_is_preprocessed[env_id] = True
+
+                        self.episode_returns[i] = 0
+                        self.episode_timesteps[i] = 0
+                        self.episode_starts[i] = time.perf_counter()
+                    else:
+                        # Otherwise assign states to next states
+                        env_states[i] = next_states[i]
 
-                if 0 < max_timesteps_per_episode[i] <= self.episode_timesteps[i]:
-                    episode_terminals[i] = True
-                if self.worker_executes_preprocessing:
-                    self.state_is_preprocessed[env_id] = False
-                # Do accounting for finished episodes.
-                if episode_terminals[i]:
-                    episodes_executed += 1
-                    self.episodes_since_update += 1
-                    episode_duration = time.perf_counter() - self.episode_starts[i]
-                    self.finished_episode_rewards[i].append(self.episode_returns[i])
-                    self.finished_episode_durations[i].append(episode_duration)
-                    self.finished_episode_timesteps[i].append(self.episode_timesteps[i])
-
-                    self.log_finished_episode(
-                        reward=self.episode_returns[i],
-                        duration=episode_duration,
-                        timesteps=self.episode_timesteps[i],
-                        env_num=i
-                    )
-
-                    # Reset this environment and its preprocecssor stack.
-                    env_states[i] = self.vector_env.reset(i)
                     if self.worker_executes_preprocessing and self.preprocessors[env_id] is not None:
-                        self.preprocessors[env_id].reset()
-                        # This re-fills the sequence with the reset state.
-                        state = self.agent.state_space.force_batch(env_states[i])
-                        # Pre - process, add to buffer
-                        self.preprocessed_states_buffer[i] = np.array(self.preprocessors[env_id].preprocess(state))
-                        self.state_is_preprocessed[env_id] = True
-
-                    self.episode_returns[i] = 0
-                    self.episode_timesteps[i] = 0
-                    self.episode_starts[i] = time.perf_counter()
+                        #next_state = self.agent.state_space.force_batch(env_states[i])
+                        with self.phase_timer.phase("preprocessing"):
+                            next_states[i] = np.array(
+                                self.preprocessors[env_id].preprocess(env_states[i])
+                            )  # next_state
+                    with self.phase_timer.phase("observe"):
+                        self._observe(
+                            self.env_ids[i], preprocessed_states[i], env_actions[i], env_rewards[i], next_states[i],
+                            episode_terminals[i]
+                        )
+                if self.learner_thread is not None:
+                    with self.phase_timer.phase("learner_wait"):
+                        self.wait_for_learner()
                 else:
-                    # Otherwise assign states to next states
-                    env_states[i] = next_states[i]
-
-                if self.worker_executes_preprocessing and self.preprocessors[env_id] is not None:
-                    #next_state = self.agent.state_space.force_batch(env_states[i])
-                    next_states[i] = np.array(self.preprocessors[env_id].preprocess(env_states[i]))  # next_state
-                self._observe(
-                    self.env_ids[i], preprocessed_states[i], env_actions[i], env_rewards[i], next_states[i],
-                    episode_terminals[i]
-                )
-            self.update_if_necessary()
-            timesteps_executed += self.num_environments
-            num_timesteps_reached = (0 < num_timesteps <= timesteps_executed)
+                    self.update_if_necessary()
+                timesteps_executed += self.num_environments
+                num_timesteps_reached = (0 < num_timesteps <= timesteps_executed)
 
-            if 0 < num_episodes <= episodes_executed or num_timesteps_reached:
-                break
+                if 0 < num_episodes <= episodes_executed or num_timesteps_reached:
+                    break
+        finally:
+            if self.learner_thread is not None:
+                self.stop_learner_thread()
 
         total_time = (time.perf_counter() - start) or 1e-10
 
@@ -324,15 +417,11 @@ class SingleThreadedWorker(Worker):
             max_episode_reward = np.max(self.episode_returns)
             final_episode_reward = self.episode_returns[0]
         else:
-            all_finished_durations = []
-            all_finished_rewards = []
-            for i in range_(self.num_environments):
-                all_finished_rewards.extend(self.finished_episode_rewards[i])
-                all_finished_durations.extend(self.finished_episode_durations[i])
-            mean_episode_runtime = np.mean(all_finished_durations)
-            mean_episode_reward = np.mean(all_finished_rewards)
-            max_episode_reward = np.max(all_finished_rewards)
-            final_episode_reward = all_finished_rewards[-1]
+            reward_stats = StreamingStatistics.merged(self.episode_reward_stats, window_size=1)
+            mean_episode_runtime = StreamingStatistics.merged(self.episode_duration_stats, window_size=1).mean
+            mean_episode_reward = reward_stats.mean
+            max_episode_reward = reward_stats.max
+            final_episode_reward = reward_stats.last
 
         self.episode_terminals = episode_terminals
         self.env_states = env_states
@@ -351,6 +440,12 @@ class SingleThreadedWorker(Worker):
             max_episode_reward=max_episode_reward,
             final_episode_reward=final_episode_reward
         )
+        if episodes_executed > 0 and reward_stats.num_quantile_samples > 0:
+            results["episode_reward_quantiles"] = {
+                key: value for key, value in reward_stats.get_statistics().items() if key.startswith("q")
+            }
+        if self.phase_timer.enabled:
+            results["phase_times"] = self.phase_timer.get_statistics()
 
         # Total time of run.
         self.logger.info("Finished execution in {} s".format(total_time))
@@ -370,12 +465,122 @@ class SingleThreadedWorker(Worker):
 
         return results
 
+    def _get_action(self, **kwargs):
+        if self.learner_thread is not None and self.lock_actions is True:
+            # Do not read parameters while the learner thread updates them in place.
+            with self.agent_lock:
+                return self.agent.get_action(**kwargs)
+        return self.agent.get_action(**kwargs)
+
     def _observe(self, env_ids, states, actions, rewards, next_states, terminals):
         # TODO: If worker does not execute preprocessing, next state is not preprocessed here.
         # Observe per environment.
+        if self.learner_thread is not None:
+            # Do not block acting on running updates, the learner thread inserts buffered samples.
+            self.observe_buffer.append((env_ids, states, actions, rewards, next_states, terminals))
+            return
         self.agent.observe(
             preprocessed_states=states, actions=actions, internals=[],
             rewards=rewards, next_states=next_states,
             terminals=terminals, env_id=env_ids
         )
 
+    def insert_buffered_samples(self):
+        """
+        Observes all samples buffered by the acting loop (while the learner thread is running).
+        """
+        while len(self.observe_buffer) > 0:
+            env_ids, states, actions, rewards, next_states, terminals = self.observe_buffer.popleft()
+            self.agent.observe(
+                preprocessed_states=states, actions=actions, internals=[],
+                rewards=rewards, next_states=next_states,
+                terminals=terminals, env_id=env_ids
+            )
+
+    def start_learner_thread(self):
+        """
+        Starts the background learner thread performing agent updates according to the update schedule.
+        """
+        if self.max_update_ratio is None:
+            self.max_update_ratio = self.update_steps / self.update_interval
+        self.learner_stop_event.clear()
+        self.learner_error = None
+        self.timesteps_at_last_update = self.agent.timesteps
+        self.learner_thread = threading.Thread(target=self.run_learner, name="learner-thread")
+        self.learner_thread.daemon = True
+        self.learner_thread.start()
+
+    def stop_learner_thread(self):
+        """
+        Stops the background learner thread (after its current update), observes the samples it has not inserted
+        yet and re-raises any error that occurred in it.
+        """
+        self.learner_stop_event.set()
+        with self.learner_condition:
+            self.learner_condition.notify_all()
+        self.learner_thread.join()
+        self.learner_thread = None
+        self.logger.info("Learner thread performed {} update steps in the background.".format(
+            self.background_update_steps
+        ))
+        if self.learner_error is not None:
+            self.observe_buffer.clear()
+            raise self.learner_error
+        self.insert_buffered_samples()
+
+    def run_learner(self):
+        """
+        Learner thread loop: Inserts buffered samples and updates the agent whenever the update-to-data ratio allows
+        it (or the acting loop waits for fresher weights), waits for new data otherwise.
+        """
+        try:
+            while not self.learner_stop_event.is_set():
+                self.insert_buffered_samples()
+                with self.learner_condition:
+                    if self.background_update_steps >= self.num_allowed_update_steps() and \
+                            not self.weights_too_stale():
+                        self.learner_condition.wait(timeout=0.1)
+                        continue
+                with self.agent_lock:
+                    self.execute_update()
+                self.background_update_steps += self.update_steps
+                with self.learner_condition:
+                    self.timesteps_at_last_update = self.agent.timesteps
+                    self.learner_condition.notify_all()
+        except Exception as e:
+            self.learner_error = e
+            with self.learner_condition:
+                self.learner_condition.notify_all()
+
+    def num_allowed_update_steps(self):
+        """
+        Returns:
+            int: The number of update steps the learner thread may have performed given the data collected so far.
+        """
+        timesteps = self.agent.timesteps - self.steps_before_update
+        if timesteps <= 0 or (self.agent.observe_spec["buffer_enabled"] is True and
+                              self.agent.timesteps < self.agent.observe_spec["buffer_size"]):
+            return 0
+        return int(timesteps * self.max_update_ratio)
+
+    def weights_too_stale(self):
+        """
+        Returns:
+            bool: Whether more than `max_weight_staleness` time steps were collected since the last finished update
+                (once updating has started).
+        """
+        return self.max_weight_staleness is not None and self.num_allowed_update_steps() > 0 and \
+            self.agent.timesteps - self.timesteps_at_last_update > self.max_weight_staleness
+
+    def wait_for_learner(self):
+        """
+        Notifies the learner thread of new data and blocks the acting loop as long as the current weights are
+        staler than `max_weight_staleness` time steps.
+        """
+        with self.learner_condition:
+            self.learner_condition.notify_all()
+            while self.learner_error is None and self.weights_too_stale():
+                self.learner_condition.wait(timeout=0.1)
+        if self.learner_error is not None:
+            self.stop_learner_thread()
+
@@ -23,6 +23,7 @@ import numpy as np
 from six.moves import xrange as range_
 
 from rlgraph.environments import VectorEnv, SequentialVectorEnv
+from rlgraph.utils.phase_timer import PhaseTimer
 from rlgraph.utils.specifiable import Specifiable
 
 
@@ -31,7 +32,8 @@ class Worker(Specifiable):
     Generic worker to locally interact with simulator environments.
     """
     def __init__(self, agent, env_spec=None, num_environments=1, frameskip=1, render=False,
-                 worker_executes_exploration=True, exploration_epsilon=0.1, episode_finish_callback=None):
+                 worker_executes_exploration=True, exploration_epsilon=0.1, episode_finish_callback=None,
+                 record_phase_times=False):
         """
         Args:
             agent (Agent): Agent to execute environment on.
@@ -44,6 +46,9 @@ class Worker(Specifiable):
                 Default: False.
             worker_executes_exploration (bool): If worker executes exploration by sampling.
             exploration_epsilon (Optional[float]): Epsilon to use if worker executes exploration.
+            record_phase_times (bool): Whether to record the time spent in the different phases of execution
+                (preprocessing, action computation, env stepping, observing, updating, etc.). The results are
+                returned under the "phase_times" key of the execution statistics. Default: False.
         """
         super(Worker, self).__init__()
         self.num_environments = num_environments
@@ -83,6 +88,8 @@ class Worker(Specifiable):
 
         self.episode_finish_callback = episode_finish_callback
 
+        self.phase_timer = PhaseTimer(enabled=record_phase_times)
+
     def execute_timesteps(self, num_timesteps, max_timesteps_per_episode=0, update_spec=None, use_exploration=True,
                           frameskip=1, reset=True):
         """
@@ -203,14 +210,15 @@ class Worker(Specifiable):
         return None
 
     def execute_update(self):
-        loss = 0
-        for _ in range_(self.update_steps):
-            ret = self.agent.update()
-            if isinstance(ret, tuple):
-                loss += ret[0]
-            else:
-                loss += ret
-        return loss
+        with self.phase_timer.phase("update"):
+            loss = 0
+            for _ in range_(self.update_steps):
+                ret = self.agent.update()
+                if isinstance(ret, tuple):
+                    loss += ret[0]
+                else:
+                    loss += ret
+            return loss
 
     def set_update_schedule(self, update_schedule=None):
         """
@@ -18,8 +18,10 @@ from __future__ import division
 from __future__ import print_function
 
 import logging
+import time
 
 from rlgraph.graphs import MetaGraphBuilder
+from rlgraph.utils.latency_histogram import LatencyHistogram
 from rlgraph.utils.rlgraph_errors import RLGraphError
 from rlgraph.utils.specifiable import Specifiable
 from rlgraph.utils.input_parsing import parse_saver_spec, parse_execution_spec
@@ -92,6 +94,14 @@ class GraphExecutor(Specifiable):
         self.default_device = None
         self.device_map = None
 
+        # Light-weight, backend-independent tracing of `execute` calls: Call counts and latency histograms per
+        # (combination of) API-method(s).
+        self.api_call_tracing_enabled = self.execution_spec.get("enable_api_call_tracing", False)
+        # Log all statistics every n `execute` calls (0 for never).
+        self.api_call_tracing_frequency = self.execution_spec.get("api_call_tracing_frequency", 0)
+        self.api_call_histograms = {}
+        self.api_call_count = 0
+
     def build(self, root_components, input_spaces, **kwargs):
         """
         Sets up the computation graph by:
@@ -125,6 +135,56 @@ class GraphExecutor(Specifiable):
         """
         raise NotImplementedError
 
+    def trace_api_call(self, api_method_calls, start):
+        """
+        Records the latency of an `execute` call that started at `start` (ending now) in the histogram for the called
+        API-method(s).
+
+        Args:
+            api_method_calls (tuple): The `api_method_calls` passed into `execute`.
+            start (float): The `time.perf_counter()` value at the start of the call.
+        """
+        latency = time.perf_counter() - start
+        names = [call if isinstance(call, str) else call[0] for call in api_method_calls if call is not None]
+        key = names[0] if len(names) == 1 else "+".join(names)
+        histogram = self.api_call_histograms.get(key)
+        if histogram is None:
+            histogram = self.api_call_histograms[key] = LatencyHistogram()
+        histogram.record(latency)
+
+        self.api_call_count += 1
+        if self.api_call_tracing_frequency > 0 and self.api_call_count % self.api_call_tracing_frequency == 0:
+            self.dump_api_call_statistics()
+
+    def get_api_call_statistics(self, reset=False):
+        """
+        Returns the call counts and latency statistics (in seconds) of all traced API-method calls.
+
+        Args:
+            reset (bool): Whether to clear all histograms after reading them (e.g. for per-interval reporting).
+
+        Returns:
+            Dict[str,dict]: Per API-method (or "+"-joined API-methods for calls executing more than one method at
+                once): count, mean, min, max and the p50, p90, p99 and p99.9 percentiles.
+        """
+        statistics = {name: histogram.get_statistics() for name, histogram in self.api_call_histograms.items()}
+        if reset is True:
+            for histogram in self.api_call_histograms.values():
+                histogram.reset()
+        return statistics
+
+    def dump_api_call_statistics(self):
+        """
+        Logs the latency statistics of all traced API-method calls.
+        """
+        for name, stats in sorted(self.get_api_call_statistics().items()):
+            self.logger.info(
+                "API-method '{}': calls={} mean={:.3f}ms p50={:.3f}ms p99={:.3f}ms p99.9={:.3f}ms max={:.3f}ms".format(
+                    name, stats["count"], stats["mean"] * 1000, stats["p50"] * 1000, stats["p99"] * 1000,
+                    stats["p99.9"] * 1000, stats["max"] * 1000
+                )
+            )
+
     def read_variable_values(self, variables):
         """
         Read variable values from a graph, e.g. by calling the underlying graph
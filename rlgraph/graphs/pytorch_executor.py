@@ -81,6 +81,14 @@ class PyTorchExecutor(GraphExecutor):
         )
 
     def execute(self, *api_method_calls):
+        if self.api_call_tracing_enabled:
+            start = time.perf_counter()
+            ret = self._execute(*api_method_calls)
+            self.trace_api_call(api_method_calls, start)
+            return ret
+        return self._execute(*api_method_calls)
+
+    def _execute(self, *api_method_calls):
         # Have to call each method separately.
         ret = []
         for api_method in api_method_calls:
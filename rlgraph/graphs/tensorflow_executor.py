@@ -217,6 +217,14 @@ class TensorFlowExecutor(GraphExecutor):
         )
 
     def execute(self, *api_method_calls):
+        if self.api_call_tracing_enabled:
+            start = time.perf_counter()
+            ret = self._execute(*api_method_calls)
+            self.trace_api_call(api_method_calls, start)
+            return ret
+        return self._execute(*api_method_calls)
+
+    def _execute(self, *api_method_calls):
         # Fetch inputs for the different API-methods.
         fetch_dict, feed_dict = self.graph_builder.get_execution_inputs(*api_method_calls)
         ret = self.monitored_session.run(
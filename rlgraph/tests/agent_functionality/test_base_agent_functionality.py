@@ -23,7 +23,7 @@ import unittest
 from rlgraph.agents import Agent, PPOAgent
 from rlgraph.environments import GridWorld, OpenAIGymEnv
 from rlgraph.tests.test_util import config_from_path, recursive_assert_almost_equal
-from rlgraph.utils import root_logger
+from rlgraph.utils import root_logger, RLGraphError
 
 
 class TestBaseAgentFunctionality(unittest.TestCase):
@@ -53,6 +53,50 @@ class TestBaseAgentFunctionality(unittest.TestCase):
 
         recursive_assert_almost_equal(new_actual_weights["policy_weights"], new_weights)
 
+    def test_acting_only_agent(self):
+        """
+        Tests building an Agent w/o memory, optimizer and update API-methods and syncing weights into it.
+        """
+        env = GridWorld(world="2x2")
+        agent_config = config_from_path("configs/dqn_agent_for_functionality_test.json")
+        learner = Agent.from_spec(agent_config, state_space=env.state_space, action_space=env.action_space)
+        actor = Agent.from_spec(
+            agent_config, state_space=env.state_space, action_space=env.action_space, acting_only=True
+        )
+        self.assertTrue(actor.memory is None)
+        self.assertTrue(actor.optimizer is None)
+        self.assertFalse("update_from_memory" in actor.root_component.api_methods)
+        self.assertFalse("insert_records" in actor.root_component.api_methods)
+
+        # Sync learner weights into the actor.
+        learner_weights = learner.get_weights()["policy_weights"]
+        actor.set_weights(learner_weights)
+        recursive_assert_almost_equal(actor.get_weights()["policy_weights"], learner_weights)
+
+        state = env.reset()
+        action = actor.get_action(state, use_exploration=False)
+        self.assertTrue(env.action_space.contains(action))
+        self.assertEqual(action, learner.get_action(state, use_exploration=False))
+
+        with self.assertRaises(RLGraphError):
+            actor.observe(preprocessed_states=state, actions=action, internals=[], rewards=0.0, next_states=state,
+                          terminals=False)
+
+    def test_observe_buffer_larger_than_memory(self):
+        """
+        Tests that the observe buffer must fit into the memory (which acting-only Agents do not have).
+        """
+        env = GridWorld(world="2x2")
+        agent_config = config_from_path("configs/dqn_agent_for_functionality_test.json")
+        agent_config["observe_spec"] = dict(buffer_size=agent_config["memory_spec"]["capacity"] + 1)
+        with self.assertRaises(AssertionError):
+            Agent.from_spec(agent_config, state_space=env.state_space, action_space=env.action_space)
+
+        actor = Agent.from_spec(
+            agent_config, state_space=env.state_space, action_space=env.action_space, acting_only=True
+        )
+        self.assertTrue(actor.memory is None)
+
     def test_value_function_weights(self):
         """
         Tests changing of value function weights.
@@ -17,6 +17,8 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
+import os
+import tempfile
 import unittest
 import numpy as np
 
@@ -305,3 +307,33 @@ class TestDQFDAgentFunctionality(unittest.TestCase):
         # Evaluate demos for the state -> should have action with positive reward.
         agent_actions = agent.get_action(np.array([demo_states[0]]), apply_preprocessing=False, use_exploration=False)
         print("learned action = ", agent_actions)
+
+    def test_import_observations(self):
+        """
+        Tests bulk importing demos from memory-mapped npy-files and from a dict in several chunks.
+        """
+        state_space = FloatBox(shape=(4,))
+        action_space = IntBox(2)
+        agent = DQFDAgent.from_spec(
+            config_from_path("configs/dqfd_agent_for_cartpole.json"),
+            state_space=state_space,
+            action_space=action_space
+        )
+
+        num_records = 250
+        demos = dict(
+            states=state_space.sample(num_records),
+            actions=action_space.sample(num_records),
+            rewards=FloatBox().sample(num_records),
+            next_states=state_space.sample(num_records),
+            terminals=BoolBox().sample(num_records)
+        )
+        demo_dir = tempfile.mkdtemp()
+        for key, value in demos.items():
+            np.save(os.path.join(demo_dir, key + ".npy"), value)
+
+        num_imported = agent.import_observations([demo_dir, demos], chunk_size=100)
+        self.assertEqual(num_imported, 2 * num_records)
+
+        # Demos can be sampled for updates.
+        agent.update_from_demos(num_updates=2)
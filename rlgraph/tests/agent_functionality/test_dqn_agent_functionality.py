@@ -26,7 +26,7 @@ import rlgraph.spaces as spaces
 from rlgraph.components.loss_functions.dqn_loss_function import DQNLossFunction
 from rlgraph.environments import GridWorld, RandomEnv
 from rlgraph.execution.single_threaded_worker import SingleThreadedWorker
-from rlgraph.tests.test_util import config_from_path
+from rlgraph.tests.test_util import config_from_path, recursive_assert_almost_equal
 from rlgraph.utils import root_logger, one_hot
 from rlgraph.tests.agent_test import AgentTest
 
@@ -309,3 +309,84 @@ class TestDQNAgentFunctionality(unittest.TestCase):
                 mat_updated[i][index] += agent.optimizer.learning_rate * dl_over_dw
 
         return mat_updated
+
+    def test_multi_step_update(self):
+        """
+        Tests performing several update steps (and due target-net syncs) within one `update` call.
+        """
+        env = RandomEnv(state_space=spaces.FloatBox(shape=(4,)), action_space=spaces.IntBox(2), deterministic=True)
+        agent = Agent.from_spec(
+            config_from_path("configs/dqn_agent_for_cartpole.json"),
+            state_space=env.state_space,
+            action_space=env.action_space
+        )
+        worker = SingleThreadedWorker(env_spec=lambda: env, agent=agent, worker_executes_preprocessing=False)
+        worker.execute_timesteps(64, use_exploration=True)
+
+        sync_interval = agent.update_spec["sync_interval"]
+        update_interval = agent.update_spec["update_interval"]
+        agent.steps_since_target_net_sync = 0
+        num_steps = sync_interval // update_interval + 1
+        loss, records = agent.update(num_steps=num_steps)
+        self.assertEqual(loss.shape, (num_steps,))
+        self.assertEqual(len(records), num_steps)
+        # One sync was due after `num_steps` - 1 steps.
+        self.assertEqual(agent.steps_since_target_net_sync, update_interval)
+
+        # A due sync reads the policy weights after the (last) update step -> Target-net equals the policy.
+        agent.steps_since_target_net_sync = sync_interval - update_interval
+        agent.update(num_steps=2)
+        self.assertEqual(agent.steps_since_target_net_sync, update_interval)
+        agent.steps_since_target_net_sync = sync_interval - update_interval
+        agent.update()
+        variables = agent.root_component.variable_registry
+        policy_variables, target_variables = [{
+            name[len(scope):]: var for name, var in variables.items() if name.startswith(scope + "/")
+        } for scope in [agent.policy.scope, agent.target_policy.scope]]
+        self.assertEqual(sorted(policy_variables), sorted(target_variables))
+        recursive_assert_almost_equal(
+            agent.graph_executor.read_variable_values(target_variables),
+            agent.graph_executor.read_variable_values(policy_variables)
+        )
+
+        batch_size = 8
+        batch = dict(
+            states=env.state_space.sample(batch_size), actions=env.action_space.sample(batch_size),
+            rewards=np.random.random(size=batch_size), terminals=np.zeros(shape=(batch_size,), dtype=bool),
+            next_states=env.state_space.sample(batch_size), importance_weights=np.ones(shape=(batch_size,))
+        )
+        loss, loss_per_item = agent.update(batch, num_steps=3)
+        self.assertEqual(loss.shape, (3,))
+        self.assertEqual(loss_per_item.shape, (3, batch_size))
+
+    def test_update_from_input_pipeline(self):
+        """
+        Tests updating from external batches that are fed through an input pipeline.
+        """
+        env = RandomEnv(state_space=spaces.FloatBox(shape=(4,)), action_space=spaces.IntBox(2), deterministic=True)
+        agent = Agent.from_spec(
+            config_from_path("configs/dqn_agent_for_cartpole.json"),
+            state_space=env.state_space,
+            action_space=env.action_space,
+            input_pipeline_spec=dict(capacity=4, prefetch_size=2)
+        )
+
+        batch_size = 8
+        batches = [dict(
+            states=env.state_space.sample(batch_size), actions=env.action_space.sample(batch_size),
+            rewards=np.random.random(size=batch_size), terminals=np.zeros(shape=(batch_size,), dtype=bool),
+            next_states=env.state_space.sample(batch_size), importance_weights=np.ones(shape=(batch_size,)),
+            indices=np.arange(batch_size)  # <- Additional keys are ignored.
+        ) for _ in range(3)]
+
+        # Batches inserted ahead of time.
+        for batch in batches:
+            agent.input_pipeline.insert(batch)
+        loss, loss_per_item = agent.update(num_steps=3)
+        self.assertEqual(loss.shape, (3,))
+        self.assertEqual(loss_per_item.shape, (3, batch_size))
+
+        # Batches passed into `update`.
+        loss, loss_per_item = agent.update(batches[0], num_steps=2)
+        self.assertEqual(loss_per_item.shape, (2, batch_size))
+        self.assertTrue(agent.input_pipeline.queue.empty())
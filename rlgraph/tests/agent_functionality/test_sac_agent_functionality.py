@@ -4,7 +4,7 @@ import numpy as np
 
 from rlgraph.agents.sac_agent import SACAgentComponent, SyncSpecification, SACAgent
 from rlgraph.environments import OpenAIGymEnv
-from rlgraph.spaces import FloatBox, BoolBox
+from rlgraph.spaces import FloatBox, BoolBox, IntBox
 from rlgraph.components import Policy, PreprocessorStack, ReplayMemory, AdamOptimizer, Synchronizable, \
     SACValueNetwork
 from rlgraph.tests import ComponentTest
@@ -124,6 +124,30 @@ class TestSACAgentFunctionality(unittest.TestCase):
         updated_weights = agent.get_weights()["policy_weights"]
         recursive_assert_almost_equal(updated_weights, new_weights)
 
+    def test_multi_step_update(self):
+        """
+        Tests that multi-step updates return per-step losses, also while the memory does not hold a batch yet.
+        """
+        agent = SACAgent.from_spec(
+            config_from_path("configs/sac_agent_for_cartpole.json"),
+            state_space=FloatBox(shape=(4,)),
+            action_space=IntBox(2)
+        )
+        batch_size = agent.batch_size
+        expected_shapes = [(3,), (3, batch_size), (3,), (3,)]
+
+        # Memory is empty: No update, but zero losses per step.
+        self.assertEqual([np.shape(ret) for ret in agent.update(num_steps=3)], expected_shapes)
+
+        batch = dict(
+            states=agent.preprocessed_state_space.sample(batch_size),
+            actions=agent.action_space.sample(batch_size),
+            rewards=np.ones((batch_size,)),
+            terminals=np.zeros((batch_size,)),
+            next_states=agent.preprocessed_state_space.sample(batch_size),
+        )
+        self.assertEqual([np.shape(ret) for ret in agent.update(batch, num_steps=3)], expected_shapes)
+
     def test_image_value_functions(self):
         """
         Tests if actions and states are successfully merged on image inputs to compute Q(s,a).
@@ -0,0 +1,162 @@
+# Copyright 2018/2019 The RLgraph authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import threading
+import unittest
+
+import numpy as np
+
+from rlgraph import get_backend
+from rlgraph.components.helpers.mem_segment_tree import MemSegmentTree, MinSumSegmentTree
+from rlgraph.components.memories.concurrent_mem_prioritized_replay import ConcurrentMemPrioritizedReplay
+from rlgraph.spaces import Dict, BoolBox, FloatBox, IntBox
+from rlgraph.tests import ComponentTest
+from rlgraph.utils.ops import flatten_op
+
+
+class TestConcurrentMemPrioritizedReplay(unittest.TestCase):
+    """
+    Tests the multi-producer prioritized replay, also under contention.
+    """
+    record_space = Dict(
+        states=dict(state1=float, state2=FloatBox(shape=(2,))),
+        reward=float,
+        terminals=BoolBox(),
+        add_batch_rank=True
+    )
+    input_spaces = dict(
+        records=record_space,
+        num_records=int,
+        indices=IntBox(add_batch_rank=True),
+        update=FloatBox(add_batch_rank=True)
+    )
+
+    def test_batched_tree_insert(self):
+        capacity = 8
+        def create_tree():
+            return MinSumSegmentTree(
+                sum_tree=MemSegmentTree([0.0] * 2 * capacity, capacity),
+                min_tree=MemSegmentTree([float("inf")] * 2 * capacity, capacity, min),
+                capacity=capacity
+            )
+
+        single = create_tree()
+        batched = create_tree()
+        indices = [0, 3, 4, 3, 7]
+        elements = [1.0, 2.0, 0.5, 3.0, 4.0]
+        for index, element in zip(indices, elements):
+            single.insert(index, element)
+        batched.insert_batch(indices, elements)
+
+        np.testing.assert_array_equal(batched.sum_segment_tree.values, single.sum_segment_tree.values)
+        np.testing.assert_array_equal(batched.min_segment_tree.values, single.min_segment_tree.values)
+        self.assertEqual(batched.sum_segment_tree.get_sum(), 8.5)
+
+    def test_batched_tree_sampling(self):
+        capacity = 16
+        tree = MemSegmentTree([0.0] * 2 * capacity, capacity)
+        priorities = np.random.random(size=(11,))
+        # Leave some leaves empty (they must never be sampled).
+        priorities[[2, 7]] = 0.0
+        for index, priority in enumerate(priorities):
+            tree.insert(index, priority)
+        np.testing.assert_array_almost_equal(tree.get_leaves([1, 3, 10]), priorities[[1, 3, 10]])
+
+        # The level-wise descent of all samples matches descending for each sample on its own.
+        prob_sum = tree.get_sum()
+        np.random.seed(10)
+        indices = tree.sample(1000, prob_sum)
+        np.random.seed(10)
+        prefix_sums = np.random.random(size=(1000,)) * prob_sum
+        np.testing.assert_array_equal(indices, [tree.index_of_prefixsum(prefix_sum) for prefix_sum in prefix_sums])
+        self.assertFalse(np.any(np.isin(indices, [2, 7])))
+        self.assertTrue(np.all(indices < 11))
+
+    @unittest.skipIf(get_backend() == "tf", "ConcurrentMemPrioritizedReplay is not supported by the tf backend.")
+    def test_insert_sample_and_update(self):
+        memory = ConcurrentMemPrioritizedReplay(capacity=10, alpha=1.0, beta=1.0)
+        test = ComponentTest(component=memory, input_spaces=self.input_spaces)
+
+        records = self.record_space.sample(size=4)
+        test.test(("insert_records", records), expected_outputs=None)
+        # Not visible before the sampling thread commits.
+        self.assertEqual(memory.size, 0)
+
+        batch, indices, weights = test.test(("get_records", 6), expected_outputs=None)
+        self.assertEqual(memory.size, 4)
+        np.testing.assert_array_equal(batch["reward"], records["reward"][indices])
+        np.testing.assert_array_equal(batch["states"]["state2"], records["states"]["state2"][indices])
+        np.testing.assert_almost_equal(weights, np.ones(shape=(6,)))
+
+        # Give record 2 nearly all priority mass.
+        test.test(("update_records", [np.array([0, 1, 2, 3]), np.array([0.001, 0.001, 100.0, 0.001])]),
+                  expected_outputs=None)
+        _, indices, _ = test.test(("get_records", 50), expected_outputs=None)
+        self.assertGreater(np.sum(indices == 2), 45)
+
+    @unittest.skipIf(get_backend() == "tf", "ConcurrentMemPrioritizedReplay is not supported by the tf backend.")
+    def test_stratified_unique_sampling(self):
+        memory = ConcurrentMemPrioritizedReplay(capacity=10, stratified_sampling=True, unique_indices=True)
+        test = ComponentTest(component=memory, input_spaces=self.input_spaces)
+
+        test.test(("insert_records", self.record_space.sample(size=10)), expected_outputs=None)
+        # Equal priorities -> One sample per record.
+        _, indices, weights = test.test(("get_records", 10), expected_outputs=None)
+        self.assertEqual(indices.tolist(), list(range(10)))
+        np.testing.assert_almost_equal(weights, np.ones(shape=(10,)))
+        # More samples than records -> Duplicates are removed.
+        _, indices, _ = test.test(("get_records", 25), expected_outputs=None)
+        self.assertEqual(indices.tolist(), list(range(10)))
+
+    @unittest.skipIf(get_backend() == "tf", "ConcurrentMemPrioritizedReplay is not supported by the tf backend.")
+    def test_inserts_under_contention(self):
+        num_producers = 4
+        num_batches = 50
+        batch_size = 5
+        capacity = num_producers * num_batches * batch_size
+        memory = ConcurrentMemPrioritizedReplay(capacity=capacity)
+        ComponentTest(component=memory, input_spaces=self.input_spaces)
+
+        def produce(producer_id):
+            for i in range(num_batches):
+                records = self.record_space.sample(size=batch_size)
+                # Unique reward per record.
+                start = (producer_id * num_batches + i) * batch_size
+                records["reward"] = np.arange(start, start + batch_size, dtype=np.float32)
+                # Producer threads call the API directly (with the flattened records as passed in by the executor).
+                memory.insert_records(flatten_op(records))
+
+        producers = [threading.Thread(target=produce, args=(i,)) for i in range(num_producers)]
+        for producer in producers:
+            producer.start()
+        # Sample and update concurrently from this thread.
+        while any(producer.is_alive() for producer in producers):
+            if memory.size > 0:
+                _, indices, _ = memory.get_records(8)
+                memory.update_records(indices.numpy(), np.random.uniform(size=8))
+        for producer in producers:
+            producer.join()
+        memory.commit_pending_records()
+
+        # Every record arrived exactly once and all slots have a priority.
+        self.assertEqual(memory.size, capacity)
+        self.assertEqual(memory.num_inserted, capacity)
+        self.assertEqual(sorted(memory.columns["/reward"].tolist()), list(range(capacity)))
+        self.assertTrue(memory.merged_segment_tree.min_segment_tree.get_min_value() > 0.0)
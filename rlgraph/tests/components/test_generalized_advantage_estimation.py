@@ -57,27 +57,16 @@ class TestGeneralizedAdvantageEstimation(unittest.TestCase):
         return list(reversed(discounted))
 
     @staticmethod
-    def discount_all(values, decay, terminal):
-        # Discounts multiple sub-sequences by keeping track of terminals.
+    def discount_all(values, decay, sequence_indices):
+        # Discounts multiple sub-sequences (each ending where sequence_indices is True).
         discounted = []
-        i = 0
-        length = 0
         prev_v = 0.0
-        for v in reversed(values):
-            # Accumulate prior value.
-            accum_v = prev_v + v * pow(decay, length)
-            discounted.append(accum_v)
-            prev_v = accum_v
-
-            # Arrived at new sequence, start over.
-            if np.all(terminal[i]):
-                print("Resetting discount after processing i = ", i)
-                length = 0
+        for v, sequence_end in zip(reversed(values), reversed(sequence_indices)):
+            # Arrived at the end of a sub-sequence, start over.
+            if np.all(sequence_end):
                 prev_v = 0.0
-
-            # Increase length of current sub-sequence.
-            length += 1
-            i += 1
+            prev_v = v + decay * prev_v
+            discounted.append(prev_v)
         return list(reversed(discounted))
 
     def gae_helper(self, baseline, reward, gamma, gae_lambda, terminals, sequence_indices):
@@ -109,7 +98,7 @@ class TestGeneralizedAdvantageEstimation(unittest.TestCase):
 
         deltas = np.asarray(deltas)
         print("len deltas = ", len(deltas))
-        return np.asarray(self.discount_all(deltas, gamma * gae_lambda, terminals))
+        return np.asarray(self.discount_all(deltas, gamma * gae_lambda, sequence_indices))
 
     def test_single_non_terminal_sequence(self):
         gae = GeneralizedAdvantageEstimation(gae_lambda=self.gae_lambda, discount=self.gamma)
@@ -0,0 +1,60 @@
+# Copyright 2018/2019 The RLgraph authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import threading
+import time
+import unittest
+
+from rlgraph.components.common.input_pipeline import InputPipeline
+from rlgraph.spaces import *
+from rlgraph.tests import ComponentTest
+
+
+class TestInputPipeline(unittest.TestCase):
+
+    def test_input_pipeline(self):
+        record_space = Dict(a=FloatBox(shape=(3, 2)), b=Tuple(bool, IntBox(5)), add_batch_rank=True)
+        input_pipeline = InputPipeline(record_space=record_space, capacity=3, prefetch_size=2)
+        test = ComponentTest(component=input_pipeline, input_spaces=dict())
+
+        batches = [record_space.sample(size=4), record_space.sample(size=2)]
+        for batch in batches:
+            input_pipeline.insert(batch)
+
+        # Batches come out in insertion order.
+        for batch in batches:
+            test.test("get_batch", expected_outputs=batch)
+
+    def test_get_batch_blocks_until_insert(self):
+        record_space = Dict(a=FloatBox(shape=(2,)), b=IntBox(5), add_batch_rank=True)
+        input_pipeline = InputPipeline(record_space=record_space, capacity=2, prefetch_size=1)
+        test = ComponentTest(component=input_pipeline, input_spaces=dict())
+
+        # No zero (build) record when executing: `get_batch` waits for the first insert.
+        batch = record_space.sample(size=3)
+
+        def insert_later():
+            time.sleep(0.5)
+            input_pipeline.insert(batch)
+
+        thread = threading.Thread(target=insert_later)
+        thread.start()
+        test.test("get_batch", expected_outputs=batch)
+        thread.join()
@@ -0,0 +1,80 @@
+# Copyright 2018/2019 The RLgraph authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import unittest
+
+import numpy as np
+
+from rlgraph import get_backend
+from rlgraph.components.helpers.memmap_storage import MemmapStorage
+from rlgraph.components.memories.memmap_replay_memory import MemmapReplayMemory
+from rlgraph.spaces import Dict, BoolBox, FloatBox
+from rlgraph.tests import ComponentTest
+from rlgraph.utils.ops import flatten_op
+
+
+class TestMemmapReplayMemory(unittest.TestCase):
+    """
+    Tests the disk-backed replay memory and its storage.
+    """
+    record_space = Dict(
+        states=dict(state1=float, state2=FloatBox(shape=(2,))),
+        reward=float,
+        terminals=BoolBox(),
+        add_batch_rank=True
+    )
+    capacity = 10
+
+    def test_storage_reads_buffered_and_flushed_records(self):
+        flat_record_space = self.record_space.flatten()
+        storage = MemmapStorage(flat_record_space, capacity=self.capacity, write_buffer_size=4)
+
+        # Insert 13 records (rolls over once) in chunks of varying size.
+        records = self.record_space.sample(size=13)
+        flat_records = flatten_op(records)
+        index = 0
+        for start, end in [(0, 3), (3, 9), (9, 10), (10, 13)]:
+            storage.insert({key: value[start:end] for key, value in flat_records.items()}, index)
+            index = (index + end - start) % self.capacity
+
+        # Storage index i holds the latest record inserted at i (some on disk, some still buffered).
+        self.assertGreater(storage.buffer_count, 0)
+        indices = np.array([9, 0, 2, 2, 5, 3])
+        read = storage.read(indices)
+        expected_positions = np.where(indices < 3, indices + self.capacity, indices)
+        for key, value in flat_records.items():
+            np.testing.assert_array_equal(read[key], value[expected_positions])
+
+    @unittest.skipIf(get_backend() == "tf", "MemmapReplayMemory is not supported by the tf backend.")
+    def test_insert_and_sample(self):
+        memory = MemmapReplayMemory(capacity=self.capacity, write_buffer_size=3)
+        test = ComponentTest(component=memory, input_spaces=dict(records=self.record_space, num_records=int))
+
+        records = self.record_space.sample(size=self.capacity + 2)
+        test.test(("insert_records", records), expected_outputs=None)
+        self.assertEqual(memory.size, self.capacity)
+        self.assertEqual(memory.index, 2)
+
+        batch, indices, weights = test.test(("get_records", 5), expected_outputs=None)
+        self.assertEqual(len(indices), 5)
+        # Sampled records are the ones stored at the sampled indices.
+        expected_positions = np.where(indices < 2, indices + self.capacity, indices)
+        np.testing.assert_array_equal(batch["reward"], records["reward"][expected_positions])
+        np.testing.assert_array_equal(batch["states"]["state2"], records["states"]["state2"][expected_positions])
@@ -225,4 +225,54 @@ class TestPrioritizedReplay(unittest.TestCase):
             self.assertEqual(sum_segment_values[start], 2.0)
             # min is still 1.
             self.assertEqual(min_segment_values[start], 1.0)
-            start = int(start / 2)
\ No newline at end of file
+            start = int(start / 2)
+
+    def test_batched_segment_tree_updates(self):
+        """
+        Tests that batched priority updates produce the same trees as sequential inserts and that sampling
+        follows the priorities.
+        """
+        memory = PrioritizedReplay(
+            capacity=self.capacity,
+            alpha=self.alpha,
+            beta=self.beta
+        )
+        test = ComponentTest(component=memory, input_spaces=self.input_spaces)
+        priority_capacity = 1
+        while priority_capacity < self.capacity:
+            priority_capacity *= 2
+
+        observation = non_terminal_records(self.record_space, self.capacity)
+        test.test(("insert_records", observation), expected_outputs=None)
+
+        indices = np.asarray([0, 2, 4, 7])
+        priorities = np.asarray([0.5, 100.0, 0.25, 2.0])
+        test.test(("update_records", [indices, priorities]), expected_outputs=None)
+
+        # Reference trees.
+        leaves = np.zeros(shape=(priority_capacity,))
+        leaves[:self.capacity] = 1.0
+        leaves[indices] = priorities
+        min_leaves = np.full(shape=(priority_capacity,), fill_value=float("inf"))
+        min_leaves[:self.capacity] = leaves[:self.capacity]
+
+        memory_variables = memory.get_variables(["sum-segment-tree", "min-segment-tree"], global_scope=False)
+        sum_segment_values, min_segment_values = test.read_variable_values(
+            memory_variables["sum-segment-tree"], memory_variables["min-segment-tree"]
+        )
+        np.testing.assert_almost_equal(sum_segment_values[priority_capacity:], leaves, decimal=5)
+        for node in range(1, priority_capacity):
+            self.assertAlmostEqual(
+                sum_segment_values[node], sum_segment_values[2 * node] + sum_segment_values[2 * node + 1], places=4
+            )
+            self.assertEqual(
+                min_segment_values[node], min(min_segment_values[2 * node], min_segment_values[2 * node + 1])
+            )
+        self.assertAlmostEqual(sum_segment_values[1], np.sum(leaves), places=4)
+        self.assertEqual(min_segment_values[1], 0.25)
+
+        # Index 2 holds most of the priority mass.
+        _, sample_indices, weights = test.test(("get_records", 100), expected_outputs=None)
+        self.assertGreater(np.sum(sample_indices == 2), 80)
+        self.assertTrue(np.all(sample_indices < self.capacity))
+        self.assertTrue(np.all(weights <= 1.0 + 1e-5))
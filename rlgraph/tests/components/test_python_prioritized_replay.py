@@ -17,13 +17,20 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
+import os
+import tempfile
 import unittest
 import numpy as np
 from six.moves import xrange as range_
+from rlgraph import get_backend
+from rlgraph.components.memories.memory import Memory
 from rlgraph.components.memories.mem_prioritized_replay import MemPrioritizedReplay
 from rlgraph.execution.ray.apex.apex_memory import ApexMemory
+from rlgraph.execution.ray.apex.sharded_prioritized_replay import ShardedPrioritizedReplay
 from rlgraph.execution.ray.ray_util import ray_compress
 from rlgraph.spaces import Dict, IntBox, BoolBox, FloatBox
+from rlgraph.tests import ComponentTest
+from rlgraph.utils.rlgraph_errors import RLGraphError
 
 
 # TODO (Michael): Clean up memory semantics and tests re:
@@ -151,6 +158,188 @@ class TestPythonPrioritizedReplay(unittest.TestCase):
         # Does not return anything
         memory.update_records(indices, np.random.uniform(size=10))
 
+    def test_mem_prioritized_replay_snapshots(self):
+        """
+        Tests storing and restoring the (column-wise) records and priorities of the in-memory prioritized replay.
+        """
+        memory = MemPrioritizedReplay(capacity=self.capacity, alpha=self.alpha, beta=self.beta)
+        test = ComponentTest(component=memory, input_spaces=self.input_spaces)
+        snapshot_dir = tempfile.mkdtemp()
+
+        test.test(("insert_records", self.record_space.sample(size=4)), expected_outputs=None)
+        self.assertEqual(memory.store_snapshot(snapshot_dir), 4)
+        # Wraps around the end of the columns.
+        test.test(("insert_records", self.record_space.sample(size=8)), expected_outputs=None)
+        test.test(("update_records", [np.array([0, 5]), np.array([3.0, 0.5])]), expected_outputs=None)
+        self.assertEqual(memory.store_snapshot(snapshot_dir), 8)
+
+        restored = MemPrioritizedReplay(capacity=self.capacity, alpha=self.alpha, beta=self.beta)
+        ComponentTest(component=restored, input_spaces=self.input_spaces)
+        self.assertEqual(restored.load_snapshot(snapshot_dir), 12)
+        self.assertEqual(restored.size, memory.size)
+        self.assertEqual(restored.index, memory.index)
+        indices = np.arange(self.capacity)
+        for key, value in memory.read_snapshot_records(indices).items():
+            np.testing.assert_array_equal(restored.read_snapshot_records(indices)[key], value)
+        np.testing.assert_array_equal(restored.merged_segment_tree.sum_segment_tree.values,
+                                      memory.merged_segment_tree.sum_segment_tree.values)
+
+    def test_backend_restricted_memories(self):
+        """
+        Tests that memories not supported by the backend are registered, but fail to build with a clear error.
+        """
+        replay_spaces = dict(records=self.record_space, num_records=int)
+        if get_backend() == "tf":
+            specs = [("memmap", replay_spaces), ("concurrentprioritized", self.input_spaces)]
+        else:
+            specs = [("fifo", replay_spaces),
+                     (dict(type="rlgraph.components.memories.prioritized_replay.PrioritizedReplay"), self.input_spaces)]
+        for spec, input_spaces in specs:
+            memory = Memory.from_spec(spec, capacity=self.capacity)
+            with self.assertRaisesRegex(RLGraphError, "backend"):
+                ComponentTest(component=memory, input_spaces=input_spaces)
+
+    def test_apex_memory_snapshots(self):
+        """
+        Tests incremental snapshots and restore of the Apex memory.
+        """
+        def insert(memory, num_records):
+            observation = self.apex_space.sample(size=num_records)
+            for i in range_(num_records):
+                memory.insert_records((
+                    ray_compress(observation["states"][i]),
+                    observation["actions"][i],
+                    observation["reward"][i],
+                    observation["terminals"][i],
+                    ray_compress(observation["states"][i]),
+                    observation["weights"][i]
+                ))
+
+        memory = ApexMemory(capacity=self.capacity, alpha=self.alpha, beta=self.beta)
+        snapshot_dir = tempfile.mkdtemp()
+
+        insert(memory, 6)
+        self.assertEqual(memory.store_snapshot(snapshot_dir), 6)
+        # Only new records are appended (rolling over the capacity).
+        insert(memory, 7)
+        self.assertEqual(memory.store_snapshot(snapshot_dir), 7)
+        memory.update_records(np.arange(4), np.random.uniform(size=4))
+        self.assertEqual(memory.store_snapshot(snapshot_dir), 0)
+        self.assertEqual(len([f for f in os.listdir(snapshot_dir) if f.startswith("records-")]), 3)
+
+        restored = ApexMemory(capacity=self.capacity, alpha=self.alpha, beta=self.beta)
+        self.assertEqual(restored.load_snapshot(snapshot_dir), 13)
+        self.assertEqual(restored.size, memory.size)
+        self.assertEqual(restored.index, memory.index)
+        self.assertEqual(restored.merged_segment_tree.sum_segment_tree.values,
+                         memory.merged_segment_tree.sum_segment_tree.values)
+        indices = np.arange(self.capacity)
+        for key, value in memory.read_records(indices).items():
+            np.testing.assert_array_equal(restored.read_records(indices)[key], value)
+
+        # Enough new records to overwrite everything -> Full snapshot replaces the old segments.
+        insert(restored, self.capacity)
+        self.assertEqual(restored.store_snapshot(snapshot_dir), self.capacity)
+        self.assertEqual(len([f for f in os.listdir(snapshot_dir) if f.startswith("records-")]), 1)
+
+    def test_sharded_prioritized_replay(self):
+        """
+        Tests global proportional sampling and priority update routing over several shards.
+        """
+        for use_processes in [False, True]:
+            memory = ShardedPrioritizedReplay(
+                num_shards=2, memory_spec=dict(capacity=self.capacity, alpha=self.alpha, beta=self.beta),
+                use_processes=use_processes
+            )
+            observation = self.apex_space.sample(size=8)
+            for i in range_(8):
+                memory.insert_records((
+                    ray_compress(observation["states"][i]),
+                    observation["actions"][i],
+                    observation["reward"][i],
+                    observation["terminals"][i],
+                    ray_compress(observation["states"][i]),
+                    None
+                ))
+            # Round-robin inserts.
+            self.assertEqual(memory.get_global_stats(), (8.0, 1.0, 8))
+            self.assertEqual(list(memory.sizes), [4, 4])
+
+            batch, indices, weights = memory.get_records(20)
+            self.assertEqual(batch["states"].shape, (20, 4))
+            self.assertTrue(np.all(indices < 2 * self.capacity))
+            # All priorities are equal -> All weights are 1.0.
+            np.testing.assert_almost_equal(weights, np.ones(shape=(20,)), decimal=5)
+
+            # Global index 1 is record 0 of shard 1: Only its priority changes.
+            memory.update_records(np.array([1]), np.array([101.0]))
+            self.assertEqual(memory.get_global_stats(), (108.0, 1.0, 8))
+            np.testing.assert_almost_equal(memory.get_shard_probabilities(), [4.0 / 108.0, 104.0 / 108.0])
+
+            # The high priority record dominates the samples and gets the smallest weight.
+            batch, indices, weights = memory.get_records(200)
+            self.assertGreater(np.sum(indices == 1), 150)
+            self.assertTrue(np.all(weights[indices == 1] < weights[indices != 1].min()))
+            memory.terminate()
+
+    def test_sharded_replay_batched_inserts(self):
+        """
+        Tests that inserts are buffered and sent in batches per shard, and that the shard statistics arrive with the
+        replies of the (non-blocking) insert and update calls.
+        """
+        for use_processes in [False, True]:
+            memory = ShardedPrioritizedReplay(
+                num_shards=2, memory_spec=dict(capacity=self.capacity, alpha=self.alpha, beta=self.beta),
+                use_processes=use_processes, insert_batch_size=4
+            )
+            observation = self.apex_space.sample(size=6)
+            for i in range_(6):
+                memory.insert_records((
+                    ray_compress(observation["states"][i]),
+                    observation["actions"][i],
+                    observation["reward"][i],
+                    observation["terminals"][i],
+                    ray_compress(observation["states"][i]),
+                    None
+                ))
+            # One batch of 4 records sent (2 per shard), 2 records still buffered.
+            self.assertEqual(memory.num_buffered, 2)
+            self.assertEqual([len(calls) for calls in memory.pending_calls], [1, 1])
+            self.assertEqual(list(memory.sizes), [0, 0])
+
+            # Reading the statistics flushes and receives all replies.
+            self.assertEqual(memory.get_global_stats(), (6.0, 1.0, 6))
+            self.assertEqual(memory.num_buffered, 0)
+            self.assertEqual([len(calls) for calls in memory.pending_calls], [0, 0])
+
+            # Updates are sent without waiting, their replies carry the new statistics.
+            memory.update_records(np.array([0, 1]), np.array([2.0, 3.0]))
+            self.assertEqual([len(calls) for calls in memory.pending_calls], [1, 1])
+            self.assertEqual(memory.get_global_stats(), (9.0, 1.0, 6))
+            memory.terminate()
+
+    def test_sharded_replay_stale_shard_stats(self):
+        """
+        Tests that shards reported empty (zero mass) are sampled again once newer statistics arrive, and that late
+        stale reports do not overwrite them.
+        """
+        memory = ShardedPrioritizedReplay(num_shards=2)
+        # Both shards are empty when first sampled.
+        memory.set_shard_stats(0, (0.0, float("inf"), 0), version=0)
+        memory.set_shard_stats(1, (0.0, float("inf"), 0), version=1)
+        # Shard 0 reports records via its (newer) insert, shard 1 is starved.
+        memory.set_shard_stats(0, (4.0, 1.0, 4), version=3)
+        np.testing.assert_almost_equal(memory.get_shard_probabilities(), [1.0, 0.0])
+
+        # The insert into shard 1 reports its mass.
+        memory.set_shard_stats(1, (4.0, 1.0, 4), version=4)
+        np.testing.assert_almost_equal(memory.get_shard_probabilities(), [0.5, 0.5])
+
+        # A late zero-mass report requested before the insert is ignored.
+        memory.set_shard_stats(1, (0.0, float("inf"), 0), version=2)
+        np.testing.assert_almost_equal(memory.get_shard_probabilities(), [0.5, 0.5])
+        self.assertEqual(memory.get_global_stats(), (8.0, 1.0, 8))
+
     def test_segment_tree_insert_values(self):
         """
         Tests if segment tree inserts into correct positions.
@@ -255,3 +444,39 @@ class TestPythonPrioritizedReplay(unittest.TestCase):
         self.assertEqual(tree.index_of_prefixsum(1.51), 2)
         self.assertEqual(tree.index_of_prefixsum(3.0), 3)
         self.assertEqual(tree.index_of_prefixsum(5.50), 3)
+
+    def test_stratified_sampling(self):
+        """
+        Tests stratified (one sample per equal-mass segment) and unique-index sampling.
+        """
+        memory = ApexMemory(capacity=8)
+        tree = memory.merged_segment_tree.sum_segment_tree
+        for i in range_(8):
+            tree.insert(i, 1.0)
+
+        # Equal priorities -> Every segment holds exactly one index.
+        indices = tree.sample(8, tree.get_sum(), stratified=True)
+        self.assertEqual(sorted(indices.tolist()), list(range_(8)))
+        np.testing.assert_array_equal(tree.get_leaves(indices), np.ones(shape=(8,)))
+
+        # Index 5 holds half of the mass, exactly covering the (unit-mass) segments 5 to 11 -> Exactly half of the
+        # stratified samples.
+        tree.insert(5, 7.0)
+        indices = tree.sample(14, tree.get_sum(), stratified=True)
+        self.assertEqual(np.sum(indices == 5), 7)
+
+        memory = ApexMemory(capacity=self.capacity, stratified_sampling=True, unique_indices=True)
+        observation = self.apex_space.sample(size=5)
+        for i in range_(5):
+            memory.insert_records((
+                ray_compress(observation["states"][i]),
+                observation["actions"][i],
+                observation["reward"][i],
+                observation["terminals"][i],
+                ray_compress(observation["states"][i]),
+                None
+            ))
+        records, indices, weights = memory.get_records(20)
+        self.assertEqual(indices.tolist(), list(range_(5)))
+        self.assertEqual(len(records["states"]), 5)
+        np.testing.assert_almost_equal(weights, np.ones(shape=(5,)), decimal=5)
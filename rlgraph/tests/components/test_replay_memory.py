@@ -17,8 +17,12 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
+import tempfile
 import unittest
 
+import numpy as np
+
+from rlgraph import get_backend
 from rlgraph.components.memories.replay_memory import ReplayMemory
 from rlgraph.spaces import Dict, BoolBox
 from rlgraph.tests import ComponentTest
@@ -123,3 +127,26 @@ class TestReplayMemory(unittest.TestCase):
         num_records = self.capacity
         batch, _, _ = test.test(("get_records", num_records), expected_outputs=None)
         self.assertEqual(self.capacity, len(batch['terminals']))
+
+    @unittest.skipIf(get_backend() == "tf", "tf memories are stored with the model's checkpoints.")
+    def test_snapshots(self):
+        """
+        Tests storing and restoring the memory's contents.
+        """
+        memory = ReplayMemory(capacity=self.capacity)
+        test = ComponentTest(component=memory, input_spaces=self.input_spaces)
+        snapshot_dir = tempfile.mkdtemp()
+
+        test.test(("insert_records", self.record_space.sample(size=4)), expected_outputs=None)
+        self.assertEqual(memory.store_snapshot(snapshot_dir), 4)
+        test.test(("insert_records", self.record_space.sample(size=8)), expected_outputs=None)
+        self.assertEqual(memory.store_snapshot(snapshot_dir), 8)
+
+        restored = ReplayMemory(capacity=self.capacity)
+        ComponentTest(component=restored, input_spaces=self.input_spaces)
+        self.assertEqual(restored.load_snapshot(snapshot_dir), 12)
+        self.assertEqual(restored.size, memory.size)
+        self.assertEqual(restored.index, memory.index)
+        indices = np.arange(self.capacity)
+        for key, value in memory.read_snapshot_records(indices).items():
+            np.testing.assert_array_equal(restored.read_snapshot_records(indices)[key], value)
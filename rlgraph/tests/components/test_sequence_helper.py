@@ -158,3 +158,41 @@ class TestSequenceHelper(unittest.TestCase):
 
         recursive_assert_almost_equal(x=lengths, y=[1, 1, 1, 1])
         recursive_assert_almost_equal(x=decays, y=expected_decays)
+
+        input_ = np.asarray([0, 0, 1, 0, 1])
+        expected_decays = [1.0, 0.5, 0.25, 1.0, 0.5]
+        lengths, decays = test.test(("calc_sequence_decays", [input_, decay_value]))
+
+        recursive_assert_almost_equal(x=lengths, y=[3, 2])
+        recursive_assert_almost_equal(x=decays, y=expected_decays)
+
+    def test_reverse_apply_decays_to_sequence(self):
+        """
+        Tests discounting all sub-sequences at once.
+        """
+        sequence_helper = SequenceHelper()
+        decay_value = 0.5
+
+        test = ComponentTest(component=sequence_helper, input_spaces=self.input_spaces)
+        values = np.asarray([1.0, 2.0, 3.0, 4.0, 5.0, 6.0, 7.0])
+        sequence_indices = np.asarray([0, 0, 1, 1, 0, 0, 0])
+
+        # Discounted sums within each sub-sequence: [0, 2], [3], [4, 6].
+        expected = np.asarray([
+            1.0 + 0.5 * 2.0 + 0.25 * 3.0, 2.0 + 0.5 * 3.0, 3.0,
+            4.0,
+            5.0 + 0.5 * 6.0 + 0.25 * 7.0, 6.0 + 0.5 * 7.0, 7.0
+        ])
+        decayed_values = test.test(("reverse_apply_decays_to_sequence", [values, sequence_indices, decay_value]))
+        recursive_assert_almost_equal(decayed_values, expected, decimals=5)
+
+        # A long sequence (many scan steps) against a sequential loop.
+        values = np.random.uniform(size=(1000,))
+        sequence_indices = np.random.uniform(size=(1000,)) < 0.01
+        expected = np.zeros_like(values)
+        accumulated = 0.0
+        for i in reversed(range(1000)):
+            accumulated = values[i] + (0.0 if sequence_indices[i] else decay_value * accumulated)
+            expected[i] = accumulated
+        decayed_values = test.test(("reverse_apply_decays_to_sequence", [values, sequence_indices, decay_value]))
+        recursive_assert_almost_equal(decayed_values, expected, decimals=4)
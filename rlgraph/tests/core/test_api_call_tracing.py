@@ -0,0 +1,93 @@
+# Copyright 2018/2019 The RLgraph authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+import unittest
+
+import numpy as np
+
+from rlgraph.agents import Agent
+from rlgraph.spaces import FloatBox, IntBox
+from rlgraph.utils.latency_histogram import LatencyHistogram
+
+
+class TestApiCallTracing(unittest.TestCase):
+    """
+    Tests latency histograms and the tracing of GraphExecutor API-method calls.
+    """
+    def test_latency_histogram_percentiles(self):
+        histogram = LatencyHistogram(significant_digits=2)
+        values = np.random.lognormal(mean=-7.0, sigma=1.5, size=10000)
+        for value in values:
+            histogram.record(value)
+
+        stats = histogram.get_statistics()
+        self.assertEqual(stats["count"], 10000)
+        self.assertAlmostEqual(stats["mean"], np.mean(values))
+        self.assertEqual(stats["max"], np.max(values))
+        # Percentiles are accurate up to the histogram's precision (plus the `lowest_value` resolution).
+        for percentile in [50.0, 90.0, 99.0, 99.9]:
+            expected = np.percentile(values, percentile, method="inverted_cdf")
+            self.assertLessEqual(abs(histogram.get_percentile(percentile) - expected), 0.01 * expected + 1e-6)
+
+        # Memory is fixed, out-of-range values end up in the last bucket.
+        num_buckets = len(histogram.counts)
+        histogram.record(1000.0)
+        self.assertEqual(len(histogram.counts), num_buckets)
+        self.assertEqual(histogram.get_percentile(100.0), 1000.0)
+
+        other = LatencyHistogram(significant_digits=2)
+        other.record(0.5)
+        histogram.merge(other)
+        self.assertEqual(histogram.total_count, 10002)
+
+        histogram.reset()
+        self.assertEqual(histogram.get_statistics()["count"], 0)
+        self.assertEqual(histogram.get_percentile(99.0), 0.0)
+
+    def test_executor_api_call_tracing(self):
+        state_space = FloatBox(shape=(4,))
+        agent = Agent.from_spec(
+            dict(
+                type="dqn",
+                network_spec=[dict(type="dense", units=16, activation="relu")],
+                memory_spec=dict(type="replay", capacity=1000),
+                optimizer_spec=dict(type="adam", learning_rate=0.001)
+            ),
+            state_space=state_space,
+            action_space=IntBox(2),
+            execution_spec=dict(enable_api_call_tracing=True)
+        )
+        for _ in range(10):
+            agent.get_action(state_space.sample(size=2))
+
+        stats = agent.graph_executor.get_api_call_statistics(reset=True)
+        self.assertTrue(len(stats) > 0)
+        action_stats = [s for name, s in stats.items() if "action" in name]
+        self.assertEqual(sum(s["count"] for s in action_stats), 10)
+        for s in action_stats:
+            self.assertGreater(s["p50"], 0.0)
+            self.assertLessEqual(s["p50"], s["p99"])
+            self.assertLessEqual(s["p99"], s["max"])
+        # Reset clears all counts.
+        self.assertTrue(all(s["count"] == 0 for s in agent.graph_executor.get_api_call_statistics().values()))
+
+        # Tracing is disabled by default.
+        agent = Agent.from_spec(
+            dict(type="dqn", network_spec=[dict(type="dense", units=16)], memory_spec=dict(type="replay"),
+                 optimizer_spec=dict(type="adam", learning_rate=0.001)),
+            state_space=state_space, action_space=IntBox(2)
+        )
+        agent.get_action(state_space.sample(size=2))
+        self.assertEqual(agent.graph_executor.get_api_call_statistics(), {})
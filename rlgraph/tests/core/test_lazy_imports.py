@@ -0,0 +1,61 @@
+# Copyright 2018/2019 The RLgraph authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import subprocess
+import sys
+import unittest
+
+
+class TestLazyImports(unittest.TestCase):
+    """
+    Tests that packages only import their sub-modules on demand.
+    """
+    def run_in_fresh_interpreter(self, code):
+        # Use a fresh interpreter as other tests may already have imported the modules in question.
+        out = subprocess.check_output([sys.executable, "-c", code])
+        return out.decode().strip().split("\n")[-1]
+
+    def test_package_import_does_not_import_sub_modules(self):
+        out = self.run_in_fresh_interpreter(
+            "import sys\n"
+            "import rlgraph.agents, rlgraph.environments\n"
+            "print(any(m in sys.modules for m in ['rlgraph.agents.dqn_agent', 'rlgraph.agents.impala_agents', "
+            "'rlgraph.environments.openai_gym', 'rlgraph.environments.grid_world', 'gym']))"
+        )
+        self.assertEqual(out, "False")
+
+    def test_lookup_imports_on_demand(self):
+        out = self.run_in_fresh_interpreter(
+            "import sys\n"
+            "from rlgraph.environments import Environment\n"
+            "env = Environment.from_spec(dict(type='grid-world', world='2x2'))\n"
+            "print(type(env).__name__, 'rlgraph.environments.grid_world' in sys.modules, "
+            "'rlgraph.environments.openai_gym' in sys.modules)"
+        )
+        self.assertEqual(out, "GridWorld True False")
+
+    def test_from_import_of_lazy_attributes(self):
+        from rlgraph.agents import Agent, DQNAgent
+        from rlgraph.components import Component, DenseLayer
+
+        self.assertTrue(Agent.lookup_class("dqn") is DQNAgent)
+        self.assertTrue(Component.lookup_class("dense-layer") is DenseLayer)
+        self.assertTrue("DQNAgent" in dir(sys.modules["rlgraph.agents"]))
+        with self.assertRaises(ImportError):
+            from rlgraph.agents import NonExistingAgent
@@ -25,6 +25,8 @@ from rlgraph.environments.environment import Environment
 from rlgraph.utils.specifiable_server import SpecifiableServer, SpecifiableServerHook
 from rlgraph.utils.util import convert_dtype
 from rlgraph.spaces import IntBox, FloatBox
+from rlgraph.tests.test_util import recursive_assert_almost_equal
+from rlgraph.utils.rlgraph_errors import RLGraphError
 
 
 class TestSpecifiableServer(unittest.TestCase):
@@ -73,3 +75,56 @@ class TestSpecifiableServer(unittest.TestCase):
         self.assertTrue(out1[2] is np.bool_(False))
         self.assertTrue(out2[2] is np.bool_(False))
 
+
+    def test_specifiable_server_shared_memory_transport(self):
+        action_space = IntBox(2)
+        state_space = FloatBox(shape=(84, 84, 3))
+        env_spec = dict(type="random_env", state_space=state_space, action_space=action_space, deterministic=True)
+        results = []
+        for use_shared_memory in [True, False]:
+            specifiable_server = SpecifiableServer(Environment, env_spec, dict(
+                step_flow=[state_space, float, bool]
+            ), "terminate", use_shared_memory=use_shared_memory)
+            specifiable_server.start_server()
+            # Shared buffers are only created if requested.
+            self.assertEqual("step_flow" in specifiable_server.shared_views, use_shared_memory)
+            results.append([specifiable_server.remote_call("step_flow", 1) for _ in range(3)])
+            specifiable_server.stop_server()
+            SpecifiableServer.INSTANCES.remove(specifiable_server)
+
+        # Both transports must return the same values.
+        for out_shared, out_piped in zip(results[0], results[1]):
+            self.assertEqual(out_shared[0].shape, state_space.shape)
+            self.assertEqual(out_shared[0].dtype, np.float32)
+            np.testing.assert_array_equal(out_shared[0], out_piped[0])
+            self.assertAlmostEqual(out_shared[1], out_piped[1], places=6)
+            self.assertEqual(out_shared[2], out_piped[2])
+
+    def test_specifiable_server_with_many_instances(self):
+        state_space = FloatBox(shape=(1,))
+        env_spec = dict(type="deterministic_env", steps_to_terminal=3)
+        for use_shared_memory in [True, False]:
+            specifiable_server = SpecifiableServer(Environment, env_spec, dict(
+                step_flow=[state_space, float, bool]
+            ), "terminate", use_shared_memory=use_shared_memory, num_instances=3)
+            specifiable_server.start_server()
+
+            # Single calls only go to the first env.
+            out = specifiable_server.remote_call("step_flow", 0)
+            self.assertEqual(out[0], 1.0)
+
+            # Step all three envs in one round-trip: Results are batched.
+            out = specifiable_server.remote_call_many("step_flow", [(0,), (1,), (0,)])
+            recursive_assert_almost_equal(out[0], np.array([[2.0], [1.0], [1.0]]))
+            self.assertEqual(out[1].shape, (3,))
+            recursive_assert_almost_equal(out[2], np.array([False, False, False]))
+            # First env reaches its terminal (and is reset).
+            out = specifiable_server.remote_call_many("step_flow", [(0,), (1,), (0,)])
+            recursive_assert_almost_equal(out[0], np.array([[0.0], [2.0], [2.0]]))
+            recursive_assert_almost_equal(out[2], np.array([True, False, False]))
+
+            # Need one args-tuple per hosted env.
+            self.assertRaises(RLGraphError, specifiable_server.remote_call_many, "step_flow", [(0,)])
+
+            specifiable_server.stop_server()
+            SpecifiableServer.INSTANCES.remove(specifiable_server)
@@ -0,0 +1,73 @@
+# Copyright 2018/2019 The RLgraph authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+import unittest
+
+import numpy as np
+
+from rlgraph.utils.streaming_statistics import StreamingStatistics
+
+
+class TestStreamingStatistics(unittest.TestCase):
+    """
+    Tests fixed-memory streaming statistics.
+    """
+    def test_lifetime_and_window_statistics(self):
+        values = np.random.normal(loc=5.0, scale=2.0, size=5000)
+        stats = StreamingStatistics(window_size=100)
+        stats.extend(values)
+
+        result = stats.get_statistics()
+        self.assertEqual(result["count"], 5000)
+        self.assertAlmostEqual(result["mean"], np.mean(values))
+        self.assertAlmostEqual(result["std"], np.std(values))
+        self.assertEqual(result["min"], np.min(values))
+        self.assertEqual(result["max"], np.max(values))
+        self.assertEqual(result["last"], values[-1])
+        # Only the most recent values are kept.
+        self.assertEqual(len(stats.window), 100)
+        self.assertAlmostEqual(result["window_mean"], np.mean(values[-100:]))
+        self.assertEqual(result["window_max"], np.max(values[-100:]))
+
+        stats.reset()
+        self.assertEqual(stats.get_statistics()["mean"], None)
+
+    def test_quantiles_and_merge(self):
+        values_a = np.random.uniform(0.0, 1.0, size=20000)
+        values_b = np.random.uniform(1.0, 2.0, size=20000)
+        stats_a = StreamingStatistics(window_size=10, num_quantile_samples=1000, quantiles=(0.25, 0.5))
+        stats_a.extend(values_a)
+        stats_b = StreamingStatistics(window_size=10, num_quantile_samples=1000, quantiles=(0.25, 0.5))
+        stats_b.extend(values_b)
+
+        self.assertEqual(len(stats_a.quantile_samples), 1000)
+        self.assertAlmostEqual(stats_a.get_statistics()["q0.5"], 0.5, delta=0.1)
+
+        merged = StreamingStatistics.merged([stats_a, stats_b])
+        all_values = np.concatenate([values_a, values_b])
+        result = merged.get_statistics()
+        self.assertEqual(result["count"], 40000)
+        self.assertAlmostEqual(result["mean"], np.mean(all_values))
+        self.assertAlmostEqual(result["std"], np.std(all_values))
+        self.assertEqual(result["min"], np.min(values_a))
+        self.assertEqual(result["max"], np.max(values_b))
+        self.assertEqual(result["last"], values_b[-1])
+        self.assertEqual(list(merged.window), list(values_a[-10:]) + list(values_b[-10:]))
+        self.assertAlmostEqual(result["q0.5"], 1.0, delta=0.15)
+        self.assertAlmostEqual(result["q0.25"], 0.5, delta=0.15)
+
+        # Merging empty statistics is a no-op.
+        merged.merge(StreamingStatistics())
+        self.assertEqual(merged.count, 40000)
@@ -0,0 +1,101 @@
+# Copyright 2018/2019 The RLgraph authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import unittest
+
+import numpy as np
+
+from rlgraph.environments import Environment, SequentialVectorEnv, VectorEnv
+import rlgraph.spaces as spaces
+
+
+class TestVectorEnvs(unittest.TestCase):
+    """
+    Tests the natively vectorized versions of GridWorld, RandomEnv and DeterministicEnv against their
+    single-instance counterparts.
+    """
+    def test_vector_grid_world(self):
+        num_envs = 8
+        for spec in [
+            dict(world="2x2"),
+            dict(world="4x4", state_representation="xy"),
+            dict(world="16x16", action_type="ftj", state_representation="xy+orientation"),
+            dict(world="8x8", action_type="ftj", state_representation="camera", reward_function="rich")
+        ]:
+            vector_env = Environment.from_spec(dict(spec, type="vector-grid-world", num_environments=num_envs))
+            self.assertTrue(isinstance(vector_env, VectorEnv))
+            sequential_env = SequentialVectorEnv(num_environments=num_envs, env_spec=dict(spec, type="grid-world"))
+
+            self.assertTrue(np.all(vector_env.reset_all() == np.array(sequential_env.reset_all())))
+            num_actions = 4 if spec.get("action_type", "udlr") == "udlr" else 18
+            for _ in range(100):
+                actions = np.random.randint(num_actions, size=(num_envs,))
+                s, r, t, _ = vector_env.step(actions)
+                expected_s, expected_r, expected_t, _ = sequential_env.step(actions)
+                self.assertTrue(np.all(s == np.array(expected_s)))
+                self.assertTrue(np.all(r == np.array(expected_r)))
+                self.assertTrue(np.all(t == np.array(expected_t)))
+                for i in np.nonzero(t)[0]:
+                    self.assertTrue(np.all(vector_env.reset(i) == sequential_env.reset(i)))
+
+    def test_vector_deterministic_env(self):
+        vector_env = Environment.from_spec(dict(type="vector-deterministic", num_environments=3, steps_to_terminal=2))
+
+        s = vector_env.reset_all()
+        self.assertTrue(np.all(s == 0.0) and s.shape == (3, 1))
+        s, r, t, _ = vector_env.step(np.array([0, 1, 0]))
+        self.assertTrue(np.all(s == 1.0) and np.all(r == -100.0) and not np.any(t))
+        self.assertTrue(np.all(vector_env.reset(1) == 0.0))
+        s, r, t, _ = vector_env.step(np.array([0, 1, 0]))
+        self.assertTrue(np.all(s[:, 0] == [2.0, 1.0, 2.0]))
+        self.assertTrue(np.all(r == [-99.0, -100.0, -99.0]))
+        self.assertTrue(np.all(t == [True, False, True]))
+        self.assertEqual(str(vector_env.get_env()), "DeterministicEnv()")
+
+    def test_vector_random_env(self):
+        vector_env = Environment.from_spec(dict(
+            type="vector-random", num_environments=5, state_space=spaces.FloatBox(shape=(2,)),
+            action_space=spaces.IntBox(2), reward_space=spaces.FloatBox(-1.0, 1.0), terminal_prob=0.5,
+            deterministic=True
+        ))
+        self.assertEqual(vector_env.reset_all().shape, (5, 2))
+        self.assertEqual(vector_env.reset(0).shape, (2,))
+        terminals = []
+        for _ in range(100):
+            s, r, t, _ = vector_env.step(np.zeros(shape=(5,), dtype=np.int32))
+            self.assertEqual(s.shape, (5, 2))
+            self.assertTrue(np.all(r >= -1.0) and np.all(r <= 1.0))
+            terminals.append(t)
+        self.assertAlmostEqual(np.mean(terminals), 0.5, places=1)
+
+    def test_vector_random_env_single_environment(self):
+        # A single environment still returns batched states, rewards and terminals.
+        vector_env = Environment.from_spec(dict(
+            type="vector-random", num_environments=1,
+            state_space=spaces.Dict(a=spaces.FloatBox(shape=(2,)), b=spaces.IntBox(3)),
+            action_space=spaces.IntBox(2), reward_space=spaces.FloatBox(-1.0, 1.0), deterministic=True
+        ))
+        s = vector_env.reset_all()
+        self.assertEqual(s["a"].shape, (1, 2))
+        self.assertEqual(s["b"].shape, (1,))
+        s, r, t, _ = vector_env.step(np.zeros(shape=(1,), dtype=np.int32))
+        self.assertEqual(s["a"].shape, (1, 2))
+        self.assertEqual(s["b"].shape, (1,))
+        self.assertEqual(r.shape, (1,))
+        self.assertEqual(t.shape, (1,))
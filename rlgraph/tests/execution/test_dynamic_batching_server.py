@@ -0,0 +1,143 @@
+# Copyright 2018/2019 The RLgraph authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import multiprocessing
+import threading
+import unittest
+
+import numpy as np
+
+from rlgraph.execution.dynamic_batching_server import DynamicBatchingServer
+from rlgraph.utils.rlgraph_errors import RLGraphError
+
+
+def double(inputs):
+    return dict(doubled=inputs["a"] * 2, summed=inputs["a"].sum(axis=1) + inputs["b"])
+
+
+def request_from_process(client, value, results):
+    out = client.get_action(dict(a=np.full(shape=(1, 3), fill_value=value), b=np.array([value])))
+    results.put((value, out["summed"][0]))
+
+
+class TestDynamicBatchingServer(unittest.TestCase):
+    """
+    Tests batching requests from many threads/processes into single batch-function calls.
+    """
+    def test_batching_requests_from_threads(self):
+        server = DynamicBatchingServer(batch_fn=double, minimum_batch_size=8, maximum_batch_size=16, timeout_ms=50)
+        server.start()
+
+        num_threads = 32
+        results = [None] * num_threads
+
+        def request(i):
+            # Requests with different batch sizes.
+            states = dict(a=np.full(shape=(i % 3 + 1, 2), fill_value=i), b=np.arange(i % 3 + 1))
+            results[i] = server.get_action(states)
+
+        threads = [threading.Thread(target=request, args=(i,)) for i in range(num_threads)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        server.stop()
+
+        for i, result in enumerate(results):
+            batch_size = i % 3 + 1
+            self.assertTrue(np.all(result["doubled"] == np.full(shape=(batch_size, 2), fill_value=2 * i)))
+            self.assertTrue(np.all(result["summed"] == 2 * i + np.arange(batch_size)))
+
+        stats = server.get_stats()
+        self.assertEqual(stats["num_requests"], num_threads)
+        self.assertEqual(stats["num_states"], sum(i % 3 + 1 for i in range(num_threads)))
+        # Requests got batched, but never beyond the max. batch size.
+        self.assertLess(stats["num_batches"], num_threads)
+        self.assertLessEqual(stats["mean_batch_size"], 16)
+
+    def test_timeout_and_errors(self):
+        def fail(inputs):
+            raise ValueError("Bad inputs!")
+
+        # Single request is computed after the timeout although the min. batch size is never reached.
+        server = DynamicBatchingServer(batch_fn=double, minimum_batch_size=100, maximum_batch_size=100, timeout_ms=10)
+        server.start()
+        result = server.get_action(dict(a=np.ones(shape=(1, 2)), b=np.ones(shape=(1,))))
+        self.assertEqual(result["summed"][0], 3.0)
+        server.stop()
+
+        # Errors are passed on to the callers.
+        server = DynamicBatchingServer(batch_fn=fail, timeout_ms=10)
+        server.start()
+        self.assertRaises(ValueError, server.get_action, np.ones(shape=(1, 2)))
+        server.stop()
+
+        self.assertRaises(RLGraphError, DynamicBatchingServer, batch_fn=double, minimum_batch_size=4,
+                          maximum_batch_size=2)
+
+    def test_batching_requests_from_processes(self):
+        server = DynamicBatchingServer(batch_fn=double, minimum_batch_size=4, timeout_ms=50, use_processes=True)
+        results = multiprocessing.Queue()
+        processes = [
+            multiprocessing.Process(target=request_from_process, args=(server.get_client(), i, results))
+            for i in range(4)
+        ]
+        server.start()
+        for process in processes:
+            process.start()
+        outputs = dict(results.get(timeout=30) for _ in processes)
+        for process in processes:
+            process.join()
+        server.stop()
+
+        self.assertEqual(outputs, {i: 4 * i for i in range(4)})
+        self.assertEqual(server.get_stats()["num_requests"], 4)
+
+    def test_batching_agent_actions(self):
+        class GreedyAgent(object):
+            def __init__(self):
+                self.batch_sizes = []
+
+            def get_action(self, states, use_exploration=True):
+                assert use_exploration is False
+                self.batch_sizes.append(len(states))
+                return np.argmax(states, axis=-1)
+
+        agent = GreedyAgent()
+        server = DynamicBatchingServer(
+            agent=agent, minimum_batch_size=4, timeout_ms=50, get_action_kwargs=dict(use_exploration=False)
+        )
+        server.start()
+
+        states = np.random.uniform(size=(8, 4))
+        results = [None] * 8
+
+        def request(i):
+            results[i] = server.get_action(states[i:i + 1])
+
+        threads = [threading.Thread(target=request, args=(i,)) for i in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        server.stop()
+
+        # Same actions as one direct call for all states.
+        self.assertTrue(np.all(np.concatenate(results) == np.argmax(states, axis=-1)))
+        self.assertLess(len(agent.batch_sizes), 8)
@@ -0,0 +1,80 @@
+# Copyright 2018/2019 The RLgraph authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+import pickle
+import unittest
+
+import numpy as np
+
+from rlgraph.execution.environment_sample import CompressedColumn, EnvironmentSample, compress_array, \
+    decompress_array
+from rlgraph.tests.test_util import recursive_assert_almost_equal
+
+
+class TestEnvironmentSample(unittest.TestCase):
+    """
+    Tests the columnar EnvironmentSample layout.
+    """
+    def test_compress_array(self):
+        for array in [np.random.random(size=(84, 84, 4)).astype(np.float32),
+                      np.random.randint(0, 255, size=(2, 3), dtype=np.uint8), np.array(5, dtype=np.int64)]:
+            restored = decompress_array(compress_array(array))
+            self.assertEqual(restored.dtype, array.dtype)
+            recursive_assert_almost_equal(restored, array)
+
+    def test_compressed_column(self):
+        states = np.random.random(size=(10, 4)).astype(np.float32)
+        column = CompressedColumn.from_array(states)
+        self.assertEqual(len(column), 10)
+        recursive_assert_almost_equal(column.to_array(), states)
+        recursive_assert_almost_equal(decompress_array(column[3]), states[3])
+        recursive_assert_almost_equal(column[2:5].to_array(), states[2:5])
+        self.assertEqual(len(column[5:5]), 0)
+
+        records = column.get_records()
+        self.assertEqual(len(records), 10)
+        recursive_assert_almost_equal(decompress_array(records[-1]), states[-1])
+
+        merged = CompressedColumn.concat([column[8:], CompressedColumn.from_array(states[:2])])
+        recursive_assert_almost_equal(merged.to_array(), np.concatenate([states[8:], states[:2]]))
+
+    def test_merge_samples(self):
+        samples = []
+        batches = []
+        for _ in range(3):
+            batch = dict(
+                states=np.random.random(size=(5, 3)).astype(np.float32),
+                actions=list(np.random.randint(0, 2, size=5)),
+                rewards=np.random.random(size=5),
+                terminals=[False, False, True, False, False]
+            )
+            batches.append(batch)
+            # Samples survive pickling (as done by Ray's object store).
+            sample = pickle.loads(pickle.dumps(EnvironmentSample(batch, batch_size=5, compressed_keys=["states"])))
+            samples.append(sample)
+            self.assertTrue(isinstance(sample.columns["states"], CompressedColumn))
+            self.assertTrue(isinstance(sample.columns["actions"], np.ndarray))
+
+        merged = EnvironmentSample.merge(samples)
+        self.assertEqual(merged.batch_size, 15)
+        self.assertTrue(isinstance(merged.columns["states"], CompressedColumn))
+        batch = merged.get_batch()
+        for key in ["states", "actions", "rewards", "terminals"]:
+            recursive_assert_almost_equal(batch[key], np.concatenate([b[key] for b in batches]))
+
+        # Compressed records can be taken as is, e.g. for a replay memory.
+        records = merged.get_batch(decompress=False)["states"]
+        self.assertEqual(len(records), 15)
+        recursive_assert_almost_equal(decompress_array(records[7]), batches[1]["states"][2])
@@ -0,0 +1,150 @@
+# Copyright 2018/2019 The RLgraph authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import os
+import time
+import unittest
+
+from rlgraph.execution import get_distributed_executor_class
+from rlgraph.execution.multiprocess import MultiprocessApexExecutor, ProcessTaskManager, ProcessTaskPool, \
+    SerializedObject
+from rlgraph.spaces import FloatBox, IntBox
+from rlgraph.utils.rlgraph_errors import RLGraphError
+
+
+class Counter(object):
+    """
+    Simple actor for testing.
+    """
+    def __init__(self, start):
+        self.value = start
+
+    def add(self, value):
+        self.value += value
+        return self.value
+
+    def sleep(self, seconds):
+        time.sleep(seconds)
+        return seconds
+
+    def fail(self):
+        raise ValueError("Failing on purpose.")
+
+    def exit(self):
+        os._exit(1)
+
+
+class TestMultiprocessExecutor(unittest.TestCase):
+    """
+    Tests process actors and executing distributed workloads in local processes.
+    """
+    def test_process_actors(self):
+        task_manager = ProcessTaskManager()
+        actors = [task_manager.create_actor(Counter, i) for i in range(2)]
+
+        # Calls on one actor execute in order.
+        task_ids = [task_manager.submit(actors[0], "add", 10), task_manager.submit(actors[0], "add", 1)]
+        self.assertEqual(task_manager.get(task_ids), [10, 11])
+        # Serialized objects arrive deserialized.
+        task_manager.send(actors[1], "add", SerializedObject(5))
+        self.assertEqual(task_manager.get(task_manager.submit(actors[1], "add", 0)), 6)
+
+        # Waiting returns as soon as the first task is done.
+        task_pool = ProcessTaskPool(task_manager)
+        task_pool.add_task(actors[0], task_manager.submit(actors[0], "sleep", 0.1))
+        task_pool.add_task(actors[1], task_manager.submit(actors[1], "sleep", 5.0))
+        completed = list(task_pool.get_completed(timeout=None))
+        self.assertEqual([actor for actor, _ in completed], [actors[0]])
+        self.assertEqual(len(task_pool.get_pending()), 1)
+
+        # Errors are raised in the calling process.
+        with self.assertRaises(RLGraphError):
+            task_manager.get(task_manager.submit(actors[0], "fail"))
+        # Also for calls without results (on the next wait).
+        task_manager.send(actors[0], "fail")
+        with self.assertRaises(RLGraphError):
+            task_manager.get(task_manager.submit(actors[0], "add", 0))
+        # Dead actors do not block.
+        with self.assertRaises(RLGraphError):
+            task_manager.get(task_manager.submit(actors[0], "exit"))
+
+        task_manager.shutdown()
+        self.assertFalse(any(actor.is_alive() for actor in actors))
+
+    def test_apex_workload(self):
+        """
+        Runs a short Ape-X workload with a sample worker and two memory shards in local processes.
+        """
+        executor = get_distributed_executor_class("apex")(
+            environment_spec=self.apex_env_spec, agent_config=self.get_apex_agent_config()
+        )
+        self.assertIsInstance(executor, MultiprocessApexExecutor)
+
+        result = executor.execute_workload(workload=dict(
+            num_timesteps=500, report_interval=100, report_interval_min_seconds=0
+        ))
+        print(result)
+        self.assertGreaterEqual(result["timesteps_executed"], 500)
+        self.assertGreater(executor.weight_syncs_executed, 0)
+        self.assertGreater(len(executor.result_by_worker()["episode_rewards"][0]), 0)
+        # Shards which were empty when first sampled are not starved (their statistics refresh on inserts).
+        self.assertTrue(all(priority_sum > 0.0 for priority_sum in executor.sharded_replay.priority_sums))
+        executor.shutdown()
+
+    def test_apex_workload_with_adaptive_sample_sizes(self):
+        """
+        Runs a short Ape-X workload whose sample tasks are sized by worker throughput and learner consumption.
+        """
+        executor = get_distributed_executor_class("apex")(
+            environment_spec=self.apex_env_spec, agent_config=self.get_apex_agent_config(
+                num_sample_workers=2, adaptive_sample_size=True, target_in_flight_tasks=3, target_replay_ratio=4.0
+            )
+        )
+        result = executor.execute_workload(workload=dict(
+            num_timesteps=3000, report_interval=500, report_interval_min_seconds=0
+        ))
+        print(result)
+        self.assertGreaterEqual(result["timesteps_executed"], 3000)
+        # Both workers were measured and keep at least one of the 3 tasks in flight.
+        self.assertEqual(len(executor.sample_sizer.throughputs), 2)
+        self.assertTrue(all(0 < num_tasks <= 2 for num_tasks in executor.sample_tasks_in_flight.values()))
+        self.assertIsNotNone(executor.sample_sizer.consumption_rate)
+        executor.shutdown()
+
+    apex_env_spec = dict(type="random", state_space=FloatBox(shape=(4,)), action_space=IntBox(2), terminal_prob=0.2)
+
+    @staticmethod
+    def get_apex_agent_config(**executor_spec):
+        executor_spec_ = dict(
+            weight_sync_steps=32, replay_sampling_task_depth=1, env_interaction_task_depth=1,
+            num_worker_samples=25, learn_queue_size=1, num_sample_workers=1, num_replay_workers=2
+        )
+        executor_spec_.update(executor_spec)
+        return dict(
+            type="dqn",
+            network_spec=[dict(type="dense", units=16)],
+            memory_spec=dict(type="prioritized_replay", capacity=1000),
+            optimizer_spec=dict(type="adam", learning_rate=0.001),
+            update_spec=dict(batch_size=16),
+            execution_spec=dict(ray_spec=dict(
+                executor_spec=executor_spec_,
+                worker_spec=dict(n_step_adjustment=1, worker_executes_postprocessing=True),
+                apex_replay_spec=dict(memory_spec=dict(capacity=1000), min_sample_memory_size=32)
+            ))
+        )
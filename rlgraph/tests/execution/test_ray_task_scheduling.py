@@ -0,0 +1,95 @@
+# Copyright 2018/2019 The RLgraph authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+import time
+import unittest
+
+from rlgraph import get_distributed_backend
+from rlgraph.execution.ray.ray_util import AdaptiveSampleSizer, RayTaskPool, wait_for_tasks
+
+if get_distributed_backend() == "ray":
+    import ray
+
+
+class TestRayTaskScheduling(unittest.TestCase):
+    """
+    Tests adaptive sample sizes and blocking waits for Ray tasks.
+    """
+    def test_adaptive_sample_sizes(self):
+        sizer = AdaptiveSampleSizer(base_sample_size=100, smoothing=0.0)
+        # Unmeasured workers get the base size.
+        self.assertEqual(sizer.get_sample_size("fast"), 100)
+
+        sizer.update("fast", num_timesteps=100, runtime=0.5)
+        sizer.update("slow", num_timesteps=100, runtime=1.5)
+        # Throughputs 200/s and ~67/s -> mean ~133/s.
+        self.assertEqual(sizer.get_sample_size("fast"), 150)
+        self.assertEqual(sizer.get_sample_size("slow"), 50)
+
+        # Sizes are clipped.
+        sizer.update("very-slow", num_timesteps=1, runtime=100.0)
+        self.assertEqual(sizer.get_sample_size("very-slow"), sizer.min_sample_size)
+
+        # Splitting an update batch: Both workers should finish at the same time.
+        sample_sizes = sizer.distribute(400, ["fast", "slow"])
+        self.assertEqual(sample_sizes, [300, 100])
+        self.assertAlmostEqual(sample_sizes[0] / sizer.throughputs["fast"],
+                               sample_sizes[1] / sizer.throughputs["slow"])
+
+    def test_consumption_scaled_sample_sizes(self):
+        sizer = AdaptiveSampleSizer(base_sample_size=100, smoothing=0.0)
+        sizer.update("fast", num_timesteps=300, runtime=1.0)
+        sizer.update("slow", num_timesteps=100, runtime=1.0)
+        # No consumption measured yet -> Unscaled.
+        self.assertEqual(sizer.get_scale(), 1.0)
+        self.assertEqual(sizer.get_sample_size("fast"), 150)
+
+        # Learner consumes 800/s, workers produce 400/s -> Tasks double in size.
+        sizer.update_consumption(num_timesteps=1600, runtime=2.0)
+        self.assertEqual(sizer.get_scale(), 2.0)
+        self.assertEqual(sizer.get_sample_size("fast"), 300)
+        self.assertEqual(sizer.get_sample_size("slow"), 100)
+
+        # Workers outpace the learner -> Tasks shrink (down to the min scale).
+        sizer.update_consumption(num_timesteps=10, runtime=1.0)
+        self.assertEqual(sizer.get_scale(), sizer.min_scale)
+        self.assertEqual(sizer.get_sample_size("fast"), 38)
+
+        # The in-flight tasks are split by throughput (at least one per worker).
+        self.assertEqual(sizer.get_task_depth("fast", target_in_flight_tasks=8, num_workers=2), 6)
+        self.assertEqual(sizer.get_task_depth("slow", target_in_flight_tasks=8, num_workers=2), 2)
+        self.assertEqual(sizer.get_task_depth("slow", target_in_flight_tasks=2, num_workers=2), 1)
+        # Evenly split as long as not all workers have been measured.
+        self.assertEqual(sizer.get_task_depth("fast", target_in_flight_tasks=8, num_workers=3), 3)
+
+    def test_blocking_wait(self):
+        ray.init(num_cpus=2, ignore_reinit_error=True)
+
+        @ray.remote
+        def sleep(seconds):
+            time.sleep(seconds)
+            return seconds
+
+        task_pool = RayTaskPool()
+        task_pool.add_task("fast-worker", sleep.remote(0.1))
+        task_pool.add_task("slow-worker", sleep.remote(5.0))
+
+        start = time.perf_counter()
+        wait_for_tasks([task_pool], timeout=None)
+        completed = list(task_pool.get_completed(timeout=0))
+        # Returns as soon as the first task is done.
+        self.assertLess(time.perf_counter() - start, 4.0)
+        self.assertEqual([worker for worker, _ in completed], ["fast-worker"])
+        self.assertEqual(len(task_pool.get_pending()), 1)
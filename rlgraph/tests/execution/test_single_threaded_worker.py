@@ -17,11 +17,16 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
+import time
 import unittest
 
+from rlgraph.agents import Agent
 from rlgraph.agents.random_agent import RandomAgent
-from rlgraph.environments import OpenAIGymEnv
+from rlgraph.environments import OpenAIGymEnv, RandomEnv
 from rlgraph.execution.single_threaded_worker import SingleThreadedWorker
+from rlgraph.spaces import FloatBox, IntBox
+from rlgraph.tests.test_util import config_from_path
+from rlgraph.utils.rlgraph_errors import RLGraphError
 
 
 class TestSingleThreadedWorker(unittest.TestCase):
@@ -71,3 +76,116 @@ class TestSingleThreadedWorker(unittest.TestCase):
         self.assertEqual(result['episodes_executed'], 5)
         self.assertLessEqual(result['env_frames'], 50)
         self.assertGreaterEqual(result['runtime'], 0.0)
+
+    def test_phase_times(self):
+        """
+        Tests recording of per-phase timing metrics.
+        """
+        env_spec = dict(type="random", state_space=FloatBox(shape=(1,)), action_space=IntBox(2), terminal_prob=0.2)
+        agent = RandomAgent(action_space=IntBox(2), state_space=FloatBox(shape=(1,)))
+        worker = SingleThreadedWorker(
+            env_spec=env_spec,
+            agent=agent,
+            frameskip=1,
+            worker_executes_preprocessing=False,
+            record_phase_times=True
+        )
+
+        result = worker.execute_timesteps(100)
+        phase_times = result["phase_times"]
+        for phase in ["action_computation", "env_step", "env_reset", "observe"]:
+            self.assertGreater(phase_times[phase]["count"], 0)
+            self.assertGreaterEqual(phase_times[phase]["total_time"], 0.0)
+        self.assertEqual(phase_times["env_step"]["count"], 100)
+        self.assertAlmostEqual(sum(phase["fraction"] for phase in phase_times.values()), 1.0)
+
+        # Disabled by default.
+        worker = SingleThreadedWorker(env_spec=env_spec, agent=agent, frameskip=1)
+        self.assertTrue("phase_times" not in worker.execute_timesteps(10))
+
+    def test_background_updates(self):
+        """
+        Tests acting while a learner thread performs the updates.
+        """
+        agent = Agent.from_spec(
+            config_from_path("configs/dqn_agent_for_cartpole.json"),
+            state_space=self.environment.state_space,
+            action_space=self.environment.action_space
+        )
+        worker = SingleThreadedWorker(
+            env_spec=lambda: self.environment,
+            agent=agent,
+            frameskip=1,
+            worker_executes_preprocessing=False,
+            update_in_background=True,
+            max_weight_staleness=20
+        )
+
+        result = worker.execute_timesteps(400)
+        self.assertEqual(result['timesteps_executed'], 400)
+        self.assertTrue(worker.learner_thread is None)
+        # Never more update steps than allowed by the schedule's update-to-data ratio.
+        update_ratio = agent.update_spec["update_steps"] / agent.update_spec["update_interval"]
+        self.assertGreater(worker.background_update_steps, 0)
+        self.assertLessEqual(worker.background_update_steps, 400 * update_ratio)
+
+    def test_background_updates_with_small_weight_staleness(self):
+        """
+        Tests that acting and learning do not block each other if the weight staleness bound is smaller than the
+        number of time steps per update step allowed by the update-to-data ratio.
+        """
+        agent = Agent.from_spec(
+            config_from_path("configs/dqn_agent_for_cartpole.json"),
+            state_space=self.environment.state_space,
+            action_space=self.environment.action_space
+        )
+        environment = RandomEnv(state_space=self.environment.state_space, action_space=self.environment.action_space)
+        worker = SingleThreadedWorker(
+            env_spec=lambda: environment,
+            agent=agent,
+            frameskip=1,
+            worker_executes_preprocessing=False,
+            update_in_background=True,
+            max_weight_staleness=2
+        )
+
+        result = worker.execute_timesteps(
+            300, update_spec=dict(update_interval=4, update_steps=1, steps_before_update=10)
+        )
+        self.assertEqual(result['timesteps_executed'], 300)
+        self.assertTrue(worker.learner_thread is None)
+        self.assertGreater(worker.background_update_steps, 0)
+
+    def test_background_updates_stopped_on_error(self):
+        """
+        Tests that the learner thread is stopped if acting fails.
+        """
+        agent = Agent.from_spec(
+            config_from_path("configs/dqn_agent_for_cartpole.json"),
+            state_space=self.environment.state_space,
+            action_space=self.environment.action_space
+        )
+        environment = RandomEnv(state_space=self.environment.state_space, action_space=self.environment.action_space)
+        step = environment.step
+
+        def failing_step(*args, **kwargs):
+            if agent.timesteps >= 100:
+                raise RLGraphError("Environment failure.")
+            return step(*args, **kwargs)
+
+        environment.step = failing_step
+        worker = SingleThreadedWorker(
+            env_spec=lambda: environment,
+            agent=agent,
+            frameskip=1,
+            worker_executes_preprocessing=False,
+            update_in_background=True
+        )
+
+        with self.assertRaises(RLGraphError):
+            worker.execute_timesteps(400)
+        self.assertTrue(worker.learner_thread is None)
+        # The learner does not update any further.
+        update_steps = worker.background_update_steps
+        time.sleep(0.5)
+        self.assertEqual(worker.background_update_steps, update_steps)
@@ -0,0 +1,65 @@
+# Copyright 2018/2019 The RLgraph authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import json
+import os
+import tempfile
+import unittest
+
+from rlgraph import get_backend
+from rlgraph.benchmarks import run_benchmarks
+from rlgraph.benchmarks.run_benchmarks import main
+
+
+class TestBenchmarks(unittest.TestCase):
+    """
+    Tests the benchmark harness (not the actual throughput numbers) with tiny settings.
+    """
+    def test_run_benchmarks(self):
+        output = run_benchmarks(scenarios=["env", "act"], batch_sizes=[1, 4], num_envs=[1, 4], iterations=5)
+        # Must be JSON serializable.
+        output = json.loads(json.dumps(output))
+
+        self.assertEqual(output["meta"]["backends"], [get_backend()])
+        env_results = [result for result in output["results"] if result["scenario"] == "env"]
+        # Vector and sequential env per number of envs.
+        self.assertEqual(len(env_results), 4)
+        for result in env_results:
+            self.assertGreater(result["metrics"]["env_steps_per_second"], 0.0)
+
+        act_results = [result for result in output["results"] if result["scenario"] == "act"]
+        self.assertEqual([result["params"]["batch_size"] for result in act_results], [1, 4])
+        for result in act_results:
+            self.assertEqual(result["backend"], get_backend())
+            self.assertLessEqual(result["metrics"]["latency_p50_ms"], result["metrics"]["latency_p99_ms"])
+
+    def test_cli(self):
+        fd, path = tempfile.mkstemp(suffix=".json")
+        os.close(fd)
+        try:
+            main(["--scenarios", "env", "--num-envs", "2", "--iterations", "5", "--output", path])
+            with open(path) as f:
+                output = json.load(f)
+        finally:
+            os.remove(path)
+        self.assertEqual(len(output["results"]), 2)
+        self.assertEqual(output["results"][0]["params"]["num_envs"], 2)
+
+        with self.assertRaises(SystemExit):
+            main(["--scenarios", "non-existing"])
@@ -159,6 +159,10 @@ def parse_execution_spec(execution_spec):
             enable_timeline=False,
             # With which frequency do we write out a timeline file?
             timeline_frequency=1,
+            # Record call counts and latency histograms per API-method call?
+            enable_api_call_tracing=False,
+            # With which frequency (in calls) do we log the latency statistics (0=never)?
+            api_call_tracing_frequency=0
         )
         execution_spec = default_dict(execution_spec, default_spec)
 
@@ -207,7 +211,11 @@ def parse_execution_spec(execution_spec):
             device_map={},
             # TODO potentially set to nproc?
             torch_num_threads=1,
-            OMP_NUM_THREADS=1
+            OMP_NUM_THREADS=1,
+            # Record call counts and latency histograms per API-method call?
+            enable_api_call_tracing=False,
+            # With which frequency (in calls) do we log the latency statistics (0=never)?
+            api_call_tracing_frequency=0
         )
         execution_spec = default_dict(execution_spec, default_spec)
 
@@ -0,0 +1,152 @@
+# Copyright 2018/2019 The RLgraph authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+import math
+
+import numpy as np
+
+from rlgraph.utils.rlgraph_errors import RLGraphError
+
+
+class LatencyHistogram(object):
+    """
+    A fixed-memory, HDR-style (high dynamic range) histogram of latencies.
+
+    Recorded values are converted into integer ticks of `lowest_value` and counted in log-linear buckets: Each
+    power-of-two range of values is split into the same number of linear sub-buckets, such that the relative error
+    of any reported value (e.g. a percentile) is bounded by `10^-significant_digits`, independent of the
+    magnitude of the value. Memory is allocated once upon construction and recording a value is O(1).
+    """
+    def __init__(self, lowest_value=1e-6, highest_value=60.0, significant_digits=2):
+        """
+        Args:
+            lowest_value (float): The smallest distinguishable value (e.g. 1e-6 for microsecond resolution when
+                recording seconds). Default: 1e-6.
+            highest_value (float): The largest trackable value. Larger values are counted in the highest bucket
+                (but still reflected in `max`). Default: 60.0.
+            significant_digits (int): The number of significant decimal digits to maintain (1-5). Default: 2.
+        """
+        if not 1 <= significant_digits <= 5:
+            raise RLGraphError("ERROR: `significant_digits` must be between 1 and 5, but is {}!".
+                               format(significant_digits))
+        if not 0.0 < lowest_value < highest_value:
+            raise RLGraphError("ERROR: Must have 0 < `lowest_value` ({}) < `highest_value` ({})!".
+                               format(lowest_value, highest_value))
+
+        self.lowest_value = lowest_value
+        self.highest_value = highest_value
+        self.significant_digits = significant_digits
+
+        # Number of linear sub-buckets per power-of-two bucket (the smallest power of two allowing for the precision).
+        self.sub_bucket_count_magnitude = int(math.ceil(math.log2(2 * 10 ** significant_digits)))
+        self.sub_bucket_count = 1 << self.sub_bucket_count_magnitude
+        self.sub_bucket_half_count = self.sub_bucket_count // 2
+
+        self.highest_tick = int(math.ceil(highest_value / lowest_value))
+        self.bucket_count = max(self.highest_tick.bit_length() - self.sub_bucket_count_magnitude, 0) + 1
+        self.counts = np.zeros(shape=((self.bucket_count + 1) * self.sub_bucket_half_count,), dtype=np.int64)
+        self.max_index = len(self.counts) - 1
+
+        self.total_count = 0
+        self.total_value = 0.0
+        self.min_value = float("inf")
+        self.max_value = 0.0
+
+    def record(self, value):
+        """
+        Records a single value.
+
+        Args:
+            value (float): The value (e.g. a latency in seconds) to record.
+        """
+        self.counts[self._get_index(int(value / self.lowest_value))] += 1
+        self.total_count += 1
+        self.total_value += value
+        if value < self.min_value:
+            self.min_value = value
+        if value > self.max_value:
+            self.max_value = value
+
+    def get_percentile(self, percentile):
+        """
+        Args:
+            percentile (float): The percentile (0.0-100.0) to compute.
+
+        Returns:
+            float: The highest value equivalent (within the histogram's precision) to the given percentile of all
+                recorded values or 0.0 if no values have been recorded.
+        """
+        if self.total_count == 0:
+            return 0.0
+        target_count = max(int(math.ceil(percentile / 100.0 * self.total_count)), 1)
+        index = int(np.searchsorted(np.cumsum(self.counts), target_count))
+        # The last bucket also holds all values above `highest_value`.
+        if index == self.max_index:
+            return self.max_value
+        return min(self._get_highest_equivalent_value(index) * self.lowest_value, self.max_value)
+
+    def merge(self, other):
+        """
+        Adds all values recorded in another histogram with identical settings to this one.
+
+        Args:
+            other (LatencyHistogram): The histogram to merge into this one.
+        """
+        if other.counts.shape != self.counts.shape or other.lowest_value != self.lowest_value:
+            raise RLGraphError("ERROR: Can only merge histograms with identical settings!")
+        self.counts += other.counts
+        self.total_count += other.total_count
+        self.total_value += other.total_value
+        self.min_value = min(self.min_value, other.min_value)
+        self.max_value = max(self.max_value, other.max_value)
+
+    def reset(self):
+        self.counts[:] = 0
+        self.total_count = 0
+        self.total_value = 0.0
+        self.min_value = float("inf")
+        self.max_value = 0.0
+
+    def get_statistics(self, percentiles=(50.0, 90.0, 99.0, 99.9)):
+        """
+        Args:
+            percentiles (Iterable[float]): The percentiles to report.
+
+        Returns:
+            dict: The number of recorded values, their mean, min, max and the given percentiles (keyed e.g. "p99" or
+                "p99.9").
+        """
+        statistics = dict(
+            count=self.total_count,
+            mean=self.total_value / self.total_count if self.total_count > 0 else 0.0,
+            min=self.min_value if self.total_count > 0 else 0.0,
+            max=self.max_value
+        )
+        for percentile in percentiles:
+            statistics["p{:g}".format(percentile)] = self.get_percentile(percentile)
+        return statistics
+
+    def _get_index(self, tick):
+        # Power-of-two bucket (0 for all ticks < sub_bucket_count) and linear sub-bucket within it.
+        bucket_index = max(tick.bit_length() - self.sub_bucket_count_magnitude, 0)
+        index = bucket_index * self.sub_bucket_half_count + (tick >> bucket_index)
+        return index if index < self.max_index else self.max_index
+
+    def _get_highest_equivalent_value(self, index):
+        if index < self.sub_bucket_count:
+            return index
+        bucket_index = (index - self.sub_bucket_count) // self.sub_bucket_half_count + 1
+        sub_bucket_index = (index - self.sub_bucket_count) % self.sub_bucket_half_count + self.sub_bucket_half_count
+        return ((sub_bucket_index + 1) << bucket_index) - 1
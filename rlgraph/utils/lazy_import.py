@@ -0,0 +1,82 @@
+# Copyright 2018/2019 The RLgraph authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import importlib
+import sys
+
+
+def load_class(class_path):
+    """
+    Imports the module of a "module.Class" path and returns the class (or any other module-level attribute).
+
+    Args:
+        class_path (str): The full python path of the class, e.g. "rlgraph.agents.dqn_agent.DQNAgent".
+
+    Returns:
+        any: The imported class.
+    """
+    module_name, class_name = class_path.rsplit(".", 1)
+    return getattr(importlib.import_module(module_name), class_name)
+
+
+def get_attribute_modules(class_paths):
+    """
+    Splits "module.Class" paths into a dict mapping class names to their defining modules.
+
+    Args:
+        class_paths (iterable[str]): Full python paths of classes, e.g. "rlgraph.agents.dqn_agent.DQNAgent".
+            Duplicates are allowed (as are common in `__lookup_classes__` values).
+
+    Returns:
+        dict: Mapping from class names (e.g. "DQNAgent") to module names (e.g. "rlgraph.agents.dqn_agent").
+    """
+    attribute_modules = dict()
+    for class_path in class_paths:
+        module_name, class_name = class_path.rsplit(".", 1)
+        attribute_modules[class_name] = module_name
+    return attribute_modules
+
+
+def lazy_module_attributes(module_name, attribute_modules):
+    """
+    Creates PEP 562 module-level `__getattr__` and `__dir__` functions for a package, such that the package's public
+    classes are only imported on first access (e.g. via `from rlgraph.agents import DQNAgent` or a `from_spec` lookup).
+    This way, importing a package does not pull in every backend, environment library and sub-module below it.
+
+    Args:
+        module_name (str): The `__name__` of the package to create the functions for.
+        attribute_modules (dict): Mapping from attribute names to the modules (or sub-packages) to import them from.
+
+    Returns:
+        tuple: The `__getattr__` and `__dir__` functions to be assigned to the package's module-level namespace.
+    """
+    module = sys.modules[module_name]
+
+    def __getattr__(name):
+        if name not in attribute_modules:
+            raise AttributeError("module '{}' has no attribute '{}'".format(module_name, name))
+        value = getattr(importlib.import_module(attribute_modules[name]), name)
+        # Cache on the package so subsequent accesses bypass `__getattr__`.
+        setattr(module, name, value)
+        return value
+
+    def __dir__():
+        return sorted(set(module.__dict__.keys()) | set(attribute_modules.keys()))
+
+    return __getattr__, __dir__
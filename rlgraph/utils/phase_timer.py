@@ -0,0 +1,116 @@
+# Copyright 2018/2019 The RLgraph authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import time
+
+
+class PhaseTimer(object):
+    """
+    Accumulates wall-clock time spent in named phases (e.g. "env_step" or "action_computation") of a worker's
+    sampling loop.
+
+    Timing a phase is done via `with timer.phase("env_step"): ...`. The context managers are cached per phase name,
+    so no objects are created per call, and a disabled timer returns a shared no-op context manager, such that
+    instrumented code only pays for a method call and an attribute check when timing is switched off.
+    """
+    def __init__(self, enabled=True):
+        """
+        Args:
+            enabled (bool): Whether to actually record times. Default: True.
+        """
+        self.enabled = enabled
+        self.phases = {}
+
+    def phase(self, name):
+        """
+        Args:
+            name (str): The name of the phase to time.
+
+        Returns:
+            any: A context manager adding the time spent inside it to the given phase.
+        """
+        if self.enabled is False:
+            return _NO_OP_PHASE
+        phase = self.phases.get(name)
+        if phase is None:
+            phase = self.phases[name] = _Phase()
+        return phase
+
+    def add(self, name, duration, count=1):
+        """
+        Adds an externally measured duration to a phase.
+
+        Args:
+            name (str): The name of the phase.
+            duration (float): The time (in seconds) to add.
+            count (int): The number of calls this duration covers.
+        """
+        if self.enabled is False:
+            return
+        phase = self.phase(name)
+        phase.total_time += duration
+        phase.count += count
+
+    def reset(self):
+        self.phases = {}
+
+    def get_statistics(self):
+        """
+        Returns:
+            Dict[str,dict]: Per phase: The total time (s), the number of timed calls, the mean time per call (s) and
+                the fraction of the total time spent in all phases.
+        """
+        all_phases_time = sum(phase.total_time for phase in self.phases.values()) or 1e-10
+        return {
+            name: dict(
+                total_time=phase.total_time,
+                count=phase.count,
+                mean_time=phase.total_time / max(phase.count, 1),
+                fraction=phase.total_time / all_phases_time
+            ) for name, phase in self.phases.items()
+        }
+
+
+class _Phase(object):
+    __slots__ = ["total_time", "count", "start"]
+
+    def __init__(self):
+        self.total_time = 0.0
+        self.count = 0
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *args):
+        self.total_time += time.perf_counter() - self.start
+        self.count += 1
+        return False
+
+
+class _NoOpPhase(object):
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+
+_NO_OP_PHASE = _NoOpPhase()
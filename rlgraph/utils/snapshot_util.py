@@ -0,0 +1,149 @@
+# Copyright 2018/2019 The RLgraph authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import os
+import re
+
+import numpy as np
+
+from rlgraph.utils.rlgraph_errors import RLGraphError
+
+# Prefix of the npz keys holding memory state (as opposed to record columns).
+_STATE_PREFIX = "state:"
+
+
+def store_memory_snapshot(memory, directory):
+    """
+    Stores an append-only snapshot of a (python-side) replay memory in `directory`:
+    - The records inserted since the last snapshot are appended as a new segment file. Once older segments are
+        obsolete (all their records were overwritten or the segments hold more than twice the capacity), a full
+        segment is written instead and the older segments are removed.
+    - The memory's state (index, size, priorities, ...) is written into a state file, which also records the last
+        valid segment (so segments of interrupted snapshots are ignored on restore).
+
+    The memory must provide:
+    - `capacity`, `index`, `size`, `num_inserted` (total number of inserted records) and
+        `num_inserted_at_snapshot` (value of `num_inserted` at the last snapshot or restore).
+    - `get_snapshot_state()` and `set_snapshot_state(state)`: Get/set a dict of numpy-compatible state values.
+    - `read_snapshot_records(indices)` and `write_snapshot_records(indices, records)`: Read/write a dict of
+        numpy record columns at the given storage indices.
+
+    Args:
+        memory (any): The memory to snapshot.
+        directory (str): The snapshot directory. Created if it does not exist.
+
+    Returns:
+        int: The number of records written.
+    """
+    if not os.path.exists(directory):
+        os.makedirs(directory)
+    segments = _get_valid_segments(directory, remove_invalid=True)
+    num_new = memory.num_inserted - memory.num_inserted_at_snapshot
+    num_records_in_segments = sum(num_records for _, num_records, _ in segments)
+
+    full_snapshot = len(segments) == 0 or num_new >= memory.capacity or \
+        num_records_in_segments + num_new > 2 * memory.capacity
+    num_records = memory.size if full_snapshot else num_new
+    # Storage indices of the records to write, oldest first.
+    indices = (memory.index - num_records + np.arange(num_records)) % memory.capacity
+
+    sequence_number = segments[-1][0] + 1 if len(segments) > 0 else 0
+    records = memory.read_snapshot_records(indices)
+    # Record keys may contain characters that are invalid in npz-keys -> Store columns by position.
+    arrays = {"column_{}".format(i): records[key] for i, key in enumerate(records.keys())}
+    arrays["keys"] = np.asarray(list(records.keys()))
+    arrays["indices"] = indices
+    _save_atomic(os.path.join(directory, "records-{:08d}-{}.npz".format(sequence_number, num_records)), arrays)
+
+    state = {_STATE_PREFIX + key: value for key, value in memory.get_snapshot_state().items()}
+    state["last_segment"] = sequence_number
+    state["first_segment"] = sequence_number if full_snapshot else segments[0][0]
+    _save_atomic(os.path.join(directory, "state.npz"), state)
+
+    # Remove segments made obsolete by a full snapshot.
+    if full_snapshot:
+        for _, _, filename in segments:
+            os.remove(os.path.join(directory, filename))
+
+    memory.num_inserted_at_snapshot = memory.num_inserted
+    return num_records
+
+
+def load_memory_snapshot(memory, directory):
+    """
+    Restores a memory from a snapshot written by `store_memory_snapshot`. Record segments are written into the
+    memory's storage column-wise (oldest first), then the memory's state is restored.
+
+    Args:
+        memory (any): The memory to restore (see `store_memory_snapshot` for the required interface).
+        directory (str): The snapshot directory.
+
+    Returns:
+        int: The number of records read from disk.
+    """
+    state = _load_state(directory)
+    if state is None:
+        raise RLGraphError("ERROR: No memory snapshot found in '{}'!".format(directory))
+
+    num_records_read = 0
+    for _, num_records, filename in _get_valid_segments(directory):
+        with np.load(os.path.join(directory, filename), allow_pickle=True) as npz_file:
+            records = {key: npz_file["column_{}".format(i)] for i, key in enumerate(npz_file["keys"])}
+            memory.write_snapshot_records(npz_file["indices"], records)
+        num_records_read += num_records
+
+    memory.set_snapshot_state({
+        key[len(_STATE_PREFIX):]: value for key, value in state.items() if key.startswith(_STATE_PREFIX)
+    })
+    memory.num_inserted_at_snapshot = memory.num_inserted
+    return num_records_read
+
+
+def _load_state(directory):
+    state_file = os.path.join(directory, "state.npz")
+    if not os.path.exists(state_file):
+        return None
+    with np.load(state_file, allow_pickle=True) as npz_file:
+        return {key: npz_file[key] for key in npz_file.files}
+
+
+def _get_valid_segments(directory, remove_invalid=False):
+    """
+    Returns (sequence number, number of records, filename)-tuples of all segments belonging to the last completed
+    snapshot, sorted by sequence number. Other segments are left-overs of interrupted snapshots.
+    """
+    state = _load_state(directory)
+    segments = list()
+    for filename in os.listdir(directory):
+        match = re.match(r'^records-(\d+)-(\d+)\.npz$', filename)
+        if match:
+            sequence_number = int(match.group(1))
+            if state is not None and state["first_segment"] <= sequence_number <= state["last_segment"]:
+                segments.append((sequence_number, int(match.group(2)), filename))
+            elif remove_invalid is True:
+                os.remove(os.path.join(directory, filename))
+    return sorted(segments)
+
+
+def _save_atomic(path, arrays):
+    # Write to a temporary file first, so an interrupted snapshot never leaves a corrupt file behind.
+    temp_path = path + ".tmp.npz"
+    np.savez(temp_path, **arrays)
+    os.replace(temp_path, path)
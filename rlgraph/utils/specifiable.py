@@ -26,6 +26,7 @@ import re
 import yaml
 import logging
 
+from rlgraph.utils.lazy_import import load_class
 from rlgraph.utils.rlgraph_errors import RLGraphError
 from rlgraph.utils.util import default_dict, force_list
 
@@ -189,12 +190,29 @@ class Specifiable(object):
 
     @classmethod
     def lookup_class(cls, lookup_type):
+        """
+        Looks up a constructor in `cls.__lookup_classes__`.
+        Values in `__lookup_classes__` may either be classes or "module.Class" strings. The latter are only imported
+        on first lookup (and then cached in the dict), so that registering a class does not require importing it.
+
+        Args:
+            lookup_type (any): The key to look up (strings are also tried in lower case without special chars).
+
+        Returns:
+            Optional[callable]: The found constructor or None if `lookup_type` is not a key of `__lookup_classes__`.
+        """
         if isinstance(cls.__lookup_classes__, dict) and \
             (lookup_type in cls.__lookup_classes__ or (isinstance(lookup_type, str)
              and re.sub(r'[\W_]', '', lookup_type.lower()) in cls.__lookup_classes__)):
-            available_class_for_type = cls.__lookup_classes__.get(lookup_type)
+            key = lookup_type
+            available_class_for_type = cls.__lookup_classes__.get(key)
             if available_class_for_type is None:
-                available_class_for_type = cls.__lookup_classes__[re.sub(r'[\W_]', '', lookup_type.lower())]
+                key = re.sub(r'[\W_]', '', lookup_type.lower())
+                available_class_for_type = cls.__lookup_classes__[key]
+            # Lazily registered class: Import now and cache.
+            if isinstance(available_class_for_type, str):
+                available_class_for_type = load_class(available_class_for_type)
+                cls.__lookup_classes__[key] = available_class_for_type
             return available_class_for_type
         return None
 
@@ -17,8 +17,11 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
+import ctypes
 import multiprocessing
 
+import numpy as np
+
 from rlgraph import get_backend
 from rlgraph.spaces.space import Space
 from rlgraph.spaces.containers import ContainerSpace
@@ -40,8 +43,11 @@ class SpecifiableServer(Specifiable):
 
     # Class instances get registered/deregistered here.
     INSTANCES = []
+    # Command marker for calling a method on all hosted Specifiable objects.
+    CALL_MANY = "__call_many__"
 
-    def __init__(self, specifiable_class, spec, output_spaces, shutdown_method=None):
+    def __init__(self, specifiable_class, spec, output_spaces, shutdown_method=None, use_shared_memory=True,
+                 num_instances=1):
         """
         Args:
             specifiable_class (type): The class to use for constructing the Specifiable from spec. This class needs to be
@@ -53,6 +59,12 @@ class SpecifiableServer(Specifiable):
             shutdown_method (Optional[str]): An optional name of a shutdown method that will be called on the
                 Specifiable object before "server" shutdown to give the Specifiable a chance to clean up.
                 The Specifiable must implement this method.
+            use_shared_memory (bool): Whether to return the results of methods with fully defined (primitive)
+                output Spaces through shared memory (instead of pickling them through the pipe). The server process
+                then writes the results in place into pre-allocated buffers and only sends a small control message.
+                Only possible if `output_spaces` is a dict. Default: True.
+            num_instances (int): The number of Specifiable objects (all constructed from `spec`) to host inside the
+                server process. All of them can be called in one round-trip via `call_many`. Default: 1.
             #flatten_output_dicts (bool): Whether output dictionaries should be flattened to tuples and then
             #    returned.
         """
@@ -72,6 +84,13 @@ class SpecifiableServer(Specifiable):
         else:
             self.output_spaces = output_spaces
         self.shutdown_method = shutdown_method
+        self.use_shared_memory = use_shared_memory
+        self.num_instances = num_instances
+
+        # Per method name: The list of shared buffers (one per return value) and their numpy views.
+        # Created in `start_server`.
+        self.shared_buffers = None
+        self.shared_views = None
 
         # The process in which the Specifiable will run.
         self.process = None
@@ -87,6 +106,7 @@ class SpecifiableServer(Specifiable):
         """
         Returns a function that will create a server-call (given method_name must be one of the Specifiable object)
         from within the backend-specific graph.
+        The call goes to the first hosted Specifiable object. Use `call_many` to call all hosted objects at once.
 
         Args:
             method_name (str): The method to call on the Specifiable.
@@ -105,76 +125,224 @@ class SpecifiableServer(Specifiable):
             return func
 
         def call(*args):
-            if isinstance(self.output_spaces, dict):
-                assert method_name in self.output_spaces, "ERROR: Method '{}' not specified in output_spaces: {}!".\
-                    format(method_name, self.output_spaces)
-                specs = self.output_spaces[method_name]
-            else:
-                specs = self.output_spaces(method_name)
-
-            if specs is None:
-                raise RLGraphError(
-                    "No Space information received for method '{}:{}'".format(self.specifiable_class.__name__, method_name)
+            return self._graph_call(method_name, args, batched=False)
+
+        return call
+
+    def call_many(self, method_name, *args):
+        """
+        Creates a single server-call (from within the backend-specific graph) that calls the given method on all
+        hosted Specifiable objects (one round-trip for all of them).
+
+        Args:
+            method_name (str): The method to call on each Specifiable.
+            *args (any): The args to pass to the method. Each arg must be batched with one row per hosted
+                Specifiable object (i.e. its 0th rank must have size `num_instances`).
+
+        Returns:
+            any: The method's return values, batched along the 0th rank (one row per hosted Specifiable object).
+        """
+        return self._graph_call(method_name, args, batched=True)
+
+    def _graph_call(self, method_name, args, batched):
+        """
+        Creates the in-graph (backend-specific) server-call for `call` and `call_many`.
+        """
+        if isinstance(self.output_spaces, dict):
+            assert method_name in self.output_spaces, "ERROR: Method '{}' not specified in output_spaces: {}!".\
+                format(method_name, self.output_spaces)
+            specs = self.output_spaces[method_name]
+        else:
+            specs = self.output_spaces(method_name)
+
+        if specs is None:
+            raise RLGraphError(
+                "No Space information received for method '{}:{}'".format(self.specifiable_class.__name__, method_name)
+            )
+
+        dtypes = []
+        shapes = []
+        return_slots = []
+        for i, space in enumerate(force_list(specs)):
+            assert not isinstance(space, ContainerSpace)
+            # Expecting an op (space 0).
+            if space == 0:
+                assert batched is False, "ERROR: Cannot `call_many` method '{}' returning an op!".format(method_name)
+                dtypes.append(0)
+                shapes.append(0)
+                return_slots.append(i)
+            # Expecting a tensor.
+            elif space is not None:
+                dtypes.append(convert_dtype(space.dtype))
+                shapes.append(((self.num_instances,) if batched is True else ()) + space.shape)
+                return_slots.append(i)
+
+        if get_backend() == "tf":
+            # This function will send the method-call-comment via the out-pipe to the remote (server) Specifiable
+            # object - all in-graph - and return the results to be used further by other graph ops.
+            def py_call(*call_args):
+                call_args = [arg.decode('UTF-8') if isinstance(arg, bytes) else arg for arg in call_args]
+                try:
+                    if batched is True:
+                        # Split the batched args into one args-list per hosted Specifiable.
+                        list_of_args = list(zip(*call_args[1:])) if len(call_args) > 1 else \
+                            [()] * self.num_instances
+                        return self.remote_call_many(call_args[0], list_of_args)
+                    return self.remote_call(*call_args)
+                except Exception as e:
+                    if isinstance(e, IOError):
+                        raise StopIteration()  # Clean exit.
+                    else:
+                        print("ERROR: Sent={} Exception={}".format(call_args, e))
+                        raise
+
+            results = tf.py_func(py_call, (method_name,) + tuple(args), dtypes, name=method_name)
+
+            # Force known shapes on the returned tensors.
+            for i, (result, shape) in enumerate(zip(results, shapes)):
+                # Not an op (which have shape=0).
+                if shape != 0:
+                    result.set_shape(shape)
+        else:
+            raise NotImplementedError
+
+        return results[0] if len(dtypes) == 1 else tuple(results)
+
+    def remote_call(self, method_name, *args):
+        """
+        Calls a method on the (first) Specifiable object running inside the (started) server process and returns
+        its results.
+
+        Args:
+            method_name (str): The name of the method to call.
+            *args (any): The args to pass to the method.
+
+        Returns:
+            any: The method's return values.
+        """
+        self.remote_send(method_name, *args)
+        return self.remote_receive(method_name)
+
+    def remote_send(self, method_name, *args):
+        """
+        Sends a method call to the (first) Specifiable object running inside the (started) server process without
+        waiting for its results. This way, several servers can work concurrently. Each sent call must be matched by
+        one `remote_receive` (in the same order) before the next `remote_call`.
+
+        Args:
+            method_name (str): The name of the method to call.
+            *args (any): The args to pass to the method.
+        """
+        self.out_pipe.send([method_name] + list(args))
+
+    def remote_receive(self, method_name):
+        """
+        Waits for the results of the oldest call sent via `remote_send`.
+
+        Args:
+            method_name (str): The name of the called method.
+
+        Returns:
+            any: The method's return values.
+        """
+        received_results = self.out_pipe.recv()
+
+        # If an error occurred, it'll be passed back through the pipe.
+        if isinstance(received_results, Exception):
+            raise received_results
+        # Results have been written into the shared buffers.
+        elif received_results is True and method_name in self.shared_views:
+            # Copy out, as the next call will overwrite the buffers in place.
+            return [np.array(view[0]) for view in self.shared_views[method_name]]
+        return received_results
+
+    def remote_call_many(self, method_name, list_of_args):
+        """
+        Calls a method on all Specifiable objects running inside the (started) server process using a single
+        round-trip and returns their results batched.
+
+        Args:
+            method_name (str): The name of the method to call.
+            list_of_args (List[tuple]): One args-tuple per hosted Specifiable object.
+
+        Returns:
+            list: One item per return value of the method, each batched along the 0th rank (one row per
+                hosted Specifiable object).
+        """
+        if len(list_of_args) != self.num_instances:
+            raise RLGraphError(
+                "ERROR: `call_many` needs one args-tuple per hosted Specifiable ({}), but got {}!".format(
+                    self.num_instances, len(list_of_args)
                 )
+            )
+        self.out_pipe.send([self.CALL_MANY, method_name, [list(args) for args in list_of_args]])
+        received_results = self.out_pipe.recv()
+
+        if isinstance(received_results, Exception):
+            raise received_results
+        elif received_results is True and method_name in self.shared_views:
+            return [np.array(view) for view in self.shared_views[method_name]]
+        # Batch the per-Specifiable results.
+        return [np.stack(results) for results in zip(*[force_list(r) for r in received_results])]
+
+    def create_shared_buffers(self):
+        """
+        Allocates one shared-memory buffer per return value of each method whose output Spaces are fully known.
+        Each buffer holds one row per hosted Specifiable object.
 
-            dtypes = []
-            shapes = []
-            return_slots = []
-            for i, space in enumerate(force_list(specs)):
-                assert not isinstance(space, ContainerSpace)
-                # Expecting an op (space 0).
-                if space == 0:
-                    dtypes.append(0)
-                    shapes.append(0)
-                    return_slots.append(i)
-                # Expecting a tensor.
-                elif space is not None:
-                    dtypes.append(convert_dtype(space.dtype))
-                    shapes.append(space.shape)
-                    return_slots.append(i)
-
-            if get_backend() == "tf":
-                # This function will send the method-call-comment via the out-pipe to the remote (server) Specifiable
-                # object - all in-graph - and return the results to be used further by other graph ops.
-                def py_call(*call_args):
-                    call_args = [arg.decode('UTF-8') if isinstance(arg, bytes) else arg for arg in call_args]
-                    try:
-                        self.out_pipe.send(call_args)
-                        received_results = self.out_pipe.recv()
-
-                        # If an error occurred, it'll be passed back through the pipe.
-                        if isinstance(received_results, Exception):
-                            raise received_results
-                        elif received_results is not None:
-                            return received_results
-
-                    except Exception as e:
-                        if isinstance(e, IOError):
-                            raise StopIteration()  # Clean exit.
-                        else:
-                            print("ERROR: Sent={} Exception={}".format(call_args, e))
-                            raise
-
-                results = tf.py_func(py_call, (method_name,) + tuple(args), dtypes, name=method_name)
-
-                # Force known shapes on the returned tensors.
-                for i, (result, shape) in enumerate(zip(results, shapes)):
-                    # Not an op (which have shape=0).
-                    if shape != 0:
-                        result.set_shape(shape)
-            else:
-                raise NotImplementedError
-
-            return results[0] if len(dtypes) == 1 else tuple(results)
+        Returns:
+            dict: Mapping from method names to lists of shared buffers (each a `multiprocessing.RawArray`).
+        """
+        shared_buffers = {}
+        if self.use_shared_memory is False or not isinstance(self.output_spaces, dict):
+            return shared_buffers
+
+        for method_name, specs in self.output_spaces.items():
+            spaces = force_list(specs)
+            # Only primitive Spaces with numeric dtypes can be mapped onto fixed-size buffers.
+            if len(spaces) == 0 or not all(isinstance(space, Space) and not isinstance(space, ContainerSpace) and
+                                           np.dtype(convert_dtype(space.dtype, "np")).kind in "biuf"
+                                           for space in spaces):
+                continue
+            shared_buffers[method_name] = [
+                multiprocessing.RawArray(
+                    ctypes.c_byte, max(self.num_instances * int(np.prod(space.shape)), 1) *
+                    np.dtype(convert_dtype(space.dtype, "np")).itemsize
+                ) for space in spaces
+            ]
+        return shared_buffers
+
+    def get_shared_views(self, shared_buffers):
+        """
+        Creates numpy views (of the correct dtypes and shapes) on the given shared buffers.
 
-        return call
+        Args:
+            shared_buffers (dict): The shared buffers as returned by `create_shared_buffers`.
+
+        Returns:
+            dict: Mapping from method names to lists of numpy arrays (sharing memory with the buffers) with
+                shapes [num_instances] + Space shape.
+        """
+        shared_views = {}
+        for method_name, buffers in shared_buffers.items():
+            shared_views[method_name] = [
+                np.frombuffer(
+                    buffer, dtype=convert_dtype(space.dtype, "np"), count=self.num_instances * int(np.prod(space.shape))
+                ).reshape((self.num_instances,) + space.shape)
+                for buffer, space in zip(buffers, force_list(self.output_spaces[method_name]))
+            ]
+        return shared_views
 
     def start_server(self):
         # Create the in- and out- pipes to communicate with the proxy-Specifiable.
         self.out_pipe, self.in_pipe = multiprocessing.Pipe()
+        # Allocate the shared memory for results before the server process gets forked.
+        self.shared_buffers = self.create_shared_buffers()
+        self.shared_views = self.get_shared_views(self.shared_buffers)
         # Create and start the process passing it the spec to construct the desired Specifiable object..
         self.process = multiprocessing.Process(
-            target=self.run_server, args=(self.specifiable_class, self.spec, self.in_pipe, self.shutdown_method)
+            target=self.run_server, args=(self.specifiable_class, self.spec, self.in_pipe, self.shutdown_method,
+                                          self.shared_buffers)
         )
         self.process.start()
 
@@ -193,12 +361,16 @@ class SpecifiableServer(Specifiable):
             pass
         self.process.join()
 
-    def run_server(self, class_, spec, in_pipe, shutdown_method=None):
-        proxy_object = None
+    def run_server(self, class_, spec, in_pipe, shutdown_method=None, shared_buffers=None):
+        proxy_objects = []
+        method_name = None
+        inputs = None
         try:
+            shared_views = self.get_shared_views(shared_buffers or {})
 
-            # Construct the Specifiable object.
-            proxy_object = class_.from_spec(spec)
+            # Construct the Specifiable object(s).
+            for _ in range(self.num_instances):
+                proxy_objects.append(class_.from_spec(spec))
 
             # Send the ready signal (no errors).
             in_pipe.send(None)
@@ -209,29 +381,45 @@ class SpecifiableServer(Specifiable):
 
                 # "close" signal (None) -> End this process.
                 if command is None:
-                    # Give the proxy_object a chance to clean up via some `shutdown_method`.
-                    if shutdown_method is not None and hasattr(proxy_object, shutdown_method):
-                        getattr(proxy_object, shutdown_method)()
+                    # Give the proxy_objects a chance to clean up via some `shutdown_method`.
+                    for proxy_object in proxy_objects:
+                        if shutdown_method is not None and hasattr(proxy_object, shutdown_method):
+                            getattr(proxy_object, shutdown_method)()
                     in_pipe.close()
                     return
 
-                # Call the method with the given args.
-                method_name = str(command[0])  # must decode here as method_name comes in as bytes
-                inputs = command[1:]
-                results = getattr(proxy_object, method_name)(*inputs)
-
+                # Call the method on all proxy objects (one args-list each).
+                if command[0] == self.CALL_MANY:
+                    method_name = str(command[1])
+                    inputs = command[2]
+                    results = [getattr(proxy_object, method_name)(*args)
+                               for proxy_object, args in zip(proxy_objects, inputs)]
+                # Call the method on the first proxy object with the given args.
+                else:
+                    method_name = str(command[0])  # must decode here as method_name comes in as bytes
+                    inputs = command[1:]
+                    results = [getattr(proxy_objects[0], method_name)(*inputs)]
+
+                # Write return values in place into shared memory and only send the control message.
+                if method_name in shared_views:
+                    for i, instance_results in enumerate(results):
+                        for view, result in zip(shared_views[method_name], force_list(instance_results)):
+                            view[i] = result
+                    in_pipe.send(True)
                 # Send return values back to caller.
-                in_pipe.send(results)
+                else:
+                    in_pipe.send(results if command[0] == self.CALL_MANY else results[0])
 
         # If something happens during the construction and proxy run phase, pass the exception back through our pipe.
         except Exception as e:
             print("ERROR: Last called={} Sent={}".format(method_name, inputs))
             # Try to clean up.
-            if proxy_object is not None and shutdown_method is not None and hasattr(proxy_object, shutdown_method):
-                try:
-                    getattr(proxy_object, shutdown_method)()
-                except:
-                    pass
+            for proxy_object in proxy_objects:
+                if shutdown_method is not None and hasattr(proxy_object, shutdown_method):
+                    try:
+                        getattr(proxy_object, shutdown_method)()
+                    except:
+                        pass
             # Send the exception back so the main process knows what's going on.
             in_pipe.send(e)
 
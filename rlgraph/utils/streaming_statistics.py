@@ -0,0 +1,186 @@
+# Copyright 2018/2019 The RLgraph authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+from collections import deque
+import random
+
+import numpy as np
+
+
+class StreamingStatistics(object):
+    """
+    Fixed-memory statistics over a (possibly endless) stream of values, e.g. episode rewards of a long-running
+    worker.
+
+    Keeps lifetime aggregates (count, mean and variance via Welford's algorithm, min, max, last value), a window of
+    the most recent `window_size` values and - optionally - a uniform reservoir sample of all values from which
+    approximate quantiles are computed. Memory and the cost of `get_statistics` do not grow with the number of
+    values added.
+    """
+    def __init__(self, window_size=100, num_quantile_samples=0, quantiles=(0.1, 0.5, 0.9)):
+        """
+        Args:
+            window_size (int): The number of most recent values to keep (accessible via `window`). Default: 100.
+            num_quantile_samples (int): The size of the reservoir sample used to estimate quantiles over all values.
+                0 for no quantile estimates. Default: 0.
+            quantiles (Iterable[float]): The quantiles (0.0-1.0) to report if `num_quantile_samples` > 0.
+        """
+        self.window_size = window_size
+        self.num_quantile_samples = num_quantile_samples
+        self.quantiles = quantiles
+
+        self.window = deque(maxlen=window_size)
+        self.quantile_samples = []
+
+        self.count = 0
+        self.mean = 0.0
+        # Sum of squared differences from the mean (Welford).
+        self.m2 = 0.0
+        self.min = float("inf")
+        self.max = float("-inf")
+        self.last = None
+
+    def add(self, value):
+        """
+        Adds a single value to the stream.
+
+        Args:
+            value (float): The value to add.
+        """
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+        self.last = value
+        self.window.append(value)
+
+        if self.num_quantile_samples > 0:
+            # Reservoir sampling: Every value seen so far is in the sample with equal probability.
+            if len(self.quantile_samples) < self.num_quantile_samples:
+                self.quantile_samples.append(value)
+            else:
+                index = random.randrange(self.count)
+                if index < self.num_quantile_samples:
+                    self.quantile_samples[index] = value
+
+    def extend(self, values):
+        for value in values:
+            self.add(value)
+
+    def merge(self, other):
+        """
+        Merges another stream's statistics into this one (e.g. to aggregate the statistics of several environments
+        or workers). Lifetime aggregates are exact, the window holds the other stream's values after this one's
+        and quantile samples are re-sampled proportional to the streams' counts.
+
+        Args:
+            other (StreamingStatistics): The statistics to merge into this one.
+        """
+        if other.count == 0:
+            return
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.m2 += other.m2 + delta ** 2 * self.count * other.count / count
+        self.mean += delta * other.count / count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self.last = other.last
+        self.window.extend(other.window)
+
+        if self.num_quantile_samples > 0:
+            samples = self.quantile_samples + other.quantile_samples
+            if len(samples) > self.num_quantile_samples:
+                # Each sample stands for count/len(samples) values of its stream.
+                weights = np.array(
+                    [self.count / max(len(self.quantile_samples), 1)] * len(self.quantile_samples) +
+                    [other.count / max(len(other.quantile_samples), 1)] * len(other.quantile_samples)
+                )
+                indices = np.random.choice(
+                    len(samples), size=self.num_quantile_samples, replace=False, p=weights / np.sum(weights)
+                )
+                samples = [samples[i] for i in indices]
+            self.quantile_samples = samples
+        self.count = count
+
+    @staticmethod
+    def merged(statistics, window_size=None, num_quantile_samples=None):
+        """
+        Merges several streams' statistics into a new StreamingStatistics object.
+
+        Args:
+            statistics (Iterable[StreamingStatistics]): The statistics to merge.
+            window_size (Optional[int]): The window size of the result. Default: Sum of all window sizes.
+            num_quantile_samples (Optional[int]): The reservoir size of the result. Default: Maximum over all
+                statistics.
+
+        Returns:
+            StreamingStatistics: The merged statistics.
+        """
+        statistics = list(statistics)
+        if window_size is None:
+            window_size = sum(stats.window_size for stats in statistics) or 1
+        if num_quantile_samples is None:
+            num_quantile_samples = max([stats.num_quantile_samples for stats in statistics] or [0])
+        result = StreamingStatistics(
+            window_size=window_size, num_quantile_samples=num_quantile_samples,
+            quantiles=statistics[0].quantiles if len(statistics) > 0 else (0.1, 0.5, 0.9)
+        )
+        for stats in statistics:
+            result.merge(stats)
+        return result
+
+    def reset(self):
+        self.window.clear()
+        self.quantile_samples = []
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = float("inf")
+        self.max = float("-inf")
+        self.last = None
+
+    def get_statistics(self):
+        """
+        Returns:
+            dict: count, mean, std, min, max and last value over all values, mean, min and max over the window of the
+                most recent values, and (if quantile samples are collected) the estimated quantiles (keyed e.g.
+                "q0.5"). All values are None if nothing has been added yet.
+        """
+        if self.count == 0:
+            statistics = dict(
+                count=0, mean=None, std=None, min=None, max=None, last=None,
+                window_mean=None, window_min=None, window_max=None
+            )
+        else:
+            statistics = dict(
+                count=self.count,
+                mean=self.mean,
+                std=(self.m2 / self.count) ** 0.5,
+                min=self.min,
+                max=self.max,
+                last=self.last,
+                window_mean=float(np.mean(self.window)),
+                window_min=min(self.window),
+                window_max=max(self.window)
+            )
+        if self.num_quantile_samples > 0:
+            for quantile in self.quantiles:
+                statistics["q{:g}".format(quantile)] = float(np.percentile(self.quantile_samples, quantile * 100)) \
+                    if len(self.quantile_samples) > 0 else None
+        return statistics